@@ -15,72 +15,97 @@
 """Python idiomatic client for Google Cloud Firestore."""
 
 
-from google.cloud.firestore_v1 import __version__
-from google.cloud.firestore_v1 import ArrayRemove
-from google.cloud.firestore_v1 import ArrayUnion
-from google.cloud.firestore_v1 import AsyncClient
-from google.cloud.firestore_v1 import AsyncCollectionReference
-from google.cloud.firestore_v1 import AsyncDocumentReference
-from google.cloud.firestore_v1 import AsyncQuery
-from google.cloud.firestore_v1 import async_transactional
-from google.cloud.firestore_v1 import AsyncTransaction
-from google.cloud.firestore_v1 import AsyncWriteBatch
-from google.cloud.firestore_v1 import Client
-from google.cloud.firestore_v1 import CollectionGroup
-from google.cloud.firestore_v1 import CollectionReference
-from google.cloud.firestore_v1 import DELETE_FIELD
-from google.cloud.firestore_v1 import DocumentReference
-from google.cloud.firestore_v1 import DocumentSnapshot
-from google.cloud.firestore_v1 import DocumentTransform
-from google.cloud.firestore_v1 import ExistsOption
-from google.cloud.firestore_v1 import GeoPoint
-from google.cloud.firestore_v1 import Increment
-from google.cloud.firestore_v1 import LastUpdateOption
-from google.cloud.firestore_v1 import Maximum
-from google.cloud.firestore_v1 import Minimum
-from google.cloud.firestore_v1 import Query
-from google.cloud.firestore_v1 import ReadAfterWriteError
-from google.cloud.firestore_v1 import SERVER_TIMESTAMP
-from google.cloud.firestore_v1 import Transaction
-from google.cloud.firestore_v1 import transactional
-from google.cloud.firestore_v1 import types
-from google.cloud.firestore_v1 import Watch
-from google.cloud.firestore_v1 import WriteBatch
-from google.cloud.firestore_v1 import WriteOption
-from typing import List
-
-
-__all__: List[str] = [
+import sys
+
+from google.cloud import firestore_v1
+from typing import Any, List
+
+
+def __getattr__(name: str) -> Any:
+    """Resolve public names lazily from :mod:`google.cloud.firestore_v1`.
+
+    Args:
+        name (str): The attribute being looked up.
+
+    Returns:
+        Any: The object exported by :mod:`google.cloud.firestore_v1`.
+
+    Raises:
+        AttributeError: If ``name`` is not a public name of this package.
+    """
+    if name not in __all__:
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+    value = getattr(firestore_v1, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
+
+
+# The names are resolved by ``__getattr__`` on first access, so they are not
+# bound in this module until then.
+__all__: List[str] = [  # noqa: F822
     "__version__",
     "ArrayRemove",
     "ArrayUnion",
     "AsyncClient",
     "AsyncCollectionReference",
     "AsyncDocumentReference",
+    "AsyncHedgingPolicy",
+    "AsyncOperationPoller",
     "AsyncQuery",
+    "AsyncReadBatcher",
+    "AsyncShardedCounter",
     "async_transactional",
     "AsyncTransaction",
     "AsyncWriteBatch",
+    "AsyncWriteBuffer",
+    "BulkEncoder",
+    "BundleReader",
+    "BundleWriter",
     "Client",
     "CollectionGroup",
     "CollectionReference",
     "DELETE_FIELD",
+    "Deadline",
+    "DocumentCache",
     "DocumentReference",
     "DocumentSnapshot",
     "DocumentTransform",
     "ExistsOption",
     "GeoPoint",
+    "HedgingPolicy",
+    "HedgingStats",
     "Increment",
+    "IndexAdvisor",
     "LastUpdateOption",
+    "ListenerState",
+    "MaterializationLimitExceeded",
     "Maximum",
     "Minimum",
     "Query",
+    "QueryMatcher",
+    "QueryResults",
+    "QueryResultsStats",
     "ReadAfterWriteError",
+    "ReadBatcher",
     "SERVER_TIMESTAMP",
+    "ShardedCounter",
     "Transaction",
     "transactional",
     "types",
     "Watch",
     "WriteBatch",
+    "WriteBuffer",
     "WriteOption",
 ]
+
+
+if sys.version_info < (3, 7):  # pragma: NO COVER
+    # Module-level ``__getattr__`` requires Python 3.7; import eagerly.
+    for _name in __all__:
+        __getattr__(_name)
+    del _name
@@ -16,97 +16,135 @@
 #
 
 
-"""Python idiomatic client for Google Cloud Firestore."""
-
-
-import pkg_resources
-
-try:
-    __version__ = pkg_resources.get_distribution("google-cloud-firestore").version
-except pkg_resources.DistributionNotFound:
-    __version__ = None
-
-from google.cloud.firestore_v1 import types
-from google.cloud.firestore_v1._helpers import GeoPoint
-from google.cloud.firestore_v1._helpers import ExistsOption
-from google.cloud.firestore_v1._helpers import LastUpdateOption
-from google.cloud.firestore_v1._helpers import ReadAfterWriteError
-from google.cloud.firestore_v1._helpers import WriteOption
-from google.cloud.firestore_v1.async_batch import AsyncWriteBatch
-from google.cloud.firestore_v1.async_client import AsyncClient
-from google.cloud.firestore_v1.async_collection import AsyncCollectionReference
-from google.cloud.firestore_v1.async_document import AsyncDocumentReference
-from google.cloud.firestore_v1.async_query import AsyncQuery
-from google.cloud.firestore_v1.async_transaction import async_transactional
-from google.cloud.firestore_v1.async_transaction import AsyncTransaction
-from google.cloud.firestore_v1.base_document import DocumentSnapshot
-from google.cloud.firestore_v1.batch import WriteBatch
-from google.cloud.firestore_v1.client import Client
-from google.cloud.firestore_v1.collection import CollectionReference
-from google.cloud.firestore_v1.document import DocumentReference
-from google.cloud.firestore_v1.query import CollectionGroup
-from google.cloud.firestore_v1.query import Query
-from google.cloud.firestore_v1.transaction import Transaction
-from google.cloud.firestore_v1.transaction import transactional
-from google.cloud.firestore_v1.transforms import ArrayRemove
-from google.cloud.firestore_v1.transforms import ArrayUnion
-from google.cloud.firestore_v1.transforms import DELETE_FIELD
-from google.cloud.firestore_v1.transforms import Increment
-from google.cloud.firestore_v1.transforms import Maximum
-from google.cloud.firestore_v1.transforms import Minimum
-from google.cloud.firestore_v1.transforms import SERVER_TIMESTAMP
-from google.cloud.firestore_v1.watch import Watch
-
-
-# TODO(https://github.com/googleapis/python-firestore/issues/93): this is all on the generated surface. We require this to match
-# firestore.py. So comment out until needed on customer level for certain.
-# from .services.firestore import FirestoreClient
-# from .types.common import DocumentMask
-# from .types.common import Precondition
-# from .types.common import TransactionOptions
-# from .types.document import ArrayValue
-# from .types.document import Document
-# from .types.document import MapValue
-# from .types.document import Value
-# from .types.firestore import BatchGetDocumentsRequest
-# from .types.firestore import BatchGetDocumentsResponse
-# from .types.firestore import BatchWriteRequest
-# from .types.firestore import BatchWriteResponse
-# from .types.firestore import BeginTransactionRequest
-# from .types.firestore import BeginTransactionResponse
-# from .types.firestore import CommitRequest
-# from .types.firestore import CommitResponse
-# from .types.firestore import CreateDocumentRequest
-# from .types.firestore import DeleteDocumentRequest
-# from .types.firestore import GetDocumentRequest
-# from .types.firestore import ListCollectionIdsRequest
-# from .types.firestore import ListCollectionIdsResponse
-# from .types.firestore import ListDocumentsRequest
-# from .types.firestore import ListDocumentsResponse
-# from .types.firestore import ListenRequest
-# from .types.firestore import ListenResponse
-# from .types.firestore import PartitionQueryRequest
-# from .types.firestore import PartitionQueryResponse
-# from .types.firestore import RollbackRequest
-# from .types.firestore import RunQueryRequest
-# from .types.firestore import RunQueryResponse
-# from .types.firestore import Target
-# from .types.firestore import TargetChange
-# from .types.firestore import UpdateDocumentRequest
-# from .types.firestore import WriteRequest
-# from .types.firestore import WriteResponse
-# from .types.query import Cursor
-# from .types.query import StructuredQuery
-# from .types.write import DocumentChange
-# from .types.write import DocumentDelete
-# from .types.write import DocumentRemove
-from .types.write import DocumentTransform
-from typing import List
-
-
-# from .types.write import ExistenceFilter
-# from .types.write import Write
-# from .types.write import WriteResult
+"""Python idiomatic client for Google Cloud Firestore.
+
+The public names below are imported on first access (`PEP 562`_), so that
+``import google.cloud.firestore_v1`` does not pay for the async, watch and
+generated API modules an application never uses.
+
+.. _PEP 562: https://www.python.org/dev/peps/pep-0562/
+"""
+
+import importlib
+import sys
+
+from typing import Any, List
+
+
+_DISTRIBUTION_NAME = "google-cloud-firestore"
+
+# Maps each public name to the module defining it.
+_LAZY_ATTRIBUTES = {
+    "ArrayRemove": "google.cloud.firestore_v1.transforms",
+    "ArrayUnion": "google.cloud.firestore_v1.transforms",
+    "AsyncClient": "google.cloud.firestore_v1.async_client",
+    "AsyncCollectionReference": "google.cloud.firestore_v1.async_collection",
+    "AsyncDocumentReference": "google.cloud.firestore_v1.async_document",
+    "AsyncHedgingPolicy": "google.cloud.firestore_v1.async_hedging",
+    "AsyncOperationPoller": "google.cloud.firestore_v1.async_operation_poller",
+    "AsyncQuery": "google.cloud.firestore_v1.async_query",
+    "AsyncReadBatcher": "google.cloud.firestore_v1.async_read_batcher",
+    "AsyncShardedCounter": "google.cloud.firestore_v1.async_sharded_counter",
+    "async_transactional": "google.cloud.firestore_v1.async_transaction",
+    "AsyncTransaction": "google.cloud.firestore_v1.async_transaction",
+    "AsyncWriteBatch": "google.cloud.firestore_v1.async_batch",
+    "AsyncWriteBuffer": "google.cloud.firestore_v1.async_write_buffer",
+    "BulkEncoder": "google.cloud.firestore_v1.bulk_encoder",
+    "BundleReader": "google.cloud.firestore_v1.bundle",
+    "BundleWriter": "google.cloud.firestore_v1.bundle",
+    "Client": "google.cloud.firestore_v1.client",
+    "CollectionGroup": "google.cloud.firestore_v1.query",
+    "CollectionReference": "google.cloud.firestore_v1.collection",
+    "DELETE_FIELD": "google.cloud.firestore_v1.transforms",
+    "Deadline": "google.cloud.firestore_v1.deadline",
+    "DocumentCache": "google.cloud.firestore_v1.document_cache",
+    "DocumentReference": "google.cloud.firestore_v1.document",
+    "DocumentSnapshot": "google.cloud.firestore_v1.base_document",
+    "DocumentTransform": "google.cloud.firestore_v1.types.write",
+    "ExistsOption": "google.cloud.firestore_v1._helpers",
+    "GeoPoint": "google.cloud.firestore_v1._helpers",
+    "HedgingPolicy": "google.cloud.firestore_v1.hedging",
+    "HedgingStats": "google.cloud.firestore_v1.base_hedging",
+    "Increment": "google.cloud.firestore_v1.transforms",
+    "IndexAdvisor": "google.cloud.firestore_v1.index_advisor",
+    "LastUpdateOption": "google.cloud.firestore_v1._helpers",
+    "ListenerState": "google.cloud.firestore_v1.watch",
+    "MaterializationLimitExceeded": "google.cloud.firestore_v1.query_results",
+    "Maximum": "google.cloud.firestore_v1.transforms",
+    "Minimum": "google.cloud.firestore_v1.transforms",
+    "Query": "google.cloud.firestore_v1.query",
+    "QueryMatcher": "google.cloud.firestore_v1.query_matcher",
+    "QueryResults": "google.cloud.firestore_v1.query_results",
+    "QueryResultsStats": "google.cloud.firestore_v1.query_results",
+    "ReadAfterWriteError": "google.cloud.firestore_v1._helpers",
+    "ReadBatcher": "google.cloud.firestore_v1.read_batcher",
+    "SERVER_TIMESTAMP": "google.cloud.firestore_v1.transforms",
+    "ShardedCounter": "google.cloud.firestore_v1.sharded_counter",
+    "Transaction": "google.cloud.firestore_v1.transaction",
+    "transactional": "google.cloud.firestore_v1.transaction",
+    "Watch": "google.cloud.firestore_v1.watch",
+    "WriteBatch": "google.cloud.firestore_v1.batch",
+    "WriteBuffer": "google.cloud.firestore_v1.write_buffer",
+    "WriteOption": "google.cloud.firestore_v1._helpers",
+}
+
+
+def _get_version() -> Any:
+    """Look up the installed version of this distribution.
+
+    Prefers :mod:`importlib.metadata` (Python 3.8+), which is much cheaper
+    to import than ``pkg_resources``.
+
+    Returns:
+        Optional[str]: The version, or :data:`None` if the distribution is
+        not installed.
+    """
+    try:
+        from importlib import metadata
+    except ImportError:  # pragma: NO COVER  Python < 3.8
+        import pkg_resources
+
+        try:
+            return pkg_resources.get_distribution(_DISTRIBUTION_NAME).version
+        except pkg_resources.DistributionNotFound:
+            return None
+
+    try:
+        return metadata.version(_DISTRIBUTION_NAME)
+    except metadata.PackageNotFoundError:
+        return None
+
+
+def __getattr__(name: str) -> Any:
+    """Import a public name of this package on first access.
+
+    Args:
+        name (str): The attribute being looked up.
+
+    Returns:
+        Any: The class, function, constant or module named ``name``.
+
+    Raises:
+        AttributeError: If ``name`` is not a public name of this package.
+    """
+    if name == "__version__":
+        value = _get_version()
+    elif name == "types":
+        value = importlib.import_module("google.cloud.firestore_v1.types")
+    elif name in _LAZY_ATTRIBUTES:
+        module = importlib.import_module(_LAZY_ATTRIBUTES[name])
+        value = getattr(module, name)
+    else:
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+    # Cache on the module so later lookups bypass ``__getattr__``.
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
+
 
 __all__: List[str] = [
     "__version__",
@@ -115,30 +153,58 @@ __all__: List[str] = [
     "AsyncClient",
     "AsyncCollectionReference",
     "AsyncDocumentReference",
+    "AsyncHedgingPolicy",
+    "AsyncOperationPoller",
     "AsyncQuery",
+    "AsyncReadBatcher",
+    "AsyncShardedCounter",
     "async_transactional",
     "AsyncTransaction",
     "AsyncWriteBatch",
+    "AsyncWriteBuffer",
+    "BulkEncoder",
+    "BundleReader",
+    "BundleWriter",
     "Client",
     "CollectionGroup",
     "CollectionReference",
     "DELETE_FIELD",
+    "Deadline",
+    "DocumentCache",
     "DocumentReference",
     "DocumentSnapshot",
     "DocumentTransform",
     "ExistsOption",
     "GeoPoint",
+    "HedgingPolicy",
+    "HedgingStats",
     "Increment",
+    "IndexAdvisor",
     "LastUpdateOption",
+    "ListenerState",
+    "MaterializationLimitExceeded",
     "Maximum",
     "Minimum",
     "Query",
+    "QueryMatcher",
+    "QueryResults",
+    "QueryResultsStats",
     "ReadAfterWriteError",
+    "ReadBatcher",
     "SERVER_TIMESTAMP",
+    "ShardedCounter",
     "Transaction",
     "transactional",
     "types",
     "Watch",
     "WriteBatch",
+    "WriteBuffer",
     "WriteOption",
 ]
+
+
+if sys.version_info < (3, 7):  # pragma: NO COVER
+    # Module-level ``__getattr__`` requires Python 3.7; import eagerly.
+    for _name in __all__:
+        __getattr__(_name)
+    del _name
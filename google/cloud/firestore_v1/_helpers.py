@@ -15,6 +15,7 @@
 """Common helpers shared across Google Cloud Firestore modules."""
 
 import datetime
+import functools
 
 from google.api_core.datetime_helpers import DatetimeWithNanoseconds  # type: ignore
 from google.api_core import gapic_v1  # type: ignore
@@ -27,12 +28,13 @@ from google.cloud._helpers import _datetime_to_pb_timestamp  # type: ignore
 from google.cloud.firestore_v1.types.write import DocumentTransform
 from google.cloud.firestore_v1 import transforms
 from google.cloud.firestore_v1 import types
+from google.cloud.firestore_v1.deadline import Deadline
 from google.cloud.firestore_v1.field_path import FieldPath
 from google.cloud.firestore_v1.field_path import parse_field_path
 from google.cloud.firestore_v1.types import common
 from google.cloud.firestore_v1.types import document
 from google.cloud.firestore_v1.types import write
-from typing import Any, Generator, List, NoReturn, Optional, Tuple, Union
+from typing import Any, Generator, Iterable, List, NoReturn, Optional, Tuple, Union
 
 _EmptyDict: transforms.Sentinel
 _GRPC_ERROR_MAPPING: dict
@@ -42,6 +44,10 @@ BAD_PATH_TEMPLATE = "A path element must be a string. Received {}, which is a {}
 DOCUMENT_PATH_DELIMITER = "/"
 INACTIVE_TXN = "Transaction not in progress, cannot be used in API requests."
 READ_AFTER_WRITE_ERROR = "Attempted read after write in a transaction."
+READ_TIME_WITH_TRANSACTION = (
+    "A read_time cannot be combined with a transaction; use a read-only "
+    "transaction created with ``read_time`` instead."
+)
 BAD_REFERENCE_ERROR = (
     "Reference value {!r} in unexpected format, expected to be of the form "
     "``projects/{{project}}/databases/{{database}}/"
@@ -253,6 +259,38 @@ def reference_value_to_document(reference_value, client) -> Any:
     return document
 
 
+def raw_pb(message) -> Any:
+    """Get the raw protobuf wrapped by a proto-plus message or container.
+
+    Responses of a client in raw protobuf mode are already raw protobufs,
+    and are returned as is.
+
+    Args:
+        message (Union[proto.Message, google.protobuf.message.Message]): A
+            message, or a map / repeated field of a message.
+
+    Returns:
+        google.protobuf.message.Message: The raw protobuf.
+    """
+    return getattr(message, "_pb", message)
+
+
+def timestamp_from_pb(message_pb, field_name: str) -> Optional[datetime.datetime]:
+    """Read a ``Timestamp`` field of a raw protobuf, as proto-plus would.
+
+    Args:
+        message_pb (google.protobuf.message.Message): A raw protobuf.
+        field_name (str): The name of the ``Timestamp`` field.
+
+    Returns:
+        Optional[~google.api_core.datetime_helpers.DatetimeWithNanoseconds]:
+        The timestamp, or :data:`None` if the field is not set.
+    """
+    if not message_pb.HasField(field_name):
+        return None
+    return DatetimeWithNanoseconds.from_timestamp_pb(getattr(message_pb, field_name))
+
+
 def decode_value(
     value, client
 ) -> Union[None, bool, int, float, list, datetime.datetime, str, bytes, dict, GeoPoint]:
@@ -260,7 +298,8 @@ def decode_value(
 
     Args:
         value (google.cloud.firestore_v1.types.Value): A
-            Firestore protobuf to be decoded / parsed / converted.
+            Firestore protobuf to be decoded / parsed / converted. May also
+            be the raw ``Value`` protobuf.
         client (:class:`~google.cloud.firestore_v1.client.Client`):
             A client that has a document factory.
 
@@ -270,40 +309,55 @@ def decode_value(
         Python value converted from the ``value``.
 
     Raises:
-        NotImplementedError: If the ``value_type`` is ``reference_value``.
         ValueError: If the ``value_type`` is unknown.
     """
-    value_type = value._pb.WhichOneof("value_type")
+    return _decode_value_pb(raw_pb(value), client)
 
-    if value_type == "null_value":
-        return None
-    elif value_type == "boolean_value":
-        return value.boolean_value
+
+def _decode_value_pb(value_pb, client) -> Any:
+    """Convert a raw ``Value`` protobuf, without proto-plus marshalling."""
+    value_type = value_pb.WhichOneof("value_type")
+
+    if value_type == "string_value":
+        return value_pb.string_value
     elif value_type == "integer_value":
-        return value.integer_value
+        return value_pb.integer_value
     elif value_type == "double_value":
-        return value.double_value
+        return value_pb.double_value
+    elif value_type == "boolean_value":
+        return value_pb.boolean_value
+    elif value_type == "null_value":
+        return None
     elif value_type == "timestamp_value":
-        return DatetimeWithNanoseconds.from_timestamp_pb(value._pb.timestamp_value)
-    elif value_type == "string_value":
-        return value.string_value
+        return DatetimeWithNanoseconds.from_timestamp_pb(value_pb.timestamp_value)
+    elif value_type == "map_value":
+        return _decode_dict_pb(value_pb.map_value.fields, client)
+    elif value_type == "array_value":
+        return [
+            _decode_value_pb(element, client) for element in value_pb.array_value.values
+        ]
     elif value_type == "bytes_value":
-        return value.bytes_value
+        return value_pb.bytes_value
     elif value_type == "reference_value":
-        return reference_value_to_document(value.reference_value, client)
+        return reference_value_to_document(value_pb.reference_value, client)
     elif value_type == "geo_point_value":
-        return GeoPoint(value.geo_point_value.latitude, value.geo_point_value.longitude)
-    elif value_type == "array_value":
-        return [decode_value(element, client) for element in value.array_value.values]
-    elif value_type == "map_value":
-        return decode_dict(value.map_value.fields, client)
+        geo_point = value_pb.geo_point_value
+        return GeoPoint(geo_point.latitude, geo_point.longitude)
     else:
         raise ValueError("Unknown ``value_type``", value_type)
 
 
+def _decode_dict_pb(fields_pb, client) -> dict:
+    """Convert a raw protobuf map of ``Value``-s."""
+    return {key: _decode_value_pb(value, client) for key, value in fields_pb.items()}
+
+
 def decode_dict(value_fields, client) -> dict:
     """Converts a protobuf map of Firestore ``Value``-s.
 
+    The values are decoded from the raw protobufs, which skips the
+    proto-plus wrapper of each value.
+
     Args:
         value_fields (google.protobuf.pyext._message.MessageMapContainer): A
             protobuf map of Firestore ``Value``-s.
@@ -315,7 +369,29 @@ def decode_dict(value_fields, client) -> dict:
             str, bytes, dict, ~google.cloud.Firestore.GeoPoint]]: A dictionary
         of native Python values converted from the ``value_fields``.
     """
-    return {key: decode_value(value, client) for key, value in value_fields.items()}
+    fields = raw_pb(value_fields)
+    if isinstance(fields, dict):
+        return {key: decode_value(value, client) for key, value in fields.items()}
+    return _decode_dict_pb(fields, client)
+
+
+def document_pb_from_snapshot(snapshot) -> types.document.Document:
+    """Converts the snapshot of an existing document to a protobuf.
+
+    Args:
+        snapshot (:class:`~google.cloud.firestore_v1.base_document.DocumentSnapshot`):
+            A snapshot of an existing document.
+
+    Returns:
+        google.cloud.firestore_v1.types.Document: The document's name,
+        fields and timestamps.
+    """
+    return document.Document(
+        name=snapshot.reference._document_path,
+        fields=encode_dict(snapshot._data),
+        create_time=snapshot.create_time,
+        update_time=snapshot.update_time,
+    )
 
 
 def get_doc_id(document_pb, expected_prefix) -> str:
@@ -919,6 +995,33 @@ def get_transaction_id(transaction, read_operation=True) -> Union[bytes, None]:
         return transaction.id
 
 
+def make_consistency_kwargs(transaction, read_time) -> dict:
+    """Build the ``consistency_selector`` fields for a read request.
+
+    Args:
+        transaction (Optional[:class:`~google.cloud.firestore_v1.transaction.\
+            Transaction`]):
+            An existing transaction that the read will run in.
+        read_time (Optional[Union[datetime.datetime, \
+            google.protobuf.timestamp_pb2.Timestamp]]):
+            If set, read documents as they were at this time.
+
+    Returns:
+        dict: Either a ``transaction`` or a ``read_time`` entry, ready to be
+        merged into a read request.
+
+    Raises:
+        ValueError: If both ``transaction`` and ``read_time`` are passed.
+    """
+    if read_time is None:
+        return {"transaction": get_transaction_id(transaction)}
+
+    if transaction is not None:
+        raise ValueError(READ_TIME_WITH_TRANSACTION)
+
+    return {"read_time": read_time}
+
+
 def metadata_with_prefix(prefix: str, **kw) -> List[Tuple[str, str]]:
     """Create RPC metadata containing a prefix.
 
@@ -1030,10 +1133,21 @@ class ExistsOption(WriteOption):
         write._pb.current_document.CopyFrom(current_doc._pb)
 
 
-def make_retry_timeout_kwargs(retry, timeout) -> dict:
-    """Helper fo API methods which take optional 'retry' / 'timeout' args."""
+def make_retry_timeout_kwargs(retry, timeout, is_async=False) -> dict:
+    """Helper fo API methods which take optional 'retry' / 'timeout' args.
+
+    If ``timeout`` is a :class:`~google.cloud.firestore_v1.deadline.Deadline`,
+    the retry is bounded by it too. ``is_async`` tells whether the arguments
+    are for an async GAPIC method, which needs an async retry.
+    """
     kwargs = {}
 
+    if isinstance(timeout, Deadline):
+        if is_async:
+            retry = timeout.async_retry(retry)
+        else:
+            retry = timeout.retry(retry)
+
     if retry is not gapic_v1.method.DEFAULT:
         kwargs["retry"] = retry
 
@@ -1041,3 +1155,36 @@ def make_retry_timeout_kwargs(retry, timeout) -> dict:
         kwargs["timeout"] = timeout
 
     return kwargs
+
+
+def chunks(entries: list, size: int) -> Iterable[list]:
+    """Split ``entries`` into consecutive lists of at most ``size`` items.
+
+    Args:
+        entries (list): The items to split.
+        size (int): The maximum number of items in each list.
+
+    Yields:
+        list: The next items of ``entries``.
+    """
+    for start in range(0, len(entries), size):
+        yield entries[start : start + size]
+
+
+def bind_page_kwargs(pager, kwargs: dict) -> Any:
+    """Send the retry / timeout of a paged request with each page request.
+
+    The GAPIC pagers request the next pages without them, so that, e.g.,
+    the pages after the first one would not share a
+    :class:`~google.cloud.firestore_v1.deadline.Deadline`.
+
+    Args:
+        pager (Any): The pager returned by the GAPIC method.
+        kwargs (dict): The retry / timeout arguments of the request.
+
+    Returns:
+        Any: The same pager.
+    """
+    if kwargs and hasattr(pager, "_method"):
+        pager._method = functools.partial(pager._method, **kwargs)
+    return pager
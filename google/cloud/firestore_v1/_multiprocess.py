@@ -0,0 +1,243 @@
+# Copyright 2020 Google LLC All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Read the partitions of a query in a pool of forked processes.
+
+Used by :meth:`~google.cloud.firestore_v1.query.CollectionGroup.stream_multiprocess`.
+The client, the retry and the output options are inherited by the workers
+through the fork, so only the serialized ``RunQueryRequest`` of each
+partition is pickled to a worker, and only batches of serialized documents
+(or of decoded columns) are pickled back.
+"""
+
+import multiprocessing
+import queue as queue_module
+
+from google.cloud.firestore_v1 import _helpers
+from google.cloud.firestore_v1.base_document import BaseDocumentReference
+from google.cloud.firestore_v1.field_path import FieldPath
+from google.cloud.firestore_v1.types import document as document_pb
+from google.cloud.firestore_v1.types import firestore
+from typing import Any, Dict, Generator, Iterable, List, Optional
+
+DEFAULT_SCAN_BATCH_SIZE = 500
+"""int: Default number of documents sent to the parent process at once."""
+NAME_COLUMN = "__name__"
+"""str: Column of the document paths in the batches of a columnar scan."""
+
+# Number of batches each worker may queue before waiting for the parent.
+_BATCHES_PER_WORKER = 4
+# Seconds between checks for failed workers while waiting for a batch.
+_POLL_INTERVAL = 0.1
+# Sent by a worker once it finished a partition.
+_DONE = None
+
+# State of a worker process, set up by ``_init_worker``.
+_worker = {}
+
+
+def _init_worker(client, batches, kwargs: dict, columns, batch_size: int) -> None:
+    """Keep the state inherited from the parent for ``_scan_partition``."""
+    _worker.update(
+        client=client,
+        batches=batches,
+        kwargs=kwargs,
+        columns=columns,
+        batch_size=batch_size,
+    )
+
+
+def _column_value(fields_pb, parts: List[str]) -> Any:
+    """Find the ``Value`` at a field path, or :data:`None` if it is missing."""
+    fields = fields_pb
+    value = None
+    for part in parts:
+        if value is not None:
+            if value.WhichOneof("value_type") != "map_value":
+                return None
+            fields = value.map_value.fields
+        if part not in fields:
+            return None
+        value = fields[part]
+    return value
+
+
+def _picklable(value) -> Any:
+    """Replace document references, bound to a client, with their paths."""
+    if isinstance(value, BaseDocumentReference):
+        return value.path
+    if isinstance(value, list):
+        return [_picklable(element) for element in value]
+    if isinstance(value, dict):
+        return {key: _picklable(element) for key, element in value.items()}
+    return value
+
+
+class _Columns(object):
+    """Accumulate query results as lists of field values, one per column.
+
+    Args:
+        client (:class:`~google.cloud.firestore_v1.client.Client`): The
+            client decoding the values.
+        columns (Iterable[str]): The field paths of the columns.
+    """
+
+    def __init__(self, client, columns: Iterable[str]) -> None:
+        self._client = client
+        self._columns = [
+            (column, FieldPath.from_string(column).parts) for column in columns
+        ]
+        self._reset()
+
+    def _reset(self) -> None:
+        self.batch = {NAME_COLUMN: []}
+        for column, _ in self._columns:
+            self.batch[column] = []
+
+    def __len__(self) -> int:
+        return len(self.batch[NAME_COLUMN])
+
+    def append(self, document_pb) -> None:
+        _, _, path = document_pb.name.partition("/documents/")
+        self.batch[NAME_COLUMN].append(path)
+        for column, parts in self._columns:
+            value = _column_value(document_pb.fields, parts)
+            if value is not None:
+                value = _picklable(_helpers.decode_value(value, self._client))
+            self.batch[column].append(value)
+
+    def pop(self) -> Dict[str, list]:
+        batch = self.batch
+        self._reset()
+        return batch
+
+
+class _Documents(object):
+    """Accumulate query results as serialized ``Document`` protobufs."""
+
+    def __init__(self) -> None:
+        self.batch = []
+
+    def __len__(self) -> int:
+        return len(self.batch)
+
+    def append(self, document_pb) -> None:
+        self.batch.append(document_pb.SerializeToString())
+
+    def pop(self) -> List[bytes]:
+        batch, self.batch = self.batch, []
+        return batch
+
+
+def _scan_partition(task: tuple) -> int:
+    """Run the query of a partition, sending its results in batches.
+
+    Args:
+        task (Tuple[int, bytes]): The index of the partition, and its
+            serialized ``RunQueryRequest``.
+
+    Returns:
+        int: The number of documents read.
+    """
+    index, request_pb = task
+    client = _worker["client"]
+    batches = _worker["batches"]
+    if _worker["columns"] is None:
+        output = _Documents()
+    else:
+        output = _Columns(client, _worker["columns"])
+
+    count = 0
+    response_iterator = client._firestore_api.run_query(
+        request=firestore.RunQueryRequest.deserialize(request_pb),
+        metadata=client._rpc_metadata,
+        **_worker["kwargs"],
+    )
+    for response in response_iterator:
+        response = _helpers.raw_pb(response)
+        if not response.HasField("document"):
+            continue
+        output.append(response.document)
+        count += 1
+        if len(output) >= _worker["batch_size"]:
+            batches.put((index, output.pop()))
+
+    if len(output):
+        batches.put((index, output.pop()))
+    batches.put((index, _DONE))
+    return count
+
+
+def scan(
+    client,
+    partitions: Iterable,
+    processes: Optional[int],
+    columns: Optional[Iterable[str]],
+    batch_size: int,
+    read_time,
+    kwargs: dict,
+) -> Generator[Any, Any, None]:
+    """Read partitions in a pool of forked processes.
+
+    Args:
+        client (:class:`~google.cloud.firestore_v1.client.Client`): The
+            client the workers inherit.
+        partitions (Iterable[:class:`~google.cloud.firestore_v1.base_query.QueryPartition`]):
+            The partitions to read.
+        processes (Optional[int]): The number of worker processes.
+        columns (Optional[Iterable[str]]): If passed, the field paths of the
+            columns to decode.
+        batch_size (int): The maximum number of documents in a batch.
+        read_time (Optional[datetime.datetime]): If passed, reads the
+            documents as of this time.
+        kwargs (dict): The retry and timeout of the requests.
+
+    Yields:
+        Union[~google.cloud.firestore_v1.types.Document, Dict[str, list]]:
+        The documents, or batches of columns, in the order they are read.
+    """
+    tasks = []
+    for index, partition in enumerate(partitions):
+        request, _, _ = partition.query()._prep_stream(read_time=read_time)
+        request_pb = firestore.RunQueryRequest(**request)._pb.SerializeToString()
+        tasks.append((index, request_pb))
+    if not tasks:
+        return
+
+    if columns is not None:
+        columns = list(columns)
+    processes = min(processes or multiprocessing.cpu_count(), len(tasks))
+    # The workers must inherit the client: it cannot be pickled.
+    context = multiprocessing.get_context("fork")
+    batches = context.Queue(maxsize=processes * _BATCHES_PER_WORKER)
+    initargs = (client, batches, kwargs, columns, batch_size)
+
+    with context.Pool(processes, _init_worker, initargs) as pool:
+        result = pool.map_async(_scan_partition, tasks, chunksize=1)
+        remaining = len(tasks)
+        while remaining:
+            try:
+                _, batch = batches.get(timeout=_POLL_INTERVAL)
+            except queue_module.Empty:
+                if result.ready() and not result.successful():
+                    result.get()
+                continue
+
+            if batch is _DONE:
+                remaining -= 1
+            elif columns is None:
+                for document in batch:
+                    yield document_pb.Document.deserialize(document)
+            else:
+                yield batch
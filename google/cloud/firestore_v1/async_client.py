@@ -24,19 +24,29 @@ In the hierarchy of API concepts
   :class:`~google.cloud.firestore_v1.async_document.AsyncDocumentReference`
 """
 
+import asyncio
+
 from google.api_core import gapic_v1  # type: ignore
 from google.api_core import retry as retries  # type: ignore
 
 from google.cloud.firestore_v1.base_client import (
     BaseClient,
     DEFAULT_DATABASE,
+    DEFAULT_WALK_CONCURRENCY,
     _CLIENT_INFO,
     _parse_batch_get,  # type: ignore
     _path_helper,
+    _raw_stub,
+    _walk_children,
+    _walk_entry,
 )
 
+from google.cloud.firestore_v1 import _helpers
 from google.cloud.firestore_v1.async_query import AsyncCollectionGroup
 from google.cloud.firestore_v1.async_batch import AsyncWriteBatch
+from google.cloud.firestore_v1.async_write_buffer import AsyncWriteBuffer
+from google.cloud.firestore_v1.async_read_batcher import AsyncReadBatcher
+from google.cloud.firestore_v1.async_hedging import AsyncHedgingPolicy
 from google.cloud.firestore_v1.async_collection import AsyncCollectionReference
 from google.cloud.firestore_v1.async_document import (
     AsyncDocumentReference,
@@ -49,7 +59,25 @@ from google.cloud.firestore_v1.services.firestore import (
 from google.cloud.firestore_v1.services.firestore.transports import (
     grpc_asyncio as firestore_grpc_transport,
 )
-from typing import Any, AsyncGenerator, Iterable, Tuple
+from typing import Any, AsyncGenerator, Iterable, Optional, Tuple, Union
+
+
+class _RawFirestoreGrpcAsyncIOTransport(
+    firestore_grpc_transport.FirestoreGrpcAsyncIOTransport
+):
+    """Deserialize the responses of streamed reads into raw protobufs."""
+
+    @property
+    def batch_get_documents(self):
+        return _raw_stub(self, "batch_get_documents")
+
+    @property
+    def run_query(self):
+        return _raw_stub(self, "run_query")
+
+    @property
+    def listen(self):
+        return _raw_stub(self, "listen")
 
 
 class AsyncClient(BaseClient):
@@ -78,8 +106,20 @@ class AsyncClient(BaseClient):
         client_options (Union[dict, google.api_core.client_options.ClientOptions]):
             Client options used to set user options on the client. API Endpoint
             should be set through client_options.
+        raw_protobuf (Optional[bool]): If :data:`True`, the responses of
+            ``BatchGetDocuments``, ``RunQuery`` and ``Listen`` are
+            deserialized into raw protobuf messages, without proto-plus
+            wrappers, and decoded from those. The snapshots returned are
+            the same. Defaults to :data:`False`.
+        max_get_documents (Optional[int]): The maximum number of documents
+            ``get`` may return for a query or collection, unless passed
+            its own ``max_documents``. Reading more raises
+            :class:`~google.cloud.firestore_v1.query_results.MaterializationLimitExceeded`.
+            Defaults to no limit.
     """
 
+    _is_async = True
+
     def __init__(
         self,
         project=None,
@@ -87,6 +127,8 @@ class AsyncClient(BaseClient):
         database=DEFAULT_DATABASE,
         client_info=_CLIENT_INFO,
         client_options=None,
+        raw_protobuf=False,
+        max_get_documents=None,
     ) -> None:
         super(AsyncClient, self).__init__(
             project=project,
@@ -94,6 +136,8 @@ class AsyncClient(BaseClient):
             database=database,
             client_info=client_info,
             client_options=client_options,
+            raw_protobuf=raw_protobuf,
+            max_get_documents=max_get_documents,
         )
 
     @property
@@ -103,10 +147,11 @@ class AsyncClient(BaseClient):
             :class:`~google.cloud.gapic.firestore.v1`.async_firestore_client.FirestoreAsyncClient:
             The GAPIC client with the credentials of the current client.
         """
+        transport = firestore_grpc_transport.FirestoreGrpcAsyncIOTransport
+        if self._raw_protobuf:
+            transport = _RawFirestoreGrpcAsyncIOTransport
         return self._firestore_api_helper(
-            firestore_grpc_transport.FirestoreGrpcAsyncIOTransport,
-            firestore_client.FirestoreAsyncClient,
-            firestore_client,
+            transport, firestore_client.FirestoreAsyncClient, firestore_client,
         )
 
     @property
@@ -203,8 +248,8 @@ class AsyncClient(BaseClient):
             :class:`~google.cloud.firestore_v1.document.AsyncDocumentReference`:
             A reference to a document in a collection.
         """
-        return AsyncDocumentReference(
-            *self._document_path_helper(*document_path), client=self
+        return self._get_document_reference(
+            AsyncDocumentReference, self._document_path_helper(*document_path)
         )
 
     async def get_all(
@@ -214,6 +259,7 @@ class AsyncClient(BaseClient):
         transaction=None,
         retry: retries.Retry = gapic_v1.method.DEFAULT,
         timeout: float = None,
+        read_time=None,
     ) -> AsyncGenerator[DocumentSnapshot, Any]:
         """Retrieve a batch of documents.
 
@@ -248,17 +294,24 @@ class AsyncClient(BaseClient):
                 should be retried.  Defaults to a system-specified policy.
             timeout (float): The timeout for this request.  Defaults to a
                 system-specified value.
+            read_time (Optional[datetime.datetime]): If set, read the
+                documents as they were at this time rather than their latest
+                versions. Cannot be combined with ``transaction``.
 
         Yields:
             .DocumentSnapshot: The next document snapshot that fulfills the
             query, or :data:`None` if the document does not exist.
         """
         request, reference_map, kwargs = self._prep_get_all(
-            references, field_paths, transaction, retry, timeout
+            references, field_paths, transaction, retry, timeout, read_time
         )
 
-        response_iterator = await self._firestore_api.batch_get_documents(
-            request=request, metadata=self._rpc_metadata, **kwargs,
+        response_iterator = await self._call_read(
+            self._firestore_api.batch_get_documents,
+            True,
+            request=request,
+            metadata=self._rpc_metadata,
+            **kwargs,
         )
 
         async for get_doc_response in response_iterator:
@@ -283,10 +336,78 @@ class AsyncClient(BaseClient):
         iterator = await self._firestore_api.list_collection_ids(
             request=request, metadata=self._rpc_metadata, **kwargs,
         )
+        iterator = _helpers.bind_page_kwargs(iterator, kwargs)
 
         async for collection_id in iterator:
             yield self.collection(collection_id)
 
+    async def walk(
+        self,
+        root: Union[AsyncCollectionReference, AsyncDocumentReference, None] = None,
+        max_depth: Optional[int] = None,
+        concurrency: int = DEFAULT_WALK_CONCURRENCY,
+        retry: retries.Retry = gapic_v1.method.DEFAULT,
+        timeout: float = None,
+    ) -> AsyncGenerator[Tuple[str, str], Any]:
+        """Walk the tree of collections and documents below ``root``.
+
+        The tree is explored breadth-first: all the nodes of a level are
+        expanded, up to ``concurrency`` at a time, with ``ListCollectionIds``
+        (below documents) and ``ListDocuments`` (below collections) before
+        the next level. Documents which do not exist but have subcollections
+        are walked as well.
+
+        Entries are yielded in a stable order: level by level, in the order
+        of their parents, and ordered by ID among siblings. Each node is
+        yielded and expanded once.
+
+        Args:
+            root (Optional[Union[:class:`~google.cloud.firestore_v1.async_collection.AsyncCollectionReference`, :class:`~google.cloud.firestore_v1.async_document.AsyncDocumentReference`]]):
+                The node to walk below (not yielded itself). Defaults to the
+                root of the database.
+            max_depth (Optional[int]): The number of levels to walk: ``1``
+                only yields the children of ``root``, ``2`` their children
+                as well, and so on. Defaults to the whole tree.
+            concurrency (Optional[int]): The maximum number of listing
+                requests in flight. Defaults to
+                :data:`~google.cloud.firestore_v1.base_client.DEFAULT_WALK_CONCURRENCY`.
+            retry (google.api_core.retry.Retry): Designation of what errors, if any,
+                should be retried.  Defaults to a system-specified policy.
+            timeout (float): The timeout for each request.  Defaults to a
+                system-specified value.
+
+        Yields:
+            Tuple[str, str]: The database-relative path of each node, and
+            its kind, either ``"collection"`` or ``"document"``.
+
+        Raises:
+            TypeError: If ``root`` is not a reference.
+            ValueError: If ``max_depth`` or ``concurrency`` is not positive.
+        """
+        level, kwargs = self._prep_walk(root, max_depth, concurrency, retry, timeout)
+        semaphore = asyncio.Semaphore(concurrency)
+        visited = set()
+        depth = 0
+
+        async def list_children(node):
+            async with semaphore:
+                return await _list_children(node, kwargs)
+
+        while level and (max_depth is None or depth < max_depth):
+            depth += 1
+            next_level = []
+            tasks = [asyncio.ensure_future(list_children(node)) for node in level]
+            try:
+                # Awaited in the order of their parents.
+                for task in tasks:
+                    for child in _walk_children(await task, visited):
+                        yield _walk_entry(child)
+                        next_level.append(child)
+            finally:
+                for task in tasks:
+                    task.cancel()
+            level = next_level
+
     def batch(self) -> AsyncWriteBatch:
         """Get a batch instance from this client.
 
@@ -314,3 +435,97 @@ class AsyncClient(BaseClient):
             A transaction attached to this client.
         """
         return AsyncTransaction(self, **kwargs)
+
+    def write_buffer(self, **kwargs) -> AsyncWriteBuffer:
+        """Get a write buffer that coalesces writes made through it.
+
+        See :class:`~google.cloud.firestore_v1.async_write_buffer.AsyncWriteBuffer` for
+        more information on write buffers and the constructor arguments.
+
+        Args:
+            kwargs (Dict[str, Any]): The keyword arguments (other than
+                ``client``) to pass along to the
+                :class:`~google.cloud.firestore_v1.async_write_buffer.AsyncWriteBuffer`
+                constructor.
+
+        Returns:
+            :class:`~google.cloud.firestore_v1.async_write_buffer.AsyncWriteBuffer`:
+            A write buffer attached to this client.
+        """
+        return AsyncWriteBuffer(self, **kwargs)
+
+    def batch_reads(self, **kwargs) -> AsyncReadBatcher:
+        """Collect concurrent document reads into batched calls.
+
+        Until the returned batcher is closed, plain
+        :meth:`~google.cloud.firestore_v1.async_document.AsyncDocumentReference.get`
+        calls made through this client are sent in ``BatchGetDocuments``
+        calls. A batcher previously returned by this method stops accepting
+        reads (the reads it already holds are still sent).
+
+        See :class:`~google.cloud.firestore_v1.async_read_batcher.AsyncReadBatcher`
+        for more information on read batching and the constructor arguments.
+
+        Args:
+            kwargs (Dict[str, Any]): The keyword arguments (other than
+                ``client``) to pass along to the
+                :class:`~google.cloud.firestore_v1.async_read_batcher.AsyncReadBatcher`
+                constructor.
+
+        Returns:
+            :class:`~google.cloud.firestore_v1.async_read_batcher.AsyncReadBatcher`:
+            A read batcher attached to this client.
+        """
+        read_batcher = AsyncReadBatcher(self, **kwargs)
+        if self._read_batcher is not None:
+            self._read_batcher._detach()
+        self._read_batcher = read_batcher
+        return read_batcher
+
+    def hedge_reads(self, **kwargs) -> AsyncHedgingPolicy:
+        """Send duplicate requests for slow reads, and use the first response.
+
+        Until the returned policy is closed, the requests of
+        :meth:`~google.cloud.firestore_v1.async_document.AsyncDocumentReference.get`,
+        :meth:`get_all` and :meth:`~google.cloud.firestore_v1.async_query.AsyncQuery.stream`
+        made through this client are hedged. A policy previously returned
+        by this method stops being used.
+
+        See :class:`~google.cloud.firestore_v1.async_hedging.AsyncHedgingPolicy` for more
+        information on hedging and the constructor arguments.
+
+        Args:
+            kwargs (Dict[str, Any]): The keyword arguments (other than
+                ``client``) to pass along to the
+                :class:`~google.cloud.firestore_v1.async_hedging.AsyncHedgingPolicy`
+                constructor.
+
+        Returns:
+            :class:`~google.cloud.firestore_v1.async_hedging.AsyncHedgingPolicy`:
+            A hedging policy attached to this client, whose ``stats`` tell
+            how often hedges are sent and win.
+        """
+        policy = AsyncHedgingPolicy(self, **kwargs)
+        if self._hedging_policy is not None:
+            self._hedging_policy._detach()
+        self._hedging_policy = policy
+        return policy
+
+
+async def _list_children(node, kwargs: dict) -> list:
+    """List the nodes directly below a node of :meth:`AsyncClient.walk`.
+
+    Args:
+        node (Union[AsyncClient, AsyncCollectionReference, AsyncDocumentReference]):
+            The node, the client standing for the root of the database.
+        kwargs (dict): The retry and timeout of the request.
+
+    Returns:
+        list: The documents of a collection, or the collections below the
+        root or a document.
+    """
+    if isinstance(node, AsyncCollectionReference):
+        iterator = node.list_documents(**kwargs)
+    else:
+        iterator = node.collections(**kwargs)
+    return [child async for child in iterator]
@@ -14,14 +14,21 @@
 
 """Classes for representing collections for the Google Cloud Firestore API."""
 
+import asyncio
+
 from google.api_core import gapic_v1  # type: ignore
 from google.api_core import retry as retries  # type: ignore
 
 from google.cloud.firestore_v1.base_collection import (
     BaseCollectionReference,
+    _MAX_SCAN_WORKERS,
+    _SCAN_BUFFER_SIZE,
     _item_to_document_ref,
+    _page_document_ids,
+    _scan_document_id,
 )
 from google.cloud.firestore_v1 import (
+    _helpers,
     async_query,
     async_document,
 )
@@ -29,11 +36,14 @@ from google.cloud.firestore_v1 import (
 from google.cloud.firestore_v1.document import DocumentReference
 
 from typing import AsyncIterator
-from typing import Any, AsyncGenerator, Tuple
+from typing import Any, AsyncGenerator, AsyncIterable, Tuple, Union
 
 # Types needed only for Type Hints
+from google.cloud.firestore_v1.query_results import QueryResults
 from google.cloud.firestore_v1.transaction import Transaction
 
+_EXHAUSTED = object()
+
 
 class AsyncCollectionReference(BaseCollectionReference):
     """A reference to a collection in a Firestore database.
@@ -61,6 +71,8 @@ class AsyncCollectionReference(BaseCollectionReference):
         TypeError: If a keyword other than ``client`` is used.
     """
 
+    __slots__ = ()
+
     def __init__(self, *path, **kwargs) -> None:
         super(AsyncCollectionReference, self).__init__(*path, **kwargs)
 
@@ -140,15 +152,141 @@ class AsyncCollectionReference(BaseCollectionReference):
         iterator = await self._client._firestore_api.list_documents(
             request=request, metadata=self._client._rpc_metadata, **kwargs,
         )
+        iterator = _helpers.bind_page_kwargs(iterator, kwargs)
         async for i in iterator:
             yield _item_to_document_ref(self, i)
 
+    async def list_document_ids(
+        self,
+        page_size: int = None,
+        partition_count: int = None,
+        retry: retries.Retry = gapic_v1.method.DEFAULT,
+        timeout: float = None,
+    ) -> AsyncGenerator[str, None]:
+        """List the IDs of all documents in the current collection.
+
+        Unlike :meth:`list_documents`, this yields plain document ID strings,
+        and requests the next page of results in the background while the
+        current one is consumed.
+
+        If ``partition_count`` is passed, the IDs are instead read by a
+        parallel scan: the collection group with this collection's ID is
+        split into up to ``partition_count`` ranges with ``PartitionQuery``,
+        and the parts of the ranges inside this collection are read
+        concurrently (a few at a time). The scan only sees existing
+        documents, so it skips the missing documents (with subcollections)
+        which :meth:`list_documents` returns.
+
+        Args:
+            page_size (Optional[int]]): The maximum number of documents
+                in each page of results from this request. Non-positive values
+                are ignored. Defaults to a sensible value set by the API.
+            partition_count (Optional[int]): If set, the number of ranges to
+                split a parallel scan into.
+            retry (google.api_core.retry.Retry): Designation of what errors, if any,
+                should be retried.  Defaults to a system-specified policy.
+            timeout (float): The timeout for this request.  Defaults to a
+                system-specified value.
+
+        Yields:
+            str: The IDs of the documents in the collection, in order.
+
+        Raises:
+            ValueError: If ``partition_count`` is not positive.
+        """
+        request, kwargs = self._prep_list_document_ids(
+            page_size, partition_count, retry, timeout
+        )
+
+        if partition_count is not None:
+            async for document_id in self._scan_document_ids(partition_count, kwargs):
+                yield document_id
+            return
+
+        pager = await self._client._firestore_api.list_documents(
+            request=request, metadata=self._client._rpc_metadata, **kwargs,
+        )
+        pager = _helpers.bind_page_kwargs(pager, kwargs)
+        async for page in _prefetch(pager.pages):
+            for document_id in _page_document_ids(page):
+                yield document_id
+
+    async def _scan_document_ids(
+        self, partition_count: int, kwargs: dict
+    ) -> AsyncGenerator[str, None]:
+        """Read the IDs of the documents in this collection in parallel.
+
+        Up to :data:`~google.cloud.firestore_v1.base_collection._MAX_SCAN_WORKERS`
+        partitions are read at once, each reading at most
+        :data:`~google.cloud.firestore_v1.base_collection._SCAN_BUFFER_SIZE`
+        IDs ahead of the caller.
+
+        Args:
+            partition_count (int): The number of ranges to split the scan into.
+            kwargs (dict): The retry / timeout arguments for each request.
+
+        Yields:
+            str: The IDs of the documents in the collection, in order.
+        """
+        _, expected_prefix = self._parent_info()
+        collection_group = self._client.collection_group(self.id)
+        queries = []
+        async for partition in collection_group.get_partitions(
+            partition_count, **kwargs
+        ):
+            query = self._id_scan_query(partition)
+            if query is not None:
+                queries.append(query)
+
+        async def scan(query, buffer):
+            try:
+                request, _, _ = query._prep_stream()
+                response_iterator = await self._client._firestore_api.run_query(
+                    request=request, metadata=self._client._rpc_metadata, **kwargs,
+                )
+                async for response in response_iterator:
+                    document_id = _scan_document_id(response, expected_prefix)
+                    if document_id:
+                        await buffer.put(document_id)
+            except Exception as exc:
+                await buffer.put(exc)
+            else:
+                await buffer.put(_EXHAUSTED)
+
+        buffers = [asyncio.Queue(_SCAN_BUFFER_SIZE) for _ in queries]
+        tasks = []
+
+        def start_next():
+            # Partitions start in order, as the ones before them finish.
+            if len(tasks) < len(queries):
+                index = len(tasks)
+                tasks.append(
+                    asyncio.ensure_future(scan(queries[index], buffers[index]))
+                )
+
+        for _ in range(_MAX_SCAN_WORKERS):
+            start_next()
+        try:
+            for buffer in buffers:
+                item = await buffer.get()
+                while item is not _EXHAUSTED:
+                    if isinstance(item, Exception):
+                        raise item
+                    yield item
+                    item = await buffer.get()
+                start_next()
+        finally:
+            for task in tasks:
+                task.cancel()
+
     async def get(
         self,
         transaction: Transaction = None,
         retry: retries.Retry = gapic_v1.method.DEFAULT,
         timeout: float = None,
-    ) -> list:
+        max_documents: int = None,
+        compact: bool = False,
+    ) -> Union[list, QueryResults]:
         """Read the documents in this collection.
 
         This sends a ``RunQuery`` RPC and returns a list of documents
@@ -162,17 +300,35 @@ class AsyncCollectionReference(BaseCollectionReference):
                 should be retried.  Defaults to a system-specified policy.
             timeout (float): The timeout for this request.  Defaults to a
                 system-specified value.
+            max_documents (Optional[int]): The maximum number of documents
+                to return. Defaults to the client's ``max_get_documents``,
+                if any.
+            compact (Optional[bool]): If :data:`True`, return the documents
+                in a :class:`~google.cloud.firestore_v1.query_results.QueryResults`,
+                which holds them encoded and decodes them when they are
+                read, instead of a list of snapshots. Defaults to
+                :data:`False`.
 
         If a ``transaction`` is used and it already has write operations
         added, this method cannot be used (i.e. read-after-write is not
         allowed).
 
         Returns:
-            list: The documents in this collection that match the query.
+            Union[list, :class:`~google.cloud.firestore_v1.query_results.QueryResults`]:
+            The documents in this collection.
+
+        Raises:
+            ~google.cloud.firestore_v1.query_results.MaterializationLimitExceeded:
+                If the collection has more than ``max_documents`` documents.
         """
         query, kwargs = self._prep_get_or_stream(retry, timeout)
 
-        return await query.get(transaction=transaction, **kwargs)
+        return await query.get(
+            transaction=transaction,
+            max_documents=max_documents,
+            compact=compact,
+            **kwargs,
+        )
 
     async def stream(
         self,
@@ -214,3 +370,31 @@ class AsyncCollectionReference(BaseCollectionReference):
 
         async for d in query.stream(transaction=transaction, **kwargs):
             yield d  # pytype: disable=name-error
+
+
+async def _prefetch(iterable: AsyncIterable) -> AsyncGenerator[Any, None]:
+    """Yield the items of ``iterable``, fetching each next one in advance.
+
+    While the caller consumes an item, the following one is produced in a
+    separate task, so paged RPCs overlap with processing of the previous
+    page.
+
+    Args:
+        iterable (AsyncIterable): The async iterable to read ahead.
+
+    Yields:
+        The items of ``iterable``, in order.
+    """
+    iterator = iterable.__aiter__()
+    future = asyncio.ensure_future(iterator.__anext__())
+    try:
+        while True:
+            try:
+                item = await future
+            except StopAsyncIteration:
+                return
+
+            future = asyncio.ensure_future(iterator.__anext__())
+            yield item
+    finally:
+        future.cancel()
@@ -55,6 +55,8 @@ class AsyncDocumentReference(BaseDocumentReference):
         TypeError: If a keyword other than ``client`` is used.
     """
 
+    __slots__ = ()
+
     def __init__(self, *path, **kwargs) -> None:
         super(AsyncDocumentReference, self).__init__(*path, **kwargs)
 
@@ -322,6 +324,7 @@ class AsyncDocumentReference(BaseDocumentReference):
         transaction=None,
         retry: retries.Retry = gapic_v1.method.DEFAULT,
         timeout: float = None,
+        read_time=None,
     ) -> Union[DocumentSnapshot, Coroutine[Any, Any, DocumentSnapshot]]:
         """Retrieve a snapshot of the current document.
 
@@ -344,6 +347,9 @@ class AsyncDocumentReference(BaseDocumentReference):
                 should be retried.  Defaults to a system-specified policy.
             timeout (float): The timeout for this request.  Defaults to a
                 system-specified value.
+            read_time (Optional[datetime.datetime]): If set, read the
+                document as it was at this time rather than its latest
+                version. Cannot be combined with ``transaction``.
 
         Returns:
             :class:`~google.cloud.firestore_v1.base_document.DocumentSnapshot`:
@@ -353,12 +359,21 @@ class AsyncDocumentReference(BaseDocumentReference):
                 :attr:`create_time` attributes will all be ``None`` and
                 its :attr:`exists` attribute will be ``False``.
         """
-        request, kwargs = self._prep_get(field_paths, transaction, retry, timeout)
+        request, kwargs = self._prep_get(
+            field_paths, transaction, retry, timeout, read_time
+        )
+        read_batcher = self._get_read_batcher(transaction, retry, timeout, read_time)
+        if read_batcher is not None:
+            return await read_batcher.get(self, field_paths)
 
         firestore_api = self._client._firestore_api
         try:
-            document_pb = await firestore_api.get_document(
-                request=request, metadata=self._client._rpc_metadata, **kwargs,
+            document_pb = await self._client._call_read(
+                firestore_api.get_document,
+                False,
+                request=request,
+                metadata=self._client._rpc_metadata,
+                **kwargs,
             )
         except exceptions.NotFound:
             data = None
@@ -375,7 +390,7 @@ class AsyncDocumentReference(BaseDocumentReference):
             reference=self,
             data=data,
             exists=exists,
-            read_time=None,  # No server read_time available
+            read_time=read_time,  # The server only echoes a pinned read_time
             create_time=create_time,
             update_time=update_time,
         )
@@ -408,6 +423,7 @@ class AsyncDocumentReference(BaseDocumentReference):
         iterator = await self._client._firestore_api.list_collection_ids(
             request=request, metadata=self._client._rpc_metadata, **kwargs,
         )
+        iterator = _helpers.bind_page_kwargs(iterator, kwargs)
 
         async for collection_id in iterator:
             yield self.collection(collection_id)
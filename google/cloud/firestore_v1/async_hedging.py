@@ -0,0 +1,192 @@
+# Copyright 2020 Google LLC All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Helpers for hedging idempotent reads against slow backends."""
+
+import asyncio
+import time
+
+from google.cloud.firestore_v1.base_hedging import BaseHedgingPolicy, _END
+
+from typing import Any, AsyncGenerator, Callable
+
+
+async def _call(method: Callable, kwargs: dict) -> Any:
+    return await method(**kwargs)
+
+
+async def _first_response(method: Callable, kwargs: dict) -> tuple:
+    """Start a stream and wait for its first response (or its end)."""
+    stream = await method(**kwargs)
+    iterator = stream.__aiter__()
+    try:
+        first = await iterator.__anext__()
+    except StopAsyncIteration:
+        first = _END
+    return stream, iterator, first
+
+
+async def _rest(iterator, first) -> AsyncGenerator[Any, None]:
+    if first is _END:
+        return
+    yield first
+    async for response in iterator:
+        yield response
+
+
+class AsyncHedgingPolicy(BaseHedgingPolicy):
+    """Send duplicate requests for reads which take longer than usual.
+
+    Once enabled with
+    :meth:`~google.cloud.firestore_v1.async_client.AsyncClient.hedge_reads`,
+    the requests of :meth:`~google.cloud.firestore_v1.async_document.AsyncDocumentReference.get`,
+    :meth:`~google.cloud.firestore_v1.async_client.AsyncClient.get_all` and
+    :meth:`~google.cloud.firestore_v1.async_query.AsyncQuery.stream` (and
+    the methods built on them) are hedged.
+
+    Each request runs in its own task; the tasks of losing requests are
+    cancelled, as are losing streams.
+
+    Args:
+        client (:class:`~google.cloud.firestore_v1.async_client.AsyncClient`):
+            The client that created this policy.
+        kwargs (Dict[str, Any]): Passed to
+            :class:`~google.cloud.firestore_v1.base_hedging.BaseHedgingPolicy`.
+    """
+
+    async def call(self, method: Callable, **kwargs: Any) -> Any:
+        """Send a single-response request, hedging it if slow.
+
+        Args:
+            method (Callable): The API method.
+            kwargs (Dict[str, Any]): The arguments of ``method``.
+
+        Returns:
+            Any: The first response.
+
+        Raises:
+            ~google.api_core.exceptions.DeadlineExceeded: If the policy's
+                ``deadline`` passes before a response.
+            Exception: The error of the first request, if all of them
+                fail.
+        """
+        return await self._race(
+            lambda attempt_kwargs: _call(method, attempt_kwargs), kwargs
+        )
+
+    async def stream(
+        self, method: Callable, **kwargs: Any
+    ) -> AsyncGenerator[Any, None]:
+        """Start a streaming request, hedging it if its first response is slow.
+
+        Args:
+            method (Callable): The API method.
+            kwargs (Dict[str, Any]): The arguments of ``method``.
+
+        Returns:
+            AsyncGenerator[Any, None]: The responses of the first stream to
+            respond.
+
+        Raises:
+            ~google.api_core.exceptions.DeadlineExceeded: If the policy's
+                ``deadline`` passes before a response.
+            Exception: The error of the first request, if all of them
+                fail.
+        """
+        _, iterator, first = await self._race(
+            lambda attempt_kwargs: _first_response(method, attempt_kwargs),
+            kwargs,
+            lambda result: self._cancel_stream(result[0]),
+        )
+        return _rest(iterator, first)
+
+    async def _race(
+        self, attempt: Callable, kwargs: dict, cancel_result: Callable = None
+    ) -> Any:
+        """Run ``attempt``, then hedges of it, until one of them returns.
+
+        Args:
+            attempt (Callable[[dict], Awaitable]): Sends a request with the
+                given arguments.
+            kwargs (dict): The arguments of the request.
+            cancel_result (Optional[Callable[[Any], None]]): Cancels the
+                result of an attempt which lost the race.
+
+        Returns:
+            Any: The result of the first attempt to return.
+        """
+        loop = asyncio.get_event_loop()
+        start = time.monotonic()
+        deadline = None
+        if self._deadline is not None:
+            deadline = start + self._deadline
+
+        # Attempts not finished yet, mapped to their index and start time.
+        attempts = {}
+        errors = []
+
+        def launch(index):
+            task = loop.create_task(attempt(self._attempt_kwargs(kwargs, deadline)))
+            attempts[task] = (index, time.monotonic())
+
+        try:
+            launch(0)
+            hedges = 0
+            next_hedge = start + self.hedge_delay()
+            while True:
+                done, _ = await asyncio.wait(
+                    list(attempts),
+                    timeout=self._wait_timeout(hedges, next_hedge, deadline),
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                for task in done:
+                    index, started = attempts.pop(task)
+                    error = task.exception()
+                    if error is None or self._is_answer(error):
+                        self._record(hedges, index, time.monotonic() - started)
+                        return task.result()
+                    errors.append(error)
+
+                if not attempts:
+                    self._record(hedges, None, 0.0)
+                    raise errors[0]
+
+                now = time.monotonic()
+                if deadline is not None and now >= deadline:
+                    self._record(hedges, None, 0.0)
+                    raise self._deadline_exceeded()
+
+                if hedges < self._max_hedges and now >= next_hedge:
+                    hedges += 1
+                    launch(hedges)
+                    next_hedge = now + self.hedge_delay()
+        finally:
+            # Also reached if the read itself is cancelled.
+            for task in attempts:
+                if task.done():
+                    if cancel_result is not None and not task.cancelled():
+                        if task.exception() is None:
+                            cancel_result(task.result())
+                else:
+                    task.cancel()
+
+    async def close(self) -> None:
+        """Stop hedging the client's reads."""
+        self._detach()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
@@ -0,0 +1,270 @@
+# Copyright 2020 Google LLC All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Track many long-running admin operations at once.
+
+Index and field changes made with the asyncio admin client return
+long-running operations. Rather than waiting on each of them in turn, an
+:class:`AsyncOperationPoller` polls them all concurrently and reports
+their combined progress:
+
+.. code-block:: python
+
+    admin_client = FirestoreAdminAsyncClient()
+    poller = AsyncOperationPoller()
+    await poller.submit(
+        *[admin_client.create_index(parent=parent, index=index) for index in indexes]
+    )
+    async for progress in poller.progress():
+        print(progress.fraction_done, progress.estimated_remaining)
+    results = await poller.results()
+"""
+
+import asyncio
+import time
+
+from typing import Any, AsyncGenerator, List, Optional
+
+
+DEFAULT_INITIAL_DELAY = 1.0
+"""float: Default number of seconds before the first poll."""
+DEFAULT_MAXIMUM_DELAY = 60.0
+"""float: Default maximum number of seconds between two polls."""
+DEFAULT_MULTIPLIER = 1.5
+"""float: Default factor by which the delay between polls grows."""
+
+
+class OperationStatus(object):
+    """The state of one long-running operation, decoded from its metadata.
+
+    Args:
+        name (str): The name of the operation.
+        done (bool): Whether the operation has completed.
+        failed (bool): Whether the operation completed with an error.
+        completed_work (int): The number of documents processed.
+        estimated_work (int): The estimated number of documents to process.
+    """
+
+    def __init__(self, name, done, failed, completed_work, estimated_work) -> None:
+        self.name = name
+        self.done = done
+        self.failed = failed
+        self.completed_work = completed_work
+        self.estimated_work = estimated_work
+
+    @classmethod
+    def from_operation(cls, operation) -> "OperationStatus":
+        """Decode the status of an operation.
+
+        Args:
+            operation (~google.api_core.operation_async.AsyncOperation): The
+                operation, with ``IndexOperationMetadata`` or
+                ``FieldOperationMetadata`` (or any metadata with
+                ``progress_documents``).
+
+        Returns:
+            OperationStatus: The status.
+        """
+        operation_pb = operation.operation
+        metadata = operation.metadata
+        completed_work = estimated_work = 0
+        if metadata is not None:
+            progress = metadata.progress_documents
+            completed_work = progress.completed_work
+            estimated_work = progress.estimated_work
+
+        return cls(
+            operation_pb.name,
+            operation_pb.done,
+            operation_pb.HasField("error"),
+            completed_work,
+            estimated_work,
+        )
+
+
+class OperationProgress(object):
+    """The combined progress of the operations of a poller.
+
+    Args:
+        statuses (List[OperationStatus]): The status of each operation.
+        elapsed (float): The number of seconds since the operations were
+            submitted.
+    """
+
+    def __init__(self, statuses: List[OperationStatus], elapsed: float) -> None:
+        self.statuses = statuses
+        self.elapsed = elapsed
+
+    @property
+    def done(self) -> int:
+        """int: The number of completed operations."""
+        return sum(1 for status in self.statuses if status.done)
+
+    @property
+    def failed(self) -> int:
+        """int: The number of operations which completed with an error."""
+        return sum(1 for status in self.statuses if status.failed)
+
+    @property
+    def fraction_done(self) -> float:
+        """float: The share of the work completed, between 0 and 1.
+
+        Operations are weighted by their estimated number of documents, and
+        completed operations count as fully done.
+        """
+        completed = estimated = 0
+        for status in self.statuses:
+            if status.done:
+                work = max(status.estimated_work, status.completed_work, 1)
+                completed += work
+                estimated += work
+            else:
+                estimated += max(status.estimated_work, 1)
+                completed += min(status.completed_work, status.estimated_work)
+
+        if not estimated:
+            return 1.0
+        return completed / estimated
+
+    @property
+    def estimated_remaining(self) -> Optional[float]:
+        """Optional[float]: The estimated number of seconds until all the
+        operations complete, assuming a steady rate of progress, or
+        :data:`None` if no progress has been made yet."""
+        fraction_done = self.fraction_done
+        if not fraction_done:
+            return None
+        return self.elapsed * (1.0 - fraction_done) / fraction_done
+
+    def __repr__(self):
+        return "<OperationProgress {:d}/{:d} done ({:.1%})>".format(
+            self.done, len(self.statuses), self.fraction_done
+        )
+
+
+class AsyncOperationPoller(object):
+    """Poll many long-running admin operations concurrently.
+
+    All pending operations are refreshed together, after a delay shared by
+    all of them: it starts at ``initial_delay`` and grows by ``multiplier``
+    after each poll, up to ``maximum_delay``.
+
+    Args:
+        initial_delay (Optional[float]): The number of seconds before the
+            first poll.
+        maximum_delay (Optional[float]): The maximum number of seconds
+            between two polls.
+        multiplier (Optional[float]): The factor by which the delay grows
+            after each poll.
+    """
+
+    def __init__(
+        self,
+        initial_delay: float = DEFAULT_INITIAL_DELAY,
+        maximum_delay: float = DEFAULT_MAXIMUM_DELAY,
+        multiplier: float = DEFAULT_MULTIPLIER,
+    ) -> None:
+        self._initial_delay = initial_delay
+        self._maximum_delay = maximum_delay
+        self._multiplier = multiplier
+        self._operations = []
+        self._started = None
+
+    def __len__(self) -> int:
+        return len(self._operations)
+
+    @property
+    def operations(self) -> list:
+        """List[~google.api_core.operation_async.AsyncOperation]: The
+        operations tracked by this poller, in submission order."""
+        return list(self._operations)
+
+    def add(self, operation) -> None:
+        """Track an operation which has already been started.
+
+        Args:
+            operation (~google.api_core.operation_async.AsyncOperation):
+                The operation.
+        """
+        if self._started is None:
+            self._started = time.monotonic()
+        self._operations.append(operation)
+
+    async def submit(self, *requests) -> list:
+        """Start operations concurrently and track them.
+
+        Args:
+            requests (Awaitable[~google.api_core.operation_async.AsyncOperation]):
+                Calls to the asyncio admin client, e.g.
+                ``admin_client.create_index(...)`` or
+                ``admin_client.update_field(...)``.
+
+        Returns:
+            List[~google.api_core.operation_async.AsyncOperation]: The
+            started operations.
+        """
+        operations = await asyncio.gather(*requests)
+        for operation in operations:
+            self.add(operation)
+        return list(operations)
+
+    def _progress(self) -> OperationProgress:
+        elapsed = 0.0
+        if self._started is not None:
+            elapsed = time.monotonic() - self._started
+        statuses = [
+            OperationStatus.from_operation(operation) for operation in self._operations
+        ]
+        return OperationProgress(statuses, elapsed)
+
+    async def progress(self) -> AsyncGenerator[OperationProgress, Any]:
+        """Poll the operations until they are all done.
+
+        Yields:
+            OperationProgress: The combined progress of the operations,
+            after each poll (and before the first one).
+        """
+        delay = self._initial_delay
+        progress = self._progress()
+        yield progress
+        while progress.done < len(progress.statuses):
+            await asyncio.sleep(delay)
+            delay = min(delay * self._multiplier, self._maximum_delay)
+
+            pending = [
+                operation
+                for operation in self._operations
+                if not operation.operation.done
+            ]
+            await asyncio.gather(*[operation.done() for operation in pending])
+            progress = self._progress()
+            yield progress
+
+    async def results(self) -> list:
+        """Wait for all operations to complete.
+
+        Returns:
+            List[Any]: The result of each operation, in submission order.
+            Failed operations are represented by their exception.
+        """
+        async for _ in self.progress():
+            pass
+
+        results = []
+        for operation in self._operations:
+            try:
+                results.append(await operation.result())
+            except Exception as exc:
+                results.append(exc)
+        return results
@@ -19,6 +19,9 @@ a :class:`~google.cloud.firestore_v1.collection.Collection` and that can be
 a more common way to create a query than direct usage of the constructor.
 """
 
+import asyncio
+import heapq
+
 from google.api_core import gapic_v1  # type: ignore
 from google.api_core import retry as retries  # type: ignore
 
@@ -26,13 +29,16 @@ from google.cloud.firestore_v1.base_query import (
     BaseCollectionGroup,
     BaseQuery,
     QueryPartition,
-    _query_response_to_snapshot,
-    _collection_group_query_response_to_snapshot,
+    _strip_fields,
     _enum_from_direction,
 )
 
+from google.cloud.firestore_v1 import _helpers
 from google.cloud.firestore_v1 import async_document
-from typing import AsyncGenerator
+from google.cloud.firestore_v1.query_results import QueryResults
+from google.cloud.firestore_v1.query_results import _check_materialized
+from google.cloud.firestore_v1.query_results import _max_documents
+from typing import AsyncGenerator, Union
 
 # Types needed only for Type Hints
 from google.cloud.firestore_v1.transaction import Transaction
@@ -125,7 +131,10 @@ class AsyncQuery(BaseQuery):
         transaction: Transaction = None,
         retry: retries.Retry = gapic_v1.method.DEFAULT,
         timeout: float = None,
-    ) -> list:
+        read_time=None,
+        max_documents: int = None,
+        compact: bool = False,
+    ) -> Union[list, QueryResults]:
         """Read the documents in the collection that match this query.
 
         This sends a ``RunQuery`` RPC and returns a list of documents
@@ -139,14 +148,31 @@ class AsyncQuery(BaseQuery):
                 should be retried.  Defaults to a system-specified policy.
             timeout (float): The timeout for this request.  Defaults to a
                 system-specified value.
+            read_time (Optional[datetime.datetime]): If set, read the
+                documents as they were at this time rather than their latest
+                versions. Cannot be combined with ``transaction``.
+            max_documents (Optional[int]): The maximum number of documents
+                to return. The query stops reading once more match. Defaults
+                to the client's ``max_get_documents``, if any.
+            compact (Optional[bool]): If :data:`True`, return the documents
+                in a :class:`~google.cloud.firestore_v1.query_results.QueryResults`,
+                which holds them encoded and decodes them when they are
+                read, instead of a list of snapshots. Defaults to
+                :data:`False`.
 
         If a ``transaction`` is used and it already has write operations
         added, this method cannot be used (i.e. read-after-write is not
         allowed).
 
         Returns:
-            list: The documents in the collection that match this query.
+            Union[list, :class:`~google.cloud.firestore_v1.query_results.QueryResults`]:
+            The documents in the collection that match this query.
+
+        Raises:
+            ~google.cloud.firestore_v1.query_results.MaterializationLimitExceeded:
+                If more than ``max_documents`` documents match the query.
         """
+        max_documents = _max_documents(self._client, max_documents)
         is_limited_to_last = self._limit_to_last
 
         if self._limit_to_last:
@@ -161,18 +187,70 @@ class AsyncQuery(BaseQuery):
                 )
             self._limit_to_last = False
 
-        result = self.stream(transaction=transaction, retry=retry, timeout=timeout)
-        result = [d async for d in result]
-        if is_limited_to_last:
-            result = list(reversed(result))
+        query = self._bound_for_get(max_documents)
+        if compact:
+            result = await query._get_compact(
+                transaction, retry, timeout, read_time, max_documents
+            )
+        else:
+            result = []
+            async for snapshot in query.stream(
+                transaction=transaction,
+                retry=retry,
+                timeout=timeout,
+                read_time=read_time,
+            ):
+                _check_materialized(len(result) + 1, max_documents)
+                result.append(snapshot)
+
+        if is_limited_to_last and compact:
+            result._reverse()
+        elif is_limited_to_last:
+            result.reverse()
 
         return result
 
+    async def _get_compact(
+        self, transaction, retry, timeout, read_time, max_documents
+    ) -> QueryResults:
+        """Read the documents for ``get(compact=True)``, without decoding them.
+
+        Args:
+            transaction, retry, timeout, read_time, max_documents: As for
+                :meth:`get`.
+
+        Returns:
+            QueryResults: The documents matching the query.
+        """
+        results = self._query_results(max_documents)
+        split_queries = self._split_disjunctions()
+        if split_queries is not None:
+            # Merging the results of split queries needs them decoded.
+            async for snapshot in self._stream_split(
+                split_queries, transaction, retry, timeout, read_time
+            ):
+                results._append_snapshot(snapshot)
+            return results
+
+        request, _, kwargs = self._prep_stream(transaction, retry, timeout, read_time)
+        response_iterator = await self._client._call_read(
+            self._client._firestore_api.run_query,
+            True,
+            request=request,
+            metadata=self._client._rpc_metadata,
+            **kwargs,
+        )
+        async for response in response_iterator:
+            if _helpers.raw_pb(response).HasField("document"):
+                results._append(response)
+        return results
+
     async def stream(
         self,
         transaction=None,
         retry: retries.Retry = gapic_v1.method.DEFAULT,
         timeout: float = None,
+        read_time=None,
     ) -> AsyncGenerator[async_document.DocumentSnapshot, None]:
         """Read the documents in the collection that match this query.
 
@@ -191,6 +269,12 @@ class AsyncQuery(BaseQuery):
         added, this method cannot be used (i.e. read-after-write is not
         allowed).
 
+        A query whose ``in`` / ``array_contains_any`` filter has more than
+        :data:`~google.cloud.firestore_v1.base_query.MAX_DISJUNCTION_SIZE`
+        values is run as several queries, streamed at once; their results
+        are merged in order, without duplicates, before the offset and limit
+        are applied.
+
         Args:
             transaction
                 (Optional[:class:`~google.cloud.firestore_v1.transaction.Transaction`]):
@@ -199,31 +283,106 @@ class AsyncQuery(BaseQuery):
                 should be retried.  Defaults to a system-specified policy.
             timeout (float): The timeout for this request.  Defaults to a
                 system-specified value.
+            read_time (Optional[datetime.datetime]): If set, read the
+                documents as they were at this time rather than their latest
+                versions. Cannot be combined with ``transaction``.
 
         Yields:
             :class:`~google.cloud.firestore_v1.async_document.DocumentSnapshot`:
             The next document that fulfills the query.
         """
+        split_queries = self._split_disjunctions()
+        if split_queries is not None:
+            async for snapshot in self._stream_split(
+                split_queries, transaction, retry, timeout, read_time
+            ):
+                yield snapshot
+            return
+
         request, expected_prefix, kwargs = self._prep_stream(
-            transaction, retry, timeout,
+            transaction, retry, timeout, read_time
         )
 
-        response_iterator = await self._client._firestore_api.run_query(
-            request=request, metadata=self._client._rpc_metadata, **kwargs,
+        response_iterator = await self._client._call_read(
+            self._client._firestore_api.run_query,
+            True,
+            request=request,
+            metadata=self._client._rpc_metadata,
+            **kwargs,
         )
 
         async for response in response_iterator:
-            if self._all_descendants:
-                snapshot = _collection_group_query_response_to_snapshot(
-                    response, self._parent
-                )
-            else:
-                snapshot = _query_response_to_snapshot(
-                    response, self._parent, expected_prefix
-                )
+            snapshot = self._response_to_snapshot(expected_prefix, response)
             if snapshot is not None:
                 yield snapshot
 
+    async def _stream_split(
+        self, split_queries, transaction, retry, timeout, read_time
+    ) -> AsyncGenerator[async_document.DocumentSnapshot, None]:
+        """Run the queries from ``_split_disjunctions`` and merge their results.
+
+        All the queries are streamed at once, and their results merged as
+        they arrive.
+
+        Args:
+            split_queries (List[AsyncQuery]): The queries to run.
+            transaction, retry, timeout, read_time: As for :meth:`stream`.
+
+        Yields:
+            :class:`~google.cloud.firestore_v1.async_document.DocumentSnapshot`:
+            The next document, in order and without duplicates, after
+            applying this query's offset and limit.
+        """
+        streams = [
+            split_query.stream(
+                transaction=transaction,
+                retry=retry,
+                timeout=timeout,
+                read_time=read_time,
+            )
+            for split_query in split_queries
+        ]
+        sort_key = self._split_sort_key()
+        extra_fields = self._split_projection_fields()
+        start, stop = self._split_window()
+
+        async def advance(index):
+            try:
+                snapshot = await streams[index].__anext__()
+            except StopAsyncIteration:
+                return None
+            return sort_key(snapshot), index, snapshot
+
+        # One head per stream, the stream index breaking ties.
+        heap = [
+            head
+            for head in await asyncio.gather(*map(advance, range(len(streams))))
+            if head is not None
+        ]
+        heapq.heapify(heap)
+        seen = set()
+        count = 0
+        try:
+            while heap and (stop is None or count < stop):
+                _, index, snapshot = heap[0]
+                head = await advance(index)
+                if head is None:
+                    heapq.heappop(heap)
+                else:
+                    heapq.heapreplace(heap, head)
+
+                path = snapshot.reference._path
+                if path in seen:
+                    continue
+                seen.add(path)
+                count += 1
+                if count > start:
+                    _strip_fields(snapshot, extra_fields)
+                    yield snapshot
+        finally:
+            for stream in streams:
+                await stream.aclose()
+
 
 class AsyncCollectionGroup(AsyncQuery, BaseCollectionGroup):
     """Represents a Collection Group in the Firestore API.
@@ -292,6 +451,7 @@ class AsyncCollectionGroup(AsyncQuery, BaseCollectionGroup):
         pager = await self._client._firestore_api.partition_query(
             request=request, metadata=self._client._rpc_metadata, **kwargs,
         )
+        pager = _helpers.bind_page_kwargs(pager, kwargs)
 
         start_at = None
         async for cursor_pb in pager:
@@ -0,0 +1,137 @@
+# Copyright 2020 Google LLC All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Helpers for batching concurrent single-document reads."""
+
+import asyncio
+
+from google.cloud.firestore_v1.base_read_batcher import (
+    BaseReadBatcher,
+    DEFAULT_MAX_BATCH_SIZE,
+    DEFAULT_WINDOW,
+)
+
+# Types needed only for Type Hints
+from google.cloud.firestore_v1.async_document import AsyncDocumentReference
+from google.cloud.firestore_v1.base_document import DocumentSnapshot
+
+from typing import Iterable
+
+
+class AsyncReadBatcher(BaseReadBatcher):
+    """Collect concurrent document reads into ``BatchGetDocuments`` calls.
+
+    Once enabled with
+    :meth:`~google.cloud.firestore_v1.async_client.AsyncClient.batch_reads`,
+    plain :meth:`~google.cloud.firestore_v1.async_document.AsyncDocumentReference.get`
+    calls (without a transaction, ``read_time``, ``retry`` or ``timeout``)
+    go through the batcher. With the default window, the reads made by all
+    the coroutines which run in the same iteration of the event loop are
+    sent together.
+
+    Args:
+        client (:class:`~google.cloud.firestore_v1.async_client.AsyncClient`):
+            The client that created this batcher.
+        window (Optional[float]): The number of seconds reads are collected
+            before being sent.
+        max_batch_size (Optional[int]): The number of documents which
+            triggers a call before the end of the window.
+    """
+
+    def __init__(
+        self,
+        client,
+        window: float = DEFAULT_WINDOW,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+    ) -> None:
+        super(AsyncReadBatcher, self).__init__(
+            client, window=window, max_batch_size=max_batch_size
+        )
+        self._flusher = None
+
+    async def get(
+        self, reference: AsyncDocumentReference, field_paths: Iterable[str] = None
+    ) -> DocumentSnapshot:
+        """Read a document as part of a batch.
+
+        Args:
+            reference (:class:`~google.cloud.firestore_v1.async_document.AsyncDocumentReference`):
+                The document to read.
+            field_paths (Optional[Iterable[str]]): The fields to read. If
+                not passed, all fields are read.
+
+        Returns:
+            :class:`~google.cloud.firestore_v1.base_document.DocumentSnapshot`:
+            A snapshot of the document.
+
+        Raises:
+            ValueError: If the batcher has been closed.
+        """
+        loop = asyncio.get_event_loop()
+        future, mask, full = self._enqueue(reference, field_paths, loop.create_future)
+
+        if full:
+            for batch_mask, references in self._take_batches([mask]):
+                loop.create_task(self._send(batch_mask, references))
+        if self._pending and self._flusher is None:
+            self._flusher = loop.create_task(self._flush_later())
+
+        # Shielded, as other reads of the same document share the future.
+        return await asyncio.shield(future)
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self._window)
+        self._flusher = None
+        await self.flush()
+
+    async def _send(self, mask, references: list) -> None:
+        """Read a batch and complete its futures."""
+        try:
+            snapshots = [
+                snapshot
+                async for snapshot in self._client.get_all(references, field_paths=mask)
+            ]
+        except Exception as exc:
+            self._fail(mask, references, exc)
+        else:
+            self._resolve(mask, references, snapshots)
+
+    async def flush(self) -> None:
+        """Send all pending reads.
+
+        Read failures are not raised here; they are raised by the ``get()``
+        calls of the affected documents.
+        """
+        await asyncio.gather(
+            *[self._send(mask, references) for mask, references in self._take_batches()]
+        )
+
+    async def close(self) -> None:
+        """Send any pending reads and stop batching the client's reads."""
+        self._detach()
+        flusher, self._flusher = self._flusher, None
+        if flusher is not None:
+            flusher.cancel()
+            try:
+                await flusher
+            except asyncio.CancelledError:
+                pass
+
+        await self.flush()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
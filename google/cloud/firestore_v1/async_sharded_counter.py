@@ -0,0 +1,89 @@
+# Copyright 2020 Google LLC All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Helpers for counters whose writes are spread across shard documents."""
+
+from google.cloud.firestore_v1.base_sharded_counter import (
+    BaseShardedCounter,
+    _CONTENTION_EXCEPTIONS,
+    _MAX_ATTEMPTS,
+    _RETRYABLE_EXCEPTIONS,
+)
+from google.cloud.firestore_v1.types import write
+from typing import Any
+
+# Types needed only for Type Hints
+from google.cloud.firestore_v1.async_transaction import AsyncTransaction
+
+
+class AsyncShardedCounter(BaseShardedCounter):
+    """A counter whose increments are spread across shard documents.
+
+    See :class:`~google.cloud.firestore_v1.base_sharded_counter.BaseShardedCounter`
+    for how shards are picked, read and resized.
+
+    Args:
+        reference (:class:`~google.cloud.firestore_v1.async_document.AsyncDocumentReference`):
+            The document representing the counter.
+        num_shards (Optional[int]): The initial (and minimum) number of
+            shards written to.
+        max_shards (Optional[int]): The maximum number of shards.
+        field (Optional[str]): The field holding the count in each shard.
+    """
+
+    async def increment(self, amount=1, key=None) -> write.WriteResult:
+        """Add to the counter.
+
+        Args:
+            amount (Optional[Union[int, float]]): The value to add (which may
+                be negative).
+            key (Optional[Union[str, bytes]]): If passed, the shard is picked
+                by hashing the key instead of at random.
+
+        Returns:
+            :class:`google.cloud.firestore_v1.types.WriteResult`:
+            The write result of the shard update.
+        """
+        for attempt in range(_MAX_ATTEMPTS):
+            # Retries go to a random shard, away from the contended one.
+            index = self._choose_shard(key if attempt == 0 else None)
+            try:
+                result = await self._shard(index).set(
+                    self._shard_data(amount), merge=True
+                )
+            except _CONTENTION_EXCEPTIONS as exc:
+                self._record_contention()
+                retryable = isinstance(exc, _RETRYABLE_EXCEPTIONS)
+                if not retryable or attempt + 1 == _MAX_ATTEMPTS:
+                    raise
+            else:
+                self._record_success()
+                return result
+
+    async def get(self, transaction: AsyncTransaction = None) -> Any:
+        """Read the total of the counter.
+
+        All the shards are read with a single ``BatchGetDocuments`` call.
+
+        Args:
+            transaction (Optional[:class:`~google.cloud.firestore_v1.async_transaction.AsyncTransaction`]):
+                An existing transaction that the shards will be read in.
+
+        Returns:
+            Union[int, float]: The total of the counter.
+        """
+        snapshots = self._reference._client.get_all(
+            self._all_shards(), field_paths=[self._field], transaction=transaction,
+        )
+        return self._total([snapshot async for snapshot in snapshots])
@@ -61,11 +61,31 @@ class AsyncTransaction(async_batch.AsyncWriteBatch, BaseTransaction):
         read_only (Optional[bool]): Flag indicating if the transaction
             should be read-only or should allow writes. Defaults to
             :data:`False`.
+        read_time (Optional[datetime.datetime]): If set, the (read-only)
+            transaction reads a consistent snapshot at this time instead of
+            beginning a server-side transaction.
+        cache_reads (Optional[bool]): If :data:`True`, documents read are
+            cached for the rest of the attempt, and the documents read by
+            earlier attempts are prefetched when the transaction is
+            retried. Defaults to :data:`False`.
+        deadline (Optional[:class:`~google.cloud.firestore_v1.deadline.Deadline`]):
+            If set, the latency budget shared by all the requests of the
+            transaction, including its retries.
     """
 
-    def __init__(self, client, max_attempts=MAX_ATTEMPTS, read_only=False) -> None:
+    def __init__(
+        self,
+        client,
+        max_attempts=MAX_ATTEMPTS,
+        read_only=False,
+        read_time=None,
+        cache_reads=False,
+        deadline=None,
+    ) -> None:
         super(AsyncTransaction, self).__init__(client)
-        BaseTransaction.__init__(self, max_attempts, read_only)
+        BaseTransaction.__init__(
+            self, max_attempts, read_only, read_time, cache_reads, deadline
+        )
 
     def _add_write_pbs(self, write_pbs: list) -> None:
         """Add `Write`` protobufs to this transaction.
@@ -96,12 +116,18 @@ class AsyncTransaction(async_batch.AsyncWriteBatch, BaseTransaction):
             msg = _CANT_BEGIN.format(self._id)
             raise ValueError(msg)
 
+        if self._read_time is not None:
+            # Snapshot reads are served at ``read_time``; no server-side
+            # transaction (and hence no locks) is needed.
+            return
+
         transaction_response = await self._client._firestore_api.begin_transaction(
             request={
                 "database": self._client._database_string,
                 "options": self._options_protobuf(retry_id),
             },
             metadata=self._client._rpc_metadata,
+            **self._deadline_kwargs(),
         )
         self._id = transaction_response.transaction
 
@@ -111,9 +137,18 @@ class AsyncTransaction(async_batch.AsyncWriteBatch, BaseTransaction):
         Raises:
             ValueError: If no transaction is in progress.
         """
+        if self._read_time is not None:
+            self._clean_up()
+            return
+
         if not self.in_progress:
             raise ValueError(_CANT_ROLLBACK)
 
+        if self._deadline is not None and self._deadline.expired:
+            # Past the deadline, leave the transaction to expire on the server.
+            self._clean_up()
+            return
+
         try:
             # NOTE: The response is just ``google.protobuf.Empty``.
             await self._client._firestore_api.rollback(
@@ -122,6 +157,7 @@ class AsyncTransaction(async_batch.AsyncWriteBatch, BaseTransaction):
                     "transaction": self._id,
                 },
                 metadata=self._client._rpc_metadata,
+                **self._deadline_kwargs(),
             )
         finally:
             self._clean_up()
@@ -138,11 +174,15 @@ class AsyncTransaction(async_batch.AsyncWriteBatch, BaseTransaction):
         Raises:
             ValueError: If no transaction is in progress.
         """
+        if self._read_time is not None:
+            self._clean_up()
+            return []
+
         if not self.in_progress:
             raise ValueError(_CANT_COMMIT)
 
         commit_response = await _commit_with_retry(
-            self._client, self._write_pbs, self._id
+            self._client, self._write_pbs, self._id, self._deadline
         )
 
         self._clean_up()
@@ -161,15 +201,46 @@ class AsyncTransaction(async_batch.AsyncWriteBatch, BaseTransaction):
                 references to be retrieved.
             retry (google.api_core.retry.Retry): Designation of what errors, if any,
                 should be retried.  Defaults to a system-specified policy.
-            timeout (float): The timeout for this request.  Defaults to a
-                system-specified value.
+            timeout (float): The timeout for this request.  Defaults to the
+                transaction's ``deadline``, if any, else to a system-specified
+                value.
 
         Yields:
             .DocumentSnapshot: The next document snapshot that fulfills the
             query, or :data:`None` if the document does not exist.
         """
-        kwargs = _helpers.make_retry_timeout_kwargs(retry, timeout)
-        return await self._client.get_all(references, transaction=self, **kwargs)
+        if timeout is None:
+            timeout = self._deadline
+        kwargs = _helpers.make_retry_timeout_kwargs(retry, timeout, is_async=True)
+        kwargs.update(self._read_options())
+        if self._cache_reads:
+            return self._get_all_cached(references, kwargs)
+        return await self._client.get_all(references, **kwargs)
+
+    async def _get_all_cached(
+        self, references: list, kwargs: dict
+    ) -> AsyncGenerator[DocumentSnapshot, Any]:
+        """Read the documents not read yet in this attempt, then yield all."""
+        paths, missing = self._uncached_references(references)
+        if missing:
+            self._cache_snapshots(
+                [snapshot async for snapshot in self._client.get_all(missing, **kwargs)]
+            )
+        for snapshot in self._cached_snapshots(paths):
+            yield snapshot
+
+    async def _prefetch_reads(self) -> None:
+        """Read the documents read by earlier attempts, in a single call."""
+        if self._read_set:
+            references = list(self._read_set.values())
+            self._cache_snapshots(
+                [
+                    snapshot
+                    async for snapshot in self._client.get_all(
+                        references, **self._deadline_kwargs(), **self._read_options()
+                    )
+                ]
+            )
 
     async def get(
         self,
@@ -184,20 +255,24 @@ class AsyncTransaction(async_batch.AsyncWriteBatch, BaseTransaction):
             ref_or_query The document references or query object to return.
             retry (google.api_core.retry.Retry): Designation of what errors, if any,
                 should be retried.  Defaults to a system-specified policy.
-            timeout (float): The timeout for this request.  Defaults to a
-                system-specified value.
+            timeout (float): The timeout for this request.  Defaults to the
+                transaction's ``deadline``, if any, else to a system-specified
+                value.
 
         Yields:
             .DocumentSnapshot: The next document snapshot that fulfills the
             query, or :data:`None` if the document does not exist.
         """
-        kwargs = _helpers.make_retry_timeout_kwargs(retry, timeout)
+        if timeout is None:
+            timeout = self._deadline
+        kwargs = _helpers.make_retry_timeout_kwargs(retry, timeout, is_async=True)
+        kwargs.update(self._read_options())
         if isinstance(ref_or_query, AsyncDocumentReference):
-            return await self._client.get_all(
-                [ref_or_query], transaction=self, **kwargs
-            )
+            if self._cache_reads:
+                return self._get_all_cached([ref_or_query], kwargs)
+            return await self._client.get_all([ref_or_query], **kwargs)
         elif isinstance(ref_or_query, AsyncQuery):
-            return await ref_or_query.stream(transaction=self, **kwargs)
+            return await ref_or_query.stream(**kwargs)
         else:
             raise ValueError(
                 'Value for argument "ref_or_query" must be a AsyncDocumentReference or a AsyncQuery.'
@@ -251,6 +326,7 @@ class _AsyncTransactional(_BaseTransactional):
         if self.retry_id is None:
             self.retry_id = self.current_id
         try:
+            await transaction._prefetch_reads()
             return await self.to_wrap(transaction, *args, **kwargs)
         except:  # noqa
             # NOTE: If ``rollback`` fails this will lose the information
@@ -304,11 +380,24 @@ class _AsyncTransactional(_BaseTransactional):
         Raises:
             ValueError: If the transaction does not succeed in
                 ``max_attempts``.
+            ~google.api_core.exceptions.DeadlineExceeded: If the
+                transaction's ``deadline`` passes first.
         """
-        self._reset()
+        self._reset(transaction)
 
         for attempt in range(transaction._max_attempts):
-            result = await self._pre_commit(transaction, *args, **kwargs)
+            transaction._check_deadline()
+            pre_commit = self._pre_commit(transaction, *args, **kwargs)
+            if transaction._deadline is not None:
+                # Cancel the attempt, wherever it waits, once the budget
+                # is spent.
+                pre_commit = transaction._deadline.wait(pre_commit)
+            try:
+                result = await pre_commit
+            except exceptions.DeadlineExceeded:
+                # The cancelled attempt is left to expire on the server.
+                transaction._clean_up()
+                raise
             succeeded = await self._maybe_commit(transaction)
             if succeeded:
                 return result
@@ -343,7 +432,7 @@ def async_transactional(
 
 # TODO(crwilcox): this was 'coroutine' from pytype merge-pyi...
 async def _commit_with_retry(
-    client: Client, write_pbs: list, transaction_id: bytes
+    client: Client, write_pbs: list, transaction_id: bytes, deadline=None
 ) -> types.CommitResponse:
     """Call ``Commit`` on the GAPIC client with retry / sleep.
 
@@ -360,6 +449,9 @@ async def _commit_with_retry(
             A ``Write`` protobuf instance to be committed.
         transaction_id (bytes):
             ID of an existing transaction that this commit will run in.
+        deadline (Optional[:class:`~google.cloud.firestore_v1.deadline.Deadline`]):
+            If set, the budget shared by the requests and the sleeps
+            between them.
 
     Returns:
         :class:`google.cloud.firestore_v1.types.CommitResponse`:
@@ -369,6 +461,10 @@ async def _commit_with_retry(
         ~google.api_core.exceptions.GoogleAPICallError: If a non-retryable
             exception is encountered.
     """
+    # ``Unavailable`` errors are retried below, within the deadline.
+    kwargs = {}
+    if deadline is not None:
+        kwargs = _helpers.make_retry_timeout_kwargs(None, deadline, is_async=True)
     current_sleep = _INITIAL_SLEEP
     while True:
         try:
@@ -379,11 +475,15 @@ async def _commit_with_retry(
                     "transaction": transaction_id,
                 },
                 metadata=client._rpc_metadata,
+                **kwargs,
             )
         except exceptions.ServiceUnavailable:
             # Retry
             pass
 
+        if deadline is not None:
+            # Give up rather than back off past the deadline.
+            deadline.check(current_sleep)
         current_sleep = await _sleep(current_sleep)
 
 
@@ -0,0 +1,123 @@
+# Copyright 2020 Google LLC All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Helpers for coalescing repeated writes to the same documents."""
+
+import asyncio
+
+from google.cloud.firestore_v1.base_write_buffer import (
+    BaseWriteBuffer,
+    DEFAULT_FLUSH_INTERVAL,
+    MAX_BATCH_SIZE,
+    _PendingWrite,
+)
+from google.cloud.firestore_v1 import _helpers
+
+
+class AsyncWriteBuffer(BaseWriteBuffer):
+    """Buffer writes and send them in periodic batch commits.
+
+    Successive ``set(..., merge=True)`` and ``update()`` calls on the same
+    document are folded into a single ``Write`` before the buffer is flushed.
+    Each write method returns an :class:`asyncio.Future` resolved with the
+    ``WriteResult`` once the change has been committed.
+
+    Flushing happens in a background task every ``flush_interval`` seconds,
+    and is scheduled as soon as ``max_batch_size`` writes are pending.
+
+    Args:
+        client (:class:`~google.cloud.firestore_v1.async_client.AsyncClient`):
+            The client that created this buffer.
+        flush_interval (Optional[float]): Number of seconds between
+            background flushes. If :data:`None`, writes are only sent when
+            the buffer is full or explicitly flushed.
+        max_batch_size (Optional[int]): Number of pending writes which
+            triggers a flush; also the maximum size of each commit.
+    """
+
+    def __init__(
+        self,
+        client,
+        flush_interval=DEFAULT_FLUSH_INTERVAL,
+        max_batch_size=MAX_BATCH_SIZE,
+    ) -> None:
+        super(AsyncWriteBuffer, self).__init__(
+            client, flush_interval=flush_interval, max_batch_size=max_batch_size
+        )
+        # Created lazily, so they bind to the loop the buffer is used on.
+        self._commit_lock = None
+        self._flusher = None
+
+    def _add(self, entry: _PendingWrite) -> asyncio.Future:
+        """Queue a change and return a future for its completion."""
+        loop = asyncio.get_event_loop()
+        pending = self._add_entry(entry)
+        future = loop.create_future()
+        pending.futures.append(future)
+
+        if self._flusher is None and self._flush_interval is not None:
+            self._flusher = loop.create_task(self._run())
+
+        if len(self._entries) >= self._max_batch_size:
+            loop.create_task(self.flush())
+
+        return future
+
+    async def _run(self) -> None:
+        """Flush the buffer periodically until it is closed."""
+        while True:
+            await asyncio.sleep(self._flush_interval)
+            # Shielded so that ``close()`` never interrupts an in-flight commit.
+            await asyncio.shield(self.flush())
+
+    async def flush(self) -> None:
+        """Commit all pending writes.
+
+        Commit failures are not raised here; they are set on the futures of
+        the affected writes.
+        """
+        if self._commit_lock is None:
+            self._commit_lock = asyncio.Lock()
+
+        async with self._commit_lock:
+            entries = self._take_entries()
+
+            for chunk in _helpers.chunks(entries, self._max_batch_size):
+                batch = self._client.batch()
+                batch._add_write_pbs([entry.write_pb for entry in chunk])
+                try:
+                    write_results = await batch.commit()
+                except Exception as exc:
+                    self._fail(chunk, exc)
+                else:
+                    self._resolve(chunk, write_results)
+
+    async def close(self) -> None:
+        """Stop the background flusher and commit any pending writes."""
+        self._closed = True
+        flusher, self._flusher = self._flusher, None
+        if flusher is not None:
+            flusher.cancel()
+            try:
+                await flusher
+            except asyncio.CancelledError:
+                pass
+
+        await self.flush()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
@@ -100,6 +100,19 @@ class BaseWriteBatch(object):
 
         self._add_write_pbs(write_pbs)
 
+    def set_columns(self, references: list, columns, encoder) -> None:
+        """Add "changes" to replace many documents with the same fields.
+
+        Args:
+            references (List[:class:`~google.cloud.firestore_v1.document.DocumentReference`]):
+                The documents that will have values set in this batch.
+            columns (Mapping[str, Sequence]): The values of each field, one
+                per document, keyed by field path.
+            encoder (:class:`~google.cloud.firestore_v1.bulk_encoder.BulkEncoder`):
+                The encoder for the fields of the documents.
+        """
+        self._add_write_pbs(encoder.encode(references, columns))
+
     def update(
         self,
         reference: DocumentReference,
@@ -155,5 +168,7 @@ class BaseWriteBatch(object):
             "writes": self._write_pbs,
             "transaction": None,
         }
-        kwargs = _helpers.make_retry_timeout_kwargs(retry, timeout)
+        kwargs = _helpers.make_retry_timeout_kwargs(
+            retry, timeout, is_async=self._client._is_async
+        )
         return request, kwargs
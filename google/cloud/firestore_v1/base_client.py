@@ -25,6 +25,7 @@ In the hierarchy of API concepts
 """
 
 import os
+import weakref
 import grpc  # type: ignore
 
 import google.api_core.client_options  # type: ignore
@@ -42,6 +43,7 @@ from google.cloud.firestore_v1.field_path import render_field_path
 from typing import (
     Any,
     AsyncGenerator,
+    Callable,
     Generator,
     Iterable,
     List,
@@ -55,6 +57,9 @@ from google.cloud.firestore_v1.base_collection import BaseCollectionReference
 from google.cloud.firestore_v1.base_document import BaseDocumentReference
 from google.cloud.firestore_v1.base_transaction import BaseTransaction
 from google.cloud.firestore_v1.base_batch import BaseWriteBatch
+from google.cloud.firestore_v1.base_write_buffer import BaseWriteBuffer
+from google.cloud.firestore_v1.base_read_batcher import BaseReadBatcher
+from google.cloud.firestore_v1.base_hedging import BaseHedgingPolicy
 from google.cloud.firestore_v1.base_query import BaseQuery
 
 
@@ -70,6 +75,37 @@ _ACTIVE_TXN: str = "There is already an active transaction."
 _INACTIVE_TXN: str = "There is no active transaction."
 _CLIENT_INFO: Any = client_info.ClientInfo(client_library_version=__version__)
 _FIRESTORE_EMULATOR_HOST: str = "FIRESTORE_EMULATOR_HOST"
+DEFAULT_WALK_CONCURRENCY = 8
+"""int: Default number of concurrent listing requests made by ``walk``."""
+WALK_COLLECTION = "collection"
+"""str: The kind of the collection entries yielded by ``walk``."""
+WALK_DOCUMENT = "document"
+"""str: The kind of the document entries yielded by ``walk``."""
+_BAD_WALK_ROOT = "'root' must be a collection or document reference, or None."
+_BAD_MAX_DEPTH = "'max_depth' must be positive."
+_BAD_CONCURRENCY = "'concurrency' must be positive."
+# Streamed reads whose responses a client in raw protobuf mode leaves as
+# raw protobufs: the gRPC method type, path, and request / response types.
+_RAW_STREAMS = {
+    "batch_get_documents": (
+        "unary_stream",
+        "/google.firestore.v1.Firestore/BatchGetDocuments",
+        types.BatchGetDocumentsRequest,
+        types.BatchGetDocumentsResponse,
+    ),
+    "run_query": (
+        "unary_stream",
+        "/google.firestore.v1.Firestore/RunQuery",
+        types.RunQueryRequest,
+        types.RunQueryResponse,
+    ),
+    "listen": (
+        "stream_stream",
+        "/google.firestore.v1.Firestore/Listen",
+        types.ListenRequest,
+        types.ListenResponse,
+    ),
+}
 
 
 class BaseClient(ClientWithProject):
@@ -98,6 +134,16 @@ class BaseClient(ClientWithProject):
         client_options (Union[dict, google.api_core.client_options.ClientOptions]):
             Client options used to set user options on the client. API Endpoint
             should be set through client_options.
+        raw_protobuf (Optional[bool]): If :data:`True`, the responses of
+            ``BatchGetDocuments``, ``RunQuery`` and ``Listen`` are
+            deserialized into raw protobuf messages, without proto-plus
+            wrappers, and decoded from those. The snapshots returned are
+            the same. Defaults to :data:`False`.
+        max_get_documents (Optional[int]): The maximum number of documents
+            ``get`` may return for a query or collection, unless passed
+            its own ``max_documents``. Reading more raises
+            :class:`~google.cloud.firestore_v1.query_results.MaterializationLimitExceeded`.
+            Defaults to no limit.
     """
 
     SCOPE = (
@@ -109,6 +155,12 @@ class BaseClient(ClientWithProject):
     _firestore_api_internal = None
     _database_string_internal = None
     _rpc_metadata_internal = None
+    _read_batcher = None
+    _hedging_policy = None
+    # ID of the process which created ``_firestore_api_internal``.
+    _firestore_api_pid = None
+    # Whether the GAPIC methods of the client are async.
+    _is_async = False
 
     def __init__(
         self,
@@ -117,6 +169,8 @@ class BaseClient(ClientWithProject):
         database=DEFAULT_DATABASE,
         client_info=_CLIENT_INFO,
         client_options=None,
+        raw_protobuf=False,
+        max_get_documents=None,
     ) -> None:
         # NOTE: This API has no use for the _http argument, but sending it
         #       will have no impact since the _http() @property only lazily
@@ -136,13 +190,28 @@ class BaseClient(ClientWithProject):
         self._client_options = client_options
 
         self._database = database
+        self._raw_protobuf = raw_protobuf
+        self._max_get_documents = max_get_documents
         self._emulator_host = os.getenv(_FIRESTORE_EMULATOR_HOST)
+        # Document references handed out by this client, keyed by path, so
+        # that repeated lookups (e.g. query results) share one instance.
+        self._document_refs = weakref.WeakValueDictionary()
+        # The same references, keyed by fully-qualified document name, so
+        # that names from responses are not split again.
+        self._document_refs_by_name = weakref.WeakValueDictionary()
 
     def _firestore_api_helper(self, transport, client_class, client_module) -> Any:
         """Lazy-loading getter GAPIC Firestore API.
+
+        The channel is created again in a process forked after it was
+        created, since a gRPC channel cannot be shared with a child process.
+
         Returns:
             The GAPIC client with the credentials of the current client.
         """
+        if self._firestore_api_pid not in (None, os.getpid()):
+            self._reset_after_fork()
+
         if self._firestore_api_internal is None:
             # Use a custom channel.
             # We need this in order to set appropriate keepalive options.
@@ -162,9 +231,24 @@ class BaseClient(ClientWithProject):
                 transport=self._transport, client_options=self._client_options
             )
             client_module._client_info = self._client_info
+            self._firestore_api_pid = os.getpid()
 
         return self._firestore_api_internal
 
+    def _reset_after_fork(self) -> None:
+        """Drop the state of the parent process in a forked child.
+
+        The parent's channel and transport are not closed, since that would
+        affect the parent, but replaced on next use. Read batchers and
+        hedging policies are detached, as their threads do not survive the
+        fork.
+        """
+        self._firestore_api_internal = None
+        self._firestore_api_pid = None
+        self._transport = None
+        self._read_batcher = None
+        self._hedging_policy = None
+
     def _emulator_channel(self):
         """
         Creates a channel using self._credentials in a similar way to grpc.secure_channel but
@@ -306,13 +390,70 @@ class BaseClient(ClientWithProject):
                 * A single ``/``-delimited path to a document
                 * A tuple of document path segments
         """
-        path = _path_helper(document_path)
+        if (
+            len(document_path) > 1
+            and document_path[0] != "projects"
+            and not any(
+                _helpers.DOCUMENT_PATH_DELIMITER in segment for segment in document_path
+            )
+        ):
+            # Already split into segments (e.g. by a collection reference).
+            return list(document_path)
+
+        if len(document_path) == 1:
+            joined_path = document_path[0]
+        else:
+            joined_path = _helpers.DOCUMENT_PATH_DELIMITER.join(document_path)
+
         base_path = self._database_string + "/documents/"
-        joined_path = _helpers.DOCUMENT_PATH_DELIMITER.join(path)
         if joined_path.startswith(base_path):
             joined_path = joined_path[len(base_path) :]
         return joined_path.split(_helpers.DOCUMENT_PATH_DELIMITER)
 
+    def _get_document_reference(
+        self, document_class: type, path: Iterable[str]
+    ) -> BaseDocumentReference:
+        """Return the reference to the document at ``path``.
+
+        References are interned: while a reference to a path is alive, the
+        same instance (and its cached full document path) is reused.
+
+        Args:
+            document_class (type): The reference class to create on a miss.
+            path (Iterable[str]): The segments of the document path.
+
+        Returns:
+            :class:`~google.cloud.firestore_v1.base_document.BaseDocumentReference`:
+            The reference to the document.
+        """
+        path = tuple(path)
+        reference = self._document_refs.get(path)
+        if reference is None or type(reference) is not document_class:
+            reference = document_class(*path, client=self)
+            self._document_refs[path] = reference
+
+        return reference
+
+    def _document_from_name(self, name: str) -> BaseDocumentReference:
+        """Return the reference to the document with a fully-qualified name.
+
+        The name is only split into path segments the first time it is
+        seen (while its reference is alive).
+
+        Args:
+            name (str): The document name, as returned by the backend.
+
+        Returns:
+            :class:`~google.cloud.firestore_v1.base_document.BaseDocumentReference`:
+            The reference to the document.
+        """
+        reference = self._document_refs_by_name.get(name)
+        if reference is None:
+            reference = self.document(name)
+            self._document_refs_by_name[name] = reference
+
+        return reference
+
     @staticmethod
     def field_path(*field_names: Tuple[str]) -> str:
         """Create a **field path** from a list of nested field names.
@@ -402,6 +543,7 @@ class BaseClient(ClientWithProject):
         transaction: BaseTransaction = None,
         retry: retries.Retry = None,
         timeout: float = None,
+        read_time=None,
     ) -> Tuple[dict, dict, dict]:
         """Shared setup for async/sync :meth:`get_all`."""
         document_paths, reference_map = _reference_info(references)
@@ -410,9 +552,11 @@ class BaseClient(ClientWithProject):
             "database": self._database_string,
             "documents": document_paths,
             "mask": mask,
-            "transaction": _helpers.get_transaction_id(transaction),
         }
-        kwargs = _helpers.make_retry_timeout_kwargs(retry, timeout)
+        request.update(_helpers.make_consistency_kwargs(transaction, read_time))
+        kwargs = _helpers.make_retry_timeout_kwargs(
+            retry, timeout, is_async=self._is_async
+        )
 
         return request, reference_map, kwargs
 
@@ -423,6 +567,7 @@ class BaseClient(ClientWithProject):
         transaction: BaseTransaction = None,
         retry: retries.Retry = None,
         timeout: float = None,
+        read_time=None,
     ) -> Union[
         AsyncGenerator[DocumentSnapshot, Any], Generator[DocumentSnapshot, Any, Any]
     ]:
@@ -433,7 +578,9 @@ class BaseClient(ClientWithProject):
     ) -> Tuple[dict, dict]:
         """Shared setup for async/sync :meth:`collections`."""
         request = {"parent": "{}/documents".format(self._database_string)}
-        kwargs = _helpers.make_retry_timeout_kwargs(retry, timeout)
+        kwargs = _helpers.make_retry_timeout_kwargs(
+            retry, timeout, is_async=self._is_async
+        )
 
         return request, kwargs
 
@@ -445,12 +592,119 @@ class BaseClient(ClientWithProject):
     ]:
         raise NotImplementedError
 
+    def _prep_walk(
+        self,
+        root: Union[BaseCollectionReference, BaseDocumentReference, None],
+        max_depth: Optional[int],
+        concurrency: int,
+        retry: retries.Retry = None,
+        timeout: float = None,
+    ) -> Tuple[list, dict]:
+        """Shared setup for async/sync :meth:`walk`.
+
+        Returns:
+            Tuple[list, dict]: The first level of nodes to expand (the client
+            itself stands for the root of the database), and the retry and
+            timeout of the listing requests.
+        """
+        if root is not None and not isinstance(
+            root, (BaseCollectionReference, BaseDocumentReference)
+        ):
+            raise TypeError(_BAD_WALK_ROOT)
+        if max_depth is not None and max_depth < 1:
+            raise ValueError(_BAD_MAX_DEPTH)
+        if concurrency < 1:
+            raise ValueError(_BAD_CONCURRENCY)
+
+        kwargs = _helpers.make_retry_timeout_kwargs(
+            retry, timeout, is_async=self._is_async
+        )
+        return [self if root is None else root], kwargs
+
+    def walk(
+        self,
+        root: Union[BaseCollectionReference, BaseDocumentReference, None] = None,
+        max_depth: Optional[int] = None,
+        concurrency: int = DEFAULT_WALK_CONCURRENCY,
+        retry: retries.Retry = None,
+        timeout: float = None,
+    ) -> Union[
+        AsyncGenerator[Tuple[str, str], Any], Generator[Tuple[str, str], Any, Any]
+    ]:
+        raise NotImplementedError
+
     def batch(self) -> BaseWriteBatch:
         raise NotImplementedError
 
     def transaction(self, **kwargs) -> BaseTransaction:
         raise NotImplementedError
 
+    def write_buffer(self, **kwargs) -> BaseWriteBuffer:
+        raise NotImplementedError
+
+    def batch_reads(self, **kwargs) -> BaseReadBatcher:
+        raise NotImplementedError
+
+    def hedge_reads(self, **kwargs) -> BaseHedgingPolicy:
+        raise NotImplementedError
+
+    def _call_read(self, method, stream: bool, **kwargs) -> Any:
+        """Call a read method of the API, hedged if reads are hedged.
+
+        Args:
+            method (Callable): The API method.
+            stream (bool): Whether ``method`` returns a stream of responses.
+            kwargs (Dict[str, Any]): The arguments of ``method``.
+
+        Returns:
+            Any: What ``method`` returns (awaitable for async clients).
+        """
+        policy = self._hedging_policy
+        if policy is None:
+            return method(**kwargs)
+        if stream:
+            return policy.stream(method, **kwargs)
+        return policy.call(method, **kwargs)
+
+
+def _walk_children(children: Iterable, visited: set) -> list:
+    """Order the children of a node of ``walk``, dropping visited ones.
+
+    Args:
+        children (Iterable[Union[.BaseCollectionReference, .BaseDocumentReference]]):
+            The collections or documents listed below the node.
+        visited (Set[Tuple[str, ...]]): The paths of the nodes already
+            yielded, updated with the new ones.
+
+    Returns:
+        List[Union[.BaseCollectionReference, .BaseDocumentReference]]: The
+        children not yet visited, ordered by ID.
+    """
+    result = []
+    for child in sorted(children, key=lambda reference: reference.id):
+        if child._path not in visited:
+            visited.add(child._path)
+            result.append(child)
+    return result
+
+
+def _walk_entry(reference) -> Tuple[str, str]:
+    """Get the ``(path, kind)`` entry yielded by ``walk`` for a node.
+
+    Args:
+        reference (Union[.BaseCollectionReference, .BaseDocumentReference]):
+            The node.
+
+    Returns:
+        Tuple[str, str]: The database-relative path of the node, and either
+        :data:`WALK_COLLECTION` or :data:`WALK_DOCUMENT`.
+    """
+    if isinstance(reference, BaseCollectionReference):
+        kind = WALK_COLLECTION
+    else:
+        kind = WALK_DOCUMENT
+    return _helpers.DOCUMENT_PATH_DELIMITER.join(reference._path), kind
+
 
 def _reference_info(references: list) -> Tuple[list, dict]:
     """Get information about document references.
@@ -529,25 +783,27 @@ def _parse_batch_get(
         ValueError: If the response has a ``result`` field (a oneof) other
             than ``found`` or ``missing``.
     """
-    result_type = get_doc_response._pb.WhichOneof("result")
+    response = _helpers.raw_pb(get_doc_response)
+    result_type = response.WhichOneof("result")
     if result_type == "found":
-        reference = _get_reference(get_doc_response.found.name, reference_map)
-        data = _helpers.decode_dict(get_doc_response.found.fields, client)
+        found = response.found
+        reference = _get_reference(found.name, reference_map)
+        data = _helpers.decode_dict(found.fields, client)
         snapshot = DocumentSnapshot(
             reference,
             data,
             exists=True,
-            read_time=get_doc_response.read_time,
-            create_time=get_doc_response.found.create_time,
-            update_time=get_doc_response.found.update_time,
+            read_time=_helpers.timestamp_from_pb(response, "read_time"),
+            create_time=_helpers.timestamp_from_pb(found, "create_time"),
+            update_time=_helpers.timestamp_from_pb(found, "update_time"),
         )
     elif result_type == "missing":
-        reference = _get_reference(get_doc_response.missing, reference_map)
+        reference = _get_reference(response.missing, reference_map)
         snapshot = DocumentSnapshot(
             reference,
             None,
             exists=False,
-            read_time=get_doc_response.read_time,
+            read_time=_helpers.timestamp_from_pb(response, "read_time"),
             create_time=None,
             update_time=None,
         )
@@ -559,6 +815,30 @@ def _parse_batch_get(
     return snapshot
 
 
+def _raw_stub(transport, name: str) -> Callable:
+    """Get a stub of a streamed read which returns raw protobufs.
+
+    Used by the transports of clients in raw protobuf mode, in place of
+    the stubs which wrap each response with proto-plus.
+
+    Args:
+        transport (Union[~.FirestoreGrpcTransport, ~.FirestoreGrpcAsyncIOTransport]):
+            The transport sending the requests.
+        name (str): The name of the method, a key of ``_RAW_STREAMS``.
+
+    Returns:
+        Callable: The stub.
+    """
+    if name not in transport._stubs:
+        method_type, path, request_type, response_type = _RAW_STREAMS[name]
+        transport._stubs[name] = getattr(transport.grpc_channel, method_type)(
+            path,
+            request_serializer=request_type.serialize,
+            response_deserializer=response_type.pb().FromString,
+        )
+    return transport._stubs[name]
+
+
 def _get_doc_mask(field_paths: Iterable[str]) -> Optional[types.common.DocumentMask]:
     """Get a document mask if field paths are provided.
 
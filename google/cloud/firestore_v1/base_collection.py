@@ -19,6 +19,7 @@ from google.api_core import retry as retries  # type: ignore
 
 from google.cloud.firestore_v1 import _helpers
 from google.cloud.firestore_v1.document import DocumentReference
+from google.cloud.firestore_v1.field_path import FieldPath
 from typing import (
     Any,
     AsyncGenerator,
@@ -27,7 +28,9 @@ from typing import (
     AsyncIterator,
     Iterator,
     Iterable,
+    List,
     NoReturn,
+    Optional,
     Tuple,
     Union,
 )
@@ -38,6 +41,14 @@ from google.cloud.firestore_v1.base_query import BaseQuery
 from google.cloud.firestore_v1.transaction import Transaction
 
 _AUTO_ID_CHARS = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789"
+_BAD_PARTITION_COUNT = "'partition_count' must be a positive integer."
+_MAX_SCAN_WORKERS = 8
+"""int: Most partitions of a ``list_document_ids`` scan read at once."""
+_SCAN_BUFFER_SIZE = 1000
+"""int: Most document IDs read ahead for each partition being read."""
+# Positions of a partition cursor outside of the scanned collection.
+_BEFORE_COLLECTION = "before"
+_AFTER_COLLECTION = "after"
 
 
 class BaseCollectionReference(object):
@@ -66,6 +77,8 @@ class BaseCollectionReference(object):
         TypeError: If a keyword other than ``client`` is used.
     """
 
+    __slots__ = ("_path", "_client", "__weakref__")
+
     def __init__(self, *path, **kwargs) -> None:
         _helpers.verify_path(path, is_collection=True)
         self._path = path
@@ -160,7 +173,9 @@ class BaseCollectionReference(object):
             document_id = _auto_id()
 
         document_ref = self.document(document_id)
-        kwargs = _helpers.make_retry_timeout_kwargs(retry, timeout)
+        kwargs = _helpers.make_retry_timeout_kwargs(
+            retry, timeout, is_async=self._client._is_async
+        )
 
         return document_ref, kwargs
 
@@ -188,7 +203,9 @@ class BaseCollectionReference(object):
             # to include no fields
             "mask": {"field_paths": None},
         }
-        kwargs = _helpers.make_retry_timeout_kwargs(retry, timeout)
+        kwargs = _helpers.make_retry_timeout_kwargs(
+            retry, timeout, is_async=self._client._is_async
+        )
 
         return request, kwargs
 
@@ -199,6 +216,80 @@ class BaseCollectionReference(object):
     ]:
         raise NotImplementedError
 
+    def _prep_list_document_ids(
+        self,
+        page_size: int = None,
+        partition_count: int = None,
+        retry: retries.Retry = None,
+        timeout: float = None,
+    ) -> Tuple[dict, dict]:
+        """Shared setup for async / sync :meth:`list_document_ids`"""
+        if partition_count is not None and partition_count < 1:
+            raise ValueError(_BAD_PARTITION_COUNT)
+
+        return self._prep_list_documents(page_size, retry, timeout)
+
+    def _id_scan_query(self, partition) -> Optional[BaseQuery]:
+        """Build the ID-only query which reads one partition of a scan.
+
+        The partition covers a range of the collection group with this
+        collection's ID; the query only covers the part of the range inside
+        this collection, so other collections with the same ID are not read.
+
+        Args:
+            partition (:class:`~google.cloud.firestore_v1.base_query.QueryPartition`):
+                A partition of the collection group with this collection's ID.
+
+        Returns:
+            Optional[:class:`~google.cloud.firestore_v1.base_query.BaseQuery`]:
+            A query over the partition, projected to the document names, or
+            :data:`None` if no document of this collection is in it.
+        """
+        start = self._scan_bound(partition.start_at)
+        end = self._scan_bound(partition.end_at)
+        if start == _AFTER_COLLECTION or end == _BEFORE_COLLECTION:
+            return None
+        if start == end and start is not None:
+            return None
+
+        query = self.select([FieldPath.document_id()]).order_by(FieldPath.document_id())
+        if start not in (None, _BEFORE_COLLECTION):
+            query = query.start_at([self.document(start)])
+        if end not in (None, _AFTER_COLLECTION):
+            query = query.end_before([self.document(end)])
+        return query
+
+    def _scan_bound(self, reference: Optional[DocumentReference]) -> Optional[str]:
+        """Locate a partition cursor relative to this collection.
+
+        Args:
+            reference (Optional[DocumentReference]): The cursor, a document
+                anywhere in the collection group.
+
+        Returns:
+            Optional[str]: :data:`None` for no cursor, the ID of the document
+            of this collection which the cursor falls on (or under), else
+            whether the cursor is before or after all of its documents.
+        """
+        if reference is None:
+            return None
+        path = reference._path
+        depth = len(self._path)
+        if len(path) > depth and path[:depth] == self._path:
+            return path[depth]
+        if path < self._path:
+            return _BEFORE_COLLECTION
+        return _AFTER_COLLECTION
+
+    def list_document_ids(
+        self,
+        page_size: int = None,
+        partition_count: int = None,
+        retry: retries.Retry = None,
+        timeout: float = None,
+    ) -> Union[Generator[str, Any, Any], AsyncGenerator[str, Any]]:
+        raise NotImplementedError
+
     def select(self, field_paths: Iterable[str]) -> BaseQuery:
         """Create a "select" query with this collection as parent.
 
@@ -419,7 +510,8 @@ class BaseCollectionReference(object):
     ) -> Tuple[Any, dict]:
         """Shared setup for async / sync :meth:`get` / :meth:`stream`"""
         query = self._query()
-        kwargs = _helpers.make_retry_timeout_kwargs(retry, timeout)
+        is_async = self._client is not None and self._client._is_async
+        kwargs = _helpers.make_retry_timeout_kwargs(retry, timeout, is_async=is_async)
 
         return query, kwargs
 
@@ -465,3 +557,49 @@ def _item_to_document_ref(collection_reference, item) -> DocumentReference:
     """
     document_id = item.name.split(_helpers.DOCUMENT_PATH_DELIMITER)[-1]
     return collection_reference.document(document_id)
+
+
+def _page_document_ids(page) -> List[str]:
+    """Extract the document IDs from a ``ListDocuments`` response page.
+
+    Args:
+        page (google.cloud.firestore_v1.types.ListDocumentsResponse): A
+            page of results.
+
+    Returns:
+        List[str]: The IDs of the documents in the page.
+    """
+    return [
+        document_pb.name.rpartition(_helpers.DOCUMENT_PATH_DELIMITER)[2]
+        for document_pb in page._pb.documents
+    ]
+
+
+def _scan_document_id(response_pb, expected_prefix: str) -> Optional[str]:
+    """Extract the document ID from a partition scan ``RunQuery`` response.
+
+    Only documents directly inside the collection at ``expected_prefix``
+    match.
+
+    Args:
+        response_pb (google.cloud.firestore_v1.types.RunQueryResponse): A
+            query response.
+        expected_prefix (str): The fully-qualified path of the collection
+            being scanned, as computed by ``_parent_info()``.
+
+    Returns:
+        Optional[str]: The ID of the document in the response, or
+        :data:`None` if there is no document or it belongs to another
+        collection.
+    """
+    response = _helpers.raw_pb(response_pb)
+    if not response.HasField("document"):
+        return None
+
+    prefix, _, document_id = response.document.name.rpartition(
+        _helpers.DOCUMENT_PATH_DELIMITER
+    )
+    if prefix != expected_prefix:
+        return None
+
+    return document_id
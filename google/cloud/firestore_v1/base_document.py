@@ -16,6 +16,7 @@
 
 import copy
 
+from google.api_core import gapic_v1  # type: ignore
 from google.api_core import retry as retries  # type: ignore
 
 from google.cloud.firestore_v1 import _helpers
@@ -53,12 +54,13 @@ class BaseDocumentReference(object):
         TypeError: If a keyword other than ``client`` is used.
     """
 
-    _document_path_internal = None
+    __slots__ = ("_path", "_client", "_document_path_internal", "__weakref__")
 
     def __init__(self, *path, **kwargs) -> None:
         _helpers.verify_path(path, is_collection=False)
         self._path = path
         self._client = kwargs.pop("client", None)
+        self._document_path_internal = None
         if kwargs:
             raise TypeError(
                 "Received unexpected arguments", kwargs, "Only `client` is supported"
@@ -190,7 +192,9 @@ class BaseDocumentReference(object):
     ) -> Tuple[Any, dict]:
         batch = self._client.batch()
         batch.create(self, document_data)
-        kwargs = _helpers.make_retry_timeout_kwargs(retry, timeout)
+        kwargs = _helpers.make_retry_timeout_kwargs(
+            retry, timeout, is_async=self._client._is_async
+        )
 
         return batch, kwargs
 
@@ -208,7 +212,9 @@ class BaseDocumentReference(object):
     ) -> Tuple[Any, dict]:
         batch = self._client.batch()
         batch.set(self, document_data, merge=merge)
-        kwargs = _helpers.make_retry_timeout_kwargs(retry, timeout)
+        kwargs = _helpers.make_retry_timeout_kwargs(
+            retry, timeout, is_async=self._client._is_async
+        )
 
         return batch, kwargs
 
@@ -230,7 +236,9 @@ class BaseDocumentReference(object):
     ) -> Tuple[Any, dict]:
         batch = self._client.batch()
         batch.update(self, field_updates, option=option)
-        kwargs = _helpers.make_retry_timeout_kwargs(retry, timeout)
+        kwargs = _helpers.make_retry_timeout_kwargs(
+            retry, timeout, is_async=self._client._is_async
+        )
 
         return batch, kwargs
 
@@ -256,7 +264,9 @@ class BaseDocumentReference(object):
             "writes": [write_pb],
             "transaction": None,
         }
-        kwargs = _helpers.make_retry_timeout_kwargs(retry, timeout)
+        kwargs = _helpers.make_retry_timeout_kwargs(
+            retry, timeout, is_async=self._client._is_async
+        )
 
         return request, kwargs
 
@@ -274,6 +284,7 @@ class BaseDocumentReference(object):
         transaction=None,
         retry: retries.Retry = None,
         timeout: float = None,
+        read_time=None,
     ) -> Tuple[dict, dict]:
         """Shared setup for async/sync :meth:`get`."""
         if isinstance(field_paths, str):
@@ -287,18 +298,36 @@ class BaseDocumentReference(object):
         request = {
             "name": self._document_path,
             "mask": mask,
-            "transaction": _helpers.get_transaction_id(transaction),
         }
-        kwargs = _helpers.make_retry_timeout_kwargs(retry, timeout)
+        request.update(_helpers.make_consistency_kwargs(transaction, read_time))
+        kwargs = _helpers.make_retry_timeout_kwargs(
+            retry, timeout, is_async=self._client._is_async
+        )
 
         return request, kwargs
 
+    def _get_read_batcher(self, transaction, retry, timeout, read_time) -> Any:
+        """Get the client's read batcher, if a :meth:`get` may go through it.
+
+        Reads in a transaction, at a ``read_time``, or with their own
+        ``retry`` / ``timeout`` are never batched.
+        """
+        if (
+            transaction is not None
+            or read_time is not None
+            or retry is not gapic_v1.method.DEFAULT
+            or timeout is not None
+        ):
+            return None
+        return self._client._read_batcher
+
     def get(
         self,
         field_paths: Iterable[str] = None,
         transaction=None,
         retry: retries.Retry = None,
         timeout: float = None,
+        read_time=None,
     ) -> "DocumentSnapshot":
         raise NotImplementedError
 
@@ -307,7 +336,9 @@ class BaseDocumentReference(object):
     ) -> Tuple[dict, dict]:
         """Shared setup for async/sync :meth:`collections`."""
         request = {"parent": self._document_path, "page_size": page_size}
-        kwargs = _helpers.make_retry_timeout_kwargs(retry, timeout)
+        kwargs = _helpers.make_retry_timeout_kwargs(
+            retry, timeout, is_async=self._client._is_async
+        )
 
         return request, kwargs
 
@@ -491,6 +522,30 @@ class DocumentSnapshot(object):
         return copy.deepcopy(self._data)
 
 
+def _decoded_snapshot(
+    reference, data, read_time, create_time, update_time
+) -> DocumentSnapshot:
+    """Build a snapshot of an existing document from freshly decoded data.
+
+    Unlike the :class:`DocumentSnapshot` constructor, ``data`` is not
+    copied: it must not be shared with anything else.
+
+    Args:
+        reference (:class:`~google.cloud.firestore_v1.document.DocumentReference`):
+            The reference to the document.
+        data (Dict[str, Any]): The decoded fields of the document.
+        read_time, create_time, update_time: As for :class:`DocumentSnapshot`.
+
+    Returns:
+        :class:`DocumentSnapshot`: The snapshot.
+    """
+    snapshot = DocumentSnapshot(
+        reference, None, True, read_time, create_time, update_time
+    )
+    snapshot._data = data
+    return snapshot
+
+
 def _get_document_path(client, path: Tuple[str]) -> str:
     """Convert a path tuple into a full path string.
 
@@ -0,0 +1,238 @@
+# Copyright 2020 Google LLC All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Helpers for hedging idempotent reads against slow backends."""
+
+import collections
+import threading
+import time
+
+from google.api_core import exceptions
+
+from google.cloud.firestore_v1.deadline import remaining_timeout
+
+from typing import NoReturn, Optional
+
+DEFAULT_PERCENTILE = 95.0
+"""float: Default percentile of recent latencies after which reads are hedged."""
+DEFAULT_MIN_DELAY = 0.01
+"""float: Default minimum number of seconds before a read is hedged."""
+DEFAULT_MAX_DELAY = 1.0
+"""float: Default maximum number of seconds before a read is hedged."""
+DEFAULT_HISTORY = 200
+"""int: Default number of recent latencies the hedge delay is learned from."""
+# Until this many latencies are known, reads are hedged after ``max_delay``.
+_MIN_SAMPLES = 20
+_DEADLINE_EXCEEDED = "Hedged read did not complete within {:g} seconds."
+_BAD_PERCENTILE = "'percentile' must be between 0 and 100."
+_BAD_MAX_HEDGES = "'max_hedges' must be positive."
+_BAD_DELAYS = "'min_delay' must be between 0 and 'max_delay'."
+# Marks a stream which ended without any response.
+_END = object()
+
+
+class HedgingStats(object):
+    """How often reads were hedged, and how often hedges won.
+
+    Args:
+        calls (int): The number of reads completed (or failed).
+        hedged (int): The number of reads for which at least one hedge was
+            sent.
+        hedges (int): The number of hedges sent.
+        won (int): The number of reads answered first by a hedge.
+    """
+
+    def __init__(self, calls=0, hedged=0, hedges=0, won=0) -> None:
+        self.calls = calls
+        self.hedged = hedged
+        self.hedges = hedges
+        self.won = won
+
+    @property
+    def hedge_rate(self) -> float:
+        """float: The share of reads which were hedged."""
+        if not self.calls:
+            return 0.0
+        return self.hedged / self.calls
+
+    @property
+    def win_rate(self) -> float:
+        """float: The share of hedged reads answered first by a hedge."""
+        if not self.hedged:
+            return 0.0
+        return self.won / self.hedged
+
+    def __repr__(self):
+        return "<HedgingStats calls={:d} hedged={:d} hedges={:d} won={:d}>".format(
+            self.calls, self.hedged, self.hedges, self.won
+        )
+
+
+class BaseHedgingPolicy(object):
+    """Send duplicate requests for reads which take longer than usual.
+
+    A read which has not completed after the hedge delay is sent again (up
+    to ``max_hedges`` times); the first response is used and the other
+    requests are cancelled. Errors are not hedged: they are retried (or
+    not) by the usual ``retry`` of each request. Client errors (such as
+    :class:`~google.api_core.exceptions.NotFound`) are answers, and end the
+    read like a response; after other errors, the read waits for its other
+    requests, and fails once all of them have failed.
+
+    The hedge delay is either fixed, or the ``percentile`` of the latencies
+    of recent reads (clamped between ``min_delay`` and ``max_delay``), so
+    that only the slowest reads are hedged. For streaming reads, the
+    latency is the time until the first response.
+
+    Args:
+        client (:class:`~google.cloud.firestore_v1.client.Client`):
+            The client that created this policy.
+        delay (Optional[float]): A fixed number of seconds before a read is
+            hedged. If not passed, the delay is learned.
+        percentile (Optional[float]): The percentile of recent latencies
+            used as the learned delay.
+        min_delay (Optional[float]): The minimum learned delay.
+        max_delay (Optional[float]): The maximum learned delay.
+        max_hedges (Optional[int]): The maximum number of duplicate
+            requests sent for a read.
+        deadline (Optional[float]): The number of seconds after which a
+            read fails with :class:`~google.api_core.exceptions.DeadlineExceeded`
+            (the remaining time is also passed as the ``timeout`` of each
+            request). If not passed, reads have no overall deadline.
+        history (Optional[int]): The number of recent latencies the delay
+            is learned from.
+    """
+
+    def __init__(
+        self,
+        client,
+        delay: float = None,
+        percentile: float = DEFAULT_PERCENTILE,
+        min_delay: float = DEFAULT_MIN_DELAY,
+        max_delay: float = DEFAULT_MAX_DELAY,
+        max_hedges: int = 1,
+        deadline: float = None,
+        history: int = DEFAULT_HISTORY,
+    ) -> None:
+        if not 0 < percentile <= 100:
+            raise ValueError(_BAD_PERCENTILE)
+        if max_hedges < 1:
+            raise ValueError(_BAD_MAX_HEDGES)
+        if not 0 <= min_delay <= max_delay:
+            raise ValueError(_BAD_DELAYS)
+
+        self._client = client
+        self._delay = delay
+        self._percentile = percentile
+        self._min_delay = min_delay
+        self._max_delay = max_delay
+        self._max_hedges = max_hedges
+        self._deadline = deadline
+        self._latencies = collections.deque(maxlen=history)
+        self._stats = HedgingStats()
+        self._lock = threading.Lock()
+
+    @property
+    def stats(self) -> HedgingStats:
+        """HedgingStats: A copy of the statistics of the reads so far."""
+        with self._lock:
+            stats = self._stats
+            return HedgingStats(stats.calls, stats.hedged, stats.hedges, stats.won)
+
+    def hedge_delay(self) -> float:
+        """Get the number of seconds after which a read is hedged.
+
+        Returns:
+            float: The fixed delay, or the one learned from recent reads.
+        """
+        if self._delay is not None:
+            return self._delay
+
+        with self._lock:
+            latencies = sorted(self._latencies)
+        if len(latencies) < _MIN_SAMPLES:
+            return self._max_delay
+
+        index = int(round(self._percentile / 100.0 * (len(latencies) - 1)))
+        return min(max(latencies[index], self._min_delay), self._max_delay)
+
+    def _record(self, hedges: int, winner: Optional[int], latency: float) -> None:
+        """Update the statistics after a read.
+
+        Args:
+            hedges (int): The number of hedges sent.
+            winner (Optional[int]): The index of the request which answered
+                first (``0`` for the original request), or :data:`None` if
+                the read failed.
+            latency (float): The latency of the winning request.
+        """
+        with self._lock:
+            self._stats.calls += 1
+            self._stats.hedges += hedges
+            if hedges:
+                self._stats.hedged += 1
+            if winner:
+                self._stats.won += 1
+            if winner is not None:
+                self._latencies.append(latency)
+
+    def _attempt_kwargs(self, kwargs: dict, deadline: Optional[float]) -> dict:
+        """Bound the ``timeout`` of a request by the overall deadline."""
+        if deadline is None:
+            return kwargs
+
+        remaining = max(deadline - time.monotonic(), 0.0)
+        timeout = remaining_timeout(kwargs.get("timeout"))
+        if timeout is None or timeout > remaining:
+            kwargs = dict(kwargs, timeout=remaining)
+        return kwargs
+
+    def _wait_timeout(
+        self, hedges: int, next_hedge: float, deadline: Optional[float]
+    ) -> Optional[float]:
+        """Get the number of seconds to wait for a response before acting."""
+        wake = None
+        if hedges < self._max_hedges:
+            wake = next_hedge
+        if deadline is not None:
+            wake = deadline if wake is None else min(wake, deadline)
+        if wake is None:
+            return None
+        return max(wake - time.monotonic(), 0.0)
+
+    @staticmethod
+    def _cancel_stream(stream) -> None:
+        """Cancel the stream of a request which lost the race."""
+        cancel = getattr(stream, "cancel", None)
+        if cancel is not None:
+            cancel()
+
+    @staticmethod
+    def _is_answer(error: Exception) -> bool:
+        """Whether an error ends a read like a response would."""
+        return isinstance(error, exceptions.ClientError)
+
+    def _deadline_exceeded(self) -> exceptions.DeadlineExceeded:
+        return exceptions.DeadlineExceeded(_DEADLINE_EXCEEDED.format(self._deadline))
+
+    def _detach(self) -> None:
+        """Stop the client from hedging its reads with this policy."""
+        if self._client._hedging_policy is self:
+            self._client._hedging_policy = None
+
+    def call(self, method, **kwargs) -> NoReturn:
+        raise NotImplementedError
+
+    def stream(self, method, **kwargs) -> NoReturn:
+        raise NotImplementedError
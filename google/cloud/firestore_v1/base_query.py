@@ -19,6 +19,9 @@ a :class:`~google.cloud.firestore_v1.collection.Collection` and that can be
 a more common way to create a query than direct usage of the constructor.
 """
 import copy
+import functools
+import heapq
+import itertools
 import math
 
 from google.api_core import retry as retries  # type: ignore
@@ -29,14 +32,28 @@ from google.cloud.firestore_v1 import document
 from google.cloud.firestore_v1 import field_path as field_path_module
 from google.cloud.firestore_v1 import transforms
 from google.cloud.firestore_v1.types import StructuredQuery
+from google.cloud.firestore_v1.types import document as document_pb
 from google.cloud.firestore_v1.types import query
 from google.cloud.firestore_v1.types import Cursor
 from google.cloud.firestore_v1.types import RunQueryResponse
 from google.cloud.firestore_v1.order import Order
-from typing import Any, Dict, Iterable, NoReturn, Optional, Tuple, Union
+from google.cloud.firestore_v1.query_results import QueryResults
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generator,
+    Iterable,
+    List,
+    NoReturn,
+    Optional,
+    Tuple,
+    Union,
+)
 
 # Types needed only for Type Hints
 from google.cloud.firestore_v1.base_document import DocumentSnapshot
+from google.cloud.firestore_v1.base_document import _decoded_snapshot
 
 _BAD_DIR_STRING: str
 _BAD_OP_NAN_NULL: str
@@ -84,6 +101,16 @@ _NO_ORDERS_FOR_CURSOR = (
 )
 _MISMATCH_CURSOR_W_ORDER_BY = "The cursor {!r} does not match the order fields {!r}."
 
+MAX_DISJUNCTION_SIZE = 10
+"""int: Most values sent in one ``in`` / ``array_contains_any`` filter.
+
+Queries with longer value lists are split into several queries, whose
+results are merged client-side."""
+_SPLITTABLE_OPERATORS = (_operator_enum.IN, _operator_enum.ARRAY_CONTAINS_ANY)
+# Callables notified with the ``StructuredQuery`` of each query run, e.g. by
+# an :class:`~google.cloud.firestore_v1.index_advisor.IndexAdvisor`.
+_query_observers: List[Callable[[StructuredQuery], None]] = []
+
 
 class BaseQuery(object):
     """Represents a query to the Firestore API.
@@ -804,12 +831,62 @@ class BaseQuery(object):
         return query.StructuredQuery(**query_kwargs)
 
     def get(
-        self, transaction=None, retry: retries.Retry = None, timeout: float = None,
+        self,
+        transaction=None,
+        retry: retries.Retry = None,
+        timeout: float = None,
+        read_time=None,
+        max_documents: int = None,
+        compact: bool = False,
     ) -> NoReturn:
         raise NotImplementedError
 
+    def _bound_for_get(self, max_documents: Optional[int]) -> "BaseQuery":
+        """Read no more documents in ``get`` than needed to exceed a limit.
+
+        Args:
+            max_documents (Optional[int]): The maximum number of documents
+                ``get`` may return.
+
+        Returns:
+            BaseQuery: This query, or a copy limited to one document more
+            than ``max_documents``.
+        """
+        if max_documents is None:
+            return self
+        if self._limit is not None and self._limit <= max_documents + 1:
+            return self
+        return self.limit(max_documents + 1)
+
+    def _query_results(self, max_documents: Optional[int]) -> QueryResults:
+        """Create the results of ``get(compact=True)`` for this query."""
+        _, expected_prefix = self._parent._parent_info()
+        return QueryResults(
+            functools.partial(self._response_to_snapshot, expected_prefix),
+            max_documents,
+        )
+
+    def _response_to_snapshot(
+        self, expected_prefix: str, response_pb: RunQueryResponse
+    ) -> Optional[document.DocumentSnapshot]:
+        """Parse a ``RunQueryResponse`` of this query to a snapshot.
+
+        Returns:
+            Optional[DocumentSnapshot]: The snapshot, or :data:`None` if
+            ``response_pb.document`` is not set.
+        """
+        if self._all_descendants:
+            return _collection_group_query_response_to_snapshot(
+                response_pb, self._parent
+            )
+        return _query_response_to_snapshot(response_pb, self._parent, expected_prefix)
+
     def _prep_stream(
-        self, transaction=None, retry: retries.Retry = None, timeout: float = None,
+        self,
+        transaction=None,
+        retry: retries.Retry = None,
+        timeout: float = None,
+        read_time=None,
     ) -> Tuple[dict, str, dict]:
         """Shared setup for async / sync :meth:`stream`"""
         if self._limit_to_last:
@@ -822,20 +899,174 @@ class BaseQuery(object):
         request = {
             "parent": parent_path,
             "structured_query": self._to_protobuf(),
-            "transaction": _helpers.get_transaction_id(transaction),
         }
-        kwargs = _helpers.make_retry_timeout_kwargs(retry, timeout)
+        for observer in _query_observers:
+            observer(request["structured_query"])
+        request.update(_helpers.make_consistency_kwargs(transaction, read_time))
+        kwargs = _helpers.make_retry_timeout_kwargs(
+            retry, timeout, is_async=self._client._is_async
+        )
 
         return request, expected_prefix, kwargs
 
     def stream(
-        self, transaction=None, retry: retries.Retry = None, timeout: float = None,
+        self,
+        transaction=None,
+        retry: retries.Retry = None,
+        timeout: float = None,
+        read_time=None,
     ) -> NoReturn:
         raise NotImplementedError
 
     def on_snapshot(self, callback) -> NoReturn:
         raise NotImplementedError
 
+    def _split_disjunctions(self) -> Optional[List["BaseQuery"]]:
+        """Split ``in`` / ``array_contains_any`` filters with too many values.
+
+        Each such filter is broken into filters of at most
+        :data:`MAX_DISJUNCTION_SIZE` values, and one query is built for each
+        combination of the pieces. The offset is dropped from these queries
+        (it is applied after merging their results), so their limit is
+        raised by the offset to keep enough results. Fields needed to merge
+        the results which a projection leaves out are added to it (see
+        :meth:`_split_projection_fields`).
+
+        Returns:
+            Optional[List[:class:`~google.cloud.firestore_v1.base_query.BaseQuery`]]:
+            The queries whose merged results answer this query, or
+            :data:`None` if no filter needs splitting.
+        """
+        filter_choices = []
+        for filter_pb in self._field_filters:
+            if (
+                isinstance(filter_pb, query.StructuredQuery.FieldFilter)
+                and filter_pb.op in _SPLITTABLE_OPERATORS
+                and len(filter_pb.value.array_value.values) > MAX_DISJUNCTION_SIZE
+            ):
+                values = list(filter_pb.value.array_value.values)
+                filter_choices.append(
+                    [
+                        query.StructuredQuery.FieldFilter(
+                            field=filter_pb.field,
+                            op=filter_pb.op,
+                            value=document_pb.Value(
+                                array_value=document_pb.ArrayValue(
+                                    values=values[start : start + MAX_DISJUNCTION_SIZE]
+                                )
+                            ),
+                        )
+                        for start in range(0, len(values), MAX_DISJUNCTION_SIZE)
+                    ]
+                )
+            else:
+                filter_choices.append([filter_pb])
+
+        if all(len(choices) == 1 for choices in filter_choices):
+            return None
+
+        limit = self._limit
+        if limit is not None and self._offset:
+            limit += self._offset
+
+        projection = self._projection
+        extra_fields = self._split_projection_fields()
+        if extra_fields:
+            projection = query.StructuredQuery.Projection(
+                fields=list(projection.fields)
+                + [
+                    query.StructuredQuery.FieldReference(field_path=field_path)
+                    for field_path in extra_fields
+                ]
+            )
+
+        return [
+            self.__class__(
+                self._parent,
+                projection=projection,
+                field_filters=field_filters,
+                orders=self._orders,
+                limit=limit,
+                limit_to_last=self._limit_to_last,
+                start_at=self._start_at,
+                end_at=self._end_at,
+                all_descendants=self._all_descendants,
+            )
+            for field_filters in itertools.product(*filter_choices)
+        ]
+
+    def _split_projection_fields(self) -> List[str]:
+        """Get the ordered fields which this query's projection leaves out.
+
+        The queries from :meth:`_split_disjunctions` select them too, so
+        that their results can be merged in order; they are removed from
+        the merged snapshots.
+
+        Returns:
+            List[str]: The field paths, empty if there is no projection.
+        """
+        if self._projection is None:
+            return []
+
+        from google.cloud.firestore_v1.query_matcher import _query_orders
+
+        selected = [field.field_path for field in self._projection.fields]
+        order_fields, _ = _query_orders(self)
+        return [
+            field_path
+            for field_path in order_fields
+            if field_path != "__name__"
+            and not any(
+                field_path == prefix or field_path.startswith(prefix + ".")
+                for prefix in selected
+            )
+        ]
+
+    def _split_sort_key(self) -> Callable[[DocumentSnapshot], Any]:
+        """Get the key merging the results of ``_split_disjunctions``."""
+        from google.cloud.firestore_v1.query_matcher import _snapshot_sort_key
+
+        return _snapshot_sort_key(self)
+
+    def _split_window(self) -> Tuple[int, Optional[int]]:
+        """Get the slice of the merged results which this query returns."""
+        start = self._offset or 0
+        stop = None if self._limit is None else start + self._limit
+        return start, stop
+
+    def _merge_split_results(
+        self, results: Iterable[Iterable[DocumentSnapshot]]
+    ) -> Generator[DocumentSnapshot, Any, None]:
+        """Merge the (ordered) results of the queries from ``_split_disjunctions``.
+
+        The results are consumed lazily, as the merged documents are read.
+
+        Args:
+            results (Iterable[Iterable[DocumentSnapshot]]): The results of
+                each query, in the order of this query.
+
+        Yields:
+            :class:`~google.cloud.firestore_v1.base_document.DocumentSnapshot`:
+            The next document, in order and without duplicates, after
+            applying this query's offset and limit.
+        """
+        merged = heapq.merge(*results, key=self._split_sort_key())
+        extra_fields = self._split_projection_fields()
+
+        seen = set()
+
+        def deduplicated():
+            for snapshot in merged:
+                path = snapshot.reference._path
+                if path not in seen:
+                    seen.add(path)
+                    yield snapshot
+
+        start, stop = self._split_window()
+        for snapshot in itertools.islice(deduplicated(), start, stop):
+            _strip_fields(snapshot, extra_fields)
+            yield snapshot
+
     def _comparator(self, doc1, doc2) -> int:
         _orders = self._orders
 
@@ -857,7 +1088,7 @@ class BaseQuery(object):
         orderBys.append(order_pb)
 
         for orderBy in orderBys:
-            if orderBy.field.field_path == "id":
+            if orderBy.field.field_path in ("id", "__name__"):
                 # If ordering by docuent id, compare resource paths.
                 comp = Order()._compare_to(doc1.reference._path, doc2.reference._path)
             else:
@@ -878,11 +1109,40 @@ class BaseQuery(object):
 
             if comp != 0:
                 # 1 == Ascending, -1 == Descending
-                return orderBy.direction * comp
+                direction = orderBy.direction
+                if direction == query.StructuredQuery.Direction.DESCENDING:
+                    direction = -1
+                return direction * comp
 
         return 0
 
 
+def _strip_fields(snapshot: DocumentSnapshot, field_paths: List[str]) -> None:
+    """Remove fields added to a projection from a snapshot's data.
+
+    Maps left empty by the removal are removed too.
+
+    Args:
+        snapshot (DocumentSnapshot): A freshly decoded snapshot.
+        field_paths (List[str]): The field paths to remove.
+    """
+    for field_path in field_paths:
+        parents = []
+        data = snapshot._data
+        parts = field_path_module.parse_field_path(field_path)
+        for part in parts[:-1]:
+            parents.append((data, part))
+            data = data.get(part)
+            if not isinstance(data, dict):
+                break
+        else:
+            data.pop(parts[-1], None)
+            for parent, part in reversed(parents):
+                if parent[part]:
+                    break
+                del parent[part]
+
+
 def _enum_from_op_string(op_string: str) -> int:
     """Convert a string representation of a binary operator to an enum.
 
@@ -1018,21 +1278,38 @@ def _query_response_to_snapshot(
         A snapshot of the data returned in the query. If
         ``response_pb.document`` is not set, the snapshot will be :data:`None`.
     """
-    if not response_pb._pb.HasField("document"):
+    response = _helpers.raw_pb(response_pb)
+    if not response.HasField("document"):
         return None
 
-    document_id = _helpers.get_doc_id(response_pb.document, expected_prefix)
+    document_pb = response.document
+    document_id = _helpers.get_doc_id(document_pb, expected_prefix)
     reference = collection.document(document_id)
-    data = _helpers.decode_dict(response_pb.document.fields, collection._client)
-    snapshot = document.DocumentSnapshot(
+    _cache_document_path(reference, document_pb.name)
+    data = _helpers.decode_dict(document_pb.fields, collection._client)
+    return _decoded_snapshot(
         reference,
         data,
-        exists=True,
-        read_time=response_pb.read_time,
-        create_time=response_pb.document.create_time,
-        update_time=response_pb.document.update_time,
+        read_time=_helpers.timestamp_from_pb(response, "read_time"),
+        create_time=_helpers.timestamp_from_pb(document_pb, "create_time"),
+        update_time=_helpers.timestamp_from_pb(document_pb, "update_time"),
     )
-    return snapshot
+
+
+def _cache_document_path(reference, document_path: str) -> None:
+    """Store the full path of a document returned by the backend.
+
+    Saves re-joining the path segments when the reference is used in a
+    later request (e.g. a write).
+
+    Args:
+        reference (:class:`~google.cloud.firestore_v1.base_document.BaseDocumentReference`):
+            The (possibly shared) reference for the document.
+        document_path (str): The fully-qualified document name from the
+            response.
+    """
+    if reference._document_path_internal is None:
+        reference._document_path_internal = document_path
 
 
 def _collection_group_query_response_to_snapshot(
@@ -1051,19 +1328,21 @@ def _collection_group_query_response_to_snapshot(
         A snapshot of the data returned in the query. If
         ``response_pb.document`` is not set, the snapshot will be :data:`None`.
     """
-    if not response_pb._pb.HasField("document"):
+    response = _helpers.raw_pb(response_pb)
+    if not response.HasField("document"):
         return None
-    reference = collection._client.document(response_pb.document.name)
-    data = _helpers.decode_dict(response_pb.document.fields, collection._client)
-    snapshot = document.DocumentSnapshot(
+    document_pb = response.document
+    name = document_pb.name
+    reference = collection._client._document_from_name(name)
+    _cache_document_path(reference, name)
+    data = _helpers.decode_dict(document_pb.fields, collection._client)
+    return _decoded_snapshot(
         reference,
         data,
-        exists=True,
-        read_time=response_pb._pb.read_time,
-        create_time=response_pb._pb.document.create_time,
-        update_time=response_pb._pb.document.update_time,
+        read_time=_helpers.timestamp_from_pb(response, "read_time"),
+        create_time=_helpers.timestamp_from_pb(document_pb, "create_time"),
+        update_time=_helpers.timestamp_from_pb(document_pb, "update_time"),
     )
-    return snapshot
 
 
 class BaseCollectionGroup(BaseQuery):
@@ -1147,7 +1426,9 @@ class BaseCollectionGroup(BaseQuery):
             "structured_query": query._to_protobuf(),
             "partition_count": partition_count,
         }
-        kwargs = _helpers.make_retry_timeout_kwargs(retry, timeout)
+        kwargs = _helpers.make_retry_timeout_kwargs(
+            retry, timeout, is_async=self._client._is_async
+        )
 
         return request, kwargs
 
@@ -0,0 +1,165 @@
+# Copyright 2020 Google LLC All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Helpers for batching concurrent single-document reads."""
+
+from google.cloud.firestore_v1 import _helpers
+
+# Types needed only for Type Hints
+from google.cloud.firestore_v1.base_document import DocumentSnapshot
+
+from typing import Any, Callable, Iterable, List, NoReturn, Optional, Tuple
+
+DEFAULT_WINDOW = 0.002
+"""float: Default number of seconds reads are collected before being sent."""
+DEFAULT_MAX_BATCH_SIZE = 100
+"""int: Default number of documents which triggers a ``BatchGetDocuments``."""
+_BATCHER_CLOSED = "Cannot read through a closed read batcher."
+_BAD_BATCH_SIZE = "'max_batch_size' must be positive."
+_NO_RESULT = "No result for document {!r} in the batched read."
+
+
+class BaseReadBatcher(object):
+    """Collect concurrent document reads into ``BatchGetDocuments`` calls.
+
+    Reads made within ``window`` seconds of each other are sent together,
+    through :meth:`~google.cloud.firestore_v1.client.Client.get_all`, with
+    one call per set of ``field_paths``. A call is sent as soon as it holds
+    ``max_batch_size`` documents. Reads of a document which is already
+    waiting for (or in) a batch share its result instead of being sent again.
+
+    Args:
+        client (:class:`~google.cloud.firestore_v1.client.Client`):
+            The client that created this batcher.
+        window (Optional[float]): The number of seconds reads are collected
+            before being sent.
+        max_batch_size (Optional[int]): The number of documents which
+            triggers a call before the end of the window.
+    """
+
+    def __init__(
+        self,
+        client,
+        window: float = DEFAULT_WINDOW,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+    ) -> None:
+        if max_batch_size < 1:
+            raise ValueError(_BAD_BATCH_SIZE)
+
+        self._client = client
+        self._window = window
+        self._max_batch_size = max_batch_size
+        # Documents not sent yet, grouped by mask then keyed by path.
+        self._pending = {}
+        # Futures of documents not read yet, keyed by (mask, path).
+        self._futures = {}
+        self._closed = False
+
+    def __len__(self) -> int:
+        return len(self._futures)
+
+    def _enqueue(
+        self, reference, field_paths: Optional[Iterable[str]], make_future: Callable
+    ) -> Tuple[Any, Optional[tuple], bool]:
+        """Queue the read of a document, unless it is already queued.
+
+        Args:
+            reference (:class:`~google.cloud.firestore_v1.base_document.BaseDocumentReference`):
+                The document to read.
+            field_paths (Optional[Iterable[str]]): The fields to read.
+            make_future (Callable[[], Future]): Creates the future for a new
+                read.
+
+        Returns:
+            Tuple[Future, Optional[Tuple[str, ...]], bool]: The future
+            resolved with the snapshot, the mask of the read, and whether
+            the batch for that mask is now full.
+
+        Raises:
+            ValueError: If the batcher has been closed.
+        """
+        if self._closed:
+            raise ValueError(_BATCHER_CLOSED)
+
+        mask = None
+        if field_paths is not None:
+            mask = tuple(sorted(set(field_paths)))
+        document_path = reference._document_path
+
+        future = self._futures.get((mask, document_path))
+        if future is not None:
+            return future, mask, False
+
+        future = make_future()
+        self._futures[(mask, document_path)] = future
+        group = self._pending.setdefault(mask, {})
+        group[document_path] = reference
+        return future, mask, len(group) >= self._max_batch_size
+
+    def _take_batches(self, masks: Iterable = None) -> List[Tuple[Any, list]]:
+        """Remove pending reads, split into calls.
+
+        Args:
+            masks (Optional[Iterable[Optional[Tuple[str, ...]]]]): The masks
+                whose reads are taken. Defaults to all of them.
+
+        Returns:
+            List[Tuple[Optional[Tuple[str, ...]], list]]: The mask and the
+            references of each call, with at most ``max_batch_size``
+            references each.
+        """
+        if masks is None:
+            masks = list(self._pending)
+
+        batches = []
+        for mask in masks:
+            group = self._pending.pop(mask, None)
+            if group:
+                for chunk in _helpers.chunks(
+                    list(group.values()), self._max_batch_size
+                ):
+                    batches.append((mask, chunk))
+        return batches
+
+    def _resolve(
+        self, mask, references: list, snapshots: Iterable[DocumentSnapshot]
+    ) -> None:
+        """Complete the futures of a call with the documents it read."""
+        for snapshot in snapshots:
+            document_path = snapshot.reference._document_path
+            future = self._futures.pop((mask, document_path), None)
+            if future is not None and not future.done():
+                future.set_result(snapshot)
+
+        for reference in references:
+            document_path = reference._document_path
+            future = self._futures.pop((mask, document_path), None)
+            if future is not None and not future.done():
+                future.set_exception(ValueError(_NO_RESULT.format(document_path)))
+
+    def _fail(self, mask, references: list, exc: Exception) -> None:
+        """Complete the futures of a call which failed."""
+        for reference in references:
+            future = self._futures.pop((mask, reference._document_path), None)
+            if future is not None and not future.done():
+                future.set_exception(exc)
+
+    def _detach(self) -> None:
+        """Stop the client from sending its reads through this batcher."""
+        self._closed = True
+        if self._client._read_batcher is self:
+            self._client._read_batcher = None
+
+    def get(self, reference, field_paths: Iterable[str] = None) -> NoReturn:
+        raise NotImplementedError
@@ -0,0 +1,161 @@
+# Copyright 2020 Google LLC All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Helpers for counters whose writes are spread across shard documents."""
+
+import random
+import threading
+import zlib
+
+from google.api_core import exceptions  # type: ignore
+
+from google.cloud.firestore_v1 import transforms
+from typing import Any, Iterable, NoReturn
+
+
+DEFAULT_NUM_SHARDS = 4
+"""int: Default number of shards a counter starts writing to."""
+DEFAULT_MAX_SHARDS = 32
+"""int: Default maximum number of shards of a counter."""
+DEFAULT_FIELD = "count"
+"""str: Default name of the field holding the count in each shard."""
+SHARDS_COLLECTION = "shards"
+"""str: ID of the subcollection holding the shards of a counter."""
+
+# Writes failing with these errors make the counter spread its writes over
+# more shards. Only the errors of writes known not to have been applied are
+# retried (on another shard), as increments are not idempotent.
+_RETRYABLE_EXCEPTIONS = (exceptions.Aborted, exceptions.ResourceExhausted)
+_CONTENTION_EXCEPTIONS = _RETRYABLE_EXCEPTIONS + (exceptions.DeadlineExceeded,)
+_MAX_ATTEMPTS = 3
+# Number of writes in a row without contention before a shard is dropped.
+_SHRINK_AFTER = 1000
+_BAD_SHARDS = "'num_shards' must be between 1 and 'max_shards' ({:d})."
+
+
+class BaseShardedCounter(object):
+    """A counter whose increments are spread across shard documents.
+
+    A single document sustains about one write per second. A sharded
+    counter writes :class:`~google.cloud.firestore_v1.transforms.Increment`
+    transforms to one of several documents in the ``shards`` subcollection
+    of ``reference`` (picked at random, or by hashing a key), and reads its
+    total by summing the shards.
+
+    The number of shards written to adapts to contention: writes failing
+    with ``ABORTED``, ``RESOURCE_EXHAUSTED`` or ``DEADLINE_EXCEEDED`` double
+    the number of shards (up to ``max_shards``), and the first two are
+    retried on another shard. Long runs of uncontended writes drop shards one
+    at a time (down to the initial ``num_shards``). Totals are read from all
+    ``max_shards`` shard documents, so they include increments written
+    before the number of shards changed.
+
+    Args:
+        reference (:class:`~google.cloud.firestore_v1.base_document.BaseDocumentReference`):
+            The document representing the counter.
+        num_shards (Optional[int]): The initial (and minimum) number of
+            shards written to.
+        max_shards (Optional[int]): The maximum number of shards. Defaults
+            to :data:`DEFAULT_MAX_SHARDS`, or to ``num_shards`` if larger.
+        field (Optional[str]): The field holding the count in each shard.
+    """
+
+    def __init__(
+        self,
+        reference,
+        num_shards: int = DEFAULT_NUM_SHARDS,
+        max_shards: int = None,
+        field: str = DEFAULT_FIELD,
+    ) -> None:
+        if max_shards is None:
+            max_shards = max(num_shards, DEFAULT_MAX_SHARDS)
+        if not 0 < num_shards <= max_shards:
+            raise ValueError(_BAD_SHARDS.format(max_shards))
+
+        self._reference = reference
+        self._min_shards = num_shards
+        self._max_shards = max_shards
+        self._field = field
+        self._lock = threading.Lock()
+        self._num_shards = num_shards
+        self._uncontended = 0
+
+    @property
+    def reference(self):
+        """The document representing the counter."""
+        return self._reference
+
+    @property
+    def num_shards(self) -> int:
+        """int: The number of shards currently written to."""
+        return self._num_shards
+
+    def _shard(self, index: int):
+        """Get the reference of a shard document."""
+        return self._reference.collection(SHARDS_COLLECTION).document(str(index))
+
+    def _all_shards(self) -> list:
+        """Get the references of all the shards the counter may have."""
+        return [self._shard(index) for index in range(self._max_shards)]
+
+    def _choose_shard(self, key=None) -> int:
+        """Pick the shard to write an increment to.
+
+        Args:
+            key (Optional[Union[str, bytes]]): If passed, writes with the
+                same key go to the same shard (as long as the number of
+                shards does not change).
+
+        Returns:
+            int: The index of the shard.
+        """
+        num_shards = self._num_shards
+        if key is None:
+            return random.randrange(num_shards)
+        if isinstance(key, str):
+            key = key.encode("utf-8")
+        return zlib.crc32(key) % num_shards
+
+    def _shard_data(self, amount) -> dict:
+        return {self._field: transforms.Increment(amount)}
+
+    def _record_success(self) -> None:
+        """Drop a shard after a long run of uncontended writes."""
+        with self._lock:
+            self._uncontended += 1
+            if self._uncontended >= _SHRINK_AFTER:
+                self._uncontended = 0
+                self._num_shards = max(self._num_shards - 1, self._min_shards)
+
+    def _record_contention(self) -> None:
+        """Spread writes over twice as many shards."""
+        with self._lock:
+            self._uncontended = 0
+            self._num_shards = min(self._num_shards * 2, self._max_shards)
+
+    def _total(self, snapshots: Iterable) -> Any:
+        """Sum the counts held by shard snapshots (missing shards count 0)."""
+        total = 0
+        for snapshot in snapshots:
+            if snapshot.exists:
+                value = (snapshot.to_dict() or {}).get(self._field)
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    total += value
+        return total
+
+    def increment(self, amount=1, key=None) -> NoReturn:
+        raise NotImplementedError
+
+    def get(self, transaction=None) -> NoReturn:
+        raise NotImplementedError
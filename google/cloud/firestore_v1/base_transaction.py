@@ -14,15 +14,18 @@
 
 """Helpers for applying Google Cloud Firestore changes in a transaction."""
 
+from google.api_core import gapic_v1  # type: ignore
 from google.api_core import retry as retries  # type: ignore
 
+from google.cloud.firestore_v1 import _helpers
 from google.cloud.firestore_v1 import types
-from typing import Any, Coroutine, NoReturn, Optional, Union
+from typing import Any, Coroutine, Iterable, List, NoReturn, Optional, Tuple, Union
 
 _CANT_BEGIN: str
 _CANT_COMMIT: str
 _CANT_RETRY_READ_ONLY: str
 _CANT_ROLLBACK: str
+_READ_TIME_READ_WRITE: str
 _EXCEED_ATTEMPTS_TEMPLATE: str
 _INITIAL_SLEEP: float
 _MAX_SLEEP: float
@@ -46,6 +49,7 @@ _MULTIPLIER: float = 2.0
 """float: Multiplier for exponential backoff. To be used in :func:`_sleep`."""
 _EXCEED_ATTEMPTS_TEMPLATE: str = "Failed to commit transaction in {:d} attempts."
 _CANT_RETRY_READ_ONLY: str = "Only read-write transactions can be retried."
+_READ_TIME_READ_WRITE: str = "Only read-only transactions can be pinned to a read_time."
 
 
 class BaseTransaction(object):
@@ -58,12 +62,50 @@ class BaseTransaction(object):
         read_only (Optional[bool]): Flag indicating if the transaction
             should be read-only or should allow writes. Defaults to
             :data:`False`.
+        read_time (Optional[datetime.datetime]): If set, the (read-only)
+            transaction reads a consistent snapshot at this time instead of
+            beginning a server-side transaction. No ``BeginTransaction`` or
+            ``Commit`` RPCs are sent, and no locks are taken.
+        cache_reads (Optional[bool]): If :data:`True`, documents read with
+            :meth:`get` / :meth:`get_all` are cached for the rest of the
+            attempt, so that reading them again sends no RPC, and the
+            documents read are recorded in :attr:`read_set`. When the
+            transaction is retried by ``@transactional``, the documents read
+            by earlier attempts are read in a single ``BatchGetDocuments``
+            call as soon as the new attempt begins. Defaults to
+            :data:`False`.
+        deadline (Optional[:class:`~google.cloud.firestore_v1.deadline.Deadline`]):
+            If set, the latency budget of the whole transaction. The
+            ``BeginTransaction``, ``Commit`` and ``Rollback`` requests, the
+            reads made through the transaction (unless given their own
+            ``timeout``) and the backoff between ``Commit`` retries share
+            it, and no attempt is started once it has passed.
+
+    Raises:
+        ValueError: If ``read_time`` is set on a read-write transaction.
     """
 
-    def __init__(self, max_attempts=MAX_ATTEMPTS, read_only=False) -> None:
+    def __init__(
+        self,
+        max_attempts=MAX_ATTEMPTS,
+        read_only=False,
+        read_time=None,
+        cache_reads=False,
+        deadline=None,
+    ) -> None:
+        if read_time is not None and not read_only:
+            raise ValueError(_READ_TIME_READ_WRITE)
+
         self._max_attempts = max_attempts
         self._read_only = read_only
+        self._read_time = read_time
         self._id = None
+        self._cache_reads = cache_reads
+        self._deadline = deadline
+        # Snapshots read in the current attempt, keyed by document path.
+        self._read_cache = {}
+        # References read in this and earlier attempts, keyed by path.
+        self._read_set = {}
 
     def _add_write_pbs(self, write_pbs) -> NoReturn:
         raise NotImplementedError
@@ -115,6 +157,72 @@ class BaseTransaction(object):
         """
         return self._id is not None
 
+    @property
+    def read_time(self):
+        """Get the snapshot time pinned for reads, if any.
+
+        Returns:
+            Optional[datetime.datetime]: The ``read_time`` passed to the
+            constructor (or :data:`None` if reads use a server-side
+            transaction).
+        """
+        return self._read_time
+
+    def _read_options(self) -> dict:
+        """Consistency keyword arguments for reads made in this transaction.
+
+        Returns:
+            dict: ``read_time`` if the transaction is pinned to a snapshot,
+            else the transaction itself.
+        """
+        if self._read_time is not None:
+            return {"read_time": self._read_time}
+        return {"transaction": self}
+
+    @property
+    def read_set(self) -> Tuple[str, ...]:
+        """Get the paths of the documents read with ``cache_reads``.
+
+        Returns:
+            Tuple[str, ...]: The paths of the documents read by this attempt
+            and the earlier attempts of the same ``@transactional`` call, in
+            the order they were first read.
+        """
+        return tuple(reference.path for reference in self._read_set.values())
+
+    def _uncached_references(self, references: Iterable) -> Tuple[List[str], list]:
+        """Record reads, and find the documents which need to be read.
+
+        Args:
+            references (Iterable[:class:`~google.cloud.firestore_v1.base_document.BaseDocumentReference`]):
+                The documents being read.
+
+        Returns:
+            Tuple[List[str], list]: The paths of the documents, without
+            duplicates, and the references of those not in the cache.
+        """
+        paths = {}
+        missing = []
+        for reference in references:
+            path = reference._document_path
+            if path in paths:
+                continue
+            paths[path] = reference
+            self._read_set[path] = reference
+            if path not in self._read_cache:
+                missing.append(reference)
+        return list(paths), missing
+
+    def _cache_snapshots(self, snapshots: Iterable) -> None:
+        """Cache snapshots read in the current attempt."""
+        for snapshot in snapshots:
+            self._read_cache[snapshot.reference._document_path] = snapshot
+
+    def _cached_snapshots(self, paths: Iterable[str]) -> list:
+        """Get the cached snapshots of documents, in order."""
+        cache = self._read_cache
+        return [cache[path] for path in paths if path in cache]
+
     @property
     def id(self):
         """Get the current transaction ID.
@@ -125,6 +233,33 @@ class BaseTransaction(object):
         """
         return self._id
 
+    def _deadline_kwargs(self, retry: retries.Retry = gapic_v1.method.DEFAULT) -> dict:
+        """Get the retry / timeout arguments of a request of this transaction.
+
+        Args:
+            retry (google.api_core.retry.Retry): The retry policy, bounded
+                by the deadline if there is one.
+
+        Returns:
+            dict: The arguments, empty if the transaction has no deadline.
+        """
+        if self._deadline is None:
+            return {}
+        return _helpers.make_retry_timeout_kwargs(
+            retry, self._deadline, is_async=self._client._is_async
+        )
+
+    def _check_deadline(self) -> None:
+        """Give up on the transaction if its deadline has passed.
+
+        Raises:
+            ~google.api_core.exceptions.DeadlineExceeded: If the deadline
+                has passed.
+        """
+        if self._deadline is not None and self._deadline.expired:
+            self._clean_up()
+            self._deadline.check()
+
     def _clean_up(self) -> None:
         """Clean up the instance after :meth:`_rollback`` or :meth:`_commit``.
 
@@ -132,6 +267,7 @@ class BaseTransaction(object):
         """
         self._write_pbs = []
         self._id = None
+        self._read_cache = {}
 
     def _begin(self, retry_id=None) -> NoReturn:
         raise NotImplementedError
@@ -171,10 +307,17 @@ class _BaseTransactional(object):
         self.retry_id = None
         """Optional[bytes]: The ID of the first attempted transaction."""
 
-    def _reset(self) -> None:
-        """Unset the transaction IDs."""
+    def _reset(self, transaction=None) -> None:
+        """Unset the transaction IDs, and forget the reads of earlier calls.
+
+        Args:
+            transaction (Optional[:class:`~google.cloud.firestore_v1.base_transaction.BaseTransaction`]):
+                The transaction the wrapped callable runs in.
+        """
         self.current_id = None
         self.retry_id = None
+        if transaction is not None:
+            transaction._read_set = {}
 
     def _pre_commit(self, transaction, *args, **kwargs) -> NoReturn:
         raise NotImplementedError
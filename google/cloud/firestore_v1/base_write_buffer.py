@@ -0,0 +1,429 @@
+# Copyright 2020 Google LLC All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Helpers for coalescing repeated writes to the same documents."""
+
+from google.cloud.firestore_v1 import _helpers
+from google.cloud.firestore_v1 import transforms
+from google.cloud.firestore_v1.field_path import FieldPath
+from google.cloud.firestore_v1.types import write
+
+# Types needed only for Type Hints
+from google.cloud.firestore_v1.document import DocumentReference
+
+from typing import Any, Dict, List, NoReturn, Optional
+
+MAX_BATCH_SIZE = 500
+"""int: Maximum number of writes the backend accepts in a single ``Commit``."""
+DEFAULT_FLUSH_INTERVAL = 1.0
+"""float: Default number of seconds between background flushes."""
+_UPDATE = "update"
+_SET_MERGE = "set_merge"
+_CONFLICT = transforms.Sentinel("Values which cannot be folded together.")
+_BUFFER_CLOSED = "Cannot add writes to a closed write buffer."
+_BAD_BATCH_SIZE = "'max_batch_size' must be between 1 and {:d}.".format(MAX_BATCH_SIZE)
+
+
+class _PendingWrite(object):
+    """A ``Write`` to a single document waiting to be flushed.
+
+    Args:
+        document_path (str): The fully-qualified path of the document.
+        write_pb (google.cloud.firestore_v1.types.Write): The ``Write``
+            protobuf for the change, as built by the usual ``pbs_for_*``
+            helpers.
+        kind (Optional[str]): ``"update"`` or ``"set_merge"`` if later
+            changes may be folded into this one, else :data:`None`.
+        field_updates (Optional[Dict[FieldPath, Any]]): The changed fields,
+            keyed by field path. Required when ``kind`` is set.
+    """
+
+    def __init__(self, document_path, write_pb, kind=None, field_updates=None) -> None:
+        self.document_path = document_path
+        self.kind = kind
+        self.field_updates = field_updates
+        self.futures = []
+        self._write_pb = write_pb
+
+    def absorb(self, other: "_PendingWrite") -> bool:
+        """Fold the changes from ``other`` into this write, if possible.
+
+        The merged write keeps the precondition of the first change. Repeated
+        :class:`~google.cloud.firestore_v1.transforms.Increment` transforms on
+        a field are summed, and later plain values replace earlier ones.
+        Changes that touch a parent / child of an already changed field, that
+        stack other transforms, or that write maps holding transforms, are
+        not folded.
+
+        Args:
+            other (_PendingWrite): A later change to the same document.
+
+        Returns:
+            bool: Indicates if ``other`` was folded into this write.
+        """
+        if self.kind is None or other.kind is None:
+            return False
+
+        merged = dict(self.field_updates)
+        for field_path, value in other.field_updates.items():
+            if field_path in merged:
+                value = _fold_values(merged[field_path], value)
+                if value is _CONFLICT:
+                    return False
+            elif any(
+                field_path.eq_or_parent(existing) or existing.eq_or_parent(field_path)
+                for existing in merged
+            ):
+                return False
+
+            merged[field_path] = value
+
+        self.field_updates = merged
+        self._write_pb = None
+        return True
+
+    @property
+    def write_pb(self) -> write.Write:
+        """The ``Write`` protobuf for all changes folded into this entry.
+
+        Returns:
+            google.cloud.firestore_v1.types.Write: The (possibly rebuilt)
+            ``Write`` protobuf.
+        """
+        if self._write_pb is None:
+            self._write_pb = _pb_for_field_updates(
+                self.document_path, self.kind, self.field_updates
+            )
+
+        return self._write_pb
+
+
+def _fold_values(old, new) -> Any:
+    """Combine two successive values written to the same field.
+
+    Args:
+        old (Any): The value written first.
+        new (Any): The value written second.
+
+    Returns:
+        Any: The single value equivalent to writing ``old`` then ``new``, or
+        ``_CONFLICT`` if no such value can be computed client-side.
+    """
+    if _has_nested_transforms(old) or _has_nested_transforms(new):
+        return _CONFLICT
+
+    if isinstance(new, transforms.Increment):
+        if isinstance(old, transforms.Increment):
+            return transforms.Increment(old.value + new.value)
+        if isinstance(old, (int, float)) and not isinstance(old, bool):
+            return old + new.value
+        return _CONFLICT
+
+    if isinstance(new, (transforms._ValueList, transforms._NumericValue)):
+        return _CONFLICT
+
+    # Plain values, ``DELETE_FIELD`` and ``SERVER_TIMESTAMP`` all replace
+    # whatever was written before.
+    return new
+
+
+def _has_nested_transforms(value) -> bool:
+    """Tell if ``value`` is a map holding transforms or sentinels.
+
+    Such a map is written as a mask entry for the field plus transforms of
+    its sub-fields, which cannot be folded with another value of the field.
+
+    Args:
+        value (Any): A value written to a field.
+
+    Returns:
+        bool: Indicates if ``value`` is a map with a transform or sentinel
+        among its leaves.
+    """
+    if not isinstance(value, dict):
+        return False
+
+    return any(
+        isinstance(
+            leaf, (transforms.Sentinel, transforms._ValueList, transforms._NumericValue)
+        )
+        for _, leaf in _helpers.extract_fields(value, FieldPath())
+    )
+
+
+def _pb_for_field_updates(
+    document_path: str, kind: str, field_updates: Dict[FieldPath, Any]
+) -> write.Write:
+    """Build the ``Write`` protobuf for a set of folded field changes.
+
+    Args:
+        document_path (str): The fully-qualified path of the document.
+        kind (str): ``"update"`` (requires the document to exist) or
+            ``"set_merge"`` (creates it if needed).
+        field_updates (Dict[FieldPath, Any]): The changed fields.
+
+    Returns:
+        google.cloud.firestore_v1.types.Write: The ``Write`` protobuf.
+    """
+    api_updates = {
+        field_path.to_api_repr(): value for field_path, value in field_updates.items()
+    }
+
+    if kind == _UPDATE:
+        return _helpers.pbs_for_update(document_path, api_updates, None)[0]
+
+    extractor = _helpers.DocumentExtractorForUpdate(api_updates)
+    write_pb = extractor.get_update_pb(document_path)
+    if extractor.has_transforms:
+        field_transform_pbs = extractor.get_field_transform_pbs(document_path)
+        write_pb.update_transforms.extend(field_transform_pbs)
+
+    return write_pb
+
+
+def _field_updates_for_merge(document_data: dict) -> Optional[Dict[FieldPath, Any]]:
+    """Flatten the data for ``set(..., merge=True)`` to leaf field paths.
+
+    Args:
+        document_data (dict): The data passed to ``set()``.
+
+    Returns:
+        Optional[Dict[FieldPath, Any]]: The leaf values keyed by field path,
+        or :data:`None` if the document data is empty.
+    """
+    field_updates = {}
+    for field_path, value in _helpers.extract_fields(document_data, FieldPath()):
+        if not field_path.parts:
+            return None
+        if value is _helpers._EmptyDict:
+            value = {}
+        field_updates[field_path] = value
+
+    return field_updates
+
+
+class BaseWriteBuffer(object):
+    """Buffer writes and send them in periodic batch commits.
+
+    Successive ``set(..., merge=True)`` and ``update()`` calls on the same
+    document are folded into a single ``Write`` before the buffer is flushed.
+
+    .. note::
+
+       Writes flushed together are committed atomically, so a failing write
+       (e.g. an ``update()`` of a missing document) fails every other write
+       in the same commit. The data passed to the write methods must not be
+       modified until the write has completed.
+
+    Args:
+        client (:class:`~google.cloud.firestore_v1.client.Client`):
+            The client that created this buffer.
+        flush_interval (Optional[float]): Number of seconds between
+            background flushes. If :data:`None`, writes are only sent when
+            the buffer is full or explicitly flushed.
+        max_batch_size (Optional[int]): Number of pending writes which
+            triggers a flush; also the maximum size of each commit.
+    """
+
+    def __init__(
+        self,
+        client,
+        flush_interval=DEFAULT_FLUSH_INTERVAL,
+        max_batch_size=MAX_BATCH_SIZE,
+    ) -> None:
+        if not 0 < max_batch_size <= MAX_BATCH_SIZE:
+            raise ValueError(_BAD_BATCH_SIZE)
+
+        self._client = client
+        self._flush_interval = flush_interval
+        self._max_batch_size = max_batch_size
+        self._entries = []
+        self._open_entries = {}
+        self._closed = False
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _add(self, entry: _PendingWrite) -> NoReturn:
+        raise NotImplementedError
+
+    def _add_entry(self, entry: _PendingWrite) -> _PendingWrite:
+        """Queue a change, folding it into a pending write if possible.
+
+        Args:
+            entry (_PendingWrite): The new change.
+
+        Returns:
+            _PendingWrite: The queued write that now carries the change.
+
+        Raises:
+            ValueError: If the buffer has been closed.
+        """
+        if self._closed:
+            raise ValueError(_BUFFER_CLOSED)
+
+        document_path = entry.document_path
+        current = self._open_entries.get(document_path)
+        if current is not None and current.absorb(entry):
+            return current
+
+        self._entries.append(entry)
+        if entry.kind is None:
+            self._open_entries.pop(document_path, None)
+        else:
+            self._open_entries[document_path] = entry
+
+        return entry
+
+    def _take_entries(self) -> List[_PendingWrite]:
+        """Remove and return all pending writes, oldest first."""
+        entries, self._entries = self._entries, []
+        self._open_entries = {}
+        return entries
+
+    @staticmethod
+    def _resolve(entries: List[_PendingWrite], write_results: list) -> None:
+        """Complete the futures of committed writes with their results."""
+        for entry, write_result in zip(entries, write_results):
+            for future in entry.futures:
+                if not future.done():
+                    future.set_result(write_result)
+
+    @staticmethod
+    def _fail(entries: List[_PendingWrite], exc: Exception) -> None:
+        """Complete the futures of writes whose commit failed."""
+        for entry in entries:
+            for future in entry.futures:
+                if not future.done():
+                    future.set_exception(exc)
+
+    def create(self, reference: DocumentReference, document_data: dict) -> Any:
+        """Queue a change to create a document.
+
+        Args:
+            reference (:class:`~google.cloud.firestore_v1.document.DocumentReference`):
+                A document reference to be created.
+            document_data (dict): Property names and values to use for
+                creating a document.
+
+        Returns:
+            A future resolved with the
+            :class:`google.cloud.firestore_v1.types.WriteResult` once the
+            write has been committed.
+        """
+        document_path = reference._document_path
+        write_pb = _helpers.pbs_for_create(document_path, document_data)[0]
+        return self._add(_PendingWrite(document_path, write_pb))
+
+    def set(
+        self, reference: DocumentReference, document_data: dict, merge=False,
+    ) -> Any:
+        """Queue a change to replace or merge into a document.
+
+        Only changes made with ``merge=True`` are folded together.
+
+        Args:
+            reference (:class:`~google.cloud.firestore_v1.document.DocumentReference`):
+                A document reference that will have values set.
+            document_data (dict):
+                Property names and values to use for replacing a document.
+            merge (Optional[bool] or Optional[List<apispec>]):
+                If True, apply merging instead of overwriting the state
+                of the document.
+
+        Returns:
+            A future resolved with the
+            :class:`google.cloud.firestore_v1.types.WriteResult` once the
+            write has been committed.
+        """
+        document_path = reference._document_path
+        if merge is not False:
+            write_pb = _helpers.pbs_for_set_with_merge(
+                document_path, document_data, merge
+            )[0]
+        else:
+            write_pb = _helpers.pbs_for_set_no_merge(document_path, document_data)[0]
+
+        field_updates = None
+        if merge is True:
+            field_updates = _field_updates_for_merge(document_data)
+
+        if field_updates is None:
+            entry = _PendingWrite(document_path, write_pb)
+        else:
+            entry = _PendingWrite(document_path, write_pb, _SET_MERGE, field_updates)
+
+        return self._add(entry)
+
+    def update(
+        self,
+        reference: DocumentReference,
+        field_updates: dict,
+        option: _helpers.WriteOption = None,
+    ) -> Any:
+        """Queue a change to update a document.
+
+        Only changes made without an ``option`` are folded together.
+
+        Args:
+            reference (:class:`~google.cloud.firestore_v1.document.DocumentReference`):
+                A document reference that will be updated.
+            field_updates (dict):
+                Field names or paths to update and values to update with.
+            option (Optional[:class:`~google.cloud.firestore_v1.client.WriteOption`]):
+                A write option to make assertions / preconditions on the server
+                state of the document before applying changes.
+
+        Returns:
+            A future resolved with the
+            :class:`google.cloud.firestore_v1.types.WriteResult` once the
+            write has been committed.
+        """
+        if option.__class__.__name__ == "ExistsOption":
+            raise ValueError("you must not pass an explicit write option to " "update.")
+
+        document_path = reference._document_path
+        write_pb = _helpers.pbs_for_update(document_path, field_updates, option)[0]
+
+        if option is None:
+            normalized = {
+                FieldPath.from_string(key): value
+                for key, value in field_updates.items()
+            }
+            entry = _PendingWrite(document_path, write_pb, _UPDATE, normalized)
+        else:
+            entry = _PendingWrite(document_path, write_pb)
+
+        return self._add(entry)
+
+    def delete(
+        self, reference: DocumentReference, option: _helpers.WriteOption = None
+    ) -> Any:
+        """Queue a change to delete a document.
+
+        Args:
+            reference (:class:`~google.cloud.firestore_v1.document.DocumentReference`):
+                A document reference that will be deleted.
+            option (Optional[:class:`~google.cloud.firestore_v1.client.WriteOption`]):
+                A write option to make assertions / preconditions on the server
+                state of the document before applying changes.
+
+        Returns:
+            A future resolved with the
+            :class:`google.cloud.firestore_v1.types.WriteResult` once the
+            write has been committed.
+        """
+        document_path = reference._document_path
+        write_pb = _helpers.pb_for_delete(document_path, option)
+        return self._add(_PendingWrite(document_path, write_pb))
@@ -0,0 +1,294 @@
+# Copyright 2020 Google LLC All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Encode many documents sharing the same fields into ``Write`` protobufs.
+
+``set()`` and ``create()`` split each document into data and transforms,
+check its field paths and encode its values one at a time. When writing
+many documents with the same schema, a :class:`BulkEncoder` does that work
+once: field paths are parsed and checked when the encoder is created, the
+update mask, transforms and precondition shared by all the writes are
+built into a template, and the values are encoded column by column.
+
+.. code-block:: python
+
+    encoder = BulkEncoder(
+        ["name", "address.city", "score"],
+        transforms={"updated": firestore.SERVER_TIMESTAMP},
+    )
+    batch = client.batch()
+    batch.set_columns(references, columns, encoder)
+    batch.commit()
+
+``columns`` maps each field path to a sequence of values, one per
+document: a ``dict`` of lists, a ``dict`` of NumPy arrays or a pandas
+``DataFrame`` all work. ``datetime64`` columns are written as timestamps,
+with ``NaT`` written as null.
+"""
+
+import datetime
+
+from google.api_core.datetime_helpers import DatetimeWithNanoseconds  # type: ignore
+
+from google.cloud.firestore_v1 import _helpers
+from google.cloud.firestore_v1 import transforms as _transforms
+from google.cloud.firestore_v1.field_path import FieldPath
+from google.cloud.firestore_v1.field_path import parse_field_path
+from google.cloud.firestore_v1.types import common
+from google.cloud.firestore_v1.types import document
+from google.cloud.firestore_v1.types import write
+from typing import Any, Iterable, List, Sequence
+
+
+_NO_FIELD_PATHS = "A bulk encoder needs at least one field path."
+_OVERLAPPING_PATHS = "Field paths overlap: {}, {}"
+_CREATE_WITH_MERGE = "A bulk encoder cannot both create and merge documents."
+_BAD_TRANSFORM = "Not a transform for field {}: {!r}"
+_MISSING_COLUMN = "No column for field {}."
+_BAD_LENGTH = "Column {} has {:d} values, expected {:d}."
+_SENTINEL_IN_COLUMN = (
+    "Column {} holds {!r}: pass transforms shared by all documents with "
+    "'transforms' instead."
+)
+
+# Field of ``Value`` set directly for each scalar type. The lookup is on the
+# exact type, so ``bool`` values are never encoded as integers.
+_SCALAR_FIELDS = {
+    bool: "boolean_value",
+    int: "integer_value",
+    float: "double_value",
+    str: "string_value",
+    bytes: "bytes_value",
+}
+_NOT_VALUES = (_transforms.Sentinel, _transforms._ValueList, _transforms._NumericValue)
+_NANOS_PER_SECOND = 10 ** 9
+# ``NaT`` ("not a time") as a ``datetime64[ns]`` integer.
+_NOT_A_TIME = -(2 ** 63)
+_EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+def _datetimes_to_list(values) -> list:
+    """Convert a ``datetime64`` column to a list of timestamps.
+
+    ``tolist()`` turns ``datetime64[ns]`` values into plain integers, so
+    the values are read as nanoseconds since the epoch instead. ``NaT``
+    becomes :data:`None`.
+    """
+    to_numpy = getattr(values, "to_numpy", None)
+    if to_numpy is not None:
+        # A pandas series: time zone aware ones hold ``Timestamp`` objects.
+        values = to_numpy()
+        if values.dtype.kind != "M":
+            return values.tolist()
+
+    timestamps = []
+    for nanos in values.astype("datetime64[ns]").astype("int64").tolist():
+        if nanos == _NOT_A_TIME:
+            timestamps.append(None)
+            continue
+        seconds, nanos = divmod(nanos, _NANOS_PER_SECOND)
+        moment = _EPOCH + datetime.timedelta(seconds=seconds)
+        timestamps.append(
+            DatetimeWithNanoseconds(
+                moment.year,
+                moment.month,
+                moment.day,
+                moment.hour,
+                moment.minute,
+                moment.second,
+                nanosecond=nanos,
+                tzinfo=datetime.timezone.utc,
+            )
+        )
+    return timestamps
+
+
+def _to_list(values) -> list:
+    """Convert a column to a list of native Python values.
+
+    NumPy arrays and pandas series hold NumPy scalars, which ``tolist()``
+    converts to ``int`` / ``float`` / ``bool`` in a single C loop.
+    ``datetime64`` columns are converted to timestamps.
+    """
+    if getattr(getattr(values, "dtype", None), "kind", None) == "M":
+        return _datetimes_to_list(values)
+
+    to_list = getattr(values, "tolist", None)
+    if to_list is not None:
+        return to_list()
+    return list(values)
+
+
+def _set_value(value_pb, value, name) -> None:
+    """Encode ``value`` into the raw ``Value`` protobuf ``value_pb``."""
+    field = _SCALAR_FIELDS.get(type(value))
+    if field is not None:
+        setattr(value_pb, field, value)
+    elif value is None:
+        value_pb.null_value = 0
+    elif isinstance(value, _NOT_VALUES):
+        raise ValueError(_SENTINEL_IN_COLUMN.format(name, value))
+    else:
+        value_pb.CopyFrom(_helpers.encode_value(value)._pb)
+
+
+class BulkEncoder(object):
+    """Encode documents with the same field paths into ``Write`` protobufs.
+
+    Args:
+        field_paths (List[Union[str, ~google.cloud.firestore_v1.field_path.FieldPath]]):
+            The field paths set in each document, e.g. ``"address.city"``.
+        merge (Optional[bool]): If :data:`True`, only the fields in
+            ``field_paths`` (and ``transforms``) are replaced in existing
+            documents, as with ``set(..., merge=field_paths)``.
+        create (Optional[bool]): If :data:`True`, the writes fail if a
+            document already exists, as with ``create()``.
+        transforms (Optional[dict]): Transforms applied to every document,
+            keyed by field path, e.g. ``{"updated": SERVER_TIMESTAMP}``.
+
+    Raises:
+        ValueError: If there are no field paths, if field paths overlap,
+            if both ``merge`` and ``create`` are passed, or if a value of
+            ``transforms`` is not a transform.
+    """
+
+    def __init__(
+        self, field_paths: Iterable, merge=False, create=False, transforms=None
+    ) -> None:
+        if merge and create:
+            raise ValueError(_CREATE_WITH_MERGE)
+
+        self._names = list(field_paths)
+        if not self._names:
+            raise ValueError(_NO_FIELD_PATHS)
+        self._field_paths = [self._parse(name) for name in self._names]
+
+        transform_data = {}
+        for name, value in (transforms or {}).items():
+            if value is _transforms.DELETE_FIELD or not isinstance(value, _NOT_VALUES):
+                raise ValueError(_BAD_TRANSFORM.format(name, value))
+            _helpers.set_field_value(transform_data, self._parse(name), value)
+        extractor = _helpers.DocumentExtractor(transform_data)
+
+        paths = sorted(self._field_paths + extractor.transform_paths)
+        for lhs, rhs in zip(paths, paths[1:]):
+            if lhs.eq_or_parent(rhs):
+                raise ValueError(_OVERLAPPING_PATHS.format(lhs, rhs))
+
+        update_mask = None
+        if merge:
+            update_mask = common.DocumentMask(
+                field_paths=[path.to_api_repr() for path in sorted(self._field_paths)]
+            )
+        current_document = None
+        if create:
+            current_document = common.Precondition(exists=False)
+
+        self._template = write.Write(
+            update=document.Document(),
+            update_mask=update_mask,
+            update_transforms=extractor.get_field_transform_pbs(None),
+            current_document=current_document,
+        )._pb
+
+    @staticmethod
+    def _parse(name) -> FieldPath:
+        if isinstance(name, FieldPath):
+            return name
+        return FieldPath(*parse_field_path(name))
+
+    @property
+    def field_paths(self) -> List[FieldPath]:
+        """List[~google.cloud.firestore_v1.field_path.FieldPath]: The field
+        paths set in each document."""
+        return list(self._field_paths)
+
+    def encode(self, references: Sequence, columns) -> List[write.Write]:
+        """Encode one ``Write`` per document.
+
+        Args:
+            references (Sequence[:class:`~google.cloud.firestore_v1.base_document.BaseDocumentReference`]):
+                The documents to write.
+            columns (Mapping[str, Sequence]): The values of each field, one
+                per document, keyed by the field paths passed to the
+                encoder (e.g. a ``dict`` of lists or NumPy arrays, or a
+                pandas ``DataFrame``).
+
+        Returns:
+            List[google.cloud.firestore_v1.types.Write]: The writes, in the
+            order of ``references``.
+
+        Raises:
+            ValueError: If a column is missing, does not have one value per
+                document, or holds a transform.
+            TypeError: If a value cannot be encoded.
+        """
+        template = self._template
+        write_pbs = []
+        fields = []
+        for reference in references:
+            write_pb = type(template)()
+            write_pb.CopyFrom(template)
+            write_pb.update.name = reference._document_path
+            write_pbs.append(write_pb)
+            fields.append(write_pb.update.fields)
+
+        for name, field_path in zip(self._names, self._field_paths):
+            try:
+                column = columns[name]
+            except KeyError:
+                raise ValueError(_MISSING_COLUMN.format(name))
+            values = _to_list(column)
+            if len(values) != len(fields):
+                raise ValueError(_BAD_LENGTH.format(name, len(values), len(fields)))
+            self._encode_column(name, field_path, values, fields)
+
+        return [write.Write.wrap(write_pb) for write_pb in write_pbs]
+
+    @staticmethod
+    def _encode_column(name, field_path, values: list, fields: list) -> None:
+        """Encode the values of one field into the documents' fields."""
+        *parents, key = field_path.parts
+
+        value_types = set(map(type, values))
+        scalar_field = None
+        if len(value_types) == 1:
+            scalar_field = _SCALAR_FIELDS.get(value_types.pop())
+
+        for fields_pb, value in zip(fields, values):
+            for parent in parents:
+                fields_pb = fields_pb[parent].map_value.fields
+            if scalar_field is not None:
+                # Homogeneous column: no per-value type dispatch.
+                setattr(fields_pb[key], scalar_field, value)
+            else:
+                _set_value(fields_pb[key], value, name)
+
+
+def encode_columns(references: Sequence, columns, **kwargs: Any) -> List[write.Write]:
+    """Encode one ``Write`` per document from column-oriented values.
+
+    Args:
+        references (Sequence[:class:`~google.cloud.firestore_v1.base_document.BaseDocumentReference`]):
+            The documents to write.
+        columns (Mapping[str, Sequence]): The values of each field, one per
+            document; every key is used as a field path.
+        kwargs (Dict[str, Any]): Passed to :class:`BulkEncoder`.
+
+    Returns:
+        List[google.cloud.firestore_v1.types.Write]: The writes, in the
+        order of ``references``.
+    """
+    encoder = BulkEncoder(list(columns.keys()), **kwargs)
+    return encoder.encode(references, columns)
@@ -0,0 +1,567 @@
+# Copyright 2020 Google LLC All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Bundles of pre-serialized documents and query results.
+
+A bundle captures the results of queries and document reads, along with
+their read times, in a single file which can be cached (e.g. by a CDN) and
+served to many readers without re-running the queries:
+
+.. code-block:: python
+
+    with BundleWriter("cities.bundle", "cities") as writer:
+        writer.add_named_query("big-cities", big_cities_query)
+        writer.add_document(client.document("cities", "SF").get())
+
+    with BundleReader(client, "cities.bundle") as reader:
+        for snapshot in reader.query("big-cities"):
+            ...
+
+The file is a sequence of ``BundleElement`` protobufs, each preceded by
+its length as a 4-byte big-endian integer. The first element holds the
+bundle's metadata; every document is preceded by a metadata element naming
+the queries it belongs to. Documents are written as they are streamed, and
+the reader memory-maps the file and only decodes the documents it returns.
+"""
+
+import datetime
+import mmap
+import shutil
+import struct
+import tempfile
+
+import proto  # type: ignore
+
+from google.cloud.firestore_v1 import _helpers
+from google.cloud.firestore_v1.base_document import DocumentSnapshot
+from google.cloud.firestore_v1.types import document as document_pb
+from google.cloud.firestore_v1.types import query as query_pb
+from google.protobuf import timestamp_pb2 as timestamp  # type: ignore
+from typing import Any, Dict, Generator, List, Optional
+
+
+__protobuf__ = proto.module(
+    package="google.firestore.bundle",
+    manifest={
+        "BundledQuery",
+        "NamedQuery",
+        "BundledDocumentMetadata",
+        "BundleMetadata",
+        "BundleElement",
+    },
+)
+
+BUNDLE_VERSION = 1
+"""int: The version of the bundle format written by :class:`BundleWriter`."""
+
+_ELEMENT_LENGTH = struct.Struct(">I")
+# The first byte of a serialized ``BundleElement`` is the tag of the (only)
+# field set on it, which identifies the element's type.
+_METADATA_TAG = 0x0A
+_NAMED_QUERY_TAG = 0x12
+_DOCUMENT_METADATA_TAG = 0x1A
+_DOCUMENT_TAG = 0x22
+_BAD_BUNDLE = "Bundle is truncated or corrupt."
+_DUPLICATE_QUERY = "A query named {!r} is already in the bundle."
+_UNKNOWN_QUERY = "No query named {!r} in the bundle."
+_WRITER_CLOSED = "Cannot add to a bundle writer which has been closed."
+
+
+class BundledQuery(proto.Message):
+    r"""A query to be re-executed against the documents of a bundle.
+
+    Attributes:
+        parent (str):
+            The parent resource name.
+        structured_query (~.query.StructuredQuery):
+            The query.
+        limit_type (~.BundledQuery.LimitType):
+            Whether the query's limit applies to the first or last results.
+    """
+
+    class LimitType(proto.Enum):
+        r"""How the limit of the query is applied."""
+        FIRST = 0
+        LAST = 1
+
+    parent = proto.Field(proto.STRING, number=1)
+
+    structured_query = proto.Field(
+        proto.MESSAGE, number=2, oneof="query_type", message=query_pb.StructuredQuery,
+    )
+
+    limit_type = proto.Field(proto.ENUM, number=3, enum=LimitType)
+
+
+class NamedQuery(proto.Message):
+    r"""A query saved in a bundle under a name.
+
+    Attributes:
+        name (str):
+            The name of the query.
+        bundled_query (~.BundledQuery):
+            The query.
+        read_time (~.timestamp.Timestamp):
+            The time at which the results of the query were read.
+    """
+
+    name = proto.Field(proto.STRING, number=1)
+
+    bundled_query = proto.Field(proto.MESSAGE, number=2, message=BundledQuery)
+
+    read_time = proto.Field(proto.MESSAGE, number=3, message=timestamp.Timestamp)
+
+
+class BundledDocumentMetadata(proto.Message):
+    r"""Metadata describing the document which follows it in a bundle.
+
+    Attributes:
+        name (str):
+            The resource name of the document.
+        read_time (~.timestamp.Timestamp):
+            The time at which the document was read.
+        exists (bool):
+            Whether the document exists. Missing documents are not followed
+            by a document element.
+        queries (Sequence[str]):
+            The names of the queries returning this document.
+    """
+
+    name = proto.Field(proto.STRING, number=1)
+
+    read_time = proto.Field(proto.MESSAGE, number=2, message=timestamp.Timestamp)
+
+    exists = proto.Field(proto.BOOL, number=3)
+
+    queries = proto.RepeatedField(proto.STRING, number=4)
+
+
+class BundleMetadata(proto.Message):
+    r"""Metadata describing a bundle; always its first element.
+
+    Attributes:
+        id (str):
+            The ID of the bundle.
+        create_time (~.timestamp.Timestamp):
+            The latest read time of the bundle's contents.
+        version (int):
+            The version of the bundle format.
+        total_documents (int):
+            The number of documents in the bundle.
+        total_bytes (int):
+            The size of the bundle in bytes, excluding this metadata.
+    """
+
+    id = proto.Field(proto.STRING, number=1)
+
+    create_time = proto.Field(proto.MESSAGE, number=2, message=timestamp.Timestamp)
+
+    version = proto.Field(proto.UINT32, number=3)
+
+    total_documents = proto.Field(proto.UINT32, number=4)
+
+    total_bytes = proto.Field(proto.UINT64, number=5)
+
+
+class BundleElement(proto.Message):
+    r"""One element of a bundle.
+
+    Attributes:
+        metadata (~.BundleMetadata):
+            The bundle's metadata.
+        named_query (~.NamedQuery):
+            A query saved in the bundle.
+        document_metadata (~.BundledDocumentMetadata):
+            Metadata about the document which follows.
+        document (~.document.Document):
+            A document.
+    """
+
+    metadata = proto.Field(
+        proto.MESSAGE, number=1, oneof="element_type", message=BundleMetadata,
+    )
+
+    named_query = proto.Field(
+        proto.MESSAGE, number=2, oneof="element_type", message=NamedQuery,
+    )
+
+    document_metadata = proto.Field(
+        proto.MESSAGE, number=3, oneof="element_type", message=BundledDocumentMetadata,
+    )
+
+    document = proto.Field(
+        proto.MESSAGE, number=4, oneof="element_type", message=document_pb.Document,
+    )
+
+
+def _frame(element: BundleElement) -> bytes:
+    serialized = BundleElement.serialize(element)
+    return _ELEMENT_LENGTH.pack(len(serialized)) + serialized
+
+
+class BundleWriter(object):
+    """Write documents and query results to a bundle file.
+
+    Elements are spooled to a temporary file as they are added, so
+    building a bundle does not hold its documents in memory. The bundle
+    is written to ``destination`` when the writer is closed.
+
+    Args:
+        destination (Union[str, BinaryIO]): The path of the bundle file,
+            or a binary file object to write the bundle to.
+        bundle_id (str): The ID of the bundle.
+    """
+
+    def __init__(self, destination, bundle_id: str) -> None:
+        self._destination = destination
+        self._bundle_id = bundle_id
+        self._body = tempfile.TemporaryFile()
+        self._document_names = set()
+        self._query_names = set()
+        self._latest_read_time = None
+        self._closed = False
+
+    def _write(self, **element) -> None:
+        if self._closed:
+            raise ValueError(_WRITER_CLOSED)
+        self._body.write(_frame(BundleElement(**element)))
+
+    def _track_read_time(self, read_time) -> None:
+        if read_time is not None and (
+            self._latest_read_time is None or read_time > self._latest_read_time
+        ):
+            self._latest_read_time = read_time
+
+    def add_document(self, snapshot: DocumentSnapshot, query_name: str = None) -> None:
+        """Add a document snapshot to the bundle.
+
+        Each document is only stored once: if the bundle already holds it,
+        only the (new) query it belongs to is recorded.
+
+        Args:
+            snapshot (:class:`~google.cloud.firestore_v1.base_document.DocumentSnapshot`):
+                The snapshot, e.g. from
+                :meth:`~google.cloud.firestore_v1.document.DocumentReference.get`.
+                Snapshots of missing documents are recorded as such.
+            query_name (Optional[str]): The named query returning this
+                document, if any.
+        """
+        name = snapshot.reference._document_path
+        self._write(
+            document_metadata=BundledDocumentMetadata(
+                name=name,
+                read_time=snapshot.read_time,
+                exists=snapshot.exists,
+                queries=[query_name] if query_name is not None else [],
+            )
+        )
+        if snapshot.exists and name not in self._document_names:
+            self._write(document=_helpers.document_pb_from_snapshot(snapshot))
+            self._document_names.add(name)
+        self._track_read_time(snapshot.read_time)
+
+    def add_named_query(
+        self, name: str, query, snapshots=None, read_time=None, **kwargs
+    ) -> None:
+        """Add a query and its results to the bundle.
+
+        Args:
+            name (str): The name the query is saved under.
+            query (:class:`~google.cloud.firestore_v1.base_query.BaseQuery`):
+                The query.
+            snapshots (Optional[Iterable[DocumentSnapshot]]): The results
+                of the query, in query order. If not passed, the query is
+                run (it must then be a synchronous
+                :class:`~google.cloud.firestore_v1.query.Query`).
+            read_time (Optional[datetime.datetime]): If passed and the query
+                is run, reads its results as of this time.
+            kwargs (Dict[str, Any]): Passed along to
+                :meth:`~google.cloud.firestore_v1.query.Query.stream` (or
+                ``get`` for ``limit_to_last`` queries) when the query is run.
+
+        Raises:
+            ValueError: If the bundle already holds a query named ``name``.
+        """
+        if name in self._query_names:
+            raise ValueError(_DUPLICATE_QUERY.format(name))
+
+        if snapshots is None:
+            if read_time is not None:
+                kwargs["read_time"] = read_time
+            if query._limit_to_last:
+                snapshots = query.get(**kwargs)
+            else:
+                snapshots = query.stream(**kwargs)
+
+        latest = read_time
+        for snapshot in snapshots:
+            self.add_document(snapshot, query_name=name)
+            if snapshot.read_time is not None and (
+                latest is None or snapshot.read_time > latest
+            ):
+                latest = snapshot.read_time
+        if latest is None:
+            latest = datetime.datetime.now(datetime.timezone.utc)
+
+        parent_path, _ = query._parent._parent_info()
+        limit_type = BundledQuery.LimitType.FIRST
+        if query._limit_to_last:
+            limit_type = BundledQuery.LimitType.LAST
+        self._write(
+            named_query=NamedQuery(
+                name=name,
+                bundled_query=BundledQuery(
+                    parent=parent_path,
+                    structured_query=query._to_protobuf(),
+                    limit_type=limit_type,
+                ),
+                read_time=latest,
+            )
+        )
+        self._query_names.add(name)
+        self._track_read_time(latest)
+
+    def close(self) -> None:
+        """Write the bundle to its destination.
+
+        This method is idempotent.
+        """
+        if self._closed:
+            return
+        self._closed = True
+
+        total_bytes = self._body.tell()
+        metadata = BundleMetadata(
+            id=self._bundle_id,
+            create_time=self._latest_read_time,
+            version=BUNDLE_VERSION,
+            total_documents=len(self._document_names),
+            total_bytes=total_bytes,
+        )
+
+        self._body.seek(0)
+        if isinstance(self._destination, str):
+            with open(self._destination, "wb") as destination:
+                self._copy_to(destination, metadata)
+        else:
+            self._copy_to(self._destination, metadata)
+        self._body.close()
+
+    def _copy_to(self, destination, metadata: BundleMetadata) -> None:
+        destination.write(_frame(BundleElement(metadata=metadata)))
+        shutil.copyfileobj(self._body, destination)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self._closed = True
+            self._body.close()
+
+
+class _DocumentEntry(object):
+    """Where to find a bundled document, and how it was read."""
+
+    __slots__ = ("offset", "length", "exists", "read_time")
+
+    def __init__(self, exists, read_time):
+        self.offset = None
+        self.length = None
+        self.exists = exists
+        self.read_time = read_time
+
+
+class BundleReader(object):
+    """Read the documents and query results stored in a bundle file.
+
+    The file is memory-mapped and indexed when opened; documents are only
+    decoded when they are returned, so large bundles can be served
+    without loading them in memory.
+
+    Args:
+        client (:class:`~google.cloud.firestore_v1.client.Client`):
+            The client used to build references for bundled documents.
+        path (str): The path of the bundle file.
+
+    Raises:
+        ValueError: If the file is not a valid bundle.
+    """
+
+    def __init__(self, client, path: str) -> None:
+        self._client = client
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # Empty files cannot be mapped.
+            self._file.close()
+            raise ValueError(_BAD_BUNDLE)
+
+        self._documents: Dict[str, _DocumentEntry] = {}
+        self._query_results: Dict[str, List[str]] = {}
+        self._named_queries: Dict[str, NamedQuery] = {}
+        self.metadata: Optional[BundleMetadata] = None
+        try:
+            self._index()
+        except Exception:
+            self.close()
+            raise
+
+    def _elements(self) -> Generator[Any, None, None]:
+        """Yield the offset, length and tag of each element of the bundle."""
+        data = self._map
+        offset = 0
+        while offset < len(data):
+            if offset + _ELEMENT_LENGTH.size > len(data):
+                raise ValueError(_BAD_BUNDLE)
+            (length,) = _ELEMENT_LENGTH.unpack_from(data, offset)
+            offset += _ELEMENT_LENGTH.size
+            if length == 0 or offset + length > len(data):
+                raise ValueError(_BAD_BUNDLE)
+            yield offset, length, data[offset]
+            offset += length
+
+    def _element(self, offset: int, length: int) -> BundleElement:
+        return BundleElement.deserialize(self._map[offset : offset + length])
+
+    def _index(self) -> None:
+        # The entry of the existing document whose body comes next.
+        pending = None
+        for offset, length, tag in self._elements():
+            if tag == _DOCUMENT_TAG:
+                if pending is None:
+                    raise ValueError(_BAD_BUNDLE)
+                # Only index the document: it is decoded on demand.
+                pending.offset, pending.length = offset, length
+                pending = None
+                continue
+
+            if pending is not None:
+                raise ValueError(_BAD_BUNDLE)
+            if self.metadata is None:
+                if tag != _METADATA_TAG:
+                    raise ValueError(_BAD_BUNDLE)
+                self.metadata = self._element(offset, length).metadata
+            elif tag == _DOCUMENT_METADATA_TAG:
+                metadata = self._element(offset, length).document_metadata
+                name = metadata.name
+                entry = self._documents.get(name)
+                # The writer stores the body of a document the first time it
+                # is seen existing, which may follow a missing snapshot.
+                if entry is None or (metadata.exists and not entry.exists):
+                    entry = _DocumentEntry(metadata.exists, metadata.read_time)
+                    self._documents[name] = entry
+                    if metadata.exists:
+                        pending = entry
+                for query_name in metadata.queries:
+                    self._query_results.setdefault(query_name, []).append(name)
+            elif tag == _NAMED_QUERY_TAG:
+                named_query = self._element(offset, length).named_query
+                self._named_queries[named_query.name] = named_query
+            else:
+                raise ValueError(_BAD_BUNDLE)
+
+        if self.metadata is None or pending is not None:
+            raise ValueError(_BAD_BUNDLE)
+
+    @property
+    def named_queries(self) -> Dict[str, NamedQuery]:
+        """Dict[str, NamedQuery]: The queries in the bundle, by name."""
+        return dict(self._named_queries)
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def _snapshot(self, name: str) -> DocumentSnapshot:
+        entry = self._documents[name]
+        prefix = self._client._database_string + "/documents/"
+        reference = self._client.document(name[len(prefix) :])
+        if not entry.exists:
+            return DocumentSnapshot(
+                reference,
+                None,
+                exists=False,
+                read_time=entry.read_time,
+                create_time=None,
+                update_time=None,
+            )
+
+        document = self._element(entry.offset, entry.length).document
+        return DocumentSnapshot(
+            reference,
+            _helpers.decode_dict(document.fields, self._client),
+            exists=True,
+            read_time=entry.read_time,
+            create_time=document.create_time,
+            update_time=document.update_time,
+        )
+
+    def get(self, reference) -> Optional[DocumentSnapshot]:
+        """Read a document from the bundle.
+
+        Args:
+            reference (:class:`~google.cloud.firestore_v1.document.DocumentReference`):
+                The document to read.
+
+        Returns:
+            Optional[DocumentSnapshot]: The bundled snapshot (which may be
+            of a missing document), or :data:`None` if the bundle holds no
+            snapshot of the document.
+        """
+        name = reference._document_path
+        if name not in self._documents:
+            return None
+        return self._snapshot(name)
+
+    def documents(self) -> Generator[DocumentSnapshot, Any, None]:
+        """Iterate over the bundled documents.
+
+        Yields:
+            :class:`~google.cloud.firestore_v1.base_document.DocumentSnapshot`:
+            A snapshot of each bundled document, in bundle order.
+        """
+        for name in list(self._documents):
+            yield self._snapshot(name)
+
+    def query(self, name: str) -> Generator[DocumentSnapshot, Any, None]:
+        """Iterate over the results of a named query.
+
+        Args:
+            name (str): The name of the query.
+
+        Yields:
+            :class:`~google.cloud.firestore_v1.base_document.DocumentSnapshot`:
+            The query's results, in query order.
+
+        Raises:
+            KeyError: If the bundle holds no query named ``name``.
+        """
+        if name not in self._named_queries:
+            raise KeyError(_UNKNOWN_QUERY.format(name))
+        for document_name in self._query_results.get(name, ()):
+            yield self._snapshot(document_name)
+
+    def close(self) -> None:
+        """Release the memory-mapped bundle file."""
+        if not self._map.closed:
+            self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -24,19 +24,32 @@ In the hierarchy of API concepts
   :class:`~google.cloud.firestore_v1.document.DocumentReference`
 """
 
+import collections
+import concurrent.futures
+import functools
+import itertools
+
 from google.api_core import gapic_v1  # type: ignore
 from google.api_core import retry as retries  # type: ignore
 
 from google.cloud.firestore_v1.base_client import (
     BaseClient,
     DEFAULT_DATABASE,
+    DEFAULT_WALK_CONCURRENCY,
     _CLIENT_INFO,
     _parse_batch_get,
     _path_helper,
+    _raw_stub,
+    _walk_children,
+    _walk_entry,
 )
 
+from google.cloud.firestore_v1 import _helpers
 from google.cloud.firestore_v1.query import CollectionGroup
 from google.cloud.firestore_v1.batch import WriteBatch
+from google.cloud.firestore_v1.write_buffer import WriteBuffer
+from google.cloud.firestore_v1.read_batcher import ReadBatcher
+from google.cloud.firestore_v1.hedging import HedgingPolicy
 from google.cloud.firestore_v1.collection import CollectionReference
 from google.cloud.firestore_v1.document import DocumentReference
 from google.cloud.firestore_v1.transaction import Transaction
@@ -44,11 +57,30 @@ from google.cloud.firestore_v1.services.firestore import client as firestore_cli
 from google.cloud.firestore_v1.services.firestore.transports import (
     grpc as firestore_grpc_transport,
 )
-from typing import Any, Generator, Iterable, Tuple
+from typing import Any, Generator, Iterable, Optional, Tuple, Union, TYPE_CHECKING
 
 # Types needed only for Type Hints
 from google.cloud.firestore_v1.base_document import DocumentSnapshot
 
+if TYPE_CHECKING:  # pragma: NO COVER
+    from google.cloud.firestore_v1.document_cache import DocumentCache
+
+
+class _RawFirestoreGrpcTransport(firestore_grpc_transport.FirestoreGrpcTransport):
+    """Deserialize the responses of streamed reads into raw protobufs."""
+
+    @property
+    def batch_get_documents(self):
+        return _raw_stub(self, "batch_get_documents")
+
+    @property
+    def run_query(self):
+        return _raw_stub(self, "run_query")
+
+    @property
+    def listen(self):
+        return _raw_stub(self, "listen")
+
 
 class Client(BaseClient):
     """Client for interacting with Google Cloud Firestore API.
@@ -76,6 +108,16 @@ class Client(BaseClient):
         client_options (Union[dict, google.api_core.client_options.ClientOptions]):
             Client options used to set user options on the client. API Endpoint
             should be set through client_options.
+        raw_protobuf (Optional[bool]): If :data:`True`, the responses of
+            ``BatchGetDocuments``, ``RunQuery`` and ``Listen`` are
+            deserialized into raw protobuf messages, without proto-plus
+            wrappers, and decoded from those. The snapshots returned are
+            the same. Defaults to :data:`False`.
+        max_get_documents (Optional[int]): The maximum number of documents
+            ``get`` may return for a query or collection, unless passed
+            its own ``max_documents``. Reading more raises
+            :class:`~google.cloud.firestore_v1.query_results.MaterializationLimitExceeded`.
+            Defaults to no limit.
     """
 
     def __init__(
@@ -85,6 +127,8 @@ class Client(BaseClient):
         database=DEFAULT_DATABASE,
         client_info=_CLIENT_INFO,
         client_options=None,
+        raw_protobuf=False,
+        max_get_documents=None,
     ) -> None:
         super(Client, self).__init__(
             project=project,
@@ -92,6 +136,8 @@ class Client(BaseClient):
             database=database,
             client_info=client_info,
             client_options=client_options,
+            raw_protobuf=raw_protobuf,
+            max_get_documents=max_get_documents,
         )
 
     @property
@@ -101,10 +147,11 @@ class Client(BaseClient):
             :class:`~google.cloud.gapic.firestore.v1`.firestore_client.FirestoreClient:
             The GAPIC client with the credentials of the current client.
         """
+        transport = firestore_grpc_transport.FirestoreGrpcTransport
+        if self._raw_protobuf:
+            transport = _RawFirestoreGrpcTransport
         return self._firestore_api_helper(
-            firestore_grpc_transport.FirestoreGrpcTransport,
-            firestore_client.FirestoreClient,
-            firestore_client,
+            transport, firestore_client.FirestoreClient, firestore_client,
         )
 
     @property
@@ -201,8 +248,8 @@ class Client(BaseClient):
             :class:`~google.cloud.firestore_v1.document.DocumentReference`:
             A reference to a document in a collection.
         """
-        return DocumentReference(
-            *self._document_path_helper(*document_path), client=self
+        return self._get_document_reference(
+            DocumentReference, self._document_path_helper(*document_path)
         )
 
     def get_all(
@@ -212,6 +259,7 @@ class Client(BaseClient):
         transaction: Transaction = None,
         retry: retries.Retry = gapic_v1.method.DEFAULT,
         timeout: float = None,
+        read_time=None,
     ) -> Generator[DocumentSnapshot, Any, None]:
         """Retrieve a batch of documents.
 
@@ -246,17 +294,24 @@ class Client(BaseClient):
                 should be retried.  Defaults to a system-specified policy.
             timeout (float): The timeout for this request.  Defaults to a
                 system-specified value.
+            read_time (Optional[datetime.datetime]): If set, read the
+                documents as they were at this time rather than their latest
+                versions. Cannot be combined with ``transaction``.
 
         Yields:
             .DocumentSnapshot: The next document snapshot that fulfills the
             query, or :data:`None` if the document does not exist.
         """
         request, reference_map, kwargs = self._prep_get_all(
-            references, field_paths, transaction, retry, timeout
+            references, field_paths, transaction, retry, timeout, read_time
         )
 
-        response_iterator = self._firestore_api.batch_get_documents(
-            request=request, metadata=self._rpc_metadata, **kwargs,
+        response_iterator = self._call_read(
+            self._firestore_api.batch_get_documents,
+            True,
+            request=request,
+            metadata=self._rpc_metadata,
+            **kwargs,
         )
 
         for get_doc_response in response_iterator:
@@ -282,10 +337,89 @@ class Client(BaseClient):
         iterator = self._firestore_api.list_collection_ids(
             request=request, metadata=self._rpc_metadata, **kwargs,
         )
+        iterator = _helpers.bind_page_kwargs(iterator, kwargs)
 
         for collection_id in iterator:
             yield self.collection(collection_id)
 
+    def walk(
+        self,
+        root: Union[CollectionReference, DocumentReference, None] = None,
+        max_depth: Optional[int] = None,
+        concurrency: int = DEFAULT_WALK_CONCURRENCY,
+        retry: retries.Retry = gapic_v1.method.DEFAULT,
+        timeout: float = None,
+    ) -> Generator[Tuple[str, str], Any, None]:
+        """Walk the tree of collections and documents below ``root``.
+
+        The tree is explored breadth-first: all the nodes of a level are
+        expanded, up to ``concurrency`` at a time, with ``ListCollectionIds``
+        (below documents) and ``ListDocuments`` (below collections) before
+        the next level. Documents which do not exist but have subcollections
+        are walked as well.
+
+        Entries are yielded in a stable order: level by level, in the order
+        of their parents, and ordered by ID among siblings. Each node is
+        yielded and expanded once.
+
+        .. code-block:: python
+
+           for path, kind in client.walk(client.collection("users")):
+               ...
+
+        Args:
+            root (Optional[Union[:class:`~google.cloud.firestore_v1.collection.CollectionReference`, :class:`~google.cloud.firestore_v1.document.DocumentReference`]]):
+                The node to walk below (not yielded itself). Defaults to the
+                root of the database.
+            max_depth (Optional[int]): The number of levels to walk: ``1``
+                only yields the children of ``root``, ``2`` their children
+                as well, and so on. Defaults to the whole tree.
+            concurrency (Optional[int]): The maximum number of listing
+                requests in flight. Defaults to
+                :data:`~google.cloud.firestore_v1.base_client.DEFAULT_WALK_CONCURRENCY`.
+            retry (google.api_core.retry.Retry): Designation of what errors, if any,
+                should be retried.  Defaults to a system-specified policy.
+            timeout (float): The timeout for each request.  Defaults to a
+                system-specified value.
+
+        Yields:
+            Tuple[str, str]: The database-relative path of each node, and
+            its kind, either ``"collection"`` or ``"document"``.
+
+        Raises:
+            TypeError: If ``root`` is not a reference.
+            ValueError: If ``max_depth`` or ``concurrency`` is not positive.
+        """
+        level, kwargs = self._prep_walk(root, max_depth, concurrency, retry, timeout)
+        list_children = functools.partial(_list_children, kwargs=kwargs)
+        visited = set()
+        depth = 0
+
+        executor = concurrent.futures.ThreadPoolExecutor(concurrency)
+        pending = collections.deque()
+        try:
+            while level and (max_depth is None or depth < max_depth):
+                depth += 1
+                next_level = []
+                nodes = iter(level)
+                # At most ``concurrency`` listings are in flight, and their
+                # children are taken in the order of their parents.
+                for node in itertools.islice(nodes, concurrency):
+                    pending.append(executor.submit(list_children, node))
+                while pending:
+                    children = pending.popleft().result()
+                    for node in itertools.islice(nodes, 1):
+                        pending.append(executor.submit(list_children, node))
+                    for child in _walk_children(children, visited):
+                        yield _walk_entry(child)
+                        next_level.append(child)
+                level = next_level
+        finally:
+            # Closing the generator early drops the listings not yet started.
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=False)
+
     def batch(self) -> WriteBatch:
         """Get a batch instance from this client.
 
@@ -313,3 +447,117 @@ class Client(BaseClient):
             A transaction attached to this client.
         """
         return Transaction(self, **kwargs)
+
+    def write_buffer(self, **kwargs) -> WriteBuffer:
+        """Get a write buffer that coalesces writes made through it.
+
+        See :class:`~google.cloud.firestore_v1.write_buffer.WriteBuffer` for
+        more information on write buffers and the constructor arguments.
+
+        Args:
+            kwargs (Dict[str, Any]): The keyword arguments (other than
+                ``client``) to pass along to the
+                :class:`~google.cloud.firestore_v1.write_buffer.WriteBuffer`
+                constructor.
+
+        Returns:
+            :class:`~google.cloud.firestore_v1.write_buffer.WriteBuffer`:
+            A write buffer attached to this client.
+        """
+        return WriteBuffer(self, **kwargs)
+
+    def batch_reads(self, **kwargs) -> ReadBatcher:
+        """Collect concurrent document reads into batched calls.
+
+        Until the returned batcher is closed, plain
+        :meth:`~google.cloud.firestore_v1.document.DocumentReference.get`
+        calls made through this client are sent in ``BatchGetDocuments``
+        calls. A batcher previously returned by this method stops accepting
+        reads (the reads it already holds are still sent).
+
+        See :class:`~google.cloud.firestore_v1.read_batcher.ReadBatcher`
+        for more information on read batching and the constructor arguments.
+
+        Args:
+            kwargs (Dict[str, Any]): The keyword arguments (other than
+                ``client``) to pass along to the
+                :class:`~google.cloud.firestore_v1.read_batcher.ReadBatcher`
+                constructor.
+
+        Returns:
+            :class:`~google.cloud.firestore_v1.read_batcher.ReadBatcher`:
+            A read batcher attached to this client.
+        """
+        read_batcher = ReadBatcher(self, **kwargs)
+        if self._read_batcher is not None:
+            self._read_batcher._detach()
+        self._read_batcher = read_batcher
+        return read_batcher
+
+    def hedge_reads(self, **kwargs) -> HedgingPolicy:
+        """Send duplicate requests for slow reads, and use the first response.
+
+        Until the returned policy is closed, the requests of
+        :meth:`~google.cloud.firestore_v1.document.DocumentReference.get`,
+        :meth:`get_all` and :meth:`~google.cloud.firestore_v1.query.Query.stream`
+        made through this client are hedged. A policy previously returned
+        by this method stops being used.
+
+        See :class:`~google.cloud.firestore_v1.hedging.HedgingPolicy` for more
+        information on hedging and the constructor arguments.
+
+        Args:
+            kwargs (Dict[str, Any]): The keyword arguments (other than
+                ``client``) to pass along to the
+                :class:`~google.cloud.firestore_v1.hedging.HedgingPolicy`
+                constructor.
+
+        Returns:
+            :class:`~google.cloud.firestore_v1.hedging.HedgingPolicy`:
+            A hedging policy attached to this client, whose ``stats`` tell
+            how often hedges are sent and win.
+        """
+        policy = HedgingPolicy(self, **kwargs)
+        if self._hedging_policy is not None:
+            self._hedging_policy._detach()
+        self._hedging_policy = policy
+        return policy
+
+    def document_cache(self, path: str, **kwargs) -> "DocumentCache":
+        """Open a persistent cache of documents read through this client.
+
+        See :class:`~google.cloud.firestore_v1.document_cache.DocumentCache`
+        for more information on document caches.
+
+        Args:
+            path (str): The SQLite database file backing the cache.
+            kwargs (Dict[str, Any]): The remaining keyword arguments to pass
+                along to the
+                :class:`~google.cloud.firestore_v1.document_cache.DocumentCache`
+                constructor.
+
+        Returns:
+            :class:`~google.cloud.firestore_v1.document_cache.DocumentCache`:
+            A document cache attached to this client.
+        """
+        # Imported here, as few applications need ``sqlite3``.
+        from google.cloud.firestore_v1.document_cache import DocumentCache
+
+        return DocumentCache(self, path, **kwargs)
+
+
+def _list_children(node, kwargs: dict) -> list:
+    """List the nodes directly below a node of :meth:`Client.walk`.
+
+    Args:
+        node (Union[Client, CollectionReference, DocumentReference]): The
+            node, the client standing for the root of the database.
+        kwargs (dict): The retry and timeout of the request.
+
+    Returns:
+        list: The documents of a collection, or the collections below the
+        root or a document.
+    """
+    if isinstance(node, CollectionReference):
+        return list(node.list_documents(**kwargs))
+    return list(node.collections(**kwargs))
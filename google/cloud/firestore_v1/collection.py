@@ -14,21 +14,37 @@
 
 """Classes for representing collections for the Google Cloud Firestore API."""
 
+import concurrent.futures
+import queue
+import threading
+
 from google.api_core import gapic_v1  # type: ignore
 from google.api_core import retry as retries  # type: ignore
 
 from google.cloud.firestore_v1.base_collection import (
     BaseCollectionReference,
+    _MAX_SCAN_WORKERS,
+    _SCAN_BUFFER_SIZE,
     _item_to_document_ref,
+    _page_document_ids,
+    _scan_document_id,
 )
+from google.cloud.firestore_v1 import _helpers
 from google.cloud.firestore_v1 import query as query_mod
-from google.cloud.firestore_v1.watch import Watch
 from google.cloud.firestore_v1 import document
-from typing import Any, Callable, Generator, Tuple
+from typing import Any, Callable, Generator, Iterator, Tuple, Union, TYPE_CHECKING
 
 # Types needed only for Type Hints
+from google.cloud.firestore_v1.query_results import QueryResults
 from google.cloud.firestore_v1.transaction import Transaction
 
+if TYPE_CHECKING:  # pragma: NO COVER
+    from google.cloud.firestore_v1.watch import Watch
+
+_EXHAUSTED = object()
+# Seconds between checks that the reader of a scan is still there.
+_SCAN_POLL_INTERVAL = 0.1
+
 
 class CollectionReference(BaseCollectionReference):
     """A reference to a collection in a Firestore database.
@@ -56,6 +72,8 @@ class CollectionReference(BaseCollectionReference):
         TypeError: If a keyword other than ``client`` is used.
     """
 
+    __slots__ = ()
+
     def __init__(self, *path, **kwargs) -> None:
         super(CollectionReference, self).__init__(*path, **kwargs)
 
@@ -135,14 +153,142 @@ class CollectionReference(BaseCollectionReference):
         iterator = self._client._firestore_api.list_documents(
             request=request, metadata=self._client._rpc_metadata, **kwargs,
         )
+        iterator = _helpers.bind_page_kwargs(iterator, kwargs)
         return (_item_to_document_ref(self, i) for i in iterator)
 
+    def list_document_ids(
+        self,
+        page_size: int = None,
+        partition_count: int = None,
+        retry: retries.Retry = gapic_v1.method.DEFAULT,
+        timeout: float = None,
+    ) -> Generator[str, Any, None]:
+        """List the IDs of all documents in the current collection.
+
+        Unlike :meth:`list_documents`, this yields plain document ID strings,
+        and requests the next page of results in the background while the
+        current one is consumed.
+
+        If ``partition_count`` is passed, the IDs are instead read by a
+        parallel scan: the collection group with this collection's ID is
+        split into up to ``partition_count`` ranges with ``PartitionQuery``,
+        and the parts of the ranges inside this collection are read
+        concurrently (a few at a time). The scan only sees existing
+        documents, so it skips the missing documents (with subcollections)
+        which :meth:`list_documents` returns.
+
+        Args:
+            page_size (Optional[int]]): The maximum number of documents
+                in each page of results from this request. Non-positive values
+                are ignored. Defaults to a sensible value set by the API.
+            partition_count (Optional[int]): If set, the number of ranges to
+                split a parallel scan into.
+            retry (google.api_core.retry.Retry): Designation of what errors, if any,
+                should be retried.  Defaults to a system-specified policy.
+            timeout (float): The timeout for this request.  Defaults to a
+                system-specified value.
+
+        Returns:
+            Generator[str]: The IDs of the documents in the collection, in
+            order.
+
+        Raises:
+            ValueError: If ``partition_count`` is not positive.
+        """
+        request, kwargs = self._prep_list_document_ids(
+            page_size, partition_count, retry, timeout
+        )
+
+        if partition_count is not None:
+            return self._scan_document_ids(partition_count, kwargs)
+
+        pager = self._client._firestore_api.list_documents(
+            request=request, metadata=self._client._rpc_metadata, **kwargs,
+        )
+        pager = _helpers.bind_page_kwargs(pager, kwargs)
+        return (
+            document_id
+            for page in _prefetch(pager.pages)
+            for document_id in _page_document_ids(page)
+        )
+
+    def _scan_document_ids(
+        self, partition_count: int, kwargs: dict
+    ) -> Generator[str, Any, None]:
+        """Read the IDs of the documents in this collection in parallel.
+
+        Up to :data:`~google.cloud.firestore_v1.base_collection._MAX_SCAN_WORKERS`
+        partitions are read at once, each reading at most
+        :data:`~google.cloud.firestore_v1.base_collection._SCAN_BUFFER_SIZE`
+        IDs ahead of the caller.
+
+        Args:
+            partition_count (int): The number of ranges to split the scan into.
+            kwargs (dict): The retry / timeout arguments for each request.
+
+        Yields:
+            str: The IDs of the documents in the collection, in order.
+        """
+        _, expected_prefix = self._parent_info()
+        collection_group = self._client.collection_group(self.id)
+        queries = [
+            query
+            for query in map(
+                self._id_scan_query,
+                collection_group.get_partitions(partition_count, **kwargs),
+            )
+            if query is not None
+        ]
+        stopped = threading.Event()
+
+        def scan(query, buffer):
+            if stopped.is_set():
+                return
+            try:
+                request, _, _ = query._prep_stream()
+                response_iterator = self._client._firestore_api.run_query(
+                    request=request, metadata=self._client._rpc_metadata, **kwargs,
+                )
+                for response in response_iterator:
+                    document_id = _scan_document_id(response, expected_prefix)
+                    if document_id and not _put(buffer, document_id, stopped):
+                        return
+            except Exception as exc:
+                _put(buffer, exc, stopped)
+            else:
+                _put(buffer, _EXHAUSTED, stopped)
+
+        buffers = [queue.Queue(_SCAN_BUFFER_SIZE) for _ in queries]
+        max_workers = max(min(len(queries), _MAX_SCAN_WORKERS), 1)
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers)
+        # Partitions start in order, so the one read next is always running.
+        futures = [
+            executor.submit(scan, query, buffer)
+            for query, buffer in zip(queries, buffers)
+        ]
+        try:
+            for buffer in buffers:
+                item = buffer.get()
+                while item is not _EXHAUSTED:
+                    if isinstance(item, Exception):
+                        raise item
+                    yield item
+                    item = buffer.get()
+        finally:
+            # Cancel the partitions not started before releasing the workers.
+            for future in futures:
+                future.cancel()
+            stopped.set()
+            executor.shutdown(wait=False)
+
     def get(
         self,
         transaction: Transaction = None,
         retry: retries.Retry = gapic_v1.method.DEFAULT,
         timeout: float = None,
-    ) -> list:
+        max_documents: int = None,
+        compact: bool = False,
+    ) -> Union[list, QueryResults]:
         """Read the documents in this collection.
 
         This sends a ``RunQuery`` RPC and returns a list of documents
@@ -156,17 +302,35 @@ class CollectionReference(BaseCollectionReference):
                 should be retried.  Defaults to a system-specified policy.
             timeout (float): The timeout for this request.  Defaults to a
                 system-specified value.
+            max_documents (Optional[int]): The maximum number of documents
+                to return. Defaults to the client's ``max_get_documents``,
+                if any.
+            compact (Optional[bool]): If :data:`True`, return the documents
+                in a :class:`~google.cloud.firestore_v1.query_results.QueryResults`,
+                which holds them encoded and decodes them when they are
+                read, instead of a list of snapshots. Defaults to
+                :data:`False`.
 
         If a ``transaction`` is used and it already has write operations
         added, this method cannot be used (i.e. read-after-write is not
         allowed).
 
         Returns:
-            list: The documents in this collection that match the query.
+            Union[list, :class:`~google.cloud.firestore_v1.query_results.QueryResults`]:
+            The documents in this collection.
+
+        Raises:
+            ~google.cloud.firestore_v1.query_results.MaterializationLimitExceeded:
+                If the collection has more than ``max_documents`` documents.
         """
         query, kwargs = self._prep_get_or_stream(retry, timeout)
 
-        return query.get(transaction=transaction, **kwargs)
+        return query.get(
+            transaction=transaction,
+            max_documents=max_documents,
+            compact=compact,
+            **kwargs,
+        )
 
     def stream(
         self,
@@ -208,7 +372,7 @@ class CollectionReference(BaseCollectionReference):
 
         return query.stream(transaction=transaction, **kwargs)
 
-    def on_snapshot(self, callback: Callable) -> Watch:
+    def on_snapshot(self, callback: Callable) -> "Watch":
         """Monitor the documents in this collection.
 
         This starts a watch on this collection using a background thread. The
@@ -234,9 +398,51 @@ class CollectionReference(BaseCollectionReference):
             # Terminate this watch
             collection_watch.unsubscribe()
         """
+        # ``watch`` pulls in ``google.api_core.bidi``; import it on first use.
+        from google.cloud.firestore_v1.watch import Watch
+
         return Watch.for_query(
             self._query(),
             callback,
             document.DocumentSnapshot,
             document.DocumentReference,
         )
+
+
+def _put(buffer: queue.Queue, item: Any, stopped: threading.Event) -> bool:
+    """Put ``item`` in ``buffer``, unless the reader stops first.
+
+    Returns:
+        bool: Whether the item was put.
+    """
+    while not stopped.is_set():
+        try:
+            buffer.put(item, timeout=_SCAN_POLL_INTERVAL)
+        except queue.Full:
+            continue
+        return True
+    return False
+
+
+def _prefetch(iterator: Iterator) -> Generator[Any, None, None]:
+    """Yield the items of ``iterator``, fetching each next one in advance.
+
+    While the caller consumes an item, the following one is produced on a
+    background thread, so paged RPCs overlap with processing of the
+    previous page.
+
+    Args:
+        iterator (Iterator): The (blocking) iterator to read ahead.
+
+    Yields:
+        The items of ``iterator``, in order.
+    """
+    with concurrent.futures.ThreadPoolExecutor(1) as executor:
+        future = executor.submit(next, iterator, _EXHAUSTED)
+        while True:
+            item = future.result()
+            if item is _EXHAUSTED:
+                return
+
+            future = executor.submit(next, iterator, _EXHAUSTED)
+            yield item
@@ -0,0 +1,491 @@
+# Copyright 2020 Google LLC All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Export collection groups to local files, and import them back.
+
+Unlike the managed export of
+:meth:`~google.cloud.firestore_admin_v1.services.firestore_admin.client.FirestoreAdminClient.export_documents`,
+which writes to Cloud Storage, these helpers read the documents with the
+client itself, so they can be used for local backups and migrations:
+
+.. code-block:: python
+
+    stats = export_documents(client, "cities", "/backups/cities")
+    ...
+    stats = import_documents(other_client, "/backups/cities")
+
+:func:`export_documents` splits the collection group into partitions with
+``PartitionQuery`` and reads them in parallel, streaming each partition to
+a series of files with at most ``documents_per_file`` documents. Files
+hold one document per line as the JSON encoding of the ``Document``
+protobuf (``"ndjson"``), or an Avro container of serialized ``Document``
+protobufs (``"avro"``, which requires the ``fastavro`` package).
+
+Progress is recorded in a checkpoint file each time a file is completed,
+so an interrupted export can be resumed by running it again with the same
+directory. :func:`import_documents` writes the exported documents back in
+parallel batches, throttled to ramp up traffic gradually.
+"""
+
+import concurrent.futures
+import json
+import os
+import threading
+import time
+
+from google.api_core import gapic_v1  # type: ignore
+from google.protobuf import json_format  # type: ignore
+
+from google.cloud.firestore_v1 import _helpers
+from google.cloud.firestore_v1.base_query import QueryPartition
+from google.cloud.firestore_v1.base_write_buffer import MAX_BATCH_SIZE
+from google.cloud.firestore_v1.types import document as document_pb
+from google.cloud.firestore_v1.types import write
+from typing import Any, Dict, Iterator, List, Optional
+
+
+NDJSON = "ndjson"
+"""str: Format of files with one JSON-encoded document per line."""
+AVRO = "avro"
+"""str: Format of Avro container files of serialized documents."""
+DEFAULT_PARTITION_COUNT = 16
+"""int: Default number of partitions to split an export into."""
+DEFAULT_DOCUMENTS_PER_FILE = 10000
+"""int: Default maximum number of documents in each exported file."""
+DEFAULT_WRITES_PER_SECOND = 500
+"""int: Default initial rate of writes of an import."""
+CHECKPOINT_FILENAME = "checkpoint.json"
+"""str: Name of the file recording the progress of an export."""
+
+# Imports increase their rate of writes by 50% every 5 minutes.
+_RAMP_UP_MULTIPLIER = 1.5
+_RAMP_UP_INTERVAL = 300.0
+_AVRO_SCHEMA = {
+    "type": "record",
+    "name": "Document",
+    "namespace": "google.firestore.v1",
+    "fields": [
+        {"name": "name", "type": "string"},
+        {"name": "document", "type": "bytes"},
+    ],
+}
+_BAD_FORMAT = "Unknown file format {!r}: expected 'ndjson' or 'avro'."
+_MISSING_FASTAVRO = "The 'fastavro' package is required to read or write Avro files."
+_OTHER_EXPORT = "Directory {!r} holds an export of a different collection group."
+
+
+class TransferStats(object):
+    """Throughput of one partition of an export, or one file of an import.
+
+    Args:
+        name (str): The partition or file.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.documents = 0
+        self.bytes = 0
+        self.seconds = 0.0
+
+    @property
+    def documents_per_second(self) -> float:
+        """float: The average rate at which documents were transferred."""
+        if not self.seconds:
+            return 0.0
+        return self.documents / self.seconds
+
+    def __repr__(self):
+        return "<TransferStats {}: {:d} documents, {:d} bytes in {:.3f}s>".format(
+            self.name, self.documents, self.bytes, self.seconds
+        )
+
+
+def _fastavro():
+    try:
+        import fastavro  # type: ignore
+    except ImportError:
+        raise ImportError(_MISSING_FASTAVRO)
+    return fastavro
+
+
+class _NDJSONFile(object):
+    """Write documents to a file, one JSON-encoded document per line."""
+
+    def __init__(self, path: str) -> None:
+        self._file = open(path, "w", encoding="utf-8")
+
+    def write(self, document) -> int:
+        line = json_format.MessageToJson(document, indent=None) + "\n"
+        self._file.write(line)
+        return len(line)
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class _AvroFile(object):
+    """Write documents to an Avro container file."""
+
+    def __init__(self, path: str) -> None:
+        fastavro = _fastavro()
+        self._file = open(path, "wb")
+        self._writer = fastavro.write.Writer(
+            self._file, fastavro.parse_schema(_AVRO_SCHEMA)
+        )
+
+    def write(self, document) -> int:
+        serialized = document.SerializeToString()
+        self._writer.write({"name": document.name, "document": serialized})
+        return len(serialized)
+
+    def close(self) -> None:
+        self._writer.flush()
+        self._file.close()
+
+
+_FILE_CLASSES = {NDJSON: _NDJSONFile, AVRO: _AvroFile}
+
+
+def _read_documents(path: str) -> Iterator[Any]:
+    """Read the ``Document`` protobufs from an exported file.
+
+    Args:
+        path (str): The file, whose extension gives its format.
+
+    Yields:
+        Tuple[google.cloud.firestore_v1.types.Document, int]: Each raw
+        ``Document`` protobuf, and its size in the file.
+    """
+    document_class = document_pb.Document.pb()
+    if path.endswith("." + AVRO):
+        fastavro = _fastavro()
+        with open(path, "rb") as exported:
+            for record in fastavro.reader(exported):
+                serialized = record["document"]
+                yield document_class.FromString(serialized), len(serialized)
+    else:
+        with open(path, encoding="utf-8") as exported:
+            for line in exported:
+                if line.strip():
+                    yield json_format.Parse(line, document_class()), len(line)
+
+
+class _Checkpoint(object):
+    """The progress of an export, saved in its directory.
+
+    Args:
+        path (str): The checkpoint file.
+        state (dict): The collection ID, file format, and the state of each
+            partition: its bounds (as document paths), the path of the last
+            document written to a completed file, the number of completed
+            files and whether the partition is done.
+    """
+
+    def __init__(self, path: str, state: dict) -> None:
+        self._path = path
+        self._lock = threading.Lock()
+        self.state = state
+
+    @classmethod
+    def load(cls, directory: str) -> Optional["_Checkpoint"]:
+        path = os.path.join(directory, CHECKPOINT_FILENAME)
+        if not os.path.exists(path):
+            return None
+        with open(path, encoding="utf-8") as checkpoint:
+            return cls(path, json.load(checkpoint))
+
+    @property
+    def partitions(self) -> List[Dict[str, Any]]:
+        return self.state["partitions"]
+
+    def update(self, index: int, **changes) -> None:
+        """Update the state of a partition, and save the checkpoint."""
+        with self._lock:
+            self.partitions[index].update(changes)
+            self.save()
+
+    def save(self) -> None:
+        # Write then rename, so that an interrupted save cannot lose progress.
+        temporary = self._path + ".tmp"
+        with open(temporary, "w", encoding="utf-8") as checkpoint:
+            json.dump(self.state, checkpoint)
+        os.replace(temporary, self._path)
+
+
+def _relative_path(name: str) -> str:
+    """Strip the database prefix from a fully-qualified document name."""
+    _, _, path = name.partition("/documents/")
+    return path
+
+
+def export_documents(
+    client,
+    collection_id: str,
+    directory: str,
+    file_format: str = NDJSON,
+    partition_count: int = DEFAULT_PARTITION_COUNT,
+    documents_per_file: int = DEFAULT_DOCUMENTS_PER_FILE,
+    max_workers: int = None,
+    read_time=None,
+    retry=gapic_v1.method.DEFAULT,
+    timeout: float = None,
+) -> List[TransferStats]:
+    """Export the documents of a collection group to files.
+
+    Partitions are read in parallel and streamed to files named
+    ``<collection_id>-<partition>-<file>.<file_format>``, so memory use does
+    not depend on the size of the export. Partitions and completed files
+    are recorded in a checkpoint file: if ``directory`` already holds an
+    unfinished export of the collection group, it is resumed after the
+    last completed file of each partition.
+
+    Args:
+        client (:class:`~google.cloud.firestore_v1.client.Client`):
+            The client to read the documents with.
+        collection_id (str): The ID of the collections to export.
+        directory (str): The directory to write the files to. It is
+            created if needed.
+        file_format (Optional[str]): ``"ndjson"`` or ``"avro"``.
+        partition_count (Optional[int]): The desired number of partitions.
+        documents_per_file (Optional[int]): The maximum number of documents
+            in each file.
+        max_workers (Optional[int]): The number of partitions read at the
+            same time. Defaults to one per partition.
+        read_time (Optional[datetime.datetime]): If passed, reads the
+            documents as of this time.
+        retry (google.api_core.retry.Retry): Designation of what errors, if any,
+            should be retried.  Defaults to a system-specified policy.
+        timeout (float): The timeout for each request.  Defaults to a
+            system-specified value.
+
+    Returns:
+        List[TransferStats]: The documents and bytes written for each
+        partition, and the time it took.
+
+    Raises:
+        ValueError: If ``file_format`` is unknown, or if ``directory`` holds
+            the export of another collection group.
+        ImportError: If ``file_format`` is ``"avro"`` and ``fastavro`` is not
+            installed.
+    """
+    if file_format not in _FILE_CLASSES:
+        raise ValueError(_BAD_FORMAT.format(file_format))
+    if file_format == AVRO:
+        _fastavro()
+    file_class = _FILE_CLASSES[file_format]
+    kwargs = _helpers.make_retry_timeout_kwargs(retry, timeout)
+    collection_group = client.collection_group(collection_id)
+
+    os.makedirs(directory, exist_ok=True)
+    checkpoint = _Checkpoint.load(directory)
+    if checkpoint is None:
+        partitions = [
+            {
+                "start_at": partition.start_at and partition.start_at.path,
+                "end_at": partition.end_at and partition.end_at.path,
+                "last": None,
+                "files": 0,
+                "done": False,
+            }
+            for partition in collection_group.get_partitions(partition_count, **kwargs)
+        ]
+        checkpoint = _Checkpoint(
+            os.path.join(directory, CHECKPOINT_FILENAME),
+            {
+                "collection_id": collection_id,
+                "format": file_format,
+                "partitions": partitions,
+            },
+        )
+        checkpoint.save()
+    elif (
+        checkpoint.state["collection_id"] != collection_id
+        or checkpoint.state["format"] != file_format
+    ):
+        raise ValueError(_OTHER_EXPORT.format(directory))
+
+    def export_partition(index):
+        state = checkpoint.partitions[index]
+        stats = TransferStats("{}-{:05d}".format(collection_id, index))
+        if state["done"]:
+            return stats
+
+        started = time.monotonic()
+        start_at = state["start_at"] and client.document(state["start_at"])
+        end_at = state["end_at"] and client.document(state["end_at"])
+        query = QueryPartition(collection_group, start_at, end_at).query()
+        if state["last"] is not None:
+            query = query.start_after([client.document(state["last"])])
+
+        request, _, _ = query._prep_stream(read_time=read_time)
+        response_iterator = client._firestore_api.run_query(
+            request=request, metadata=client._rpc_metadata, **kwargs,
+        )
+
+        files, last, output, in_file = state["files"], None, None, 0
+        for response in response_iterator:
+            response = _helpers.raw_pb(response)
+            if not response.HasField("document"):
+                continue
+
+            if output is None:
+                filename = "{}-{:05d}-{:05d}.{}".format(
+                    collection_id, index, files, file_format
+                )
+                output = file_class(os.path.join(directory, filename))
+            document = response.document
+            stats.bytes += output.write(document)
+            stats.documents += 1
+            last = document.name
+            in_file += 1
+
+            if in_file >= documents_per_file:
+                output.close()
+                output, in_file, files = None, 0, files + 1
+                checkpoint.update(index, last=_relative_path(last), files=files)
+
+        if output is not None:
+            output.close()
+            files += 1
+        changes = {"files": files, "done": True}
+        if last is not None:
+            changes["last"] = _relative_path(last)
+        checkpoint.update(index, **changes)
+
+        stats.seconds = time.monotonic() - started
+        return stats
+
+    indexes = range(len(checkpoint.partitions))
+    with concurrent.futures.ThreadPoolExecutor(max_workers or len(indexes)) as executor:
+        return list(executor.map(export_partition, indexes))
+
+
+class _RateLimiter(object):
+    """Limit the rate of operations shared between threads.
+
+    The rate starts at ``initial_rate`` operations per second and grows by
+    50% every 5 minutes, following the "500/50/5" rule for ramping up
+    traffic to Firestore.
+
+    Args:
+        initial_rate (float): The initial number of operations per second.
+        maximum_rate (Optional[float]): A cap on the rate, if any.
+    """
+
+    def __init__(self, initial_rate: float, maximum_rate: float = None) -> None:
+        self._initial_rate = initial_rate
+        self._maximum_rate = maximum_rate
+        self._lock = threading.Lock()
+        self._started = None
+        self._available_at = None
+
+    def _rate(self, now: float) -> float:
+        steps = int((now - self._started) // _RAMP_UP_INTERVAL)
+        rate = self._initial_rate * _RAMP_UP_MULTIPLIER ** steps
+        if self._maximum_rate is not None:
+            rate = min(rate, self._maximum_rate)
+        return rate
+
+    def acquire(self, count: int) -> None:
+        """Wait until ``count`` more operations may be started."""
+        with self._lock:
+            now = time.monotonic()
+            if self._started is None:
+                self._started = self._available_at = now
+            start = max(now, self._available_at)
+            self._available_at = start + count / self._rate(start)
+
+        if start > now:
+            time.sleep(start - now)
+
+
+def import_documents(
+    client,
+    directory: str,
+    max_workers: int = None,
+    batch_size: int = MAX_BATCH_SIZE,
+    writes_per_second: Optional[float] = DEFAULT_WRITES_PER_SECOND,
+    max_writes_per_second: float = None,
+) -> List[TransferStats]:
+    """Write the documents exported to a directory.
+
+    Each exported file is read by a worker thread, and its documents are
+    written (replacing any existing document) in batches of
+    ``batch_size``. Documents are written to the client's database, so an
+    export may be imported into another project or database.
+
+    Args:
+        client (:class:`~google.cloud.firestore_v1.client.Client`):
+            The client to write the documents with.
+        directory (str): The directory holding the exported files.
+        max_workers (Optional[int]): The number of files imported at the
+            same time. Defaults to one per file.
+        batch_size (Optional[int]): The number of documents in each commit.
+        writes_per_second (Optional[float]): The initial rate of writes
+            across all workers, raised by 50% every 5 minutes. If
+            :data:`None`, writes are not throttled.
+        max_writes_per_second (Optional[float]): A cap on the rate of writes.
+
+    Returns:
+        List[TransferStats]: The documents and bytes read from each file,
+        and the time it took to write them.
+
+    Raises:
+        ImportError: If the directory holds Avro files and ``fastavro`` is
+            not installed.
+    """
+    filenames = sorted(
+        filename
+        for filename in os.listdir(directory)
+        if filename.endswith(("." + NDJSON, "." + AVRO))
+    )
+    limiter = None
+    if writes_per_second is not None:
+        limiter = _RateLimiter(writes_per_second, max_writes_per_second)
+    prefix = client._database_string + "/documents/"
+
+    def commit(write_pbs):
+        if limiter is not None:
+            limiter.acquire(len(write_pbs))
+        batch = client.batch()
+        batch._add_write_pbs(write_pbs)
+        batch.commit()
+
+    def import_file(filename):
+        stats = TransferStats(filename)
+        started = time.monotonic()
+        write_pbs = []
+        for document, size in _read_documents(os.path.join(directory, filename)):
+            document.name = prefix + _relative_path(document.name)
+            # Output-only fields are not part of the written document.
+            document.ClearField("create_time")
+            document.ClearField("update_time")
+            write_pbs.append(write.Write(update=document))
+            stats.documents += 1
+            stats.bytes += size
+            if len(write_pbs) >= batch_size:
+                commit(write_pbs)
+                write_pbs = []
+        if write_pbs:
+            commit(write_pbs)
+
+        stats.seconds = time.monotonic() - started
+        return stats
+
+    if not filenames:
+        return []
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers or len(filenames)
+    ) as executor:
+        return list(executor.map(import_file, filenames))
@@ -0,0 +1,235 @@
+# Copyright 2020 Google LLC All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Latency budgets shared by all the requests of an operation."""
+
+import asyncio
+import functools
+import time
+
+from google.api_core import exceptions  # type: ignore
+from google.api_core import gapic_v1  # type: ignore
+from google.api_core import retry as retries  # type: ignore
+from google.api_core import retry_async  # type: ignore
+
+from typing import Any, Awaitable, Callable, Optional
+
+DEFAULT_RETRY = retries.Retry(
+    predicate=retries.if_exception_type(exceptions.ServiceUnavailable)
+)
+"""google.api_core.retry.Retry: Retry of the requests sent within a deadline,
+if none is passed."""
+DEFAULT_ASYNC_RETRY = retry_async.AsyncRetry(
+    predicate=retries.if_exception_type(exceptions.ServiceUnavailable)
+)
+"""google.api_core.retry_async.AsyncRetry: Retry of the async requests sent
+within a deadline, if none is passed."""
+_DEADLINE_EXCEEDED = "Deadline of {:g} seconds exceeded."
+_BAD_TIMEOUT = "'timeout' must not be negative."
+
+
+class Deadline(object):
+    """A latency budget shared by all the requests of an operation.
+
+    A deadline can be passed as the ``timeout`` of any read or write method,
+    or as the ``deadline`` of a transaction. Each request then gets the time
+    remaining as its timeout, retries stop once the deadline passes (a
+    backoff sleep which could outlast it is not started), and the requests
+    sent later for the same operation, such as the next pages of
+    ``list_documents`` or the attempts of a transaction, share the same
+    budget.
+
+    .. code-block:: python
+
+       deadline = firestore.Deadline(2.0)
+       for reference in collection.list_documents(timeout=deadline):
+           ...
+
+    When the deadline passes,
+    :class:`~google.api_core.exceptions.DeadlineExceeded` is raised (or
+    :class:`~google.api_core.exceptions.RetryError` if it passes while
+    retrying).
+
+    Args:
+        timeout (float): The number of seconds from now until the deadline.
+
+    Raises:
+        ValueError: If ``timeout`` is negative.
+    """
+
+    def __init__(self, timeout: float) -> None:
+        if timeout < 0:
+            raise ValueError(_BAD_TIMEOUT)
+
+        self._timeout = timeout
+        self._expiry = time.monotonic() + timeout
+
+    @property
+    def timeout(self) -> float:
+        """float: The number of seconds the deadline was set for."""
+        return self._timeout
+
+    @property
+    def expired(self) -> bool:
+        """bool: Whether the deadline has passed."""
+        return time.monotonic() >= self._expiry
+
+    def remaining(self) -> float:
+        """Get the time left until the deadline.
+
+        Returns:
+            float: The number of seconds left, or ``0.0`` once the deadline
+            has passed.
+        """
+        return max(self._expiry - time.monotonic(), 0.0)
+
+    def check(self, margin: float = 0.0) -> None:
+        """Make sure the deadline does not pass within ``margin`` seconds.
+
+        Args:
+            margin (Optional[float]): The number of seconds which must be
+                left. Defaults to ``0.0``.
+
+        Raises:
+            ~google.api_core.exceptions.DeadlineExceeded: If fewer seconds
+                are left.
+        """
+        if self.remaining() <= margin:
+            raise self._deadline_exceeded()
+
+    def retry(self, retry: retries.Retry = gapic_v1.method.DEFAULT) -> Any:
+        """Bound a retry policy by the deadline.
+
+        Args:
+            retry (google.api_core.retry.Retry): The retry policy. If not
+                passed, :data:`DEFAULT_RETRY` is used.
+
+        Returns:
+            Optional[Callable]: A retry decorator for GAPIC methods, which
+            stops retrying when the deadline passes, or :data:`None` if
+            ``retry`` is :data:`None`.
+        """
+        if retry is None or isinstance(retry, _BoundedRetry):
+            return retry
+        if retry is gapic_v1.method.DEFAULT:
+            retry = DEFAULT_RETRY
+        return _BoundedRetry(retry, self)
+
+    def async_retry(
+        self, retry: retry_async.AsyncRetry = gapic_v1.method.DEFAULT
+    ) -> Any:
+        """Bound an async retry policy by the deadline.
+
+        Like :meth:`retry`, for the methods of async clients: a sync retry
+        policy would not retry their calls, which only fail once awaited.
+
+        Args:
+            retry (google.api_core.retry_async.AsyncRetry): The retry policy.
+                If not passed, :data:`DEFAULT_ASYNC_RETRY` is used.
+
+        Returns:
+            Optional[Callable]: A retry decorator for async GAPIC methods,
+            which stops retrying when the deadline passes, or :data:`None`
+            if ``retry`` is :data:`None`.
+        """
+        if retry is gapic_v1.method.DEFAULT:
+            retry = DEFAULT_ASYNC_RETRY
+        return self.retry(retry)
+
+    def __call__(self, func: Callable) -> Callable:
+        """Pass the time remaining as the ``timeout`` of each call of ``func``.
+
+        This is the interface of :mod:`google.api_core.timeout`, so that a
+        deadline can be passed as the ``timeout`` of GAPIC methods.
+
+        Args:
+            func (Callable): The function to apply the timeout to.
+
+        Returns:
+            Callable: The wrapped function, which raises
+            :class:`~google.api_core.exceptions.DeadlineExceeded` if called
+            once the deadline has passed.
+        """
+
+        @functools.wraps(func)
+        def func_with_timeout(*args, **kwargs):
+            self.check()
+            kwargs["timeout"] = self.remaining()
+            return func(*args, **kwargs)
+
+        return func_with_timeout
+
+    async def wait(self, awaitable: Awaitable) -> Any:
+        """Await ``awaitable``, cancelling it if the deadline passes first.
+
+        Args:
+            awaitable (Awaitable): The awaitable, such as a coroutine.
+
+        Returns:
+            Any: The result of ``awaitable``.
+
+        Raises:
+            ~google.api_core.exceptions.DeadlineExceeded: If the deadline
+                passes first.
+        """
+        try:
+            return await asyncio.wait_for(awaitable, self.remaining())
+        except asyncio.TimeoutError:
+            raise self._deadline_exceeded()
+
+    def _deadline_exceeded(self) -> exceptions.DeadlineExceeded:
+        return exceptions.DeadlineExceeded(_DEADLINE_EXCEEDED.format(self._timeout))
+
+    def __repr__(self) -> str:
+        return "Deadline(timeout={!r}, remaining={:.3f})".format(
+            self._timeout, self.remaining()
+        )
+
+
+class _BoundedRetry(object):
+    """A retry policy which stops retrying when a deadline passes.
+
+    Args:
+        retry (Union[google.api_core.retry.Retry, \
+            google.api_core.retry_async.AsyncRetry]): The retry policy.
+        deadline (:class:`Deadline`): The deadline.
+    """
+
+    def __init__(self, retry: retries.Retry, deadline: Deadline) -> None:
+        self._retry = retry
+        self._deadline = deadline
+
+    def __call__(self, func: Callable) -> Callable:
+        @functools.wraps(func)
+        def retry_wrapped_func(*args, **kwargs):
+            # The time left is only known once the request is sent.
+            retry = self._retry.with_deadline(self._deadline.remaining())
+            return retry(func)(*args, **kwargs)
+
+        return retry_wrapped_func
+
+
+def remaining_timeout(timeout: Any) -> Optional[float]:
+    """Get the number of seconds of a ``timeout`` argument.
+
+    Args:
+        timeout (Union[float, :class:`Deadline`, None]): The timeout.
+
+    Returns:
+        Optional[float]: The number of seconds, or :data:`None` if
+        ``timeout`` is :data:`None`.
+    """
+    if isinstance(timeout, Deadline):
+        return timeout.remaining()
+    return timeout
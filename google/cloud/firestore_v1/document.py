@@ -26,9 +26,12 @@ from google.cloud.firestore_v1.base_document import (
 from google.api_core import exceptions  # type: ignore
 from google.cloud.firestore_v1 import _helpers
 from google.cloud.firestore_v1.types import write
-from google.cloud.firestore_v1.watch import Watch
 from google.protobuf import timestamp_pb2
-from typing import Any, Callable, Generator, Iterable
+from typing import Any, Callable, Generator, Iterable, TYPE_CHECKING
+
+
+if TYPE_CHECKING:  # pragma: NO COVER
+    from google.cloud.firestore_v1.watch import Watch
 
 
 class DocumentReference(BaseDocumentReference):
@@ -56,6 +59,8 @@ class DocumentReference(BaseDocumentReference):
         TypeError: If a keyword other than ``client`` is used.
     """
 
+    __slots__ = ()
+
     def __init__(self, *path, **kwargs) -> None:
         super(DocumentReference, self).__init__(*path, **kwargs)
 
@@ -323,6 +328,7 @@ class DocumentReference(BaseDocumentReference):
         transaction=None,
         retry: retries.Retry = gapic_v1.method.DEFAULT,
         timeout: float = None,
+        read_time=None,
     ) -> DocumentSnapshot:
         """Retrieve a snapshot of the current document.
 
@@ -345,6 +351,9 @@ class DocumentReference(BaseDocumentReference):
                 should be retried.  Defaults to a system-specified policy.
             timeout (float): The timeout for this request.  Defaults to a
                 system-specified value.
+            read_time (Optional[datetime.datetime]): If set, read the
+                document as it was at this time rather than its latest
+                version. Cannot be combined with ``transaction``.
 
         Returns:
             :class:`~google.cloud.firestore_v1.base_document.DocumentSnapshot`:
@@ -354,12 +363,21 @@ class DocumentReference(BaseDocumentReference):
                 :attr:`create_time` attributes will all be ``None`` and
                 its :attr:`exists` attribute will be ``False``.
         """
-        request, kwargs = self._prep_get(field_paths, transaction, retry, timeout)
+        request, kwargs = self._prep_get(
+            field_paths, transaction, retry, timeout, read_time
+        )
+        read_batcher = self._get_read_batcher(transaction, retry, timeout, read_time)
+        if read_batcher is not None:
+            return read_batcher.get(self, field_paths)
 
         firestore_api = self._client._firestore_api
         try:
-            document_pb = firestore_api.get_document(
-                request=request, metadata=self._client._rpc_metadata, **kwargs,
+            document_pb = self._client._call_read(
+                firestore_api.get_document,
+                False,
+                request=request,
+                metadata=self._client._rpc_metadata,
+                **kwargs,
             )
         except exceptions.NotFound:
             data = None
@@ -376,7 +394,7 @@ class DocumentReference(BaseDocumentReference):
             reference=self,
             data=data,
             exists=exists,
-            read_time=None,  # No server read_time available
+            read_time=read_time,  # The server only echoes a pinned read_time
             create_time=create_time,
             update_time=update_time,
         )
@@ -409,11 +427,12 @@ class DocumentReference(BaseDocumentReference):
         iterator = self._client._firestore_api.list_collection_ids(
             request=request, metadata=self._client._rpc_metadata, **kwargs,
         )
+        iterator = _helpers.bind_page_kwargs(iterator, kwargs)
 
         for collection_id in iterator:
             yield self.collection(collection_id)
 
-    def on_snapshot(self, callback: Callable) -> Watch:
+    def on_snapshot(self, callback: Callable) -> "Watch":
         """Watch this document.
 
         This starts a watch on this document using a background thread. The
@@ -445,4 +464,7 @@ class DocumentReference(BaseDocumentReference):
             # Terminate this watch
             doc_watch.unsubscribe()
         """
+        # ``watch`` pulls in ``google.api_core.bidi``; import it on first use.
+        from google.cloud.firestore_v1.watch import Watch
+
         return Watch.for_document(self, callback, DocumentSnapshot, DocumentReference)
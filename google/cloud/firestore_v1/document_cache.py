@@ -0,0 +1,372 @@
+# Copyright 2020 Google LLC All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""A persistent, offline-capable cache of documents.
+
+Documents are stored in a local SQLite database as serialized ``Document``
+protobufs, keyed by their resource name. The cache survives process
+restarts, so an application can:
+
+* warm-start a listener from the documents and resume token saved by the
+  previous process, fetching only the changes made since
+  (see :meth:`DocumentCache.listen`);
+* keep serving reads when the backend cannot be reached
+  (see :meth:`DocumentCache.stream`).
+
+.. code-block:: python
+
+    with client.document_cache("/var/cache/firestore.db") as cache:
+        for snapshot in cache.stream(client.collection("countries")):
+            ...
+"""
+
+import hashlib
+import sqlite3
+import threading
+
+from google.api_core import exceptions  # type: ignore
+
+from google.cloud.firestore_v1 import _helpers
+from google.cloud.firestore_v1.base_document import DocumentSnapshot
+from google.cloud.firestore_v1.document import DocumentReference
+from google.cloud.firestore_v1.query_matcher import QueryMatcher
+from google.cloud.firestore_v1.types import document as document_pb
+from google.cloud.firestore_v1.types import firestore
+from typing import Any, Callable, Generator, Iterable, List, Optional
+
+
+DEFAULT_MMAP_SIZE = 256 * 1024 * 1024
+"""int: Number of bytes of the database file SQLite may memory-map."""
+
+_OFFLINE_EXCEPTIONS = (
+    exceptions.DeadlineExceeded,
+    exceptions.RetryError,
+    exceptions.ServiceUnavailable,
+)
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS documents ("
+    " name TEXT PRIMARY KEY,"
+    " parent TEXT NOT NULL,"
+    " collection_id TEXT NOT NULL,"
+    " update_time INTEGER NOT NULL,"
+    " document BLOB NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS documents_by_parent ON documents (parent)",
+    "CREATE INDEX IF NOT EXISTS documents_by_collection_id"
+    " ON documents (collection_id)",
+    "CREATE TABLE IF NOT EXISTS targets ("
+    " target TEXT PRIMARY KEY,"
+    " resume_token BLOB NOT NULL)",
+)
+# Writes never replace a document with an older version of itself.
+_UPSERT = (
+    "INSERT INTO documents (name, parent, collection_id, update_time, document)"
+    " VALUES (?, ?, ?, ?, ?)"
+    " ON CONFLICT (name) DO UPDATE SET"
+    " update_time = excluded.update_time, document = excluded.document"
+    " WHERE excluded.update_time >= documents.update_time"
+)
+
+
+def _document_row(document) -> tuple:
+    """Convert a ``Document`` protobuf to a row of the ``documents`` table."""
+    document = getattr(document, "_pb", document)
+    parent, _, _ = document.name.rpartition("/")
+    update_time = document.update_time
+    return (
+        document.name,
+        parent,
+        parent.rpartition("/")[2],
+        update_time.seconds * 10 ** 9 + update_time.nanos,
+        document.SerializeToString(),
+    )
+
+
+def _target_key(query) -> str:
+    """Identify a query target across processes."""
+    parent_path, _ = query._parent._parent_info()
+    target_pb = firestore.Target.QueryTarget(
+        parent=parent_path, structured_query=query._to_protobuf()
+    )
+    serialized = target_pb._pb.SerializeToString(deterministic=True)
+    return hashlib.sha256(serialized).hexdigest()
+
+
+class DocumentCache(object):
+    """A persistent cache of documents, backed by SQLite.
+
+    Instances are safe to share between threads (e.g. with listener
+    callbacks).
+
+    Args:
+        client (:class:`~google.cloud.firestore_v1.client.Client`):
+            The client used to build references for cached documents.
+        path (str): The database file to use. Use ``":memory:"`` for a
+            cache which does not outlive the process.
+        mmap_size (Optional[int]): Number of bytes of the database file
+            which SQLite may memory-map to serve reads.
+    """
+
+    def __init__(self, client, path: str, mmap_size: int = DEFAULT_MMAP_SIZE) -> None:
+        self._client = client
+        self._path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute("PRAGMA journal_mode = WAL")
+            self._connection.execute("PRAGMA mmap_size = {:d}".format(mmap_size))
+            for statement in _SCHEMA:
+                self._connection.execute(statement)
+
+    def __len__(self) -> int:
+        with self._lock:
+            (count,) = self._connection.execute(
+                "SELECT COUNT(*) FROM documents"
+            ).fetchone()
+        return count
+
+    def _to_snapshot(self, document) -> DocumentSnapshot:
+        """Convert a ``Document`` protobuf to a snapshot."""
+        prefix = self._client._database_string + "/documents/"
+        reference = self._client.document(document.name[len(prefix) :])
+        return DocumentSnapshot(
+            reference,
+            _helpers.decode_dict(document.fields, self._client),
+            exists=True,
+            read_time=None,
+            create_time=document.create_time,
+            update_time=document.update_time,
+        )
+
+    def put(self, document) -> None:
+        """Store a document.
+
+        The cached copy is kept if it is more recent than ``document``.
+
+        Args:
+            document (Union[DocumentSnapshot, \
+                ~google.cloud.firestore_v1.types.Document]): The document
+                to store. Snapshots of missing documents are ignored.
+        """
+        self.put_all([document])
+
+    def put_all(self, documents: Iterable) -> None:
+        """Store several documents in a single transaction.
+
+        Args:
+            documents (Iterable[Union[DocumentSnapshot, \
+                ~google.cloud.firestore_v1.types.Document]]): The documents
+                to store. Snapshots of missing documents are ignored.
+        """
+        rows = []
+        for document in documents:
+            if isinstance(document, DocumentSnapshot):
+                if not document.exists:
+                    continue
+                document = _helpers.document_pb_from_snapshot(document)
+            rows.append(_document_row(document))
+
+        with self._lock, self._connection:
+            self._connection.executemany(_UPSERT, rows)
+
+    def delete(self, reference: DocumentReference) -> None:
+        """Remove a document from the cache.
+
+        Args:
+            reference (:class:`~google.cloud.firestore_v1.document.DocumentReference`):
+                The document to remove.
+        """
+        self._delete_names([reference._document_path])
+
+    def _delete_names(self, names: Iterable[str]) -> None:
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "DELETE FROM documents WHERE name = ?", [(name,) for name in names]
+            )
+
+    def get(self, reference: DocumentReference) -> Optional[DocumentSnapshot]:
+        """Read a document from the cache.
+
+        Args:
+            reference (:class:`~google.cloud.firestore_v1.document.DocumentReference`):
+                The document to read.
+
+        Returns:
+            Optional[DocumentSnapshot]: The cached snapshot, or :data:`None`
+            if the document is not cached.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT document FROM documents WHERE name = ?",
+                (reference._document_path,),
+            ).fetchone()
+
+        if row is None:
+            return None
+        return self._to_snapshot(document_pb.Document.deserialize(row[0]))
+
+    def _candidates(self, query) -> List[document_pb.Document]:
+        """Load the cached documents in the collection(s) a query reads."""
+        if query._all_descendants:
+            sql = "SELECT document FROM documents WHERE collection_id = ?"
+            parameters = (query._parent.id,)
+        else:
+            _, expected_prefix = query._parent._parent_info()
+            sql = "SELECT document FROM documents WHERE parent = ?"
+            parameters = (expected_prefix,)
+
+        with self._lock:
+            rows = self._connection.execute(sql, parameters).fetchall()
+        return [document_pb.Document.deserialize(row[0]) for row in rows]
+
+    def query(self, query) -> List[DocumentSnapshot]:
+        """Evaluate a query against the cached documents.
+
+        Args:
+            query (:class:`~google.cloud.firestore_v1.query.Query`): The
+                query to evaluate.
+
+        Returns:
+            List[DocumentSnapshot]: The matching documents, in query order.
+        """
+        matcher = QueryMatcher(query)
+        return [
+            self._to_snapshot(document)
+            for document in matcher.apply(self._candidates(query))
+        ]
+
+    def stream(self, query, **kwargs) -> Generator[DocumentSnapshot, Any, None]:
+        """Read a query from the backend, falling back to the cache.
+
+        Results streamed from the backend are written to the cache. If the
+        backend cannot be reached before the first result is received, the
+        query is evaluated against the cached documents instead.
+
+        Documents deleted on the backend are not removed from the cache by
+        this method; use :meth:`listen` to keep a cache fully in sync.
+
+        Args:
+            query (:class:`~google.cloud.firestore_v1.query.Query`): The
+                query to run.
+            kwargs (Dict[str, Any]): Passed to
+                :meth:`~google.cloud.firestore_v1.query.Query.stream`.
+
+        Yields:
+            :class:`~google.cloud.firestore_v1.base_document.DocumentSnapshot`:
+            The matching documents.
+        """
+        received = False
+        try:
+            for snapshot in query.stream(**kwargs):
+                received = True
+                self.put(snapshot)
+                yield snapshot
+        except _OFFLINE_EXCEPTIONS:
+            if received:
+                raise
+            yield from self.query(query)
+
+    def resume_token(self, query) -> Optional[bytes]:
+        """Look up the token saved by the last listener on a query.
+
+        Args:
+            query (:class:`~google.cloud.firestore_v1.query.Query`): The
+                listened query.
+
+        Returns:
+            Optional[bytes]: The resume token, if any.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT resume_token FROM targets WHERE target = ?",
+                (_target_key(query),),
+            ).fetchone()
+        return None if row is None else row[0]
+
+    def _save_resume_token(self, target: str, resume_token: bytes) -> None:
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO targets (target, resume_token) VALUES (?, ?)",
+                (target, resume_token),
+            )
+
+    def listen(self, query, callback: Callable):
+        """Listen to a query, keeping the cache in sync with its results.
+
+        If a resume token was saved for the same query, the listener starts
+        from the cached documents and the server only sends the changes
+        made since the token was issued. Otherwise (or if the server resets
+        the target) all matching documents are sent.
+
+        Args:
+            query (:class:`~google.cloud.firestore_v1.query.Query`): The
+                query to listen to.
+            callback (Callable[[List[DocumentSnapshot], list, datetime], None]):
+                Called with each snapshot, as with
+                :meth:`~google.cloud.firestore_v1.query.Query.on_snapshot`.
+
+        Returns:
+            :class:`~google.cloud.firestore_v1.watch.Watch`: The listener.
+        """
+        from google.cloud.firestore_v1.watch import ChangeType
+        from google.cloud.firestore_v1.watch import ListenerState
+        from google.cloud.firestore_v1.watch import Watch
+
+        target = _target_key(query)
+        resume_token = self.resume_token(query)
+        state = None
+        if resume_token is not None:
+            documents = QueryMatcher(query).apply(self._candidates(query))
+            state = ListenerState(resume_token, documents)
+
+        watches = []
+
+        def on_snapshot(snapshots, changes, read_time):
+            removed = [
+                change.document.reference._document_path
+                for change in changes
+                if change.type == ChangeType.REMOVED
+            ]
+            self._delete_names(removed)
+            self.put_all(
+                change.document
+                for change in changes
+                if change.type != ChangeType.REMOVED
+            )
+            # The watch is only missing if the callback runs during startup.
+            if watches and watches[0].resume_token is not None:
+                self._save_resume_token(target, watches[0].resume_token)
+            callback(snapshots, changes, read_time)
+
+        watch = Watch.for_query(
+            query, on_snapshot, DocumentSnapshot, DocumentReference, state=state,
+        )
+        watches.append(watch)
+        return watch
+
+    def clear(self) -> None:
+        """Remove all documents and resume tokens from the cache."""
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM documents")
+            self._connection.execute("DELETE FROM targets")
+
+    def close(self) -> None:
+        """Close the underlying database."""
+        with self._lock:
+            self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
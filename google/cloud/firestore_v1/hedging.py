@@ -0,0 +1,203 @@
+# Copyright 2020 Google LLC All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Helpers for hedging idempotent reads against slow backends."""
+
+import concurrent.futures
+import time
+
+from google.cloud.firestore_v1.base_hedging import BaseHedgingPolicy, _END
+
+from typing import Any, Callable, Generator
+
+DEFAULT_MAX_WORKERS = 32
+"""int: Default number of threads sending the requests of hedged reads."""
+
+
+class HedgingPolicy(BaseHedgingPolicy):
+    """Send duplicate requests for reads which take longer than usual.
+
+    Once enabled with
+    :meth:`~google.cloud.firestore_v1.client.Client.hedge_reads`, the
+    requests of :meth:`~google.cloud.firestore_v1.document.DocumentReference.get`,
+    :meth:`~google.cloud.firestore_v1.client.Client.get_all` and
+    :meth:`~google.cloud.firestore_v1.query.Query.stream` (and the methods
+    built on them) are hedged.
+
+    Requests are sent from a pool of threads, while the reading thread
+    waits for the first response. Losing streams are cancelled; losing
+    single-response requests cannot be cancelled, so their response is
+    discarded.
+
+    Args:
+        client (:class:`~google.cloud.firestore_v1.client.Client`):
+            The client that created this policy.
+        max_workers (Optional[int]): The number of threads sending
+            requests.
+        kwargs (Dict[str, Any]): Passed to
+            :class:`~google.cloud.firestore_v1.base_hedging.BaseHedgingPolicy`.
+    """
+
+    def __init__(
+        self, client, max_workers: int = DEFAULT_MAX_WORKERS, **kwargs: Any
+    ) -> None:
+        super(HedgingPolicy, self).__init__(client, **kwargs)
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="FirestoreHedgedRead"
+        )
+
+    def call(self, method: Callable, **kwargs: Any) -> Any:
+        """Send a single-response request, hedging it if slow.
+
+        Args:
+            method (Callable): The API method.
+            kwargs (Dict[str, Any]): The arguments of ``method``.
+
+        Returns:
+            Any: The first response.
+
+        Raises:
+            ~google.api_core.exceptions.DeadlineExceeded: If the policy's
+                ``deadline`` passes before a response.
+            Exception: The error of the first request, if all of them
+                fail.
+        """
+        return self._race(lambda attempt_kwargs: method(**attempt_kwargs), kwargs)
+
+    def stream(self, method: Callable, **kwargs: Any) -> Generator[Any, Any, None]:
+        """Start a streaming request, hedging it if its first response is slow.
+
+        Args:
+            method (Callable): The API method.
+            kwargs (Dict[str, Any]): The arguments of ``method``.
+
+        Yields:
+            Any: The responses of the first stream to respond.
+
+        Raises:
+            ~google.api_core.exceptions.DeadlineExceeded: If the policy's
+                ``deadline`` passes before a response.
+            Exception: The error of the first request, if all of them
+                fail.
+        """
+        # Streams are cancelled as soon as they lose, even if still
+        # waiting for their first response.
+        streams = []
+
+        def attempt(attempt_kwargs):
+            iterator = method(**attempt_kwargs)
+            streams.append(iterator)
+            return iterator, next(iterator, _END)
+
+        iterator = None
+        try:
+            iterator, first = self._race(
+                attempt, kwargs, lambda result: self._cancel_stream(result[0])
+            )
+        finally:
+            for stream in streams:
+                if stream is not iterator:
+                    self._cancel_stream(stream)
+
+        if first is _END:
+            return
+        yield first
+        yield from iterator
+
+    def _race(
+        self, attempt: Callable, kwargs: dict, cancel_result: Callable = None
+    ) -> Any:
+        """Run ``attempt``, then hedges of it, until one of them returns.
+
+        Args:
+            attempt (Callable[[dict], Any]): Sends a request with the given
+                arguments.
+            kwargs (dict): The arguments of the request.
+            cancel_result (Optional[Callable[[Any], None]]): Cancels the
+                result of an attempt which lost the race.
+
+        Returns:
+            Any: The result of the first attempt to return.
+        """
+        start = time.monotonic()
+        deadline = None
+        if self._deadline is not None:
+            deadline = start + self._deadline
+
+        # Attempts not finished yet, mapped to their index and start time.
+        attempts = {}
+        errors = []
+
+        def launch(index):
+            future = self._executor.submit(
+                attempt, self._attempt_kwargs(kwargs, deadline)
+            )
+            attempts[future] = (index, time.monotonic())
+
+        launch(0)
+        hedges = 0
+        next_hedge = start + self.hedge_delay()
+        while True:
+            done, _ = concurrent.futures.wait(
+                list(attempts),
+                timeout=self._wait_timeout(hedges, next_hedge, deadline),
+                return_when=concurrent.futures.FIRST_COMPLETED,
+            )
+            for future in done:
+                index, started = attempts.pop(future)
+                error = future.exception()
+                if error is None or self._is_answer(error):
+                    self._abandon(attempts, cancel_result)
+                    self._record(hedges, index, time.monotonic() - started)
+                    return future.result()
+                errors.append(error)
+
+            if not attempts:
+                self._record(hedges, None, 0.0)
+                raise errors[0]
+
+            now = time.monotonic()
+            if deadline is not None and now >= deadline:
+                self._abandon(attempts, cancel_result)
+                self._record(hedges, None, 0.0)
+                raise self._deadline_exceeded()
+
+            if hedges < self._max_hedges and now >= next_hedge:
+                hedges += 1
+                launch(hedges)
+                next_hedge = now + self.hedge_delay()
+
+    @staticmethod
+    def _abandon(attempts: dict, cancel_result: Callable = None) -> None:
+        """Cancel the attempts which lost the race."""
+        for future in attempts:
+            if future.cancel() or cancel_result is None:
+                continue
+
+            def cancel_done(done_future):
+                if done_future.exception() is None:
+                    cancel_result(done_future.result())
+
+            future.add_done_callback(cancel_done)
+
+    def close(self) -> None:
+        """Stop hedging the client's reads and release the threads."""
+        self._detach()
+        self._executor.shutdown(wait=False)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,332 @@
+# Copyright 2020 Google LLC All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Derive the composite indexes needed by the queries an application runs.
+
+Queries which need a missing composite index fail at runtime with
+``FailedPrecondition``. An :class:`IndexAdvisor` records the shape of the
+queries run while it is attached (e.g. during a test run), computes the
+composite indexes they need, and can create the missing ones:
+
+.. code-block:: python
+
+    advisor = IndexAdvisor()
+    with advisor:
+        run_the_test_suite()
+
+    admin_client = FirestoreAdminClient()
+    for index in advisor.missing_indexes(admin_client, "my-project"):
+        print(index)
+    advisor.create_missing_indexes(admin_client, "my-project")
+"""
+
+import collections
+import threading
+
+from google.cloud.firestore_admin_v1.types import index as index_pb
+from google.cloud.firestore_v1 import base_query
+from google.cloud.firestore_v1.base_client import DEFAULT_DATABASE
+from google.cloud.firestore_v1.types import StructuredQuery
+from typing import List, Optional, Tuple
+
+
+_ASCENDING = "ASCENDING"
+_DESCENDING = "DESCENDING"
+_CONTAINS = "CONTAINS"
+_DIRECTIONS = {
+    StructuredQuery.Direction.ASCENDING: _ASCENDING,
+    StructuredQuery.Direction.DESCENDING: _DESCENDING,
+}
+_operator_enum = StructuredQuery.FieldFilter.Operator
+_EQUALITY_OPERATORS = (_operator_enum.EQUAL, _operator_enum.IN)
+_CONTAINS_OPERATORS = (_operator_enum.ARRAY_CONTAINS, _operator_enum.ARRAY_CONTAINS_ANY)
+_EQUALITY_UNARY_OPERATORS = (
+    StructuredQuery.UnaryFilter.Operator.IS_NAN,
+    StructuredQuery.UnaryFilter.Operator.IS_NULL,
+)
+_NAME = "__name__"
+
+
+def _query_shape(query_pb) -> Optional[Tuple]:
+    """Compute the composite index a query needs, if any.
+
+    Equality filters are served by merging indexes, so they come first in
+    the index, sorted by field path; they are followed by the
+    ``array_contains`` fields and by the orders of the query (including
+    the implicit order on the field of an inequality filter).
+
+    Args:
+        query_pb (google.cloud.firestore_v1.types.StructuredQuery): The query.
+
+    Returns:
+        Optional[Tuple[str, bool, Tuple[Tuple[str, str], ...], int]]: The
+        collection ID, whether the query is a collection group query, the
+        index fields as ``(field_path, mode)`` pairs, and the number of
+        leading equality fields; or :data:`None` if the query can be
+        served by the automatic single-field indexes.
+    """
+    query_pb = getattr(query_pb, "_pb", query_pb)
+    selector = query_pb.from_[0]
+    where = query_pb.where
+    if where.HasField("composite_filter"):
+        filters = list(where.composite_filter.filters)
+    elif where.WhichOneof("filter_type") is not None:
+        filters = [where]
+    else:
+        filters = []
+
+    equality, contains, inequality = set(), [], None
+    for filter_pb in filters:
+        if filter_pb.HasField("unary_filter"):
+            unary = filter_pb.unary_filter
+            if unary.op in _EQUALITY_UNARY_OPERATORS:
+                equality.add(unary.field.field_path)
+            else:
+                inequality = unary.field.field_path
+            continue
+
+        field_filter = filter_pb.field_filter
+        field_path = field_filter.field.field_path
+        if field_filter.op in _EQUALITY_OPERATORS:
+            equality.add(field_path)
+        elif field_filter.op in _CONTAINS_OPERATORS:
+            contains.append(field_path)
+        else:
+            inequality = field_path
+
+    orders = [
+        (order.field.field_path, _DIRECTIONS[order.direction])
+        for order in query_pb.order_by
+    ]
+    if inequality is not None and not orders:
+        orders.append((inequality, _ASCENDING))
+
+    # A trailing order on the document name is implied by the index, unless
+    # it goes against the direction of the order before it.
+    if orders and orders[-1][0] == _NAME:
+        previous = orders[-2][1] if len(orders) > 1 else _ASCENDING
+        if orders[-1][1] == previous:
+            orders.pop()
+
+    if not orders:
+        return None
+
+    ordered = {field_path for field_path, _ in orders}
+    leading = [(field_path, _ASCENDING) for field_path in sorted(equality - ordered)]
+    fields = leading + [(field_path, _CONTAINS) for field_path in contains] + orders
+    if len(fields) < 2:
+        return None
+
+    return (
+        selector.collection_id,
+        selector.all_descendants,
+        tuple(fields),
+        len(leading),
+    )
+
+
+def _index_for_shape(shape: Tuple) -> index_pb.Index:
+    """Build the ``Index`` protobuf for a query shape."""
+    _, all_descendants, fields, _ = shape
+    index_fields = []
+    for field_path, mode in fields:
+        if mode == _CONTAINS:
+            index_field = index_pb.Index.IndexField(
+                field_path=field_path,
+                array_config=index_pb.Index.IndexField.ArrayConfig.CONTAINS,
+            )
+        else:
+            index_field = index_pb.Index.IndexField(
+                field_path=field_path, order=index_pb.Index.IndexField.Order[mode]
+            )
+        index_fields.append(index_field)
+
+    query_scope = index_pb.Index.QueryScope.COLLECTION
+    if all_descendants:
+        query_scope = index_pb.Index.QueryScope.COLLECTION_GROUP
+    return index_pb.Index(query_scope=query_scope, fields=index_fields)
+
+
+def _index_fields(index) -> List[Tuple[str, str]]:
+    """Convert the fields of an existing index to ``(field_path, mode)``."""
+    fields = []
+    for index_field in index.fields:
+        if index_field._pb.HasField("array_config"):
+            fields.append((index_field.field_path, _CONTAINS))
+        else:
+            fields.append((index_field.field_path, index_field.order.name))
+
+    if fields and fields[-1][0] == _NAME:
+        previous = fields[-2][1] if len(fields) > 1 else _ASCENDING
+        if fields[-1][1] == previous:
+            fields.pop()
+    return fields
+
+
+def _covers(index, shape: Tuple) -> bool:
+    """Tell if an existing index can serve queries of the given shape."""
+    _, all_descendants, fields, leading = shape
+    if index.state == index_pb.Index.State.NEEDS_REPAIR:
+        return False
+    if (index.query_scope == index_pb.Index.QueryScope.COLLECTION_GROUP) != (
+        all_descendants
+    ):
+        return False
+
+    existing = _index_fields(index)
+    if len(existing) != len(fields) or existing[leading:] != list(fields[leading:]):
+        return False
+
+    # Equality fields may appear in any order, and in either direction.
+    return {field_path for field_path, _ in existing[:leading]} == {
+        field_path for field_path, _ in fields[:leading]
+    } and all(mode != _CONTAINS for _, mode in existing[:leading])
+
+
+class IndexAdvisor(object):
+    """Record query shapes and derive the composite indexes they need.
+
+    Queries can be recorded explicitly with :meth:`record`, or by using the
+    advisor as a context manager: every query run (through ``get`` /
+    ``stream`` of any client) while it is attached is then recorded.
+
+    Instances are safe to share between threads.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._shapes = collections.Counter()
+
+    def record(self, query) -> None:
+        """Record the shape of a query.
+
+        Args:
+            query (Union[:class:`~google.cloud.firestore_v1.base_query.BaseQuery`, \
+                ~google.cloud.firestore_v1.types.StructuredQuery]):
+                The query, or its protobuf.
+        """
+        if isinstance(query, base_query.BaseQuery):
+            query = query._to_protobuf()
+
+        shape = _query_shape(query)
+        if shape is not None:
+            with self._lock:
+                self._shapes[shape] += 1
+
+    def attach(self) -> None:
+        """Start recording every query run by the library."""
+        if self.record not in base_query._query_observers:
+            base_query._query_observers.append(self.record)
+
+    def detach(self) -> None:
+        """Stop recording the queries run by the library."""
+        if self.record in base_query._query_observers:
+            base_query._query_observers.remove(self.record)
+
+    def __enter__(self):
+        self.attach()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.detach()
+
+    def required_indexes(self) -> List[Tuple[str, index_pb.Index]]:
+        """Compute the composite indexes needed by the recorded queries.
+
+        Queries differing only by the order of their equality filters (or by
+        the values they filter on) share an index.
+
+        Returns:
+            List[Tuple[str, google.cloud.firestore_admin_v1.types.Index]]:
+            The collection ID and definition of each index, most used first.
+        """
+        with self._lock:
+            shapes = [shape for shape, _ in self._shapes.most_common()]
+        return [(shape[0], _index_for_shape(shape)) for shape in shapes]
+
+    def missing_indexes(
+        self, admin_client, project: str, database: str = DEFAULT_DATABASE
+    ) -> List[Tuple[str, index_pb.Index]]:
+        """Compare the required indexes with the existing ones.
+
+        Indexes being created count as existing, while indexes which need
+        repair do not.
+
+        Args:
+            admin_client (:class:`~google.cloud.firestore_admin_v1.services.firestore_admin.client.FirestoreAdminClient`):
+                The client used to list the existing indexes.
+            project (str): The project holding the database.
+            database (Optional[str]): The database.
+
+        Returns:
+            List[Tuple[str, google.cloud.firestore_admin_v1.types.Index]]:
+            The collection ID and definition of each missing index.
+        """
+        with self._lock:
+            shapes = [shape for shape, _ in self._shapes.most_common()]
+
+        existing = {}
+        missing = []
+        for shape in shapes:
+            collection_id = shape[0]
+            if collection_id not in existing:
+                parent = admin_client.collection_group_path(
+                    project, database, collection_id
+                )
+                existing[collection_id] = list(
+                    admin_client.list_indexes(request={"parent": parent})
+                )
+            if not any(_covers(index, shape) for index in existing[collection_id]):
+                missing.append((collection_id, _index_for_shape(shape)))
+
+        return missing
+
+    def create_missing_indexes(
+        self,
+        admin_client,
+        project: str,
+        database: str = DEFAULT_DATABASE,
+        timeout: float = None,
+    ) -> List[index_pb.Index]:
+        """Create the missing indexes, and wait until they are built.
+
+        All the indexes are requested before waiting on the long-running
+        operations, so they are built concurrently.
+
+        Args:
+            admin_client (:class:`~google.cloud.firestore_admin_v1.services.firestore_admin.client.FirestoreAdminClient`):
+                The client used to manage the indexes.
+            project (str): The project holding the database.
+            database (Optional[str]): The database.
+            timeout (Optional[float]): The number of seconds to wait for
+                each index to be built.
+
+        Returns:
+            List[google.cloud.firestore_admin_v1.types.Index]: The created
+            indexes.
+        """
+        operations = [
+            admin_client.create_index(
+                request={
+                    "parent": admin_client.collection_group_path(
+                        project, database, collection_id
+                    ),
+                    "index": index,
+                }
+            )
+            for collection_id, index in self.missing_indexes(
+                admin_client, project, database
+            )
+        ]
+        return [operation.result(timeout=timeout) for operation in operations]
@@ -15,7 +15,8 @@
 from enum import Enum
 from google.cloud.firestore_v1._helpers import decode_value
 import math
-from typing import Any
+import struct
+from typing import Any, Iterable, Sequence
 
 
 class TypeOrder(Enum):
@@ -206,3 +207,203 @@ class Order(object):
         # in Python 3, so this is an equivalent suggested by
         # https://docs.python.org/3.0/whatsnew/3.0.html#ordering-comparisons
         return (left > right) - (left < right)
+
+
+# Order-preserving binary keys.
+#
+# Each value is encoded as a type tag (its ``TypeOrder`` plus one) followed
+# by a payload which sorts bytewise like ``Order.compare``, and which is
+# self-delimiting, so that the keys of arrays, maps and cursors can be made
+# by concatenating the keys of their elements:
+#
+# * numbers are a NaN marker, or the double nearest to the value (with its
+#   bits flipped so that they sort as unsigned integers) followed by the
+#   offset of the exact integer from that double;
+# * strings, blobs and path segments escape ``\x00`` as ``\x00\xff`` and end
+#   with ``\x00\x01`` (strings are UTF-8, whose byte order is code point
+#   order);
+# * arrays, maps and reference paths end with ``\x00``, which sorts before
+#   any element.
+
+_END = b"\x00"
+_ENTRY = b"\x01"
+_TERMINATOR = b"\x00\x01"
+_NAN = b"\x00"
+_NOT_NAN = b"\x01"
+_SIGN_BIT = 1 << 63
+_ALL_BITS = (1 << 64) - 1
+_DOUBLE = struct.Struct(">d")
+_UINT64 = struct.Struct(">Q")
+_TIMESTAMP = struct.Struct(">QL")
+_INVERTED = bytes(range(255, -1, -1))
+
+
+def _tag(type_order: TypeOrder) -> bytes:
+    return bytes([type_order.value + 1])
+
+
+def _escape(data: bytes) -> bytes:
+    return data.replace(b"\x00", b"\x00\xff") + _TERMINATOR
+
+
+def _double_key(number: float) -> bytes:
+    if number == 0.0:
+        number = 0.0  # -0.0 equals 0.0.
+    (bits,) = _UINT64.unpack(_DOUBLE.pack(number))
+    if bits & _SIGN_BIT:
+        bits ^= _ALL_BITS
+    else:
+        bits |= _SIGN_BIT
+    return _UINT64.pack(bits)
+
+
+def _number_key(number) -> bytes:
+    if isinstance(number, float):
+        if math.isnan(number):
+            return _NUMBER_TAG + _NAN
+        offset = 0
+    else:
+        # Rounding to a double is monotonic: integers only need the offset
+        # from the nearest double to sort among (and against) doubles.
+        nearest = float(number)
+        offset = number - int(nearest)
+        number = nearest
+    return (
+        _NUMBER_TAG + _NOT_NAN + _double_key(number) + _UINT64.pack(offset + _SIGN_BIT)
+    )
+
+
+def _path_key(path: str) -> bytes:
+    """Encode a fully-qualified document name as a reference key."""
+    return (
+        _REF_TAG
+        + b"".join(_escape(segment.encode("utf-8")) for segment in path.split("/"))
+        + _END
+    )
+
+
+def _reference_key(value_pb) -> bytes:
+    return _path_key(value_pb.reference_value)
+
+
+def _timestamp_key(value_pb) -> bytes:
+    timestamp = value_pb.timestamp_value
+    return _TIMESTAMP_TAG + _TIMESTAMP.pack(
+        timestamp.seconds + _SIGN_BIT, timestamp.nanos
+    )
+
+
+def _geo_point_key(value_pb) -> bytes:
+    geo_point = value_pb.geo_point_value
+    return (
+        _GEO_POINT_TAG
+        + _double_key(geo_point.latitude)
+        + _double_key(geo_point.longitude)
+    )
+
+
+def _array_key(value_pb) -> bytes:
+    return (
+        _ARRAY_TAG
+        + b"".join(_value_key(element) for element in value_pb.array_value.values)
+        + _END
+    )
+
+
+def _map_key(value_pb) -> bytes:
+    fields = value_pb.map_value.fields
+    return (
+        _OBJECT_TAG
+        + b"".join(
+            _ENTRY + _escape(key.encode("utf-8")) + _value_key(fields[key])
+            for key in sorted(fields)
+        )
+        + _END
+    )
+
+
+_NUMBER_TAG = _tag(TypeOrder.NUMBER)
+_TIMESTAMP_TAG = _tag(TypeOrder.TIMESTAMP)
+_REF_TAG = _tag(TypeOrder.REF)
+_GEO_POINT_TAG = _tag(TypeOrder.GEO_POINT)
+_ARRAY_TAG = _tag(TypeOrder.ARRAY)
+_OBJECT_TAG = _tag(TypeOrder.OBJECT)
+_NULL_KEY = _tag(TypeOrder.NULL)
+_BOOLEAN_KEYS = (_tag(TypeOrder.BOOLEAN) + b"\x00", _tag(TypeOrder.BOOLEAN) + b"\x01")
+_STRING_TAG = _tag(TypeOrder.STRING)
+_BLOB_TAG = _tag(TypeOrder.BLOB)
+
+_KEY_FUNCTIONS = {
+    "null_value": lambda value_pb: _NULL_KEY,
+    "boolean_value": lambda value_pb: _BOOLEAN_KEYS[value_pb.boolean_value],
+    "integer_value": lambda value_pb: _number_key(value_pb.integer_value),
+    "double_value": lambda value_pb: _number_key(value_pb.double_value),
+    "timestamp_value": _timestamp_key,
+    "string_value": lambda value_pb: (
+        _STRING_TAG + _escape(value_pb.string_value.encode("utf-8"))
+    ),
+    "bytes_value": lambda value_pb: _BLOB_TAG + _escape(value_pb.bytes_value),
+    "reference_value": _reference_key,
+    "geo_point_value": _geo_point_key,
+    "array_value": _array_key,
+    "map_value": _map_key,
+}
+
+
+def _value_key(value_pb) -> bytes:
+    value_type = value_pb.WhichOneof("value_type")
+    if value_type not in _KEY_FUNCTIONS:
+        raise ValueError(f"Could not detect value type for {value_type}")
+    return _KEY_FUNCTIONS[value_type](value_pb)
+
+
+def encode_key(value) -> bytes:
+    """Encode a value into a key with the backend's ordering.
+
+    Comparing two keys as ``bytes`` gives the same result as
+    :meth:`Order.compare` on the values, and the keys of equal values
+    (e.g. ``1`` and ``1.0``) are identical, so keys can be sorted, hashed,
+    or stored in an on-disk index.
+
+    Args:
+        value (google.cloud.firestore_v1.types.Value): The value, either as
+            a proto-plus message or as a raw protobuf.
+
+    Returns:
+        bytes: The key.
+
+    Raises:
+        ValueError: If the value has no type.
+    """
+    return _value_key(getattr(value, "_pb", value))
+
+
+def encode_keys(values: Iterable, descending: Sequence[bool] = None) -> bytes:
+    """Encode a tuple of values (e.g. a query cursor) into a single key.
+
+    Keys compare like the tuples of values, ordered by :meth:`Order.compare`
+    on the first value, then the second, and so on.
+
+    Args:
+        values (Iterable[google.cloud.firestore_v1.types.Value]): The
+            values, either as proto-plus messages or as raw protobufs.
+        descending (Optional[Sequence[bool]]): For each value, whether it
+            sorts in descending order. Values without an entry sort in
+            ascending order.
+
+    Returns:
+        bytes: The key.
+
+    Raises:
+        ValueError: If a value has no type.
+    """
+    descending = descending or ()
+    keys = []
+    for index, value in enumerate(values):
+        key = encode_key(value)
+        if index < len(descending) and descending[index]:
+            # Keys are self-delimiting, so inverting their bytes reverses
+            # their order without affecting the values that follow.
+            key = key.translate(_INVERTED)
+        keys.append(key)
+    return b"".join(keys)
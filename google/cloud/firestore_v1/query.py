@@ -26,16 +26,24 @@ from google.cloud.firestore_v1.base_query import (
     BaseCollectionGroup,
     BaseQuery,
     QueryPartition,
-    _query_response_to_snapshot,
-    _collection_group_query_response_to_snapshot,
     _enum_from_direction,
 )
 
+from google.cloud.firestore_v1 import _helpers
 from google.cloud.firestore_v1 import document
-from google.cloud.firestore_v1.watch import Watch
+from google.cloud.firestore_v1.query_results import QueryResults
+from google.cloud.firestore_v1.query_results import _check_materialized
+from google.cloud.firestore_v1.query_results import _max_documents
 from typing import Any
 from typing import Callable
 from typing import Generator
+from typing import Iterable
+from typing import TYPE_CHECKING
+from typing import Union
+
+
+if TYPE_CHECKING:  # pragma: NO COVER
+    from google.cloud.firestore_v1.watch import Watch
 
 
 class Query(BaseQuery):
@@ -125,7 +133,10 @@ class Query(BaseQuery):
         transaction=None,
         retry: retries.Retry = gapic_v1.method.DEFAULT,
         timeout: float = None,
-    ) -> list:
+        read_time=None,
+        max_documents: int = None,
+        compact: bool = False,
+    ) -> Union[list, QueryResults]:
         """Read the documents in the collection that match this query.
 
         This sends a ``RunQuery`` RPC and returns a list of documents
@@ -142,10 +153,27 @@ class Query(BaseQuery):
                 should be retried.  Defaults to a system-specified policy.
             timeout (float): The timeout for this request.  Defaults to a
                 system-specified value.
+            read_time (Optional[datetime.datetime]): If set, read the
+                documents as they were at this time rather than their latest
+                versions. Cannot be combined with ``transaction``.
+            max_documents (Optional[int]): The maximum number of documents
+                to return. The query stops reading once more match. Defaults
+                to the client's ``max_get_documents``, if any.
+            compact (Optional[bool]): If :data:`True`, return the documents
+                in a :class:`~google.cloud.firestore_v1.query_results.QueryResults`,
+                which holds them encoded and decodes them when they are
+                read, instead of a list of snapshots. Defaults to
+                :data:`False`.
 
         Returns:
-            list: The documents in the collection that match this query.
+            Union[list, :class:`~google.cloud.firestore_v1.query_results.QueryResults`]:
+            The documents in the collection that match this query.
+
+        Raises:
+            ~google.cloud.firestore_v1.query_results.MaterializationLimitExceeded:
+                If more than ``max_documents`` documents match the query.
         """
+        max_documents = _max_documents(self._client, max_documents)
         is_limited_to_last = self._limit_to_last
 
         if self._limit_to_last:
@@ -160,17 +188,70 @@ class Query(BaseQuery):
                 )
             self._limit_to_last = False
 
-        result = self.stream(transaction=transaction, retry=retry, timeout=timeout)
-        if is_limited_to_last:
-            result = reversed(list(result))
+        query = self._bound_for_get(max_documents)
+        if compact:
+            result = query._get_compact(
+                transaction, retry, timeout, read_time, max_documents
+            )
+        else:
+            result = []
+            for snapshot in query.stream(
+                transaction=transaction,
+                retry=retry,
+                timeout=timeout,
+                read_time=read_time,
+            ):
+                _check_materialized(len(result) + 1, max_documents)
+                result.append(snapshot)
+
+        if is_limited_to_last and compact:
+            result._reverse()
+        elif is_limited_to_last:
+            result.reverse()
+
+        return result
+
+    def _get_compact(
+        self, transaction, retry, timeout, read_time, max_documents
+    ) -> QueryResults:
+        """Read the documents for ``get(compact=True)``, without decoding them.
 
-        return list(result)
+        Args:
+            transaction, retry, timeout, read_time, max_documents: As for
+                :meth:`get`.
+
+        Returns:
+            QueryResults: The documents matching the query.
+        """
+        results = self._query_results(max_documents)
+        split_queries = self._split_disjunctions()
+        if split_queries is not None:
+            # Merging the results of split queries needs them decoded.
+            for snapshot in self._stream_split(
+                split_queries, transaction, retry, timeout, read_time
+            ):
+                results._append_snapshot(snapshot)
+            return results
+
+        request, _, kwargs = self._prep_stream(transaction, retry, timeout, read_time)
+        response_iterator = self._client._call_read(
+            self._client._firestore_api.run_query,
+            True,
+            request=request,
+            metadata=self._client._rpc_metadata,
+            **kwargs,
+        )
+        for response in response_iterator:
+            if _helpers.raw_pb(response).HasField("document"):
+                results._append(response)
+        return results
 
     def stream(
         self,
         transaction=None,
         retry: retries.Retry = gapic_v1.method.DEFAULT,
         timeout: float = None,
+        read_time=None,
     ) -> Generator[document.DocumentSnapshot, Any, None]:
         """Read the documents in the collection that match this query.
 
@@ -189,6 +270,12 @@ class Query(BaseQuery):
         added, this method cannot be used (i.e. read-after-write is not
         allowed).
 
+        A query whose ``in`` / ``array_contains_any`` filter has more than
+        :data:`~google.cloud.firestore_v1.base_query.MAX_DISJUNCTION_SIZE`
+        values is run as several queries, streamed at once; their results
+        are merged in order, without duplicates, before the offset and limit
+        are applied.
+
         Args:
             transaction
                 (Optional[:class:`~google.cloud.firestore_v1.transaction.Transaction`]):
@@ -197,32 +284,66 @@ class Query(BaseQuery):
                 should be retried.  Defaults to a system-specified policy.
             timeout (float): The timeout for this request.  Defaults to a
                 system-specified value.
+            read_time (Optional[datetime.datetime]): If set, read the
+                documents as they were at this time rather than their latest
+                versions. Cannot be combined with ``transaction``.
 
         Yields:
             :class:`~google.cloud.firestore_v1.document.DocumentSnapshot`:
             The next document that fulfills the query.
         """
+        split_queries = self._split_disjunctions()
+        if split_queries is not None:
+            yield from self._stream_split(
+                split_queries, transaction, retry, timeout, read_time
+            )
+            return
+
         request, expected_prefix, kwargs = self._prep_stream(
-            transaction, retry, timeout,
+            transaction, retry, timeout, read_time
         )
 
-        response_iterator = self._client._firestore_api.run_query(
-            request=request, metadata=self._client._rpc_metadata, **kwargs,
+        response_iterator = self._client._call_read(
+            self._client._firestore_api.run_query,
+            True,
+            request=request,
+            metadata=self._client._rpc_metadata,
+            **kwargs,
         )
 
         for response in response_iterator:
-            if self._all_descendants:
-                snapshot = _collection_group_query_response_to_snapshot(
-                    response, self._parent
-                )
-            else:
-                snapshot = _query_response_to_snapshot(
-                    response, self._parent, expected_prefix
-                )
+            snapshot = self._response_to_snapshot(expected_prefix, response)
             if snapshot is not None:
                 yield snapshot
 
-    def on_snapshot(self, callback: Callable) -> Watch:
+    def _stream_split(
+        self, split_queries, transaction, retry, timeout, read_time
+    ) -> Generator[document.DocumentSnapshot, Any, None]:
+        """Run the queries from ``_split_disjunctions`` and merge their results.
+
+        All the queries are streamed at once, and their results merged as
+        they arrive.
+
+        Args:
+            split_queries (List[Query]): The queries to run.
+            transaction, retry, timeout, read_time: As for :meth:`stream`.
+
+        Returns:
+            Generator[DocumentSnapshot]: The merged results.
+        """
+        return self._merge_split_results(
+            [
+                split_query.stream(
+                    transaction=transaction,
+                    retry=retry,
+                    timeout=timeout,
+                    read_time=read_time,
+                )
+                for split_query in split_queries
+            ]
+        )
+
+    def on_snapshot(self, callback: Callable) -> "Watch":
         """Monitor the documents in this collection that match this query.
 
         This starts a watch on this query using a background thread. The
@@ -251,6 +372,9 @@ class Query(BaseQuery):
             # Terminate this watch
             query_watch.unsubscribe()
         """
+        # ``watch`` pulls in ``google.api_core.bidi``; import it on first use.
+        from google.cloud.firestore_v1.watch import Watch
+
         return Watch.for_query(
             self, callback, document.DocumentSnapshot, document.DocumentReference
         )
@@ -324,6 +448,7 @@ class CollectionGroup(Query, BaseCollectionGroup):
         pager = self._client._firestore_api.partition_query(
             request=request, metadata=self._client._rpc_metadata, **kwargs,
         )
+        pager = _helpers.bind_page_kwargs(pager, kwargs)
 
         start_at = None
         for cursor_pb in pager:
@@ -332,3 +457,78 @@ class CollectionGroup(Query, BaseCollectionGroup):
             start_at = cursor
 
         yield QueryPartition(self, start_at, None)
+
+    def stream_multiprocess(
+        self,
+        partitions: Iterable[QueryPartition],
+        processes: int = None,
+        columns: Iterable[str] = None,
+        batch_size: int = None,
+        retry: retries.Retry = gapic_v1.method.DEFAULT,
+        timeout: float = None,
+        read_time=None,
+    ) -> Generator[Any, Any, None]:
+        """Read the partitions of a query in a pool of processes.
+
+        Decoding documents is CPU-bound, so a single process cannot read a
+        large collection group faster than one core decodes it. Here each
+        partition is read by a process forked from this one, which inherits
+        this query's client (and creates its own channel). Results are
+        sent back in batches, either as serialized ``Document`` protobufs,
+        or, if ``columns`` is passed, as columns of decoded values:
+
+        .. code-block:: python
+
+            group = client.collection_group("events")
+            partitions = group.get_partitions(64)
+            for batch in group.stream_multiprocess(
+                partitions, processes=8, columns=["user", "timestamp"]
+            ):
+                # {"__name__": [...], "user": [...], "timestamp": [...]}
+                frame = pandas.DataFrame(batch)
+
+        Results are yielded in the order they are read, not in the order
+        of the query. This requires the ``fork`` start method, so it is not
+        available on Windows; if this process has already used gRPC, set
+        the ``GRPC_ENABLE_FORK_SUPPORT`` environment variable to ``true``
+        before it starts.
+
+        Args:
+            partitions (Iterable[:class:`~google.cloud.firestore_v1.base_query.QueryPartition`]):
+                The partitions to read, from :meth:`get_partitions`.
+            processes (Optional[int]): The number of processes. Defaults to
+                the number of CPUs, and is at most the number of partitions.
+            columns (Optional[Iterable[str]]): The field paths to decode. If
+                passed, batches of columns are yielded instead of documents.
+                Missing fields are :data:`None`, and references are
+                decoded as the path of the document.
+            batch_size (Optional[int]): The maximum number of documents
+                sent back at once. Defaults to 500.
+            retry (google.api_core.retry.Retry): Designation of what errors, if any,
+                should be retried.  Defaults to a system-specified policy.
+            timeout (float): The timeout for each request.  Defaults to a
+                system-specified value.
+            read_time (Optional[datetime.datetime]): If set, read the
+                documents as they were at this time.
+
+        Yields:
+            Union[~google.cloud.firestore_v1.types.Document, Dict[str, list]]:
+            The documents read, or, if ``columns`` is passed, batches
+            mapping ``"__name__"`` and each column to a list of values.
+
+        Raises:
+            ValueError: If the ``fork`` start method is not available.
+        """
+        # ``multiprocessing`` is only needed here; import it on first use.
+        from google.cloud.firestore_v1 import _multiprocess
+
+        kwargs = _helpers.make_retry_timeout_kwargs(retry, timeout)
+        return _multiprocess.scan(
+            self._client,
+            partitions,
+            processes,
+            columns,
+            batch_size or _multiprocess.DEFAULT_SCAN_BATCH_SIZE,
+            read_time,
+            kwargs,
+        )
@@ -0,0 +1,508 @@
+# Copyright 2020 Google LLC All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Evaluate queries against documents held in memory.
+
+A :class:`QueryMatcher` is compiled once from a
+:class:`~google.cloud.firestore_v1.query.Query` and can then decide whether
+documents match it, and sort and window a local result set, without a round
+trip to the backend:
+
+.. code-block:: python
+
+    query = client.collection("cities").where("population", ">", 10 ** 6)
+    matcher = QueryMatcher(query)
+    big_cities = matcher.apply(cached_snapshots)
+
+Documents may be :class:`~google.cloud.firestore_v1.base_document.DocumentSnapshot`
+instances or ``Document`` protobufs. Values are compared using the same
+ordering as the backend (see :mod:`google.cloud.firestore_v1.order`).
+"""
+
+import functools
+import math
+
+from google.protobuf import struct_pb2
+
+from typing import Any, Callable, Iterable, List, Optional, Tuple
+
+from google.cloud.firestore_v1 import _helpers
+from google.cloud.firestore_v1 import field_path as field_path_module
+from google.cloud.firestore_v1.base_document import DocumentSnapshot
+from google.cloud.firestore_v1.base_query import _cursor_pb
+from google.cloud.firestore_v1 import order
+from google.cloud.firestore_v1.types import document
+from google.cloud.firestore_v1.types import StructuredQuery
+
+
+_operator_enum = StructuredQuery.FieldFilter.Operator
+_unary_enum = StructuredQuery.UnaryFilter.Operator
+_DESCENDING = StructuredQuery.Direction.DESCENDING
+_NAME_FIELD = "__name__"
+_INEQUALITY_OPERATORS = (
+    _operator_enum.LESS_THAN,
+    _operator_enum.LESS_THAN_OR_EQUAL,
+    _operator_enum.GREATER_THAN,
+    _operator_enum.GREATER_THAN_OR_EQUAL,
+    _operator_enum.NOT_EQUAL,
+    _operator_enum.NOT_IN,
+)
+_RANGE_CHECKS = {
+    _operator_enum.LESS_THAN: lambda key, bound: key < bound,
+    _operator_enum.LESS_THAN_OR_EQUAL: lambda key, bound: key <= bound,
+    _operator_enum.GREATER_THAN: lambda key, bound: key > bound,
+    _operator_enum.GREATER_THAN_OR_EQUAL: lambda key, bound: key >= bound,
+}
+_UNSUPPORTED_OPERATOR = "Cannot evaluate filter operator {!r} locally."
+
+
+# Keys of the values checked by unary filters.
+_NULL_KEY = order.encode_key(document.Value(null_value=struct_pb2.NULL_VALUE))
+_NAN_KEY = order.encode_key(document.Value(double_value=math.nan))
+
+
+def _raw_document(document) -> Optional[Tuple[str, Any, dict]]:
+    """Extract the name and raw field map of a snapshot or document.
+
+    Returns:
+        Optional[Tuple[str, Mapping[str, Value], dict]]: The document's full
+        resource name, its fields and an (initially empty) cache of the sort
+        keys computed for them, or :data:`None` if the snapshot is for a
+        missing document.
+    """
+    if isinstance(document, DocumentSnapshot):
+        if not document.exists:
+            return None
+        fields = _helpers.encode_value(document._data)._pb.map_value.fields
+        return document.reference._document_path, fields, {}
+
+    document_pb = getattr(document, "_pb", document)
+    return document_pb.name, document_pb.fields, {}
+
+
+def _make_getter(field_path: str) -> Callable:
+    """Compile a field path into a lookup on a raw document.
+
+    The returned callable returns the raw ``Value`` protobuf stored at the
+    path, or :data:`None` if the document does not have the field.
+    """
+    parts = field_path_module.parse_field_path(field_path)
+    if len(parts) == 1:
+        (part,) = parts
+        return lambda raw: raw[1].get(part)
+
+    def getter(raw):
+        fields = raw[1]
+        value_pb = None
+        for part in parts:
+            if fields is None:
+                return None
+            value_pb = fields.get(part)
+            if value_pb is None:
+                return None
+            if value_pb.WhichOneof("value_type") == "map_value":
+                fields = value_pb.map_value.fields
+            else:
+                fields = None
+        return value_pb
+
+    return getter
+
+
+def _make_key_getter(field_path: str) -> Callable:
+    """Compile a field path into a lookup returning the value's sort key.
+
+    Keys are cached on the raw document, so filters and orders on the same
+    field only convert its value once.
+    """
+    if field_path == _NAME_FIELD:
+        return lambda raw: order._path_key(raw[0])
+
+    getter = _make_getter(field_path)
+
+    def key_getter(raw):
+        cache = raw[2]
+        try:
+            return cache[field_path]
+        except KeyError:
+            pass
+        value_pb = getter(raw)
+        key = None if value_pb is None else order.encode_key(value_pb)
+        cache[field_path] = key
+        return key
+
+    return key_getter
+
+
+def _compile_field_filter(filter_pb) -> Callable:
+    """Compile a ``FieldFilter`` into a predicate on a raw document."""
+    key_getter = _make_key_getter(filter_pb.field.field_path)
+    op = filter_pb.op
+    operand = order.encode_key(filter_pb.value)
+
+    if op == _operator_enum.EQUAL:
+        return lambda raw: key_getter(raw) == operand
+
+    if op in _RANGE_CHECKS:
+        check = _RANGE_CHECKS[op]
+        type_order = operand[0]
+
+        def range_predicate(raw):
+            # Range filters only match values of the same type (the first
+            # byte of a key).
+            key = key_getter(raw)
+            return key is not None and key[0] == type_order and check(key, operand)
+
+        return range_predicate
+
+    if op == _operator_enum.NOT_EQUAL:
+
+        def not_equal_predicate(raw):
+            key = key_getter(raw)
+            return key is not None and key != _NULL_KEY and key != operand
+
+        return not_equal_predicate
+
+    # The remaining operators all take an array operand.
+    elements = frozenset(
+        order.encode_key(value_pb)
+        for value_pb in filter_pb.value._pb.array_value.values
+    )
+
+    if op == _operator_enum.IN:
+        return lambda raw: key_getter(raw) in elements
+
+    if op == _operator_enum.NOT_IN:
+
+        def not_in_predicate(raw):
+            key = key_getter(raw)
+            return key is not None and key != _NULL_KEY and key not in elements
+
+        return not_in_predicate
+
+    if op in (_operator_enum.ARRAY_CONTAINS, _operator_enum.ARRAY_CONTAINS_ANY):
+        if op == _operator_enum.ARRAY_CONTAINS:
+            elements = frozenset([operand])
+        getter = _make_getter(filter_pb.field.field_path)
+
+        def contains_predicate(raw):
+            value_pb = getter(raw)
+            if value_pb is None or value_pb.WhichOneof("value_type") != "array_value":
+                return False
+            return any(
+                order.encode_key(element) in elements
+                for element in value_pb.array_value.values
+            )
+
+        return contains_predicate
+
+    raise ValueError(_UNSUPPORTED_OPERATOR.format(op))
+
+
+def _compile_unary_filter(filter_pb) -> Callable:
+    """Compile a ``UnaryFilter`` into a predicate on a raw document."""
+    key_getter = _make_key_getter(filter_pb.field.field_path)
+    op = filter_pb.op
+
+    if op == _unary_enum.IS_NULL:
+        return lambda raw: key_getter(raw) == _NULL_KEY
+    if op == _unary_enum.IS_NAN:
+        return lambda raw: key_getter(raw) == _NAN_KEY
+    if op == _unary_enum.IS_NOT_NULL:
+        return lambda raw: key_getter(raw) not in (None, _NULL_KEY)
+    if op == _unary_enum.IS_NOT_NAN:
+        return lambda raw: key_getter(raw) not in (None, _NULL_KEY, _NAN_KEY)
+
+    raise ValueError(_UNSUPPORTED_OPERATOR.format(op))
+
+
+def _query_orders(query, orders=None) -> Tuple[List[str], Tuple[bool, ...]]:
+    """Get the fields the backend orders a query's results by.
+
+    These are the explicit orders, else the first inequality filter field,
+    then the document name.
+
+    Args:
+        query (:class:`~google.cloud.firestore_v1.base_query.BaseQuery`):
+            The query.
+        orders (Optional[List[google.cloud.firestore_v1.types.StructuredQuery.Order]]):
+            The query's normalized orders, if already computed.
+
+    Returns:
+        Tuple[List[str], Tuple[bool, ...]]: The ordered field paths, and
+        whether each is ordered descending.
+    """
+    if orders is None:
+        orders = query._normalize_orders()
+    order_fields = [order_pb.field.field_path for order_pb in orders]
+    if not orders:
+        # The backend implicitly orders by the first inequality field.
+        for filter_pb in query._field_filters:
+            if getattr(filter_pb, "op", None) in _INEQUALITY_OPERATORS:
+                order_fields.append(filter_pb.field.field_path)
+                break
+    descending = [order_pb.direction == _DESCENDING for order_pb in orders]
+    descending += [False] * (len(order_fields) - len(descending))
+    if _NAME_FIELD not in order_fields:
+        order_fields.append(_NAME_FIELD)
+        descending.append(descending[-1] if descending else False)
+    return order_fields, tuple(descending)
+
+
+def _snapshot_sort_key(query) -> Callable[[DocumentSnapshot], Any]:
+    """Build a sort key ordering snapshots like the backend orders a query.
+
+    Unlike :meth:`QueryMatcher.compare`, a snapshot without an ordered field
+    (e.g. left out by a projection) does not raise: it sorts before every
+    value.
+
+    Args:
+        query (:class:`~google.cloud.firestore_v1.base_query.BaseQuery`):
+            The query.
+
+    Returns:
+        Callable[[DocumentSnapshot], Any]: The key function, e.g. for
+        :func:`heapq.merge`.
+    """
+    order_fields, descending = _query_orders(query)
+
+    def cmp(left, right):
+        return _compare_keys(left, right, descending)
+
+    key_class = functools.cmp_to_key(cmp)
+
+    def field_key(snapshot, field_path):
+        if field_path == _NAME_FIELD:
+            return order._path_key(snapshot.reference._document_path)
+        try:
+            value = field_path_module.get_nested_value(field_path, snapshot._data)
+        except KeyError:
+            return b""
+        return order.encode_key(_helpers.encode_value(value))
+
+    def sort_key(snapshot):
+        return key_class(
+            tuple(field_key(snapshot, field_path) for field_path in order_fields)
+        )
+
+    return sort_key
+
+
+def _compare_keys(left: tuple, right: tuple, descending: Tuple[bool, ...]) -> int:
+    """Compare two positions (one key per order) in query order.
+
+    ``right`` may be shorter than ``left`` (e.g. a cursor that only covers
+    the first orders); only the common prefix is compared.
+    """
+    for left_key, right_key, desc in zip(left, right, descending):
+        if left_key != right_key:
+            comp = 1 if left_key > right_key else -1
+            return -comp if desc else comp
+    return 0
+
+
+class QueryMatcher(object):
+    """Evaluate a query against documents held in memory.
+
+    The query's filters, orders and cursors are compiled once, so a single
+    matcher can efficiently be applied to many documents, e.g. to serve an
+    offline cache, back in-memory fixtures, or filter listener results.
+
+    Like the backend, a document only matches if it belongs to the query's
+    collection (or collection group) and has a value for every ordered
+    field. When the query has no explicit order, results are ordered by
+    the first inequality filter field, and ties are always broken by
+    document name.
+
+    Args:
+        query (:class:`~google.cloud.firestore_v1.base_query.BaseQuery`):
+            The query to evaluate. Its parent must be a collection reference.
+
+    Raises:
+        ValueError: If the query contains a filter which cannot be
+            evaluated locally.
+    """
+
+    def __init__(self, query) -> None:
+        parent_path, expected_prefix = query._parent._parent_info()
+        self._collection_id = query._parent.id
+        self._all_descendants = query._all_descendants
+        self._parent_prefix = parent_path + "/"
+        self._expected_prefix = expected_prefix
+        self._limit = query._limit
+        self._offset = query._offset
+        self._limit_to_last = query._limit_to_last
+
+        predicates = []
+        for filter_pb in query._field_filters:
+            if isinstance(filter_pb, StructuredQuery.UnaryFilter):
+                predicates.append(_compile_unary_filter(filter_pb))
+            else:
+                predicates.append(_compile_field_filter(filter_pb))
+
+        orders = query._normalize_orders()
+        order_fields, descending = _query_orders(query, orders)
+
+        self._predicates = predicates
+        self._order_fields = order_fields
+        self._descending = descending
+        self._key_getters = [_make_key_getter(field) for field in order_fields]
+
+        self._start_at = self._cursor_keys(query, query._start_at, orders)
+        self._end_at = self._cursor_keys(query, query._end_at, orders)
+
+    @staticmethod
+    def _cursor_keys(query, cursor, orders) -> Optional[Tuple[tuple, bool]]:
+        cursor_pb = _cursor_pb(query._normalize_cursor(cursor, orders))
+        if cursor_pb is None:
+            return None
+        keys = tuple(order.encode_key(value) for value in cursor_pb.values)
+        return keys, cursor_pb.before
+
+    def _in_scope(self, name: str) -> bool:
+        parent, _, _ = name.rpartition("/")
+        if not self._all_descendants:
+            return parent == self._expected_prefix
+        return (
+            name.startswith(self._parent_prefix)
+            and parent.rpartition("/")[2] == self._collection_id
+        )
+
+    def _position(self, raw) -> Optional[tuple]:
+        """Return the order keys of a document, or None if any is missing."""
+        keys = tuple(key_getter(raw) for key_getter in self._key_getters)
+        if None in keys:
+            return None
+        return keys
+
+    def _within_cursors(self, keys: tuple) -> bool:
+        if self._start_at is not None:
+            cursor_keys, before = self._start_at
+            comp = _compare_keys(keys, cursor_keys, self._descending)
+            if comp < 0 or (comp == 0 and not before):
+                return False
+        if self._end_at is not None:
+            cursor_keys, before = self._end_at
+            comp = _compare_keys(keys, cursor_keys, self._descending)
+            if comp > 0 or (comp == 0 and before):
+                return False
+        return True
+
+    def _select(self, documents: Iterable) -> List[Tuple[Any, tuple]]:
+        """Filter documents, returning ``(document, order keys)`` pairs.
+
+        Each predicate is evaluated in turn over the documents which passed
+        the previous ones, so selective filters prune the work done by the
+        filters following them.
+        """
+        rows = []
+        for snapshot in documents:
+            raw = _raw_document(snapshot)
+            if raw is not None and self._in_scope(raw[0]):
+                rows.append((snapshot, raw))
+
+        for predicate in self._predicates:
+            rows = [row for row in rows if predicate(row[1])]
+
+        selected = []
+        for snapshot, raw in rows:
+            keys = self._position(raw)
+            if keys is not None and self._within_cursors(keys):
+                selected.append((snapshot, keys))
+        return selected
+
+    def _sort_rows(self, rows: List[Tuple[Any, tuple]]) -> None:
+        # Stable sorts from the least to the most significant order allow
+        # mixing ascending and descending orders with native comparisons.
+        for index in reversed(range(len(self._order_fields))):
+            rows.sort(key=lambda row: row[1][index], reverse=self._descending[index])
+
+    def matches(self, document) -> bool:
+        """Check if a document satisfies the query's filters and cursors.
+
+        The query's ``limit`` and ``offset`` are not taken into account,
+        since they depend on the other documents in the result set.
+
+        Args:
+            document (Union[\
+                :class:`~google.cloud.firestore_v1.base_document.DocumentSnapshot`, \
+                :class:`~google.cloud.firestore_v1.types.Document`]):
+                The document to check.
+
+        Returns:
+            bool: Whether the document belongs to the query's results.
+        """
+        return bool(self._select([document]))
+
+    def compare(self, document1, document2) -> int:
+        """Compare two matching documents in query order.
+
+        Args:
+            document1 (Union[DocumentSnapshot, Document]): The first document.
+            document2 (Union[DocumentSnapshot, Document]): The second document.
+
+        Returns:
+            int: A negative number, zero or a positive number if
+            ``document1`` sorts before, with or after ``document2``.
+
+        Raises:
+            ValueError: If either document lacks an ordered field.
+        """
+        keys1 = self._position(_raw_document(document1))
+        keys2 = self._position(_raw_document(document2))
+        if keys1 is None or keys2 is None:
+            raise ValueError(
+                "Can only compare documents which have all of the fields "
+                "the query is ordered by: {!r}.".format(self._order_fields)
+            )
+        return _compare_keys(keys1, keys2, self._descending)
+
+    def sort(self, documents: Iterable) -> list:
+        """Filter and sort documents in query order.
+
+        Args:
+            documents (Iterable[Union[DocumentSnapshot, Document]]): The
+                documents to evaluate.
+
+        Returns:
+            list: The matching documents, in query order. ``limit`` and
+            ``offset`` are not applied.
+        """
+        rows = self._select(documents)
+        self._sort_rows(rows)
+        return [document for document, _ in rows]
+
+    def apply(self, documents: Iterable) -> list:
+        """Compute the query's results from a local set of documents.
+
+        Args:
+            documents (Iterable[Union[DocumentSnapshot, Document]]): The
+                documents to evaluate.
+
+        Returns:
+            list: The documents the backend would return for the query,
+            given ``documents`` as the full contents of the database.
+        """
+        results = self.sort(documents)
+        offset = self._offset or 0
+
+        if self._limit_to_last:
+            results = results[: max(len(results) - offset, 0)]
+            if self._limit is not None:
+                results = results[max(len(results) - self._limit, 0) :]
+            return results
+
+        if self._limit is not None:
+            return results[offset : offset + self._limit]
+        return results[offset:]
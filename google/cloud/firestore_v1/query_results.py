@@ -0,0 +1,216 @@
+# Copyright 2020 Google LLC All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Memory-bounded results of ``get`` on queries and collections."""
+
+from google.cloud.firestore_v1 import _helpers
+from google.cloud.firestore_v1.types import document
+from google.cloud.firestore_v1.types import firestore
+from typing import Any, Callable, Generator, Optional, Union
+
+_TOO_MANY_DOCUMENTS = (
+    "The query returned more than {:d} documents, the most 'get' may hold "
+    "in memory. Use 'stream' to process large results, or raise "
+    "'max_documents'."
+)
+_BAD_MAX_DOCUMENTS = "'max_documents' must not be negative."
+# Parses the encoded documents held by ``QueryResults``.
+_parse_response = firestore.RunQueryResponse.pb().FromString
+
+
+class MaterializationLimitExceeded(ValueError):
+    """Raised when ``get`` reads more documents than it may hold.
+
+    The results are not returned: the read stops at the first document
+    over the limit.
+
+    Args:
+        limit (int): The maximum number of documents ``get`` may hold.
+    """
+
+    def __init__(self, limit: int) -> None:
+        super(MaterializationLimitExceeded, self).__init__(
+            _TOO_MANY_DOCUMENTS.format(limit)
+        )
+        self.limit = limit
+
+
+class QueryResultsStats(object):
+    """Memory accounting of :class:`QueryResults`.
+
+    Args:
+        documents (int): The number of documents held.
+        encoded_bytes (int): The size of the encoded documents held.
+        decoded_documents (int): The number of documents decoded so far (a
+            document read twice is decoded twice).
+        decoded_bytes (int): The encoded size of the documents decoded so
+            far.
+    """
+
+    def __init__(
+        self, documents=0, encoded_bytes=0, decoded_documents=0, decoded_bytes=0
+    ) -> None:
+        self.documents = documents
+        self.encoded_bytes = encoded_bytes
+        self.decoded_documents = decoded_documents
+        self.decoded_bytes = decoded_bytes
+
+    def __repr__(self):
+        return (
+            "<QueryResultsStats documents={:d} encoded_bytes={:d} "
+            "decoded_documents={:d} decoded_bytes={:d}>"
+        ).format(
+            self.documents,
+            self.encoded_bytes,
+            self.decoded_documents,
+            self.decoded_bytes,
+        )
+
+
+class QueryResults(object):
+    """The documents matching a query, held encoded.
+
+    Returned by ``get(compact=True)``. Each document is held as its
+    serialized ``RunQueryResponse``, usually several times smaller than a
+    :class:`~google.cloud.firestore_v1.base_document.DocumentSnapshot` and
+    its decoded data. Snapshots are decoded each time they are read, and
+    not kept.
+
+    .. code-block:: python
+
+       results = query.get(compact=True)
+       for snapshot in results:
+           ...
+       print(results.stats)
+
+    Args:
+        to_snapshot (Callable[[google.cloud.firestore_v1.types.RunQueryResponse], DocumentSnapshot]):
+            Decodes a response (as a raw protobuf) into a snapshot.
+        max_documents (Optional[int]): The maximum number of documents held.
+            Defaults to no limit.
+    """
+
+    def __init__(self, to_snapshot: Callable, max_documents: int = None) -> None:
+        self._to_snapshot = to_snapshot
+        self._max_documents = max_documents
+        self._responses = []
+        self._encoded_bytes = 0
+        self._decoded_documents = 0
+        self._decoded_bytes = 0
+
+    def _append(self, response_pb) -> None:
+        """Hold the document of a ``RunQueryResponse``.
+
+        Args:
+            response_pb (google.cloud.firestore_v1.types.RunQueryResponse):
+                A response with a document, possibly a raw protobuf.
+
+        Raises:
+            MaterializationLimitExceeded: If this is one document too many.
+        """
+        _check_materialized(len(self._responses) + 1, self._max_documents)
+        encoded = _helpers.raw_pb(response_pb).SerializeToString()
+        self._responses.append(encoded)
+        self._encoded_bytes += len(encoded)
+
+    def _append_snapshot(self, snapshot) -> None:
+        """Hold an already decoded snapshot, encoding it back."""
+        document_pb = document.Document(
+            name=snapshot.reference._document_path,
+            fields=_helpers.encode_dict(snapshot._data),
+            create_time=snapshot.create_time,
+            update_time=snapshot.update_time,
+        )
+        self._append(
+            firestore.RunQueryResponse(
+                document=document_pb, read_time=snapshot.read_time
+            )
+        )
+
+    def _reverse(self) -> None:
+        self._responses.reverse()
+
+    def _decode(self, encoded: bytes) -> Any:
+        self._decoded_documents += 1
+        self._decoded_bytes += len(encoded)
+        return self._to_snapshot(_parse_response(encoded))
+
+    def __len__(self) -> int:
+        return len(self._responses)
+
+    def __iter__(self) -> Generator[Any, Any, None]:
+        for encoded in self._responses:
+            yield self._decode(encoded)
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        if isinstance(index, slice):
+            return [self._decode(encoded) for encoded in self._responses[index]]
+        return self._decode(self._responses[index])
+
+    @property
+    def size(self) -> int:
+        """int: The number of documents."""
+        return len(self._responses)
+
+    @property
+    def empty(self) -> bool:
+        """bool: Whether no document matched the query."""
+        return not self._responses
+
+    @property
+    def docs(self) -> list:
+        """List[DocumentSnapshot]: All the documents, decoded at once."""
+        return list(self)
+
+    @property
+    def stats(self) -> QueryResultsStats:
+        """:class:`QueryResultsStats`: The memory held and the decoding done."""
+        return QueryResultsStats(
+            len(self._responses),
+            self._encoded_bytes,
+            self._decoded_documents,
+            self._decoded_bytes,
+        )
+
+
+def _max_documents(client, max_documents: Optional[int]) -> Optional[int]:
+    """Get the maximum number of documents ``get`` may hold.
+
+    Args:
+        client (:class:`~google.cloud.firestore_v1.base_client.BaseClient`):
+            The client running the query.
+        max_documents (Optional[int]): The limit passed to ``get``, if any.
+
+    Returns:
+        Optional[int]: ``max_documents``, else the client's
+        ``max_get_documents``, or :data:`None` for no limit.
+
+    Raises:
+        ValueError: If the limit is negative.
+    """
+    if max_documents is None:
+        max_documents = client._max_get_documents
+    if max_documents is not None and max_documents < 0:
+        raise ValueError(_BAD_MAX_DOCUMENTS)
+    return max_documents
+
+
+def _check_materialized(count: int, max_documents: Optional[int]) -> None:
+    """Make sure ``get`` may hold ``count`` documents.
+
+    Raises:
+        MaterializationLimitExceeded: If ``count`` is over ``max_documents``.
+    """
+    if max_documents is not None and count > max_documents:
+        raise MaterializationLimitExceeded(max_documents)
@@ -0,0 +1,140 @@
+# Copyright 2020 Google LLC All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Helpers for batching concurrent single-document reads."""
+
+import concurrent.futures
+import threading
+
+from google.cloud.firestore_v1.base_read_batcher import (
+    BaseReadBatcher,
+    DEFAULT_MAX_BATCH_SIZE,
+    DEFAULT_WINDOW,
+)
+
+# Types needed only for Type Hints
+from google.cloud.firestore_v1.base_document import DocumentSnapshot
+from google.cloud.firestore_v1.document import DocumentReference
+
+from typing import Iterable
+
+
+class ReadBatcher(BaseReadBatcher):
+    """Collect concurrent document reads into ``BatchGetDocuments`` calls.
+
+    Once enabled with
+    :meth:`~google.cloud.firestore_v1.client.Client.batch_reads`, plain
+    :meth:`~google.cloud.firestore_v1.document.DocumentReference.get` calls
+    (without a transaction, ``read_time``, ``retry`` or ``timeout``) go
+    through the batcher.
+
+    The batcher is safe to share between threads: each read blocks until
+    its batch has been read. Batches are sent on a timer thread at the end
+    of the window, or in the reading thread when full.
+
+    Args:
+        client (:class:`~google.cloud.firestore_v1.client.Client`):
+            The client that created this batcher.
+        window (Optional[float]): The number of seconds reads are collected
+            before being sent.
+        max_batch_size (Optional[int]): The number of documents which
+            triggers a call before the end of the window.
+    """
+
+    def __init__(
+        self,
+        client,
+        window: float = DEFAULT_WINDOW,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+    ) -> None:
+        super(ReadBatcher, self).__init__(
+            client, window=window, max_batch_size=max_batch_size
+        )
+        self._lock = threading.Lock()
+        self._timer = None
+
+    def get(
+        self, reference: DocumentReference, field_paths: Iterable[str] = None
+    ) -> DocumentSnapshot:
+        """Read a document as part of a batch.
+
+        Args:
+            reference (:class:`~google.cloud.firestore_v1.document.DocumentReference`):
+                The document to read.
+            field_paths (Optional[Iterable[str]]): The fields to read. If
+                not passed, all fields are read.
+
+        Returns:
+            :class:`~google.cloud.firestore_v1.base_document.DocumentSnapshot`:
+            A snapshot of the document.
+
+        Raises:
+            ValueError: If the batcher has been closed.
+        """
+        with self._lock:
+            future, mask, full = self._enqueue(
+                reference, field_paths, concurrent.futures.Future
+            )
+            batches = []
+            if full:
+                batches = self._take_batches([mask])
+            if self._pending and self._timer is None:
+                self._timer = threading.Timer(self._window, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+        for batch_mask, references in batches:
+            self._send(batch_mask, references)
+
+        return future.result()
+
+    def _send(self, mask, references: list) -> None:
+        """Read a batch and complete its futures."""
+        try:
+            snapshots = list(self._client.get_all(references, field_paths=mask))
+        except Exception as exc:
+            with self._lock:
+                self._fail(mask, references, exc)
+        else:
+            with self._lock:
+                self._resolve(mask, references, snapshots)
+
+    def flush(self) -> None:
+        """Send all pending reads.
+
+        Read failures are not raised here; they are raised by the ``get()``
+        calls of the affected documents.
+        """
+        with self._lock:
+            self._timer = None
+            batches = self._take_batches()
+
+        for mask, references in batches:
+            self._send(mask, references)
+
+    def close(self) -> None:
+        """Send any pending reads and stop batching the client's reads."""
+        with self._lock:
+            self._detach()
+            timer, self._timer = self._timer, None
+
+        if timer is not None:
+            timer.cancel()
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
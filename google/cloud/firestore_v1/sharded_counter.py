@@ -0,0 +1,143 @@
+# Copyright 2020 Google LLC All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Helpers for counters whose writes are spread across shard documents."""
+
+from google.cloud.firestore_v1.base_sharded_counter import (
+    BaseShardedCounter,
+    DEFAULT_FIELD,
+    DEFAULT_NUM_SHARDS,
+    SHARDS_COLLECTION,
+    _CONTENTION_EXCEPTIONS,
+    _MAX_ATTEMPTS,
+    _RETRYABLE_EXCEPTIONS,
+)
+from google.cloud.firestore_v1.types import write
+from typing import Any, Optional, TYPE_CHECKING
+
+# Types needed only for Type Hints
+from google.cloud.firestore_v1.transaction import Transaction
+
+if TYPE_CHECKING:  # pragma: NO COVER
+    from google.cloud.firestore_v1.watch import Watch
+
+
+class ShardedCounter(BaseShardedCounter):
+    """A counter whose increments are spread across shard documents.
+
+    See :class:`~google.cloud.firestore_v1.base_sharded_counter.BaseShardedCounter`
+    for how shards are picked, read and resized.
+
+    With :meth:`listen`, the total is kept up to date by a snapshot listener
+    on the shards, so that :meth:`get` does not read the shards again.
+
+    Args:
+        reference (:class:`~google.cloud.firestore_v1.document.DocumentReference`):
+            The document representing the counter.
+        num_shards (Optional[int]): The initial (and minimum) number of
+            shards written to.
+        max_shards (Optional[int]): The maximum number of shards.
+        field (Optional[str]): The field holding the count in each shard.
+    """
+
+    def __init__(
+        self,
+        reference,
+        num_shards: int = DEFAULT_NUM_SHARDS,
+        max_shards: int = None,
+        field: str = DEFAULT_FIELD,
+    ) -> None:
+        super(ShardedCounter, self).__init__(
+            reference, num_shards=num_shards, max_shards=max_shards, field=field
+        )
+        self._watch = None
+        self._cached_total = None
+
+    def increment(self, amount=1, key=None) -> write.WriteResult:
+        """Add to the counter.
+
+        Args:
+            amount (Optional[Union[int, float]]): The value to add (which may
+                be negative).
+            key (Optional[Union[str, bytes]]): If passed, the shard is picked
+                by hashing the key instead of at random.
+
+        Returns:
+            :class:`google.cloud.firestore_v1.types.WriteResult`:
+            The write result of the shard update.
+        """
+        for attempt in range(_MAX_ATTEMPTS):
+            # Retries go to a random shard, away from the contended one.
+            index = self._choose_shard(key if attempt == 0 else None)
+            try:
+                result = self._shard(index).set(self._shard_data(amount), merge=True)
+            except _CONTENTION_EXCEPTIONS as exc:
+                self._record_contention()
+                retryable = isinstance(exc, _RETRYABLE_EXCEPTIONS)
+                if not retryable or attempt + 1 == _MAX_ATTEMPTS:
+                    raise
+            else:
+                self._record_success()
+                return result
+
+    def get(self, transaction: Transaction = None) -> Any:
+        """Read the total of the counter.
+
+        All the shards are read with a single ``BatchGetDocuments`` call,
+        unless the counter is listening (and has received its first
+        snapshot) and no transaction is passed.
+
+        Args:
+            transaction (Optional[:class:`~google.cloud.firestore_v1.transaction.Transaction`]):
+                An existing transaction that the shards will be read in.
+
+        Returns:
+            Union[int, float]: The total of the counter.
+        """
+        if transaction is None and self._cached_total is not None:
+            return self._cached_total
+
+        snapshots = self._reference._client.get_all(
+            self._all_shards(), field_paths=[self._field], transaction=transaction,
+        )
+        return self._total(snapshots)
+
+    @property
+    def cached_total(self) -> Optional[Any]:
+        """Optional[Union[int, float]]: The total last received by the
+        listener, if any."""
+        return self._cached_total
+
+    def listen(self) -> "Watch":
+        """Keep the total up to date with a snapshot listener.
+
+        Returns:
+            :class:`~google.cloud.firestore_v1.watch.Watch`: The listener.
+        """
+        if self._watch is None:
+
+            def on_snapshot(snapshots, changes, read_time):
+                self._cached_total = self._total(snapshots)
+
+            shards = self._reference.collection(SHARDS_COLLECTION)
+            self._watch = shards.on_snapshot(on_snapshot)
+
+        return self._watch
+
+    def close(self) -> None:
+        """Stop the listener started by :meth:`listen`, if any."""
+        watch, self._watch = self._watch, None
+        self._cached_total = None
+        if watch is not None:
+            watch.unsubscribe()
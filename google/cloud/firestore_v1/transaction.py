@@ -59,11 +59,31 @@ class Transaction(batch.WriteBatch, BaseTransaction):
         read_only (Optional[bool]): Flag indicating if the transaction
             should be read-only or should allow writes. Defaults to
             :data:`False`.
+        read_time (Optional[datetime.datetime]): If set, the (read-only)
+            transaction reads a consistent snapshot at this time instead of
+            beginning a server-side transaction.
+        cache_reads (Optional[bool]): If :data:`True`, documents read are
+            cached for the rest of the attempt, and the documents read by
+            earlier attempts are prefetched when the transaction is
+            retried. Defaults to :data:`False`.
+        deadline (Optional[:class:`~google.cloud.firestore_v1.deadline.Deadline`]):
+            If set, the latency budget shared by all the requests of the
+            transaction, including its retries.
     """
 
-    def __init__(self, client, max_attempts=MAX_ATTEMPTS, read_only=False) -> None:
+    def __init__(
+        self,
+        client,
+        max_attempts=MAX_ATTEMPTS,
+        read_only=False,
+        read_time=None,
+        cache_reads=False,
+        deadline=None,
+    ) -> None:
         super(Transaction, self).__init__(client)
-        BaseTransaction.__init__(self, max_attempts, read_only)
+        BaseTransaction.__init__(
+            self, max_attempts, read_only, read_time, cache_reads, deadline
+        )
 
     def _add_write_pbs(self, write_pbs: list) -> None:
         """Add `Write`` protobufs to this transaction.
@@ -94,12 +114,18 @@ class Transaction(batch.WriteBatch, BaseTransaction):
             msg = _CANT_BEGIN.format(self._id)
             raise ValueError(msg)
 
+        if self._read_time is not None:
+            # Snapshot reads are served at ``read_time``; no server-side
+            # transaction (and hence no locks) is needed.
+            return
+
         transaction_response = self._client._firestore_api.begin_transaction(
             request={
                 "database": self._client._database_string,
                 "options": self._options_protobuf(retry_id),
             },
             metadata=self._client._rpc_metadata,
+            **self._deadline_kwargs(),
         )
         self._id = transaction_response.transaction
 
@@ -109,9 +135,18 @@ class Transaction(batch.WriteBatch, BaseTransaction):
         Raises:
             ValueError: If no transaction is in progress.
         """
+        if self._read_time is not None:
+            self._clean_up()
+            return
+
         if not self.in_progress:
             raise ValueError(_CANT_ROLLBACK)
 
+        if self._deadline is not None and self._deadline.expired:
+            # Past the deadline, leave the transaction to expire on the server.
+            self._clean_up()
+            return
+
         try:
             # NOTE: The response is just ``google.protobuf.Empty``.
             self._client._firestore_api.rollback(
@@ -120,6 +155,7 @@ class Transaction(batch.WriteBatch, BaseTransaction):
                     "transaction": self._id,
                 },
                 metadata=self._client._rpc_metadata,
+                **self._deadline_kwargs(),
             )
         finally:
             self._clean_up()
@@ -136,10 +172,16 @@ class Transaction(batch.WriteBatch, BaseTransaction):
         Raises:
             ValueError: If no transaction is in progress.
         """
+        if self._read_time is not None:
+            self._clean_up()
+            return []
+
         if not self.in_progress:
             raise ValueError(_CANT_COMMIT)
 
-        commit_response = _commit_with_retry(self._client, self._write_pbs, self._id)
+        commit_response = _commit_with_retry(
+            self._client, self._write_pbs, self._id, self._deadline
+        )
 
         self._clean_up()
         return list(commit_response.write_results)
@@ -157,15 +199,40 @@ class Transaction(batch.WriteBatch, BaseTransaction):
                 references to be retrieved.
             retry (google.api_core.retry.Retry): Designation of what errors, if any,
                 should be retried.  Defaults to a system-specified policy.
-            timeout (float): The timeout for this request.  Defaults to a
-                system-specified value.
+            timeout (float): The timeout for this request.  Defaults to the
+                transaction's ``deadline``, if any, else to a system-specified
+                value.
 
         Yields:
             .DocumentSnapshot: The next document snapshot that fulfills the
             query, or :data:`None` if the document does not exist.
         """
+        if timeout is None:
+            timeout = self._deadline
         kwargs = _helpers.make_retry_timeout_kwargs(retry, timeout)
-        return self._client.get_all(references, transaction=self, **kwargs)
+        kwargs.update(self._read_options())
+        if self._cache_reads:
+            return self._get_all_cached(references, kwargs)
+        return self._client.get_all(references, **kwargs)
+
+    def _get_all_cached(
+        self, references: list, kwargs: dict
+    ) -> Generator[DocumentSnapshot, Any, None]:
+        """Read the documents not read yet in this attempt, then yield all."""
+        paths, missing = self._uncached_references(references)
+        if missing:
+            self._cache_snapshots(self._client.get_all(missing, **kwargs))
+        yield from self._cached_snapshots(paths)
+
+    def _prefetch_reads(self) -> None:
+        """Read the documents read by earlier attempts, in a single call."""
+        if self._read_set:
+            references = list(self._read_set.values())
+            self._cache_snapshots(
+                self._client.get_all(
+                    references, **self._deadline_kwargs(), **self._read_options()
+                )
+            )
 
     def get(
         self,
@@ -179,18 +246,24 @@ class Transaction(batch.WriteBatch, BaseTransaction):
             ref_or_query: The document references or query object to return.
             retry (google.api_core.retry.Retry): Designation of what errors, if any,
                 should be retried.  Defaults to a system-specified policy.
-            timeout (float): The timeout for this request.  Defaults to a
-                system-specified value.
+            timeout (float): The timeout for this request.  Defaults to the
+                transaction's ``deadline``, if any, else to a system-specified
+                value.
 
         Yields:
             .DocumentSnapshot: The next document snapshot that fulfills the
             query, or :data:`None` if the document does not exist.
         """
+        if timeout is None:
+            timeout = self._deadline
         kwargs = _helpers.make_retry_timeout_kwargs(retry, timeout)
+        kwargs.update(self._read_options())
         if isinstance(ref_or_query, DocumentReference):
-            return self._client.get_all([ref_or_query], transaction=self, **kwargs)
+            if self._cache_reads:
+                return self._get_all_cached([ref_or_query], kwargs)
+            return self._client.get_all([ref_or_query], **kwargs)
         elif isinstance(ref_or_query, Query):
-            return ref_or_query.stream(transaction=self, **kwargs)
+            return ref_or_query.stream(**kwargs)
         else:
             raise ValueError(
                 'Value for argument "ref_or_query" must be a DocumentReference or a Query.'
@@ -242,6 +315,7 @@ class _Transactional(_BaseTransactional):
         if self.retry_id is None:
             self.retry_id = self.current_id
         try:
+            transaction._prefetch_reads()
             return self.to_wrap(transaction, *args, **kwargs)
         except:  # noqa
             # NOTE: If ``rollback`` fails this will lose the information
@@ -295,10 +369,13 @@ class _Transactional(_BaseTransactional):
         Raises:
             ValueError: If the transaction does not succeed in
                 ``max_attempts``.
+            ~google.api_core.exceptions.DeadlineExceeded: If the
+                transaction's ``deadline`` passes first.
         """
-        self._reset()
+        self._reset(transaction)
 
         for attempt in range(transaction._max_attempts):
+            transaction._check_deadline()
             result = self._pre_commit(transaction, *args, **kwargs)
             succeeded = self._maybe_commit(transaction)
             if succeeded:
@@ -331,7 +408,7 @@ def transactional(to_wrap: Callable) -> _Transactional:
 
 
 def _commit_with_retry(
-    client, write_pbs: list, transaction_id: bytes
+    client, write_pbs: list, transaction_id: bytes, deadline=None
 ) -> CommitResponse:
     """Call ``Commit`` on the GAPIC client with retry / sleep.
 
@@ -348,6 +425,9 @@ def _commit_with_retry(
             A ``Write`` protobuf instance to be committed.
         transaction_id (bytes):
             ID of an existing transaction that this commit will run in.
+        deadline (Optional[:class:`~google.cloud.firestore_v1.deadline.Deadline`]):
+            If set, the budget shared by the requests and the sleeps
+            between them.
 
     Returns:
         :class:`google.cloud.firestore_v1.types.CommitResponse`:
@@ -357,6 +437,10 @@ def _commit_with_retry(
         ~google.api_core.exceptions.GoogleAPICallError: If a non-retryable
             exception is encountered.
     """
+    # ``Unavailable`` errors are retried below, within the deadline.
+    kwargs = {}
+    if deadline is not None:
+        kwargs = _helpers.make_retry_timeout_kwargs(None, deadline)
     current_sleep = _INITIAL_SLEEP
     while True:
         try:
@@ -367,11 +451,15 @@ def _commit_with_retry(
                     "transaction": transaction_id,
                 },
                 metadata=client._rpc_metadata,
+                **kwargs,
             )
         except exceptions.ServiceUnavailable:
             # Retry
             pass
 
+        if deadline is not None:
+            # Give up rather than back off past the deadline.
+            deadline.check(current_sleep)
         current_sleep = _sleep(current_sleep)
 
 
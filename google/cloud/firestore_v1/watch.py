@@ -14,13 +14,16 @@
 
 import logging
 import collections
+import struct
 import threading
 from enum import Enum
 import functools
 
 from google.api_core.bidi import ResumableBidiRpc  # type: ignore
 from google.api_core.bidi import BackgroundConsumer  # type: ignore
+from google.cloud.firestore_v1.types import document
 from google.cloud.firestore_v1.types import firestore
+from google.cloud.firestore_v1.types import write
 from google.cloud.firestore_v1 import _helpers
 
 from google.api_core import exceptions  # type: ignore
@@ -65,6 +68,19 @@ _RECOVERABLE_STREAM_EXCEPTIONS = (
     exceptions.Unauthenticated,
 )
 _TERMINATING_STREAM_EXCEPTIONS = (exceptions.Cancelled,)
+# Serialized listener states are a sequence of ``ListenResponse`` messages,
+# each preceded by its length.
+_STATE_LENGTH = struct.Struct(">I")
+_BAD_LISTENER_STATE = "Serialized listener state is truncated or corrupt."
+
+# Handlers of each kind of ``TargetChange``, by name.
+_TARGET_CHANGE_HANDLERS = {
+    firestore.TargetChange.TargetChangeType.NO_CHANGE: "_on_snapshot_target_change_no_change",
+    firestore.TargetChange.TargetChangeType.ADD: "_on_snapshot_target_change_add",
+    firestore.TargetChange.TargetChangeType.REMOVE: "_on_snapshot_target_change_remove",
+    firestore.TargetChange.TargetChangeType.RESET: "_on_snapshot_target_change_reset",
+    firestore.TargetChange.TargetChangeType.CURRENT: "_on_snapshot_target_change_current",
+}
 
 DocTreeEntry = collections.namedtuple("DocTreeEntry", ["value", "index"])
 
@@ -112,6 +128,114 @@ class WatchDocTree(object):
         return k in self._dict
 
 
+class ListenerState(object):
+    """The state of a listener, which can be used to restart it later.
+
+    Restarting a listener from its state (see
+    :meth:`Watch.for_query` / :meth:`Watch.for_document`) resumes the
+    stream from ``resume_token``, so the server only sends the changes
+    made since the state was exported instead of every matching
+    document. If the server cannot resume (e.g. the token is too old), it
+    resets the target and the listener falls back to a full reload.
+
+    Args:
+        resume_token (Optional[bytes]): The token of the last snapshot
+            delivered by the listener.
+        documents (Iterable[google.cloud.firestore_v1.types.Document]):
+            The documents in that snapshot.
+        current (bool): Whether the listener was consistent with the
+            backend when the state was exported.
+        read_time (Optional[datetime.datetime]): The read time of that
+            snapshot.
+    """
+
+    def __init__(self, resume_token, documents, current=False, read_time=None):
+        self.resume_token = resume_token
+        self.documents = list(documents)
+        self.current = current
+        self.read_time = read_time
+
+    def __eq__(self, other):
+        if not isinstance(other, self.__class__):
+            return NotImplemented
+        return (
+            self.resume_token == other.resume_token
+            and self.documents == other.documents
+            and self.current == other.current
+            and self.read_time == other.read_time
+        )
+
+    def to_bytes(self) -> bytes:
+        """Serialize the state, e.g. to save it across process restarts.
+
+        Returns:
+            bytes: The serialized state, see :meth:`from_bytes`.
+        """
+        change_type = firestore.TargetChange.TargetChangeType
+        target_change = firestore.TargetChange(
+            target_change_type=change_type.CURRENT
+            if self.current
+            else change_type.NO_CHANGE,
+            resume_token=self.resume_token or b"",
+            read_time=self.read_time,
+        )
+        messages = [firestore.ListenResponse(target_change=target_change)]
+        messages.extend(
+            firestore.ListenResponse(
+                document_change=write.DocumentChange(
+                    document=document, target_ids=[WATCH_TARGET_ID]
+                )
+            )
+            for document in self.documents
+        )
+
+        chunks = []
+        for message in messages:
+            serialized = firestore.ListenResponse.serialize(message)
+            chunks.append(_STATE_LENGTH.pack(len(serialized)))
+            chunks.append(serialized)
+        return b"".join(chunks)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "ListenerState":
+        """Deserialize a state produced by :meth:`to_bytes`.
+
+        Args:
+            data (bytes): The serialized state.
+
+        Returns:
+            :class:`ListenerState`: The listener state.
+
+        Raises:
+            ValueError: If ``data`` is not a serialized listener state.
+        """
+        messages = []
+        offset = 0
+        while offset < len(data):
+            if offset + _STATE_LENGTH.size > len(data):
+                raise ValueError(_BAD_LISTENER_STATE)
+            (length,) = _STATE_LENGTH.unpack_from(data, offset)
+            offset += _STATE_LENGTH.size
+            if offset + length > len(data):
+                raise ValueError(_BAD_LISTENER_STATE)
+            messages.append(
+                firestore.ListenResponse.deserialize(data[offset : offset + length])
+            )
+            offset += length
+
+        if not messages or "target_change" not in messages[0]:
+            raise ValueError(_BAD_LISTENER_STATE)
+
+        target_change = messages[0].target_change
+        change_type = firestore.TargetChange.TargetChangeType
+        return cls(
+            target_change.resume_token or None,
+            [message.document_change.document for message in messages[1:]],
+            current=target_change.target_change_type == change_type.CURRENT,
+            read_time=target_change.read_time,
+        )
+
+
 class ChangeType(Enum):
     ADDED = 1
     REMOVED = 2
@@ -180,6 +304,7 @@ class Watch(object):
         document_reference_cls,
         BackgroundConsumer=None,  # FBO unit testing
         ResumableBidiRpc=None,  # FBO unit testing
+        state=None,
     ):
         """
         Args:
@@ -198,6 +323,9 @@ class Watch(object):
 
             document_snapshot_cls: instance of DocumentSnapshot
             document_reference_cls: instance of DocumentReference
+            state (Optional[ListenerState]): The state of an earlier
+                listener on the same target, to resume from. Its documents
+                seed the first snapshot delivered to ``snapshot_callback``.
         """
         self._document_reference = document_reference
         self._firestore = firestore
@@ -211,6 +339,8 @@ class Watch(object):
         self._closed = False
 
         self.resume_token = None
+        # The read time of the last snapshot delivered.
+        self._read_time = None
 
         rpc_request = self._get_rpc_request
 
@@ -248,6 +378,9 @@ class Watch(object):
         # aren't docs.
         self.has_pushed = False
 
+        if state is not None:
+            self._restore_state(state)
+
         # The server assigns and updates the resume token.
         if BackgroundConsumer is None:  # FBO unit tests
             BackgroundConsumer = self.BackgroundConsumer
@@ -255,9 +388,84 @@ class Watch(object):
         self._consumer = BackgroundConsumer(self._rpc, self.on_snapshot)
         self._consumer.start()
 
+    def _restore_state(self, state):
+        """Load the state of an earlier listener before listening."""
+        snapshots = [
+            self._document_to_snapshot(document, state.read_time)
+            for document in state.documents
+        ]
+        key = functools.cmp_to_key(self._comparator)
+        for index, snapshot in enumerate(sorted(snapshots, key=key)):
+            # Fill the tree in place: ``insert`` copies it on every call.
+            self.doc_tree._dict[snapshot] = DocTreeEntry(None, index)
+            self.doc_map[snapshot.reference._document_path] = snapshot
+        self.doc_tree._index = len(self.doc_map)
+        self.resume_token = state.resume_token
+        self.current = state.current
+        self._read_time = state.read_time
+
+    def export_state(self):
+        """Capture the state of the last snapshot delivered by this listener.
+
+        The state is consistent when exported from the snapshot callback
+        or once the listener is closed.
+
+        Returns:
+            :class:`ListenerState`: The state, which can be passed to
+            :meth:`for_query` / :meth:`for_document` to restart the
+            listener from where it left off.
+        """
+        documents = [
+            _helpers.document_pb_from_snapshot(snapshot)
+            for snapshot in list(self.doc_map.values())
+        ]
+        return ListenerState(
+            self.resume_token,
+            documents,
+            current=self.current,
+            read_time=self._read_time,
+        )
+
+    def _document_to_snapshot(self, document, read_time=None, reference=None):
+        """Build a snapshot of a ``Document`` sent by the server.
+
+        Args:
+            document (google.cloud.firestore_v1.types.Document): The document.
+            read_time (Optional[datetime.datetime]): The read time of the
+                snapshot.
+            reference (Optional[DocumentReference]): The reference to the
+                document, if already known.
+        """
+        data = _helpers.decode_dict(document.fields, self._firestore)
+
+        if reference is None:
+            # Create a snapshot. As Document and Query objects can be
+            # passed we need to get a Document Reference in a more manual
+            # fashion than self._document_reference
+            document_name = document.name
+            db_str = self._firestore._database_string
+            db_str_documents = db_str + "/documents/"
+            if document_name.startswith(db_str_documents):
+                document_name = document_name[len(db_str_documents) :]
+
+            reference = self._firestore.document(document_name)
+
+        return self.DocumentSnapshot(
+            reference=reference,
+            data=data,
+            exists=True,
+            read_time=read_time,
+            create_time=document.create_time,
+            update_time=document.update_time,
+        )
+
     def _get_rpc_request(self):
         if self.resume_token is not None:
             self._targets["resume_token"] = self.resume_token
+        else:
+            # E.g. after a reset: the previous token no longer matches the
+            # documents held by this listener.
+            self._targets.pop("resume_token", None)
 
         return firestore.ListenRequest(
             database=self._firestore._database_string, add_target=self._targets
@@ -332,6 +540,7 @@ class Watch(object):
         snapshot_callback,
         snapshot_class_instance,
         reference_class_instance,
+        state=None,
     ):
         """
         Creates a watch snapshot listener for a document. snapshot_callback
@@ -345,6 +554,8 @@ class Watch(object):
                 snapshots with to pass to snapshot_callback
             reference_class_instance: instance of DocumentReference to make
                 references
+            state: the :class:`ListenerState` of an earlier listener on
+                the same document, to resume from
 
         """
         return cls(
@@ -358,12 +569,32 @@ class Watch(object):
             snapshot_callback,
             snapshot_class_instance,
             reference_class_instance,
+            state=state,
         )
 
     @classmethod
     def for_query(
-        cls, query, snapshot_callback, snapshot_class_instance, reference_class_instance
+        cls,
+        query,
+        snapshot_callback,
+        snapshot_class_instance,
+        reference_class_instance,
+        state=None,
     ):
+        """
+        Creates a watch snapshot listener for a query.
+
+        Args:
+            query: the query to listen to
+            snapshot_callback: callback to be called on snapshot
+            snapshot_class_instance: instance of DocumentSnapshot to make
+                snapshots with to pass to snapshot_callback
+            reference_class_instance: instance of DocumentReference to make
+                references
+            state: the :class:`ListenerState` of an earlier listener on
+                the same query, to resume from
+
+        """
         parent_path, _ = query._parent._parent_info()
         query_target = firestore.Target.QueryTarget(
             parent=parent_path, structured_query=query._to_protobuf()
@@ -377,6 +608,7 @@ class Watch(object):
             snapshot_callback,
             snapshot_class_instance,
             reference_class_instance,
+            state=state,
         )
 
     def _on_snapshot_target_change_no_change(self, proto):
@@ -403,7 +635,7 @@ class Watch(object):
 
         code = 13
         message = "internal error"
-        if change.cause:
+        if _helpers.raw_pb(change).HasField("cause"):
             code = change.cause.code
             message = change.cause.message
 
@@ -426,122 +658,80 @@ class Watch(object):
         and 'push' the changes in a batch to the customer when we receive
         'current' from the listen response.
 
+        The kind of response is read from the ``response_type`` oneof of the
+        raw protobuf, and changed documents are kept as protobufs: they are
+        only decoded when a snapshot is pushed.
+
         Args:
             listen_response(`google.cloud.firestore_v1.types.ListenResponse`):
                 Callback method that receives a object to
         """
-        TargetChange = firestore.TargetChange
-
-        target_changetype_dispatch = {
-            TargetChange.TargetChangeType.NO_CHANGE: self._on_snapshot_target_change_no_change,
-            TargetChange.TargetChangeType.ADD: self._on_snapshot_target_change_add,
-            TargetChange.TargetChangeType.REMOVE: self._on_snapshot_target_change_remove,
-            TargetChange.TargetChangeType.RESET: self._on_snapshot_target_change_reset,
-            TargetChange.TargetChangeType.CURRENT: self._on_snapshot_target_change_current,
-        }
-
-        target_change = getattr(proto, "target_change", "")
-        document_change = getattr(proto, "document_change", "")
-        document_delete = getattr(proto, "document_delete", "")
-        document_remove = getattr(proto, "document_remove", "")
-        filter_ = getattr(proto, "filter", "")
-
-        if str(target_change):
-            target_change_type = target_change.target_change_type
-            _LOGGER.debug("on_snapshot: target change: " + str(target_change_type))
-            meth = target_changetype_dispatch.get(target_change_type)
-            if meth is None:
+        if proto is None:
+            self.close()
+            return
+
+        response_pb = _helpers.raw_pb(proto)
+        response_type = response_pb.WhichOneof("response_type")
+
+        if response_type == "target_change":
+            if proto is response_pb:
+                # Sent by a client in raw protobuf mode.
+                proto = firestore.ListenResponse.wrap(response_pb)
+            target_change_type = response_pb.target_change.target_change_type
+            _LOGGER.debug("on_snapshot: target change: %s", target_change_type)
+            meth_name = _TARGET_CHANGE_HANDLERS.get(target_change_type)
+            if meth_name is None:
                 _LOGGER.info(
-                    "on_snapshot: Unknown target change " + str(target_change_type)
+                    "on_snapshot: Unknown target change %s", target_change_type
                 )
                 self.close(
                     reason="Unknown target change type: %s " % str(target_change_type)
                 )
             else:
                 try:
-                    meth(proto)
+                    getattr(self, meth_name)(proto)
                 except Exception as exc2:
-                    _LOGGER.debug("meth(proto) exc: " + str(exc2))
+                    _LOGGER.debug("meth(proto) exc: %s", exc2)
                     raise
 
             # NOTE:
             # in other implementations, such as node, the backoff is reset here
             # in this version bidi rpc is just used and will control this.
 
-        elif str(document_change):
-            _LOGGER.debug("on_snapshot: document change")
-
+        elif response_type == "document_change":
             # No other target_ids can show up here, but we still need to see
             # if the targetId was in the added list or removed list.
-            target_ids = document_change.target_ids or []
-            removed_target_ids = document_change.removed_target_ids or []
-            changed = False
-            removed = False
-
-            if WATCH_TARGET_ID in target_ids:
-                changed = True
+            document_change = response_pb.document_change
+            document_pb = document_change.document
 
-            if WATCH_TARGET_ID in removed_target_ids:
-                removed = True
-
-            if changed:
+            if WATCH_TARGET_ID in document_change.target_ids:
                 _LOGGER.debug("on_snapshot: document change: CHANGED")
+                self.change_map[document_pb.name] = document.Document.wrap(document_pb)
 
-                # google.cloud.firestore_v1.types.Document
-                document = document_change.document
-
-                data = _helpers.decode_dict(document.fields, self._firestore)
-
-                # Create a snapshot. As Document and Query objects can be
-                # passed we need to get a Document Reference in a more manual
-                # fashion than self._document_reference
-                document_name = document.name
-                db_str = self._firestore._database_string
-                db_str_documents = db_str + "/documents/"
-                if document_name.startswith(db_str_documents):
-                    document_name = document_name[len(db_str_documents) :]
-
-                document_ref = self._firestore.document(document_name)
-
-                snapshot = self.DocumentSnapshot(
-                    reference=document_ref,
-                    data=data,
-                    exists=True,
-                    read_time=None,
-                    create_time=document.create_time,
-                    update_time=document.update_time,
-                )
-                self.change_map[document.name] = snapshot
-
-            elif removed:
+            elif WATCH_TARGET_ID in document_change.removed_target_ids:
                 _LOGGER.debug("on_snapshot: document change: REMOVED")
-                document = document_change.document
-                self.change_map[document.name] = ChangeType.REMOVED
+                self.change_map[document_pb.name] = ChangeType.REMOVED
 
         # NB: document_delete and document_remove (as far as we, the client,
         # are concerned) are functionally equivalent
 
-        elif str(document_delete):
+        elif response_type == "document_delete":
             _LOGGER.debug("on_snapshot: document change: DELETE")
-            name = document_delete.document
-            self.change_map[name] = ChangeType.REMOVED
+            self.change_map[response_pb.document_delete.document] = ChangeType.REMOVED
 
-        elif str(document_remove):
+        elif response_type == "document_remove":
             _LOGGER.debug("on_snapshot: document change: REMOVE")
-            name = document_remove.document
-            self.change_map[name] = ChangeType.REMOVED
+            self.change_map[response_pb.document_remove.document] = ChangeType.REMOVED
 
-        elif filter_:
+        elif response_type == "filter":
             _LOGGER.debug("on_snapshot: filter update")
-            if filter_.count != self._current_size():
+            if response_pb.filter.count != self._current_size():
                 # We need to remove all the current results.
                 self._reset_docs()
                 # The filter didn't match, so re-issue the query.
                 # TODO: reset stream method?
                 # self._reset_stream();
 
-        elif proto is None:
-            self.close()
         else:
             _LOGGER.debug("UNKNOWN TYPE. UHOH")
             self.close(reason=ValueError("Unknown listen response type: %s" % proto))
@@ -554,11 +744,29 @@ class Watch(object):
         deletes, adds, updates = Watch._extract_changes(
             self.doc_map, self.change_map, read_time
         )
+        # Changed documents are only decoded now, and not at all if their
+        # latest version is the one already in the snapshot.
+        adds = [self._document_to_snapshot(document, read_time) for document in adds]
+        updates = [
+            self._document_to_snapshot(
+                document, read_time, self.doc_map[document.name].reference
+            )
+            for document in updates
+            if document.update_time != self.doc_map[document.name].update_time
+        ]
 
         updated_tree, updated_map, appliedChanges = self._compute_snapshot(
             self.doc_tree, self.doc_map, deletes, adds, updates
         )
 
+        self.doc_tree = updated_tree
+        self.doc_map = updated_map
+        self.change_map.clear()
+        # Updated first, so the callback can persist the token along with
+        # the snapshot it describes.
+        self.resume_token = next_resume_token
+        self._read_time = read_time
+
         if not self.has_pushed or len(appliedChanges):
             # TODO: It is possible in the future we will have the tree order
             # on insert. For now, we sort here.
@@ -568,11 +776,6 @@ class Watch(object):
             self._snapshot_callback(keys, appliedChanges, read_time)
             self.has_pushed = True
 
-        self.doc_tree = updated_tree
-        self.doc_map = updated_map
-        self.change_map.clear()
-        self.resume_token = next_resume_token
-
     @staticmethod
     def _extract_changes(doc_map, changes, read_time):
         deletes = []
@@ -584,12 +787,8 @@ class Watch(object):
                 if name in doc_map:
                     deletes.append(name)
             elif name in doc_map:
-                if read_time is not None:
-                    value.read_time = read_time
                 updates.append(value)
             else:
-                if read_time is not None:
-                    value.read_time = read_time
                 adds.append(value)
 
         return (deletes, adds, updates)
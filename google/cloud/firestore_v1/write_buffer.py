@@ -0,0 +1,125 @@
+# Copyright 2020 Google LLC All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Helpers for coalescing repeated writes to the same documents."""
+
+import concurrent.futures
+import threading
+
+from google.cloud.firestore_v1.base_write_buffer import (
+    BaseWriteBuffer,
+    DEFAULT_FLUSH_INTERVAL,
+    MAX_BATCH_SIZE,
+    _PendingWrite,
+)
+from google.cloud.firestore_v1 import _helpers
+
+
+class WriteBuffer(BaseWriteBuffer):
+    """Buffer writes and send them in periodic batch commits.
+
+    Successive ``set(..., merge=True)`` and ``update()`` calls on the same
+    document are folded into a single ``Write`` before the buffer is flushed.
+    Each write method returns a :class:`concurrent.futures.Future` resolved
+    with the ``WriteResult`` once the change has been committed.
+
+    The buffer is safe to share between threads. Flushing happens on a
+    background thread every ``flush_interval`` seconds, and in the writing
+    thread when ``max_batch_size`` writes are pending.
+
+    Args:
+        client (:class:`~google.cloud.firestore_v1.client.Client`):
+            The client that created this buffer.
+        flush_interval (Optional[float]): Number of seconds between
+            background flushes. If :data:`None`, writes are only sent when
+            the buffer is full or explicitly flushed.
+        max_batch_size (Optional[int]): Number of pending writes which
+            triggers a flush; also the maximum size of each commit.
+    """
+
+    def __init__(
+        self,
+        client,
+        flush_interval=DEFAULT_FLUSH_INTERVAL,
+        max_batch_size=MAX_BATCH_SIZE,
+    ) -> None:
+        super(WriteBuffer, self).__init__(
+            client, flush_interval=flush_interval, max_batch_size=max_batch_size
+        )
+        self._lock = threading.Lock()
+        self._commit_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._flusher = None
+
+    def _add(self, entry: _PendingWrite) -> concurrent.futures.Future:
+        """Queue a change and return a future for its completion."""
+        future = concurrent.futures.Future()
+        with self._lock:
+            pending = self._add_entry(entry)
+            pending.futures.append(future)
+            full = len(self._entries) >= self._max_batch_size
+            if self._flusher is None and self._flush_interval is not None:
+                self._flusher = threading.Thread(
+                    target=self._run, name="Thread-FirestoreWriteBuffer"
+                )
+                self._flusher.daemon = True
+                self._flusher.start()
+
+        if full:
+            self.flush()
+
+        return future
+
+    def _run(self) -> None:
+        """Flush the buffer periodically until it is closed."""
+        while not self._stopped.wait(self._flush_interval):
+            self.flush()
+
+    def flush(self) -> None:
+        """Commit all pending writes.
+
+        Commit failures are not raised here; they are set on the futures of
+        the affected writes.
+        """
+        with self._commit_lock:
+            with self._lock:
+                entries = self._take_entries()
+
+            for chunk in _helpers.chunks(entries, self._max_batch_size):
+                batch = self._client.batch()
+                batch._add_write_pbs([entry.write_pb for entry in chunk])
+                try:
+                    write_results = batch.commit()
+                except Exception as exc:
+                    self._fail(chunk, exc)
+                else:
+                    self._resolve(chunk, write_results)
+
+    def close(self) -> None:
+        """Stop the background flusher and commit any pending writes."""
+        with self._lock:
+            self._closed = True
+            flusher, self._flusher = self._flusher, None
+
+        self._stopped.set()
+        if flusher is not None:
+            flusher.join()
+
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,96 @@
+#! /usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Measure the cold-start import time of the Firestore client.
+
+Each statement is run ``--runs`` times in a fresh interpreter with
+``python -X importtime``; the median cumulative time of the top-level
+imports is reported, along with the slowest modules of the last run.
+
+    python scripts/benchmark_import_time.py
+    python scripts/benchmark_import_time.py --top 20 \\
+        "from google.cloud.firestore import Client"
+"""
+
+import argparse
+import re
+import statistics
+import subprocess
+import sys
+
+from typing import List, Tuple
+
+DEFAULT_STATEMENTS = (
+    "import google.cloud.firestore",
+    "from google.cloud.firestore import Client",
+    "from google.cloud.firestore import AsyncClient",
+)
+
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def measure(statement: str) -> Tuple[int, List[Tuple[int, str]]]:
+    """Import ``statement`` in a new interpreter.
+
+    Returns:
+        Tuple[int, List[Tuple[int, str]]]: The total time in microseconds,
+        and the cumulative time of every imported module.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        stderr=subprocess.PIPE,
+        check=True,
+        universal_newlines=True,
+    )
+    total = 0
+    modules = []
+    for line in result.stderr.splitlines():
+        match = _LINE.match(line)
+        if match is None:
+            continue
+        cumulative = int(match.group(2))
+        modules.append((cumulative, match.group(4)))
+        # Only top-level imports (indent of one space) add to the total.
+        if len(match.group(3)) == 1:
+            total += cumulative
+
+    return total, modules
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("statements", nargs="*", default=DEFAULT_STATEMENTS)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    # Warm up the bytecode cache so that compilation is not measured.
+    measure("; ".join(args.statements))
+
+    for statement in args.statements:
+        totals = []
+        for _ in range(args.runs):
+            total, modules = measure(statement)
+            totals.append(total)
+
+        print("{}: {:.1f} ms".format(statement, statistics.median(totals) / 1000))
+        for cumulative, name in sorted(modules, reverse=True)[: args.top]:
+            print("    {:8.1f} ms  {}".format(cumulative / 1000, name))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+#! /usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Measure the cost per document of reading ``RunQuery`` responses.
+
+Serialized ``RunQueryResponse`` messages are deserialized and turned into
+snapshots, without any network, the way the default transport does it
+(proto-plus wrappers) and the way a client created with
+``raw_protobuf=True`` does it (raw protobufs).
+
+    python scripts/benchmark_raw_protobuf.py
+    python scripts/benchmark_raw_protobuf.py --documents 5000 --fields 50
+"""
+
+import argparse
+import statistics
+import time
+
+from google.auth.credentials import AnonymousCredentials
+from google.protobuf import timestamp_pb2
+
+from google.cloud.firestore_v1 import _helpers
+from google.cloud.firestore_v1.base_query import _query_response_to_snapshot
+from google.cloud.firestore_v1.client import Client
+from google.cloud.firestore_v1.types import document
+from google.cloud.firestore_v1.types import firestore
+
+from typing import Callable, List
+
+
+def make_responses(client: Client, documents: int, fields: int) -> List[bytes]:
+    """Build the serialized messages sent by the server for a query."""
+    prefix = client._database_string + "/documents/col/"
+    data = {"field{}".format(index): index for index in range(fields)}
+    encoded = _helpers.encode_dict(data)
+    now = timestamp_pb2.Timestamp(seconds=1600000000)
+
+    return [
+        firestore.RunQueryResponse.serialize(
+            firestore.RunQueryResponse(
+                document=document.Document(
+                    name=prefix + "doc{:08d}".format(index),
+                    fields=encoded,
+                    create_time=now,
+                    update_time=now,
+                ),
+                read_time=now,
+            )
+        )
+        for index in range(documents)
+    ]
+
+
+def measure(
+    client: Client, responses: List[bytes], deserialize: Callable[[bytes], object]
+) -> float:
+    """Turn ``responses`` into snapshots.
+
+    Returns:
+        float: The number of seconds taken.
+    """
+    collection = client.collection("col")
+    _, expected_prefix = collection._parent_info()
+
+    start = time.perf_counter()
+    for response in responses:
+        _query_response_to_snapshot(deserialize(response), collection, expected_prefix)
+    return time.perf_counter() - start
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--documents", type=int, default=2000)
+    parser.add_argument("--fields", type=int, default=20)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    client = Client(project="benchmark", credentials=AnonymousCredentials())
+    responses = make_responses(client, args.documents, args.fields)
+
+    for label, deserialize in (
+        ("proto-plus", firestore.RunQueryResponse.deserialize),
+        ("raw", firestore.RunQueryResponse.pb().FromString),
+    ):
+        times = [measure(client, responses, deserialize) for _ in range(args.runs)]
+        print(
+            "{}: {:d} documents, {:d} fields per document: {:,.1f} us/document".format(
+                label,
+                len(responses),
+                args.fields,
+                statistics.median(times) / len(responses) * 1e6,
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+#! /usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Measure how many ``ListenResponse`` messages a listener handles per second.
+
+A query listener is fed a stream of document changes, with a snapshot
+pushed (``CURRENT`` then ``NO_CHANGE``) every ``--batch`` documents, without
+any network. Documents are rewritten ``--rewrites`` times between pushes, so
+that most changes are superseded before being delivered.
+
+    python scripts/benchmark_watch.py
+    python scripts/benchmark_watch.py --documents 5000 --fields 50
+"""
+
+import argparse
+import statistics
+import time
+
+from google.auth.credentials import AnonymousCredentials
+from google.protobuf import timestamp_pb2
+
+from google.cloud.firestore_v1 import _helpers
+from google.cloud.firestore_v1.base_document import DocumentSnapshot
+from google.cloud.firestore_v1.client import Client
+from google.cloud.firestore_v1.document import DocumentReference
+from google.cloud.firestore_v1.types import document
+from google.cloud.firestore_v1.types import firestore
+from google.cloud.firestore_v1.types import write
+from google.cloud.firestore_v1.watch import Watch, WATCH_TARGET_ID
+
+from typing import List
+
+
+class _Rpc(object):
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def add_done_callback(self, callback):
+        pass
+
+
+class _Consumer(object):
+    def __init__(self, rpc, on_snapshot):
+        pass
+
+    def start(self):
+        pass
+
+
+def make_responses(
+    client: Client, documents: int, fields: int, batch: int, rewrites: int
+) -> List[firestore.ListenResponse]:
+    """Build the messages sent by the server for a query listener."""
+    TargetChangeType = firestore.TargetChange.TargetChangeType
+    prefix = client._database_string + "/documents/col/"
+    data = {
+        "field{}".format(index): "value {}".format(index) for index in range(fields)
+    }
+    encoded = _helpers.encode_dict(data)
+
+    responses = []
+    version = 0
+    for start in range(0, documents, batch):
+        for _ in range(rewrites):
+            for index in range(start, min(start + batch, documents)):
+                version += 1
+                responses.append(
+                    firestore.ListenResponse(
+                        document_change=write.DocumentChange(
+                            document=document.Document(
+                                name=prefix + "doc{:08d}".format(index),
+                                fields=encoded,
+                                update_time=timestamp_pb2.Timestamp(seconds=version),
+                            ),
+                            target_ids=[WATCH_TARGET_ID],
+                        )
+                    )
+                )
+        read_time = timestamp_pb2.Timestamp(seconds=version)
+        for change_type in (TargetChangeType.CURRENT, TargetChangeType.NO_CHANGE):
+            responses.append(
+                firestore.ListenResponse(
+                    target_change=firestore.TargetChange(
+                        target_change_type=change_type,
+                        read_time=read_time,
+                        resume_token=b"token",
+                    )
+                )
+            )
+    return responses
+
+
+def measure(client: Client, responses: List[firestore.ListenResponse]) -> float:
+    """Feed ``responses`` to a new listener.
+
+    Returns:
+        float: The number of seconds taken.
+    """
+    query = client.collection("col")._query()
+    parent_path, _ = query._parent._parent_info()
+    query_target = firestore.Target.QueryTarget(
+        parent=parent_path, structured_query=query._to_protobuf()
+    )
+    # Built directly, so that no stream is opened.
+    watch = Watch(
+        query,
+        client,
+        {"query": query_target._pb, "target_id": WATCH_TARGET_ID},
+        query._comparator,
+        lambda docs, changes, read_time: None,
+        DocumentSnapshot,
+        DocumentReference,
+        BackgroundConsumer=_Consumer,
+        ResumableBidiRpc=_Rpc,
+    )
+
+    on_snapshot = watch.on_snapshot
+    start = time.perf_counter()
+    for response in responses:
+        on_snapshot(response)
+    return time.perf_counter() - start
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--documents", type=int, default=2000)
+    parser.add_argument("--fields", type=int, default=20)
+    parser.add_argument("--batch", type=int, default=100)
+    parser.add_argument("--rewrites", type=int, default=3)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    client = Client(project="benchmark", credentials=AnonymousCredentials())
+    responses = make_responses(
+        client, args.documents, args.fields, args.batch, args.rewrites
+    )
+
+    rates = [len(responses) / measure(client, responses) for _ in range(args.runs)]
+    print(
+        "{:d} responses, {:d} fields per document: {:,.0f} responses/s".format(
+            len(responses), args.fields, statistics.median(rates)
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
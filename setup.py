@@ -30,7 +30,7 @@ dependencies = [
     "pytz",
     "proto-plus >= 1.3.0",
 ]
-extras = {}
+extras = {"avro": ["fastavro >= 1.0.0"]}
 
 
 # Setup boilerplate below this line.
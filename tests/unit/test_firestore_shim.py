@@ -27,3 +27,50 @@ class TestFirestoreShim(unittest.TestCase):
             found = getattr(firestore, name)
             expected = getattr(firestore_v1, name)
             self.assertIs(found, expected)
+
+    def test_shim_unknown_attribute(self):
+        from google.cloud import firestore
+
+        from google.cloud import firestore_v1
+
+        with self.assertRaises(AttributeError):
+            firestore.NotAThing
+
+        with self.assertRaises(AttributeError):
+            firestore_v1.NotAThing
+
+    def test_dir_lists_public_names(self):
+        from google.cloud import firestore
+        from google.cloud import firestore_v1
+
+        for module in (firestore, firestore_v1):
+            self.assertTrue(set(module.__all__) <= set(dir(module)))
+
+
+class TestLazyImports(unittest.TestCase):
+    @staticmethod
+    def _loaded_modules(statement):
+        import subprocess
+        import sys
+
+        script = "import sys\n{}\nprint('\\n'.join(sorted(sys.modules)))".format(
+            statement
+        )
+        output = subprocess.check_output([sys.executable, "-c", script])
+        return set(output.decode("utf-8").split())
+
+    def test_import_package(self):
+        loaded = self._loaded_modules("import google.cloud.firestore")
+
+        self.assertIn("google.cloud.firestore_v1", loaded)
+        self.assertNotIn("google.cloud.firestore_v1.client", loaded)
+        self.assertNotIn("google.cloud.firestore_v1.types", loaded)
+
+    def test_import_client(self):
+        loaded = self._loaded_modules("from google.cloud.firestore import Client")
+
+        self.assertIn("google.cloud.firestore_v1.client", loaded)
+        self.assertNotIn("google.cloud.firestore_v1.watch", loaded)
+        self.assertNotIn("google.api_core.bidi", loaded)
+        self.assertNotIn("google.cloud.firestore_v1.async_client", loaded)
+        self.assertNotIn("google.cloud.firestore_admin_v1", loaded)
@@ -360,7 +360,8 @@ class Test_reference_value_to_document(unittest.TestCase):
         reference_value = document._document_path
 
         new_document = self._call_fut(reference_value, client)
-        self.assertIsNot(new_document, document)
+        # References are interned per client.
+        self.assertIs(new_document, document)
 
         self.assertIsInstance(new_document, DocumentReference)
         self.assertIs(new_document._client, client)
@@ -522,6 +523,29 @@ class Test_decode_value(unittest.TestCase):
         }
         self.assertEqual(self._call_fut(value), expected)
 
+    def test_raw_nested(self):
+        from google.cloud.firestore_v1.types import document
+
+        client = _make_client()
+        reference = client.document("then", "there-was-one")
+        map_pb = document.MapValue(
+            fields={
+                "ref": _value_pb(reference_value=reference._document_path),
+                "list": _value_pb(
+                    array_value=document.ArrayValue(
+                        values=[
+                            _value_pb(integer_value=1),
+                            _value_pb(boolean_value=True),
+                        ]
+                    )
+                ),
+            }
+        )
+        value = _value_pb(map_value=map_pb)._pb
+
+        result = self._call_fut(value, client)
+        self.assertEqual(result, {"ref": reference, "list": [1, True]})
+
     def test_unset_value_type(self):
         with self.assertRaises(ValueError):
             self._call_fut(_value_pb())
@@ -606,6 +630,90 @@ class Test_decode_dict(unittest.TestCase):
         }
         self.assertEqual(self._call_fut(value_fields), expected)
 
+    def test_raw_map(self):
+        from google.cloud.firestore_v1.types import document
+
+        map_pb = document.MapValue(
+            fields={
+                "foo": _value_pb(string_value=u"bar"),
+                "baz": _value_pb(double_value=1.5),
+            }
+        )
+        self.assertEqual(self._call_fut(map_pb._pb.fields), {"foo": u"bar", "baz": 1.5})
+
+
+class Test_raw_pb(unittest.TestCase):
+    @staticmethod
+    def _call_fut(message):
+        from google.cloud.firestore_v1._helpers import raw_pb
+
+        return raw_pb(message)
+
+    def test_wrapped(self):
+        value = _value_pb(integer_value=3)
+        self.assertIs(self._call_fut(value), value._pb)
+
+    def test_raw(self):
+        value_pb = _value_pb(integer_value=3)._pb
+        self.assertIs(self._call_fut(value_pb), value_pb)
+
+
+class Test_timestamp_from_pb(unittest.TestCase):
+    @staticmethod
+    def _call_fut(message_pb, field_name):
+        from google.cloud.firestore_v1._helpers import timestamp_from_pb
+
+        return timestamp_from_pb(message_pb, field_name)
+
+    def test_set(self):
+        from google.api_core.datetime_helpers import DatetimeWithNanoseconds
+        from google.cloud.firestore_v1.types import document
+        from google.protobuf import timestamp_pb2
+
+        timestamp_pb = timestamp_pb2.Timestamp(seconds=552855006, nanos=766961828)
+        document_pb = document.Document(update_time=timestamp_pb)._pb
+
+        result = self._call_fut(document_pb, "update_time")
+        self.assertIsInstance(result, DatetimeWithNanoseconds)
+        self.assertEqual(result.timestamp_pb(), timestamp_pb)
+
+    def test_unset(self):
+        from google.cloud.firestore_v1.types import document
+
+        document_pb = document.Document()._pb
+        self.assertIsNone(self._call_fut(document_pb, "update_time"))
+
+
+class Test_document_pb_from_snapshot(unittest.TestCase):
+    @staticmethod
+    def _call_fut(snapshot):
+        from google.cloud.firestore_v1._helpers import document_pb_from_snapshot
+
+        return document_pb_from_snapshot(snapshot)
+
+    def test_it(self):
+        from google.cloud.firestore_v1._helpers import encode_dict
+        from google.cloud.firestore_v1.base_document import DocumentSnapshot
+        from google.cloud.firestore_v1.types import document
+        from google.protobuf import timestamp_pb2
+
+        client = _make_client()
+        reference = client.document("a", "b")
+        create_time = timestamp_pb2.Timestamp(seconds=1)
+        update_time = timestamp_pb2.Timestamp(seconds=2)
+        data = {"x": 1, "y": {"z": u"zap"}}
+        snapshot = DocumentSnapshot(
+            reference, data, True, None, create_time, update_time
+        )
+
+        expected = document.Document(
+            name=reference._document_path,
+            fields=encode_dict(data),
+            create_time=create_time,
+            update_time=update_time,
+        )
+        self.assertEqual(self._call_fut(snapshot), expected)
+
 
 class Test_get_doc_id(unittest.TestCase):
     @staticmethod
@@ -2207,6 +2315,40 @@ class Test_pb_for_delete(unittest.TestCase):
         self._helper(option=option, current_document=precondition)
 
 
+class Test_make_consistency_kwargs(unittest.TestCase):
+    @staticmethod
+    def _call_fut(transaction, read_time):
+        from google.cloud.firestore_v1._helpers import make_consistency_kwargs
+
+        return make_consistency_kwargs(transaction, read_time)
+
+    def test_neither(self):
+        self.assertEqual(self._call_fut(None, None), {"transaction": None})
+
+    def test_transaction(self):
+        from google.cloud.firestore_v1.transaction import Transaction
+
+        transaction = Transaction(mock.sentinel.client)
+        transaction._id = b"snapshot-me-not"
+
+        self.assertEqual(
+            self._call_fut(transaction, None), {"transaction": b"snapshot-me-not"}
+        )
+
+    def test_read_time(self):
+        read_time = mock.sentinel.read_time
+
+        self.assertEqual(self._call_fut(None, read_time), {"read_time": read_time})
+
+    def test_both(self):
+        from google.cloud.firestore_v1._helpers import READ_TIME_WITH_TRANSACTION
+
+        with self.assertRaises(ValueError) as exc_info:
+            self._call_fut(mock.sentinel.transaction, mock.sentinel.read_time)
+
+        self.assertEqual(exc_info.exception.args, (READ_TIME_WITH_TRANSACTION,))
+
+
 class Test_get_transaction_id(unittest.TestCase):
     @staticmethod
     def _call_fut(transaction, **kwargs):
@@ -2423,6 +2565,80 @@ class Test_make_retry_timeout_kwargs(unittest.TestCase):
         expected = {"retry": retry, "timeout": timeout}
         self.assertEqual(kwargs, expected)
 
+    def test_deadline(self):
+        from google.api_core.gapic_v1.method import DEFAULT
+        from google.api_core.retry import Retry
+        from google.cloud.firestore_v1.deadline import _BoundedRetry
+        from google.cloud.firestore_v1.deadline import Deadline
+
+        deadline = Deadline(5.0)
+        kwargs = self._call_fut(DEFAULT, deadline)
+        self.assertEqual(sorted(kwargs), ["retry", "timeout"])
+        self.assertIs(kwargs["timeout"], deadline)
+        self.assertIsInstance(kwargs["retry"], _BoundedRetry)
+
+        retry = Retry(predicate=object())
+        kwargs = self._call_fut(retry, deadline)
+        self.assertIs(kwargs["retry"]._retry, retry)
+
+        # Passed along to another method, the arguments are unchanged.
+        self.assertEqual(self._call_fut(kwargs["retry"], deadline), kwargs)
+
+        kwargs = self._call_fut(None, deadline)
+        self.assertEqual(kwargs, {"retry": None, "timeout": deadline})
+
+    def test_deadline_async(self):
+        from google.api_core.gapic_v1.method import DEFAULT
+        from google.cloud.firestore_v1._helpers import make_retry_timeout_kwargs
+        from google.cloud.firestore_v1.deadline import Deadline
+        from google.cloud.firestore_v1.deadline import DEFAULT_ASYNC_RETRY
+
+        deadline = Deadline(5.0)
+        kwargs = make_retry_timeout_kwargs(DEFAULT, deadline, is_async=True)
+        self.assertIs(kwargs["retry"]._retry, DEFAULT_ASYNC_RETRY)
+        self.assertIs(kwargs["timeout"], deadline)
+
+
+class Test_chunks(unittest.TestCase):
+    @staticmethod
+    def _call_fut(entries, size):
+        from google.cloud.firestore_v1._helpers import chunks
+
+        return list(chunks(entries, size))
+
+    def test_it(self):
+        self.assertEqual(self._call_fut([], 2), [])
+        self.assertEqual(self._call_fut([1, 2, 3, 4], 2), [[1, 2], [3, 4]])
+        self.assertEqual(self._call_fut([1, 2, 3], 2), [[1, 2], [3]])
+
+
+class Test_bind_page_kwargs(unittest.TestCase):
+    @staticmethod
+    def _call_fut(pager, kwargs):
+        from google.cloud.firestore_v1._helpers import bind_page_kwargs
+
+        return bind_page_kwargs(pager, kwargs)
+
+    def test_w_kwargs(self):
+        method = mock.Mock(spec=[])
+        pager = mock.Mock(_method=method, spec=["_method"])
+
+        self.assertIs(self._call_fut(pager, {"timeout": 5.0}), pager)
+
+        pager._method(mock.sentinel.request, metadata=())
+        method.assert_called_once_with(mock.sentinel.request, metadata=(), timeout=5.0)
+
+    def test_wo_kwargs(self):
+        method = mock.Mock(spec=[])
+        pager = mock.Mock(_method=method, spec=["_method"])
+
+        self.assertIs(self._call_fut(pager, {}), pager)
+        self.assertIs(pager._method, method)
+
+    def test_not_a_pager(self):
+        iterator = iter([])
+        self.assertIs(self._call_fut(iterator, {"timeout": 5.0}), iterator)
+
 
 def _value_pb(**kwargs):
     from google.cloud.firestore_v1.types.document import Value
@@ -0,0 +1,258 @@
+# Copyright 2020 Google LLC All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import multiprocessing
+import queue
+import unittest
+
+import mock
+
+
+class Test__column_value(unittest.TestCase):
+    @staticmethod
+    def _call_fut(fields, parts):
+        from google.cloud.firestore_v1._multiprocess import _column_value
+
+        return _column_value(fields, parts)
+
+    def test_top_level(self):
+        document = _make_document("c/d", {"a": 1})
+        value = self._call_fut(document.fields, ["a"])
+        self.assertEqual(value.integer_value, 1)
+
+    def test_nested(self):
+        document = _make_document("c/d", {"a": {"b": "c"}})
+        value = self._call_fut(document.fields, ["a", "b"])
+        self.assertEqual(value.string_value, "c")
+
+    def test_missing(self):
+        document = _make_document("c/d", {"a": {"b": "c"}})
+        self.assertIsNone(self._call_fut(document.fields, ["x"]))
+        self.assertIsNone(self._call_fut(document.fields, ["a", "x"]))
+
+    def test_not_a_map(self):
+        document = _make_document("c/d", {"a": 1})
+        self.assertIsNone(self._call_fut(document.fields, ["a", "b"]))
+
+
+class Test__Columns(unittest.TestCase):
+    @staticmethod
+    def _get_target_class():
+        from google.cloud.firestore_v1._multiprocess import _Columns
+
+        return _Columns
+
+    def _make_one(self, *args, **kwargs):
+        klass = self._get_target_class()
+        return klass(*args, **kwargs)
+
+    def test_append_and_pop(self):
+        client = _make_client()
+        columns = self._make_one(client, ["a", "b.c", "ref", "`d.e`"])
+        self.assertEqual(len(columns), 0)
+
+        columns.append(
+            _make_document(
+                "c/d1", {"a": 1, "b": {"c": [client.document("x", "y")]}, "d.e": True},
+            )
+        )
+        columns.append(_make_document("c/d2", {"ref": client.document("x", "z")}))
+        self.assertEqual(len(columns), 2)
+
+        batch = columns.pop()
+        self.assertEqual(
+            batch,
+            {
+                "__name__": ["c/d1", "c/d2"],
+                "a": [1, None],
+                "b.c": [["x/y"], None],
+                "ref": [None, "x/z"],
+                "`d.e`": [True, None],
+            },
+        )
+        self.assertEqual(len(columns), 0)
+        self.assertEqual(columns.batch["a"], [])
+
+
+class Test__Documents(unittest.TestCase):
+    def test_append_and_pop(self):
+        from google.cloud.firestore_v1._multiprocess import _Documents
+        from google.cloud.firestore_v1.types import document
+
+        documents = _Documents()
+        document_pb = _make_document("c/d", {"a": 1})
+        documents.append(document_pb)
+        self.assertEqual(len(documents), 1)
+
+        batch = documents.pop()
+        self.assertEqual(len(documents), 0)
+        self.assertEqual(
+            [document.Document.deserialize(data)._pb for data in batch], [document_pb]
+        )
+
+
+class Test__scan_partition(unittest.TestCase):
+    @staticmethod
+    def _call_fut(task):
+        from google.cloud.firestore_v1._multiprocess import _scan_partition
+
+        return _scan_partition(task)
+
+    def _scan_helper(self, columns=None):
+        from google.cloud.firestore_v1._multiprocess import _init_worker, _worker
+        from google.cloud.firestore_v1.types import firestore
+
+        client = _make_client()
+        documents = [_make_document("c/d{}".format(i), {"a": i}) for i in range(3)]
+        firestore_api = mock.Mock(spec=["run_query"])
+        firestore_api.run_query.return_value = iter(
+            [firestore.RunQueryResponse(document=document) for document in documents]
+            + [firestore.RunQueryResponse()._pb]
+        )
+        client._firestore_api_internal = firestore_api
+        batches = queue.Queue()
+        request = firestore.RunQueryRequest(parent="parent")
+
+        _init_worker(client, batches, {"timeout": 5.0}, columns, 2)
+        self.addCleanup(_worker.clear)
+        count = self._call_fut((7, request._pb.SerializeToString()))
+
+        self.assertEqual(count, 3)
+        firestore_api.run_query.assert_called_once_with(
+            request=request, metadata=client._rpc_metadata, timeout=5.0
+        )
+        return documents, [batches.get_nowait() for _ in range(batches.qsize())]
+
+    def test_documents(self):
+        documents, batches = self._scan_helper()
+
+        serialized = [document.SerializeToString() for document in documents]
+        self.assertEqual(
+            batches, [(7, serialized[:2]), (7, serialized[2:]), (7, None)],
+        )
+
+    def test_columns(self):
+        _, batches = self._scan_helper(columns=["a"])
+
+        self.assertEqual(
+            batches,
+            [
+                (7, {"__name__": ["c/d0", "c/d1"], "a": [0, 1]}),
+                (7, {"__name__": ["c/d2"], "a": [2]}),
+                (7, None),
+            ],
+        )
+
+
+@unittest.skipUnless(
+    "fork" in multiprocessing.get_all_start_methods(), "Requires os.fork()"
+)
+class Test_scan(unittest.TestCase):
+    @staticmethod
+    def _call_fut(client, partitions, columns=None, batch_size=2, kwargs=None):
+        from google.cloud.firestore_v1._multiprocess import scan
+
+        return scan(client, partitions, 2, columns, batch_size, None, kwargs or {})
+
+    @staticmethod
+    def _make_partitions(client):
+        from google.cloud.firestore_v1.base_query import QueryPartition
+
+        group = client.collection_group("c")
+        middle = client.document("c", "d2")
+        return [
+            QueryPartition(group, None, middle),
+            QueryPartition(group, middle, None),
+        ]
+
+    def _make_client(self, run_query):
+        # The fake API is inherited by the forked workers.
+        client = _make_client()
+        client._firestore_api_internal = mock.Mock(spec=["run_query"])
+        client._firestore_api_internal.run_query.side_effect = run_query
+        return client
+
+    def test_documents(self):
+        from google.cloud.firestore_v1.types import firestore
+
+        def run_query(request, metadata, **kwargs):
+            start = 0 if request.structured_query.start_at.values == [] else 2
+            for index in range(start, start + 2):
+                document = _make_document("c/d{}".format(index), {"a": index})
+                yield firestore.RunQueryResponse(document=document)
+
+        client = self._make_client(run_query)
+        partitions = self._make_partitions(client)
+
+        documents = list(self._call_fut(client, partitions))
+
+        names = sorted(document.name.rsplit("/", 1)[1] for document in documents)
+        self.assertEqual(names, ["d0", "d1", "d2", "d3"])
+        for document in documents:
+            index = int(document.name[-1])
+            self.assertEqual(document.fields["a"].integer_value, index)
+
+    def test_columns(self):
+        from google.cloud.firestore_v1.types import firestore
+
+        def run_query(request, metadata, **kwargs):
+            for index in range(3):
+                document = _make_document("c/d{}".format(index), {"a": index})
+                yield firestore.RunQueryResponse(document=document)
+
+        client = self._make_client(run_query)
+        partitions = self._make_partitions(client)
+
+        batches = list(self._call_fut(client, partitions, columns=["a"]))
+
+        self.assertEqual(len(batches), 4)
+        values = sorted(value for batch in batches for value in batch["a"])
+        self.assertEqual(values, [0, 0, 1, 1, 2, 2])
+
+    def test_error(self):
+        from google.api_core import exceptions
+
+        client = self._make_client(exceptions.NotFound("Gone."))
+        partitions = self._make_partitions(client)
+
+        with self.assertRaises(exceptions.NotFound):
+            list(self._call_fut(client, partitions))
+
+    def test_no_partitions(self):
+        client = self._make_client(AssertionError)
+        self.assertEqual(list(self._call_fut(client, [])), [])
+
+
+def _make_credentials():
+    import google.auth.credentials
+
+    return mock.Mock(spec=google.auth.credentials.Credentials)
+
+
+def _make_client(project="seventy-nine"):
+    from google.cloud.firestore_v1.client import Client
+
+    credentials = _make_credentials()
+    return Client(project=project, credentials=credentials)
+
+
+def _make_document(path, data):
+    from google.cloud.firestore_v1 import _helpers
+    from google.cloud.firestore_v1.types import document
+
+    client = _make_client()
+    return document.Document(
+        name="{}/documents/{}".format(client._database_string, path),
+        fields=_helpers.encode_dict(data),
+    )._pb
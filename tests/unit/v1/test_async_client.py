@@ -50,6 +50,39 @@ class TestAsyncClient(aiounittest.AsyncTestCase):
         self.assertEqual(client._database, DEFAULT_DATABASE)
         self.assertIs(client._client_info, _CLIENT_INFO)
         self.assertIsNone(client._emulator_host)
+        self.assertFalse(client._raw_protobuf)
+        self.assertIsNone(client._max_get_documents)
+
+    def test_constructor_max_get_documents(self):
+        credentials = _make_credentials()
+        client = self._make_one(
+            project=self.PROJECT, credentials=credentials, max_get_documents=1000
+        )
+        self.assertEqual(client._max_get_documents, 1000)
+
+    def test_constructor_raw_protobuf(self):
+        credentials = _make_credentials()
+        client = self._make_one(
+            project=self.PROJECT, credentials=credentials, raw_protobuf=True
+        )
+        self.assertTrue(client._raw_protobuf)
+
+    def test_raw_transport(self):
+        from google.cloud.firestore_v1 import types
+        from google.cloud.firestore_v1.async_client import (
+            _RawFirestoreGrpcAsyncIOTransport,
+        )
+
+        channel = mock.Mock(spec=["unary_unary", "unary_stream", "stream_stream"])
+        transport = _RawFirestoreGrpcAsyncIOTransport(channel=channel)
+
+        for name in ("batch_get_documents", "run_query", "listen"):
+            self.assertIs(getattr(transport, name), transport._stubs[name])
+        channel.unary_stream.assert_any_call(
+            "/google.firestore.v1.Firestore/RunQuery",
+            request_serializer=types.RunQueryRequest.serialize,
+            response_deserializer=types.RunQueryResponse.pb().FromString,
+        )
 
     def test_constructor_with_emulator_host(self):
         from google.cloud.firestore_v1.base_client import _FIRESTORE_EMULATOR_HOST
@@ -239,6 +272,112 @@ class TestAsyncClient(aiounittest.AsyncTestCase):
         timeout = 123.0
         await self._collections_helper(retry=retry, timeout=timeout)
 
+    async def _walk_helper(self, tree, root=(), **kwargs):
+        from tests.unit.v1.test_client import _tree_listers
+
+        client = self._make_default_one()
+        if len(root) % 2:
+            kwargs["root"] = client.collection(*root)
+        elif root:
+            kwargs["root"] = client.document(*root)
+        list_collection_ids, list_documents = _tree_listers(client, tree)
+        firestore_api = AsyncMock()
+        firestore_api.mock_add_spec(spec=["list_collection_ids", "list_documents"])
+        firestore_api.list_collection_ids.side_effect = lambda **kw: AsyncIter(
+            list_collection_ids(**kw)
+        )
+        firestore_api.list_documents.side_effect = lambda **kw: AsyncIter(
+            list_documents(**kw)
+        )
+        client._firestore_api_internal = firestore_api
+
+        entries = [entry async for entry in client.walk(**kwargs)]
+        return client, entries
+
+    @pytest.mark.asyncio
+    async def test_walk(self):
+        from tests.unit.v1.test_client import _TREE
+
+        client, entries = await self._walk_helper(_TREE)
+
+        self.assertEqual(
+            entries,
+            [
+                ("logs", "collection"),
+                ("users", "collection"),
+                ("users/alice", "document"),
+                ("users/bob", "document"),
+                ("users/alice/posts", "collection"),
+                ("users/bob/posts", "collection"),
+                ("users/alice/posts/p1", "document"),
+                ("users/alice/posts/p2", "document"),
+            ],
+        )
+        firestore_api = client._firestore_api
+        self.assertEqual(firestore_api.list_collection_ids.call_count, 5)
+        self.assertEqual(firestore_api.list_documents.call_count, 4)
+
+    @pytest.mark.asyncio
+    async def test_walk_w_root_and_max_depth(self):
+        from tests.unit.v1.test_client import _TREE
+
+        _, entries = await self._walk_helper(_TREE, root=("users",), max_depth=2)
+
+        self.assertEqual(
+            entries,
+            [
+                ("users/alice", "document"),
+                ("users/bob", "document"),
+                ("users/alice/posts", "collection"),
+                ("users/bob/posts", "collection"),
+            ],
+        )
+
+    @pytest.mark.asyncio
+    async def test_walk_bounded_concurrency(self):
+        import asyncio
+        from tests.unit.v1.test_client import _tree_listers
+
+        client = self._make_default_one()
+        tree = {"": ["a", "b", "c", "d", "e"]}
+        list_collection_ids, list_documents = _tree_listers(client, tree)
+        in_flight = []
+        peak = []
+
+        class SlowPager(AsyncIter):
+            async def __aiter__(self, **_):
+                in_flight.append(None)
+                peak.append(len(in_flight))
+                await asyncio.sleep(0.01)
+                in_flight.pop()
+                for item in self.items:
+                    yield item
+
+        firestore_api = AsyncMock()
+        firestore_api.mock_add_spec(spec=["list_collection_ids", "list_documents"])
+        firestore_api.list_collection_ids.side_effect = lambda **kw: AsyncIter(
+            list_collection_ids(**kw)
+        )
+        firestore_api.list_documents.side_effect = lambda **kw: SlowPager(
+            list_documents(**kw)
+        )
+        client._firestore_api_internal = firestore_api
+
+        entries = [entry async for entry in client.walk(concurrency=2)]
+
+        self.assertEqual(len(entries), 5)
+        self.assertEqual(firestore_api.list_documents.call_count, 5)
+        self.assertEqual(max(peak), 2)
+
+    @pytest.mark.asyncio
+    async def test_walk_bad_arguments(self):
+        client = self._make_default_one()
+
+        with self.assertRaises(TypeError):
+            await client.walk("users").__anext__()
+        with self.assertRaises(ValueError):
+            await client.walk(concurrency=0).__anext__()
+
     async def _invoke_get_all(self, client, references, document_pbs, **kwargs):
         # Create a minimal fake GAPIC with a dummy response.
         firestore_api = AsyncMock(spec=["batch_get_documents"])
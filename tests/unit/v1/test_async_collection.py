@@ -274,6 +274,151 @@ class TestAsyncCollectionReference(aiounittest.AsyncTestCase):
     async def test_list_documents_w_page_size(self):
         await self._list_documents_helper(page_size=25)
 
+    async def _list_document_ids_helper(self, page_size=None, retry=None, timeout=None):
+        from google.cloud.firestore_v1 import _helpers
+        from google.cloud.firestore_v1.types.document import Document
+        from google.cloud.firestore_v1.types.firestore import ListDocumentsResponse
+
+        client = _make_client()
+        template = client._database_string + "/documents/collection/{}"
+        pages = [
+            ListDocumentsResponse(
+                documents=[
+                    Document(name=template.format("doc-1")),
+                    Document(name=template.format("doc-2")),
+                ],
+                next_page_token="token",
+            ),
+            ListDocumentsResponse(documents=[Document(name=template.format("doc-3"))]),
+        ]
+        firestore_api = AsyncMock()
+        firestore_api.mock_add_spec(spec=["list_documents"])
+        firestore_api.list_documents.return_value = mock.Mock(pages=AsyncIter(pages))
+        client._firestore_api_internal = firestore_api
+        collection = self._make_one("collection", client=client)
+        kwargs = _helpers.make_retry_timeout_kwargs(retry, timeout)
+
+        document_ids = [
+            document_id
+            async for document_id in collection.list_document_ids(
+                page_size=page_size, **kwargs
+            )
+        ]
+
+        self.assertEqual(document_ids, ["doc-1", "doc-2", "doc-3"])
+        parent, _ = collection._parent_info()
+        firestore_api.list_documents.assert_called_once_with(
+            request={
+                "parent": parent,
+                "collection_id": collection.id,
+                "page_size": page_size,
+                "show_missing": True,
+                "mask": {"field_paths": None},
+            },
+            metadata=client._rpc_metadata,
+            **kwargs,
+        )
+
+    @pytest.mark.asyncio
+    async def test_list_document_ids(self):
+        await self._list_document_ids_helper()
+
+    @pytest.mark.asyncio
+    async def test_list_document_ids_w_page_size_retry_timeout(self):
+        from google.api_core.retry import Retry
+
+        retry = Retry(predicate=object())
+        await self._list_document_ids_helper(page_size=25, retry=retry, timeout=123.0)
+
+    @pytest.mark.asyncio
+    async def test_list_document_ids_w_bad_partition_count(self):
+        collection = self._make_one("collection", client=_make_client())
+
+        with self.assertRaises(ValueError):
+            async for _ in collection.list_document_ids(partition_count=0):
+                pass
+
+    @pytest.mark.asyncio
+    async def test_list_document_ids_w_partition_count(self):
+        from google.cloud.firestore_v1.types import document
+        from google.cloud.firestore_v1.types import firestore
+        from google.cloud.firestore_v1.types import query
+
+        client = _make_client()
+        firestore_api = AsyncMock()
+        firestore_api.mock_add_spec(spec=["partition_query", "run_query"])
+        client._firestore_api_internal = firestore_api
+        collection = self._make_one("collection", client=client)
+        template = client._database_string + "/documents/{}"
+        split = template.format("collection/doc-2")
+        firestore_api.partition_query.return_value = AsyncIter(
+            [query.Cursor(values=[document.Value(reference_value=split)])]
+        )
+
+        def _response(path=None):
+            if path is None:
+                return firestore.RunQueryResponse()
+            name = template.format(path)
+            return firestore.RunQueryResponse(document=document.Document(name=name))
+
+        def run_query(request, metadata):
+            if request["structured_query"]._pb.HasField("start_at"):
+                paths = ["collection/doc-2", "collection/doc-3", None]
+            else:
+                paths = ["collection/doc-1", "other/doc/collection/doc-9"]
+            return AsyncIter([_response(path) for path in paths])
+
+        firestore_api.run_query.side_effect = run_query
+
+        document_ids = [
+            document_id
+            async for document_id in collection.list_document_ids(partition_count=2)
+        ]
+
+        self.assertEqual(document_ids, ["doc-1", "doc-2", "doc-3"])
+        self.assertEqual(firestore_api.run_query.call_count, 2)
+        for call in firestore_api.run_query.call_args_list:
+            structured_query = call[1]["request"]["structured_query"]
+            self.assertFalse(structured_query.from_[0].all_descendants)
+
+    @mock.patch("google.cloud.firestore_v1.async_collection._SCAN_BUFFER_SIZE", new=1)
+    @mock.patch("google.cloud.firestore_v1.async_collection._MAX_SCAN_WORKERS", new=1)
+    @pytest.mark.asyncio
+    async def test_list_document_ids_w_partition_count_closed_early(self):
+        import itertools
+        from google.cloud.firestore_v1.types import document
+        from google.cloud.firestore_v1.types import firestore
+        from google.cloud.firestore_v1.types import query
+
+        client = _make_client()
+        firestore_api = AsyncMock()
+        firestore_api.mock_add_spec(spec=["partition_query", "run_query"])
+        client._firestore_api_internal = firestore_api
+        collection = self._make_one("collection", client=client)
+        template = client._database_string + "/documents/collection/{}"
+        firestore_api.partition_query.return_value = AsyncIter(
+            [
+                query.Cursor(
+                    values=[document.Value(reference_value=template.format("m"))]
+                )
+            ]
+        )
+
+        async def run_query(request, metadata):
+            for index in itertools.count():
+                name = template.format("doc-{}".format(index))
+                yield firestore.RunQueryResponse(document=document.Document(name=name))
+
+        firestore_api.run_query.side_effect = run_query
+
+        document_ids = collection.list_document_ids(partition_count=2)
+        self.assertEqual(await document_ids.__anext__(), "doc-0")
+        self.assertEqual(await document_ids.__anext__(), "doc-1")
+        await document_ids.aclose()
+
+        # The second partition waits for the first one, and is never read.
+        self.assertEqual(firestore_api.run_query.call_count, 1)
+
     @mock.patch("google.cloud.firestore_v1.async_query.AsyncQuery", autospec=True)
     @pytest.mark.asyncio
     async def test_get(self, query_class):
@@ -284,7 +429,9 @@ class TestAsyncCollectionReference(aiounittest.AsyncTestCase):
         query_instance = query_class.return_value
 
         self.assertIs(get_response, query_instance.get.return_value)
-        query_instance.get.assert_called_once_with(transaction=None)
+        query_instance.get.assert_called_once_with(
+            transaction=None, max_documents=None, compact=False
+        )
 
     @mock.patch("google.cloud.firestore_v1.async_query.AsyncQuery", autospec=True)
     @pytest.mark.asyncio
@@ -301,7 +448,11 @@ class TestAsyncCollectionReference(aiounittest.AsyncTestCase):
 
         self.assertIs(get_response, query_instance.get.return_value)
         query_instance.get.assert_called_once_with(
-            transaction=None, retry=retry, timeout=timeout,
+            transaction=None,
+            max_documents=None,
+            compact=False,
+            retry=retry,
+            timeout=timeout,
         )
 
     @mock.patch("google.cloud.firestore_v1.async_query.AsyncQuery", autospec=True)
@@ -315,7 +466,21 @@ class TestAsyncCollectionReference(aiounittest.AsyncTestCase):
         query_instance = query_class.return_value
 
         self.assertIs(get_response, query_instance.get.return_value)
-        query_instance.get.assert_called_once_with(transaction=transaction)
+        query_instance.get.assert_called_once_with(
+            transaction=transaction, max_documents=None, compact=False
+        )
+
+    @mock.patch("google.cloud.firestore_v1.async_query.AsyncQuery", autospec=True)
+    @pytest.mark.asyncio
+    async def test_get_w_max_documents_compact(self, query_class):
+        collection = self._make_one("collection")
+        get_response = await collection.get(max_documents=10, compact=True)
+
+        query_instance = query_class.return_value
+        self.assertIs(get_response, query_instance.get.return_value)
+        query_instance.get.assert_called_once_with(
+            transaction=None, max_documents=10, compact=True
+        )
 
     @mock.patch("google.cloud.firestore_v1.async_query.AsyncQuery", autospec=True)
     @pytest.mark.asyncio
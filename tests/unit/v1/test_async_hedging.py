@@ -0,0 +1,227 @@
+# Copyright 2020 Google LLC All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+
+import aiounittest
+import mock
+
+from tests.unit.v1.test__helpers import AsyncIter
+from tests.unit.v1.test__helpers import AsyncMock
+
+
+class _Stream(AsyncIter):
+    def __init__(self, items):
+        super(_Stream, self).__init__(items)
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class TestAsyncHedgingPolicy(aiounittest.AsyncTestCase):
+    @staticmethod
+    def _get_target_class():
+        from google.cloud.firestore_v1.async_hedging import AsyncHedgingPolicy
+
+        return AsyncHedgingPolicy
+
+    def _make_one(self, *args, **kwargs):
+        klass = self._get_target_class()
+        return klass(*args, **kwargs)
+
+    @staticmethod
+    def _method(*behaviours):
+        """An API method whose successive calls behave as given.
+
+        Each behaviour is either a value to return, an exception to raise,
+        or ``None`` to never return.
+        """
+        calls = []
+        cancelled = []
+
+        async def method(**kwargs):
+            index = len(calls)
+            calls.append(kwargs)
+            behaviour = behaviours[index]
+            if behaviour is None:
+                try:
+                    await asyncio.sleep(60.0)
+                except asyncio.CancelledError:
+                    cancelled.append(index)
+                    raise
+            if isinstance(behaviour, Exception):
+                raise behaviour
+            return behaviour
+
+        return method, calls, cancelled
+
+    async def test_call_fast(self):
+        policy = self._make_one(mock.sentinel.client, delay=5.0)
+        method, calls, _ = self._method(mock.sentinel.response)
+
+        response = await policy.call(method, request=mock.sentinel.request)
+
+        self.assertIs(response, mock.sentinel.response)
+        self.assertEqual(calls, [{"request": mock.sentinel.request}])
+        stats = policy.stats
+        self.assertEqual((stats.calls, stats.hedged, stats.won), (1, 0, 0))
+
+    async def test_call_hedge_wins_and_loser_cancelled(self):
+        policy = self._make_one(mock.sentinel.client, delay=0.01)
+        method, calls, cancelled = self._method(None, mock.sentinel.response)
+
+        response = await policy.call(method)
+        await asyncio.sleep(0)
+
+        self.assertIs(response, mock.sentinel.response)
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(cancelled, [0])
+        stats = policy.stats
+        self.assertEqual(
+            (stats.calls, stats.hedged, stats.hedges, stats.won), (1, 1, 1, 1)
+        )
+
+    async def test_call_all_fail(self):
+        from google.api_core import exceptions
+
+        policy = self._make_one(mock.sentinel.client, delay=0.0)
+        first = exceptions.ServiceUnavailable("first")
+        method, calls, _ = self._method(first)
+
+        with self.assertRaises(exceptions.ServiceUnavailable) as exc_info:
+            await policy.call(method)
+
+        self.assertIs(exc_info.exception, first)
+        self.assertEqual(policy.stats.calls, 1)
+
+    async def test_call_client_error_is_an_answer(self):
+        from google.api_core import exceptions
+
+        policy = self._make_one(mock.sentinel.client, delay=0.01)
+        method, _, cancelled = self._method(None, exceptions.NotFound("missing"))
+
+        with self.assertRaises(exceptions.NotFound):
+            await policy.call(method)
+        await asyncio.sleep(0)
+
+        self.assertEqual(cancelled, [0])
+
+    async def test_call_deadline(self):
+        from google.api_core import exceptions
+
+        policy = self._make_one(mock.sentinel.client, delay=0.01, deadline=0.05)
+        method, calls, cancelled = self._method(None, None)
+
+        with self.assertRaises(exceptions.DeadlineExceeded):
+            await policy.call(method)
+        await asyncio.sleep(0)
+
+        self.assertEqual(len(calls), 2)
+        for kwargs in calls:
+            self.assertLessEqual(kwargs["timeout"], 0.05)
+        self.assertEqual(sorted(cancelled), [0, 1])
+
+    async def test_stream(self):
+        policy = self._make_one(mock.sentinel.client, delay=5.0)
+        method, calls, _ = self._method(_Stream([1, 2, 3]))
+
+        responses = await policy.stream(method, request=mock.sentinel.request)
+
+        self.assertEqual([response async for response in responses], [1, 2, 3])
+        self.assertEqual(calls, [{"request": mock.sentinel.request}])
+
+    async def test_stream_empty(self):
+        policy = self._make_one(mock.sentinel.client, delay=5.0)
+        method, _, _ = self._method(_Stream([]))
+
+        responses = await policy.stream(method)
+
+        self.assertEqual([response async for response in responses], [])
+
+    async def test_stream_hedge_wins(self):
+        policy = self._make_one(mock.sentinel.client, delay=0.01)
+        method, _, cancelled = self._method(None, _Stream(["fast", "rest"]))
+
+        responses = await policy.stream(method)
+        await asyncio.sleep(0)
+
+        self.assertEqual([response async for response in responses], ["fast", "rest"])
+        self.assertEqual(cancelled, [0])
+        self.assertEqual(policy.stats.won, 1)
+
+    async def test_client_hedge_reads(self):
+        from google.cloud.firestore_v1 import _helpers
+        from google.cloud.firestore_v1.types import document
+        from google.cloud.firestore_v1.types import firestore
+
+        client = _make_client()
+        api_client = AsyncMock(
+            spec=["batch_get_documents", "get_document", "run_query"]
+        )
+        client._firestore_api_internal = api_client
+        reference = client.document("a", "b")
+        document_pb = document.Document(
+            name=reference._document_path, fields=_helpers.encode_dict({"x": 1})
+        )
+        get_document, _, cancelled = self._method(None, document_pb)
+        api_client.get_document = get_document
+        api_client.batch_get_documents = AsyncMock(
+            return_value=AsyncIter(
+                [firestore.BatchGetDocumentsResponse(found=document_pb)]
+            )
+        )
+        api_client.run_query = AsyncMock(
+            return_value=AsyncIter([firestore.RunQueryResponse(document=document_pb)])
+        )
+
+        async with client.hedge_reads(delay=0.01) as policy:
+            self.assertIs(client._hedging_policy, policy)
+            snapshot = await reference.get()
+            batch_snapshots = [result async for result in client.get_all([reference])]
+            query_snapshots = [
+                result async for result in client.collection("a").stream()
+            ]
+
+        self.assertIsNone(client._hedging_policy)
+        for result in [snapshot] + batch_snapshots + query_snapshots:
+            self.assertEqual(result.reference, reference)
+            self.assertEqual(result.to_dict(), {"x": 1})
+        self.assertEqual(len(batch_snapshots + query_snapshots), 2)
+        self.assertEqual(cancelled, [0])
+        stats = policy.stats
+        self.assertEqual((stats.calls, stats.hedged, stats.won), (3, 1, 1))
+
+    async def test_close(self):
+        client = mock.Mock(spec=["_hedging_policy"])
+        policy = self._make_one(client)
+        client._hedging_policy = policy
+
+        async with policy:
+            pass
+
+        self.assertIsNone(client._hedging_policy)
+
+
+def _make_credentials():
+    import google.auth.credentials
+
+    return mock.Mock(spec=google.auth.credentials.Credentials)
+
+
+def _make_client(project="seventy-nine"):
+    from google.cloud.firestore_v1.async_client import AsyncClient
+
+    credentials = _make_credentials()
+    return AsyncClient(project=project, credentials=credentials)
@@ -0,0 +1,150 @@
+# Copyright 2020 Google LLC All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+import aiounittest
+
+import mock
+from tests.unit.v1.test__helpers import AsyncMock
+
+
+class TestOperationProgress(unittest.TestCase):
+    @staticmethod
+    def _make_status(done=False, failed=False, completed=0, estimated=0):
+        from google.cloud.firestore_v1.async_operation_poller import OperationStatus
+
+        return OperationStatus("op", done, failed, completed, estimated)
+
+    def _make_one(self, statuses, elapsed=10.0):
+        from google.cloud.firestore_v1.async_operation_poller import OperationProgress
+
+        return OperationProgress(statuses, elapsed)
+
+    def test_fraction_done(self):
+        progress = self._make_one(
+            [
+                self._make_status(done=True, completed=100, estimated=100),
+                self._make_status(completed=50, estimated=200),
+                self._make_status(completed=10, estimated=0),
+                self._make_status(done=True, failed=True),
+            ]
+        )
+
+        # 100 + 50 + 0 + 1 of 100 + 200 + 1 + 1 documents.
+        self.assertAlmostEqual(progress.fraction_done, 151 / 302)
+        self.assertAlmostEqual(progress.estimated_remaining, 10.0 * 151 / 151)
+        self.assertEqual(progress.done, 2)
+        self.assertEqual(progress.failed, 1)
+        self.assertEqual(repr(progress), "<OperationProgress 2/4 done (50.0%)>")
+
+    def test_no_progress(self):
+        progress = self._make_one([self._make_status(estimated=10)])
+
+        self.assertEqual(progress.fraction_done, 0.0)
+        self.assertIsNone(progress.estimated_remaining)
+        self.assertEqual(self._make_one([]).fraction_done, 1.0)
+
+
+class TestAsyncOperationPoller(aiounittest.AsyncTestCase):
+    @staticmethod
+    def _get_target_class():
+        from google.cloud.firestore_v1.async_operation_poller import (
+            AsyncOperationPoller,
+        )
+
+        return AsyncOperationPoller
+
+    def _make_one(self, *args, **kwargs):
+        klass = self._get_target_class()
+        return klass(*args, **kwargs)
+
+    @staticmethod
+    def _make_operation(name, snapshots, result=None, error=None):
+        """Fake an operation whose progress advances on each refresh.
+
+        Args:
+            snapshots (List[Tuple[int, int]]): The completed / estimated
+                documents after each refresh; the operation is done after
+                the last one.
+        """
+        from google.cloud.firestore_admin_v1.types import IndexOperationMetadata
+        from google.cloud.firestore_admin_v1.types import Progress
+        from google.longrunning import operations_pb2
+        from google.rpc import status_pb2
+
+        operation = mock.Mock(spec=["operation", "metadata", "done", "result"])
+        remaining = list(snapshots)
+
+        def refresh():
+            completed, estimated = remaining.pop(0)
+            operation.metadata = IndexOperationMetadata(
+                progress_documents=Progress(
+                    completed_work=completed, estimated_work=estimated
+                )
+            )
+            operation.operation = operations_pb2.Operation(
+                name=name, done=not remaining
+            )
+            if not remaining and error is not None:
+                operation.operation.error.CopyFrom(status_pb2.Status(message="boom"))
+            return not remaining
+
+        refresh()
+        operation.done = AsyncMock(side_effect=refresh)
+        if error is None:
+            operation.result = AsyncMock(return_value=result)
+        else:
+            operation.result = AsyncMock(side_effect=error)
+        return operation
+
+    @mock.patch("asyncio.sleep", new_callable=AsyncMock)
+    async def test_progress(self, sleep):
+        poller = self._make_one(initial_delay=1.0, maximum_delay=2.0, multiplier=1.5)
+        fast = self._make_operation("fast", [(0, 10), (10, 10)])
+        slow = self._make_operation("slow", [(0, 0), (10, 30), (20, 30), (30, 30)])
+
+        async def _submit(operation):
+            return operation
+
+        started = await poller.submit(_submit(fast), _submit(slow))
+
+        self.assertEqual(started, [fast, slow])
+        self.assertEqual(len(poller), 2)
+        fractions = [
+            (progress.done, progress.fraction_done)
+            async for progress in poller.progress()
+        ]
+
+        self.assertEqual(fractions, [(0, 0.0), (1, 0.5), (1, 0.75), (2, 1.0)])
+        self.assertEqual([call[0][0] for call in sleep.call_args_list], [1.0, 1.5, 2.0])
+        # Completed operations are not refreshed again.
+        self.assertEqual(fast.done.call_count, 1)
+        self.assertEqual(slow.done.call_count, 3)
+
+    @mock.patch("asyncio.sleep", new_callable=AsyncMock)
+    async def test_results(self, sleep):
+        from google.api_core import exceptions
+
+        error = exceptions.GoogleAPICallError("boom")
+        poller = self._make_one()
+        poller.add(self._make_operation("ok", [(0, 1), (1, 1)], result="index"))
+        poller.add(self._make_operation("ko", [(0, 1), (0, 1)], error=error))
+
+        results = await poller.results()
+
+        self.assertEqual(results, ["index", error])
+        statuses = poller._progress().statuses
+        self.assertEqual([status.failed for status in statuses], [False, True])
+        self.assertEqual(len(poller.operations), 2)
@@ -105,6 +105,64 @@ class TestAsyncQuery(aiounittest.AsyncTestCase):
         timeout = 123.0
         await self._get_helper(retry=retry, timeout=timeout)
 
+    async def _get_max_documents_helper(self, count, max_get_documents=None, **kwargs):
+        firestore_api = AsyncMock(spec=["run_query"])
+        client = _make_client()
+        client._max_get_documents = max_get_documents
+        client._firestore_api_internal = firestore_api
+        parent = client.collection("dee")
+        _, expected_prefix = parent._parent_info()
+        firestore_api.run_query.return_value = AsyncIter(
+            [
+                _make_query_response(
+                    name="{}/doc{}".format(expected_prefix, index),
+                    data={"index": index},
+                )
+                for index in range(count)
+            ]
+        )
+
+        query = self._make_one(parent)
+        return query, await query.get(**kwargs)
+
+    @pytest.mark.asyncio
+    async def test_get_w_max_documents(self):
+        query, returned = await self._get_max_documents_helper(2, max_documents=2)
+
+        self.assertEqual([snapshot.id for snapshot in returned], ["doc0", "doc1"])
+        _, kwargs = query._client._firestore_api.run_query.call_args
+        self.assertEqual(kwargs["request"]["structured_query"].limit, 3)
+
+    @pytest.mark.asyncio
+    async def test_get_w_client_max_get_documents_exceeded(self):
+        from google.cloud.firestore_v1.query_results import MaterializationLimitExceeded
+
+        with self.assertRaises(MaterializationLimitExceeded) as exc_info:
+            await self._get_max_documents_helper(3, max_get_documents=2)
+
+        self.assertEqual(exc_info.exception.limit, 2)
+
+    @pytest.mark.asyncio
+    async def test_get_compact(self):
+        from google.cloud.firestore_v1.query_results import QueryResults
+
+        _, returned = await self._get_max_documents_helper(2, compact=True)
+
+        self.assertIsInstance(returned, QueryResults)
+        self.assertEqual(returned.stats.documents, 2)
+        self.assertEqual(returned.stats.decoded_documents, 0)
+        snapshots = returned.docs
+        self.assertEqual([snapshot.id for snapshot in snapshots], ["doc0", "doc1"])
+        self.assertEqual(snapshots[0].to_dict(), {"index": 0})
+        self.assertEqual(returned.stats.decoded_documents, 2)
+
+    @pytest.mark.asyncio
+    async def test_get_compact_w_max_documents_exceeded(self):
+        from google.cloud.firestore_v1.query_results import MaterializationLimitExceeded
+
+        with self.assertRaises(MaterializationLimitExceeded):
+            await self._get_max_documents_helper(3, compact=True, max_documents=2)
+
     @pytest.mark.asyncio
     async def test_get_limit_to_last(self):
         from google.cloud import firestore
@@ -469,6 +527,89 @@ class TestAsyncQuery(aiounittest.AsyncTestCase):
             metadata=client._rpc_metadata,
         )
 
+    @pytest.mark.asyncio
+    async def test_stream_w_split_disjunction(self):
+        from google.cloud.firestore_v1 import _helpers
+
+        # Create a minimal fake GAPIC.
+        firestore_api = AsyncMock(spec=["run_query"])
+
+        # Attach the fake GAPIC to a real client.
+        client = _make_client()
+        client._firestore_api_internal = firestore_api
+
+        # Make a **real** collection reference as parent.
+        parent = client.collection("dee")
+        _, expected_prefix = parent._parent_info()
+
+        def _run_query(request, metadata):
+            # Answer each split query with one document per value in its filter.
+            filter_pb = request["structured_query"].where.field_filter
+            values = [
+                _helpers.decode_value(value, client)
+                for value in filter_pb.value.array_value.values
+            ]
+            return AsyncIter(
+                [
+                    _make_query_response(
+                        name="{}/doc{:02d}".format(expected_prefix, value),
+                        data={"a": value},
+                    )
+                    for value in sorted(values)
+                ]
+            )
+
+        firestore_api.run_query.side_effect = _run_query
+
+        query = self._make_one(parent).where("a", "in", list(range(25))).order_by("a")
+        returned = [snapshot async for snapshot in query.stream()]
+
+        self.assertEqual(firestore_api.run_query.call_count, 3)
+        self.assertEqual([snapshot.get("a") for snapshot in returned], list(range(25)))
+
+    @pytest.mark.asyncio
+    async def test_stream_w_split_disjunction_inequality_and_limit(self):
+        # Create a minimal fake GAPIC.
+        firestore_api = AsyncMock(spec=["run_query"])
+
+        # Attach the fake GAPIC to a real client.
+        client = _make_client()
+        client._firestore_api_internal = firestore_api
+
+        # Make a **real** collection reference as parent.
+        parent = client.collection("dee")
+        _, expected_prefix = parent._parent_info()
+
+        def _run_query(request, metadata):
+            # The backend orders each split query by the inequality field.
+            composite_filter = request["structured_query"].where.composite_filter
+            in_filter = composite_filter.filters[1].field_filter
+            if len(in_filter.value.array_value.values) > 1:
+                documents = [("z", 1), ("zz", 2), ("zzz", 3)]
+            else:
+                documents = [("a", 5), ("b", 6)]
+            return AsyncIter(
+                [
+                    _make_query_response(
+                        name="{}/{}".format(expected_prefix, document_id),
+                        data={"x": x},
+                    )
+                    for document_id, x in documents
+                ]
+            )
+
+        firestore_api.run_query.side_effect = _run_query
+
+        query = (
+            self._make_one(parent)
+            .where("x", ">", 0)
+            .where("y", "in", list(range(11)))
+            .limit(2)
+        )
+        returned = [snapshot async for snapshot in query.stream()]
+
+        self.assertEqual([snapshot.id for snapshot in returned], ["z", "zz"])
+
 
 class TestCollectionGroup(aiounittest.AsyncTestCase):
     @staticmethod
@@ -0,0 +1,134 @@
+# Copyright 2020 Google LLC All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+
+import aiounittest
+
+import mock
+from tests.unit.v1.test__helpers import AsyncIter
+from tests.unit.v1.test__helpers import AsyncMock
+
+
+def _batch_get_response(document_path, data):
+    from google.cloud.firestore_v1 import _helpers
+    from google.cloud.firestore_v1.types import document
+    from google.cloud.firestore_v1.types import firestore
+
+    return firestore.BatchGetDocumentsResponse(
+        found=document.Document(name=document_path, fields=_helpers.encode_dict(data))
+    )
+
+
+class TestAsyncReadBatcher(aiounittest.AsyncTestCase):
+    @staticmethod
+    def _get_target_class():
+        from google.cloud.firestore_v1.async_read_batcher import AsyncReadBatcher
+
+        return AsyncReadBatcher
+
+    def _make_one(self, *args, **kwargs):
+        klass = self._get_target_class()
+        return klass(*args, **kwargs)
+
+    def setUp(self):
+        self.client = _make_client()
+        self.api_client = AsyncMock(spec=["batch_get_documents", "get_document"])
+        self.client._firestore_api_internal = self.api_client
+
+        def batch_get_documents(request, **kwargs):
+            return AsyncIter(
+                [
+                    _batch_get_response(path, {"path": path})
+                    for path in request["documents"]
+                ]
+            )
+
+        self.api_client.batch_get_documents.side_effect = batch_get_documents
+
+    async def test_get_batches_concurrent_reads(self):
+        batcher = self._make_one(self.client, window=0.0)
+        references = [self.client.document("a", str(index)) for index in range(5)]
+
+        snapshots = await asyncio.gather(
+            *[batcher.get(reference) for reference in references + references[:2]]
+        )
+
+        self.api_client.batch_get_documents.assert_called_once()
+        request = self.api_client.batch_get_documents.call_args[1]["request"]
+        self.assertEqual(
+            request["documents"],
+            [reference._document_path for reference in references],
+        )
+        self.assertEqual(
+            [snapshot.get("path") for snapshot in snapshots],
+            [reference._document_path for reference in references + references[:2]],
+        )
+        self.assertEqual(len(batcher), 0)
+
+    async def test_get_full_batch(self):
+        batcher = self._make_one(self.client, window=60.0, max_batch_size=2)
+        references = [self.client.document("a", str(index)) for index in range(3)]
+
+        tasks = [
+            asyncio.ensure_future(batcher.get(reference, ["path"]))
+            for reference in references
+        ]
+        await asyncio.gather(*tasks[:2])
+
+        self.api_client.batch_get_documents.assert_called_once()
+        self.assertFalse(tasks[2].done())
+        await batcher.close()
+        await tasks[2]
+        self.assertEqual(self.api_client.batch_get_documents.call_count, 2)
+
+    async def test_get_failure(self):
+        from google.api_core import exceptions
+
+        batcher = self._make_one(self.client, window=0.0)
+        self.api_client.batch_get_documents.side_effect = exceptions.ServiceUnavailable(
+            "x"
+        )
+
+        with self.assertRaises(exceptions.ServiceUnavailable):
+            await batcher.get(self.client.document("a", "b"))
+
+    async def test_client_batch_reads(self):
+        references = [self.client.document("a", str(index)) for index in range(3)]
+
+        async with self.client.batch_reads(window=0.0) as batcher:
+            self.assertIs(self.client._read_batcher, batcher)
+            snapshots = await asyncio.gather(
+                *[reference.get() for reference in references]
+            )
+
+        self.assertIsNone(self.client._read_batcher)
+        self.assertEqual(
+            [snapshot.reference for snapshot in snapshots], references,
+        )
+        self.api_client.batch_get_documents.assert_called_once()
+        self.api_client.get_document.assert_not_called()
+
+
+def _make_credentials():
+    import google.auth.credentials
+
+    return mock.Mock(spec=google.auth.credentials.Credentials)
+
+
+def _make_client(project="seventy-nine"):
+    from google.cloud.firestore_v1.async_client import AsyncClient
+
+    credentials = _make_credentials()
+    return AsyncClient(project=project, credentials=credentials)
@@ -0,0 +1,124 @@
+# Copyright 2020 Google LLC All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import aiounittest
+
+import mock
+from tests.unit.v1.test__helpers import AsyncIter
+from tests.unit.v1.test__helpers import AsyncMock
+
+
+class TestAsyncShardedCounter(aiounittest.AsyncTestCase):
+    @staticmethod
+    def _get_target_class():
+        from google.cloud.firestore_v1.async_sharded_counter import AsyncShardedCounter
+
+        return AsyncShardedCounter
+
+    def _make_one(self, *args, **kwargs):
+        klass = self._get_target_class()
+        return klass(*args, **kwargs)
+
+    def setUp(self):
+        self.client = _make_client()
+        self.api_client = AsyncMock(spec=["commit", "batch_get_documents"])
+        self.client._firestore_api_internal = self.api_client
+        self.reference = self.client.document("counters", "visits")
+
+    async def test_increment_w_contention(self):
+        from google.api_core import exceptions
+        from google.cloud.firestore_v1.types import firestore
+        from google.cloud.firestore_v1.types import write
+
+        counter = self._make_one(self.reference, num_shards=1, max_shards=8)
+        response = firestore.CommitResponse(write_results=[write.WriteResult()])
+        self.api_client.commit.side_effect = [
+            exceptions.Aborted("contention"),
+            response,
+        ]
+
+        with mock.patch("random.randrange", return_value=1):
+            result = await counter.increment(2, key="user-1")
+
+        self.assertEqual(result, response.write_results[0])
+        self.assertEqual(counter.num_shards, 2)
+        documents = [
+            call[1]["request"]["writes"][0].update.name
+            for call in self.api_client.commit.call_args_list
+        ]
+        self.assertEqual(
+            documents,
+            [counter._shard(0)._document_path, counter._shard(1)._document_path],
+        )
+
+    async def test_increment_not_retried_on_deadline(self):
+        from google.api_core import exceptions
+
+        counter = self._make_one(self.reference, num_shards=1)
+        self.api_client.commit.side_effect = exceptions.DeadlineExceeded("slow")
+
+        with self.assertRaises(exceptions.DeadlineExceeded):
+            await counter.increment()
+
+        self.assertEqual(self.api_client.commit.call_count, 1)
+
+    async def test_increment_gives_up(self):
+        from google.api_core import exceptions
+
+        counter = self._make_one(self.reference, num_shards=1)
+        self.api_client.commit.side_effect = exceptions.Aborted("contention")
+
+        with self.assertRaises(exceptions.Aborted):
+            await counter.increment()
+
+        self.assertEqual(self.api_client.commit.call_count, 3)
+
+    async def test_get(self):
+        from google.cloud.firestore_v1 import _helpers
+        from google.cloud.firestore_v1.types import document
+        from google.cloud.firestore_v1.types import firestore
+
+        counter = self._make_one(self.reference, num_shards=1, max_shards=2)
+        shards = counter._all_shards()
+        self.api_client.batch_get_documents.return_value = AsyncIter(
+            [
+                firestore.BatchGetDocumentsResponse(
+                    found=document.Document(
+                        name=shard._document_path,
+                        fields=_helpers.encode_dict({"count": 2}),
+                    )
+                )
+                for shard in shards
+            ]
+        )
+
+        self.assertEqual(await counter.get(), 4)
+
+        request = self.api_client.batch_get_documents.call_args[1]["request"]
+        self.assertEqual(
+            request["documents"], [shard._document_path for shard in shards]
+        )
+
+
+def _make_credentials():
+    import google.auth.credentials
+
+    return mock.Mock(spec=google.auth.credentials.Credentials)
+
+
+def _make_client(project="seventy-nine"):
+    from google.cloud.firestore_v1.async_client import AsyncClient
+
+    credentials = _make_credentials()
+    return AsyncClient(project=project, credentials=credentials)
@@ -12,6 +12,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
+
 import pytest
 import aiounittest
 
@@ -108,6 +110,42 @@ class TestAsyncTransaction(aiounittest.AsyncTestCase):
             metadata=client._rpc_metadata,
         )
 
+    @pytest.mark.asyncio
+    async def test__begin_w_deadline(self):
+        from google.cloud.firestore_v1.deadline import _BoundedRetry
+        from google.cloud.firestore_v1.deadline import Deadline
+        from google.cloud.firestore_v1.types import firestore
+
+        firestore_api = AsyncMock()
+        firestore_api.begin_transaction.return_value = firestore.BeginTransactionResponse(
+            transaction=b"to-begin"
+        )
+        client = _make_client()
+        client._firestore_api_internal = firestore_api
+        deadline = Deadline(5.0)
+        transaction = self._make_one(client, deadline=deadline)
+
+        await transaction._begin()
+
+        _, kwargs = firestore_api.begin_transaction.call_args
+        self.assertIs(kwargs["timeout"], deadline)
+        self.assertIsInstance(kwargs["retry"], _BoundedRetry)
+
+    @pytest.mark.asyncio
+    async def test__rollback_w_deadline_expired(self):
+        from google.cloud.firestore_v1.deadline import Deadline
+
+        firestore_api = AsyncMock()
+        client = _make_client()
+        client._firestore_api_internal = firestore_api
+        transaction = self._make_one(client, deadline=Deadline(0.0))
+        transaction._id = b"to-be-r\x00lled"
+
+        await transaction._rollback()
+
+        firestore_api.rollback.assert_not_called()
+        self.assertIsNone(transaction._id)
+
     @pytest.mark.asyncio
     async def test__begin_failure(self):
         from google.cloud.firestore_v1.base_transaction import _CANT_BEGIN
@@ -365,6 +403,46 @@ class TestAsyncTransaction(aiounittest.AsyncTestCase):
         with self.assertRaises(ValueError):
             await transaction.get(ref_or_query)
 
+    def test_constructor_w_cache_reads(self):
+        transaction = self._make_one(mock.sentinel.client, cache_reads=True)
+        self.assertTrue(transaction._cache_reads)
+        self.assertEqual(transaction.read_set, ())
+
+    @pytest.mark.asyncio
+    async def test_get_all_w_cache_reads(self):
+        client = _make_client()
+        client.get_all = mock.Mock(side_effect=_get_all_snapshots, spec=[])
+        transaction = self._make_one(client, cache_reads=True)
+        ref1 = _make_async_reference(client, "abc", "def")
+        ref2 = _make_async_reference(client, "abc", "ghi")
+
+        result = await transaction.get_all([ref1, ref2, ref1])
+        snapshots = [snapshot async for snapshot in result]
+        self.assertEqual([snapshot.reference for snapshot in snapshots], [ref1, ref2])
+        client.get_all.assert_called_once_with([ref1, ref2], transaction=transaction)
+
+        # Documents already read are served from the cache.
+        ref3 = _make_async_reference(client, "abc", "jkl")
+        result = await transaction.get_all([ref2, ref3])
+        again = [snapshot async for snapshot in result]
+        self.assertEqual(again, [snapshots[1], mock.ANY])
+        client.get_all.assert_called_with([ref3], transaction=transaction)
+        self.assertEqual(client.get_all.call_count, 2)
+        self.assertEqual(transaction.read_set, ("abc/def", "abc/ghi", "abc/jkl"))
+
+    @pytest.mark.asyncio
+    async def test_get_w_document_ref_w_cache_reads(self):
+        client = _make_client()
+        client.get_all = mock.Mock(side_effect=_get_all_snapshots, spec=[])
+        transaction = self._make_one(client, cache_reads=True)
+        ref = _make_async_reference(client, "abc", "def")
+
+        (snapshot,) = [snapshot async for snapshot in await transaction.get(ref)]
+        (again,) = [snapshot async for snapshot in await transaction.get(ref)]
+
+        self.assertIs(again, snapshot)
+        client.get_all.assert_called_once_with([ref], transaction=transaction)
+
 
 class Test_Transactional(aiounittest.AsyncTestCase):
     @staticmethod
@@ -746,6 +824,38 @@ class Test_Transactional(aiounittest.AsyncTestCase):
         )
         self.assertEqual(firestore_api.commit.mock_calls, [commit_call, commit_call])
 
+    @pytest.mark.asyncio
+    async def test___call__second_attempt_prefetches_reads(self):
+        from google.api_core import exceptions
+        from google.cloud.firestore_v1.types import firestore
+        from google.cloud.firestore_v1.types import write
+
+        transaction = _make_transaction(b"prefetch", cache_reads=True)
+        client = transaction._client
+        ref1 = _make_async_reference(client, "abc", "def")
+        ref2 = _make_async_reference(client, "abc", "ghi")
+        client.get_all = mock.Mock(side_effect=_get_all_snapshots, spec=[])
+
+        async def to_wrap(txn):
+            result = await txn.get_all([ref1, ref2])
+            return [snapshot.reference async for snapshot in result]
+
+        wrapped = self._make_one(to_wrap)
+        firestore_api = client._firestore_api
+        firestore_api.commit.side_effect = [
+            exceptions.Aborted("Contention junction."),
+            firestore.CommitResponse(write_results=[write.WriteResult()]),
+        ]
+
+        result = await wrapped(transaction)
+
+        self.assertEqual(result, [ref1, ref2])
+        # One read per attempt: the second attempt reads its documents
+        # before calling ``to_wrap``, which is then served from the cache.
+        read_call = mock.call([ref1, ref2], transaction=transaction)
+        self.assertEqual(client.get_all.mock_calls, [read_call, read_call])
+        self.assertEqual(transaction.read_set, ("abc/def", "abc/ghi"))
+
     @pytest.mark.asyncio
     async def test___call__failure(self):
         from google.api_core import exceptions
@@ -800,6 +910,45 @@ class Test_Transactional(aiounittest.AsyncTestCase):
             metadata=transaction._client._rpc_metadata,
         )
 
+    @pytest.mark.asyncio
+    async def test___call__deadline_expired(self):
+        from google.api_core import exceptions
+        from google.cloud.firestore_v1.deadline import Deadline
+
+        to_wrap = AsyncMock(spec=[])
+        wrapped = self._make_one(to_wrap)
+        transaction = _make_transaction(b"too-late", deadline=Deadline(0.0))
+
+        with self.assertRaises(exceptions.DeadlineExceeded):
+            await wrapped(transaction)
+
+        to_wrap.assert_not_called()
+        transaction._client._firestore_api.begin_transaction.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test___call__deadline_cancels_attempt(self):
+        from google.api_core import exceptions
+        from google.cloud.firestore_v1.deadline import Deadline
+
+        cancelled = []
+
+        async def to_wrap(transaction):
+            try:
+                await asyncio.sleep(10.0)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+
+        wrapped = self._make_one(to_wrap)
+        transaction = _make_transaction(b"slow-poke", deadline=Deadline(0.05))
+
+        with self.assertRaises(exceptions.DeadlineExceeded):
+            await wrapped(transaction)
+
+        self.assertEqual(cancelled, [True])
+        self.assertIsNone(transaction._id)
+        transaction._client._firestore_api.commit.assert_not_called()
+
 
 class Test_async_transactional(aiounittest.AsyncTestCase):
     @staticmethod
@@ -967,6 +1116,28 @@ class Test__commit_with_retry(aiounittest.AsyncTestCase):
         )
         self.assertEqual(firestore_api.commit.mock_calls, [commit_call, commit_call])
 
+    @mock.patch("google.cloud.firestore_v1.async_transaction._sleep")
+    @pytest.mark.asyncio
+    async def test_w_deadline(self, _sleep):
+        from google.api_core import exceptions
+        from google.cloud.firestore_v1.async_transaction import _commit_with_retry
+        from google.cloud.firestore_v1.deadline import Deadline
+
+        firestore_api = AsyncMock()
+        firestore_api.commit.side_effect = exceptions.ServiceUnavailable("Later.")
+        client = _make_client()
+        client._firestore_api_internal = firestore_api
+        # Less than the first backoff is left.
+        deadline = Deadline(0.5)
+
+        with self.assertRaises(exceptions.DeadlineExceeded):
+            await _commit_with_retry(client, mock.sentinel.write_pbs, b"txn", deadline)
+
+        _sleep.assert_not_called()
+        _, kwargs = firestore_api.commit.call_args
+        self.assertIs(kwargs["timeout"], deadline)
+        self.assertIsNone(kwargs["retry"])
+
 
 class Test__sleep(aiounittest.AsyncTestCase):
     @staticmethod
@@ -1035,6 +1206,19 @@ def _make_client(project="feral-tom-cat"):
     return Client(project=project, credentials=credentials)
 
 
+def _make_async_reference(client, *path):
+    from google.cloud.firestore_v1.async_document import AsyncDocumentReference
+
+    return AsyncDocumentReference(*path, client=client)
+
+
+async def _get_all_snapshots(references, **kwargs):
+    from google.cloud.firestore_v1.base_document import DocumentSnapshot
+
+    for reference in references:
+        yield DocumentSnapshot(reference, {}, True, None, None, None)
+
+
 def _make_transaction(txn_id, **txn_kwargs):
     from google.protobuf import empty_pb2
     from google.cloud.firestore_v1.types import firestore
@@ -0,0 +1,119 @@
+# Copyright 2020 Google LLC All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import aiounittest
+
+import mock
+from tests.unit.v1.test__helpers import AsyncMock
+
+
+class TestAsyncWriteBuffer(aiounittest.AsyncTestCase):
+    @staticmethod
+    def _get_target_class():
+        from google.cloud.firestore_v1.async_write_buffer import AsyncWriteBuffer
+
+        return AsyncWriteBuffer
+
+    def _make_one(self, *args, **kwargs):
+        klass = self._get_target_class()
+        return klass(*args, **kwargs)
+
+    def test_client_factory(self):
+        client = _make_client()
+        buffer = client.write_buffer(flush_interval=None)
+        self.assertIsInstance(buffer, self._get_target_class())
+        self.assertIs(buffer._client, client)
+
+    async def test_flush(self):
+        from google.cloud.firestore_v1.transforms import Increment
+
+        firestore_api = _make_firestore_api(1)
+        client = _make_client()
+        client._firestore_api_internal = firestore_api
+        buffer = self._make_one(client, flush_interval=None)
+        counter = client.document("counters", "page")
+
+        futures = [buffer.update(counter, {"n": Increment(1)}) for _ in range(3)]
+        write_pbs = [entry.write_pb for entry in buffer._entries]
+        await buffer.flush()
+
+        results = firestore_api.commit.return_value.write_results
+        for future in futures:
+            self.assertEqual(await future, results[0])
+        firestore_api.commit.assert_called_once_with(
+            request={
+                "database": client._database_string,
+                "writes": write_pbs,
+                "transaction": None,
+            },
+            metadata=client._rpc_metadata,
+        )
+
+    async def test_flush_failure(self):
+        from google.api_core import exceptions
+
+        firestore_api = AsyncMock(spec=["commit"])
+        exc = exceptions.NotFound("missing")
+        firestore_api.commit.side_effect = exc
+        client = _make_client()
+        client._firestore_api_internal = firestore_api
+        buffer = self._make_one(client, flush_interval=None)
+
+        future = buffer.update(client.document("a", "b"), {"a": 1})
+        await buffer.flush()
+
+        with self.assertRaises(exceptions.NotFound):
+            await future
+
+    async def test_background_flush_and_close(self):
+        firestore_api = _make_firestore_api(1)
+        client = _make_client()
+        client._firestore_api_internal = firestore_api
+
+        async with self._make_one(client, flush_interval=0.01) as buffer:
+            future = buffer.create(client.document("a", "b"), {"a": 1})
+            self.assertIsNotNone(buffer._flusher)
+            result = await future
+
+        self.assertEqual(result, firestore_api.commit.return_value.write_results[0])
+        self.assertIsNone(buffer._flusher)
+
+
+def _make_firestore_api(num_results):
+    from google.cloud.firestore_v1.types import firestore
+    from google.cloud.firestore_v1.types import write
+    from google.protobuf import timestamp_pb2
+
+    firestore_api = AsyncMock(spec=["commit"])
+    firestore_api.commit.return_value = firestore.CommitResponse(
+        write_results=[
+            write.WriteResult(update_time=timestamp_pb2.Timestamp(seconds=index))
+            for index in range(1, num_results + 1)
+        ],
+        commit_time=timestamp_pb2.Timestamp(seconds=1234567),
+    )
+    return firestore_api
+
+
+def _make_credentials():
+    import google.auth.credentials
+
+    return mock.Mock(spec=google.auth.credentials.Credentials)
+
+
+def _make_client(project="seventy-nine"):
+    from google.cloud.firestore_v1.async_client import AsyncClient
+
+    credentials = _make_credentials()
+    return AsyncClient(project=project, credentials=credentials)
@@ -88,6 +88,31 @@ class TestBaseWriteBatch(unittest.TestCase):
         )
         self.assertEqual(batch._write_pbs, [new_write_pb])
 
+    def test_set_columns(self):
+        from google.cloud.firestore_v1 import _helpers
+        from google.cloud.firestore_v1.bulk_encoder import BulkEncoder
+
+        client = _make_client()
+        batch = self._make_one(client)
+        references = [
+            client.document("another", "one"),
+            client.document("another", "two"),
+        ]
+        columns = {"zapzap": [u"meadows", u"flowers"]}
+
+        ret_val = batch.set_columns(references, columns, BulkEncoder(["zapzap"]))
+
+        self.assertIsNone(ret_val)
+        self.assertEqual(
+            batch._write_pbs,
+            _helpers.pbs_for_set_no_merge(
+                references[0]._document_path, {"zapzap": u"meadows"}
+            )
+            + _helpers.pbs_for_set_no_merge(
+                references[1]._document_path, {"zapzap": u"flowers"}
+            ),
+        )
+
     def test_set_merge(self):
         from google.cloud.firestore_v1.types import document
         from google.cloud.firestore_v1.types import write
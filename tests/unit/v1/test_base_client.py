@@ -90,6 +90,60 @@ class TestBaseClient(unittest.TestCase):
         self.assertIs(client._firestore_api, mock_client.return_value)
         self.assertEqual(mock_client.call_count, 1)
 
+    @mock.patch(
+        "google.cloud.firestore_v1.services.firestore.client.FirestoreClient",
+        autospec=True,
+    )
+    @mock.patch(
+        "google.cloud.firestore_v1.services.firestore.transports.grpc.FirestoreGrpcTransport",
+        autospec=True,
+    )
+    def test__firestore_api_property_after_fork(self, mock_channel, mock_client):
+        mock_client.DEFAULT_ENDPOINT = "endpoint"
+        client = self._make_default_one()
+        client._read_batcher = mock.sentinel.read_batcher
+        client._hedging_policy = mock.sentinel.hedging_policy
+
+        with mock.patch("os.getpid", return_value=1234):
+            parent_api = client._firestore_api
+            self.assertIs(client._firestore_api, parent_api)
+        self.assertEqual(mock_client.call_count, 1)
+
+        # In a forked child, the API is created again, and per-process
+        # helpers are dropped.
+        mock_client.return_value = mock.sentinel.child_api
+        with mock.patch("os.getpid", return_value=5678):
+            self.assertIs(client._firestore_api, mock.sentinel.child_api)
+            self.assertIs(client._firestore_api, mock.sentinel.child_api)
+        self.assertEqual(mock_client.call_count, 2)
+        self.assertIsNone(client._read_batcher)
+        self.assertIsNone(client._hedging_policy)
+
+    @mock.patch(
+        "google.cloud.firestore_v1.services.firestore.client.FirestoreClient",
+        autospec=True,
+    )
+    @mock.patch(
+        "google.cloud.firestore_v1.client._RawFirestoreGrpcTransport", autospec=True,
+    )
+    def test__firestore_api_property_raw_protobuf(self, mock_transport, mock_client):
+        mock_client.DEFAULT_ENDPOINT = "endpoint"
+        credentials = _make_credentials()
+        client = self._make_one(
+            project=self.PROJECT, credentials=credentials, raw_protobuf=True
+        )
+
+        self.assertIs(client._firestore_api, mock_client.return_value)
+        self.assertIs(client._transport, mock_transport.return_value)
+        mock_transport.create_channel.assert_called_once()
+
+    def test__firestore_api_property_set_directly(self):
+        client = self._make_default_one()
+        client._firestore_api_internal = mock.sentinel.firestore_api
+
+        with mock.patch("os.getpid", return_value=5678):
+            self.assertIs(client._firestore_api, mock.sentinel.firestore_api)
+
     def test___database_string_property(self):
         credentials = _make_credentials()
         database = "cheeeeez"
@@ -335,6 +389,27 @@ class Test__parse_batch_get(unittest.TestCase):
         self.assertEqual(snapshot.create_time.timestamp_pb(), create_time)
         self.assertEqual(snapshot.update_time.timestamp_pb(), update_time)
 
+    def test_found_raw(self):
+        from google.cloud.firestore_v1.types import document
+        from google.cloud._helpers import _datetime_to_pb_timestamp
+        from google.cloud.firestore_v1.document import DocumentSnapshot
+
+        read_time = _datetime_to_pb_timestamp(datetime.datetime.utcnow())
+        ref_string = self._dummy_ref_string()
+        document_pb = document.Document(
+            name=ref_string, fields={"foo": document.Value(integer_value=3)}
+        )
+        response_pb = _make_batch_response(found=document_pb, read_time=read_time)
+
+        reference_map = {ref_string: mock.sentinel.reference}
+        snapshot = self._call_fut(response_pb._pb, reference_map)
+        self.assertIsInstance(snapshot, DocumentSnapshot)
+        self.assertIs(snapshot._reference, mock.sentinel.reference)
+        self.assertEqual(snapshot._data, {"foo": 3})
+        self.assertEqual(snapshot.read_time.timestamp_pb(), read_time)
+        self.assertIsNone(snapshot.create_time)
+        self.assertIsNone(snapshot.update_time)
+
     def test_missing(self):
         from google.cloud.firestore_v1.document import DocumentReference
 
@@ -363,6 +438,45 @@ class Test__parse_batch_get(unittest.TestCase):
         response_pb._pb.WhichOneof.assert_called_once_with("result")
 
 
+class Test__raw_stub(unittest.TestCase):
+    @staticmethod
+    def _call_fut(transport, name):
+        from google.cloud.firestore_v1.base_client import _raw_stub
+
+        return _raw_stub(transport, name)
+
+    def test_unary_stream(self):
+        from google.cloud.firestore_v1 import types
+
+        transport = mock.Mock(_stubs={}, spec=["_stubs", "grpc_channel"])
+        stub = self._call_fut(transport, "run_query")
+
+        channel = transport.grpc_channel
+        self.assertIs(stub, channel.unary_stream.return_value)
+        self.assertIs(transport._stubs["run_query"], stub)
+        channel.unary_stream.assert_called_once_with(
+            "/google.firestore.v1.Firestore/RunQuery",
+            request_serializer=types.RunQueryRequest.serialize,
+            response_deserializer=types.RunQueryResponse.pb().FromString,
+        )
+
+        # The stub is cached.
+        self.assertIs(self._call_fut(transport, "run_query"), stub)
+        channel.unary_stream.assert_called_once()
+
+    def test_stream_stream(self):
+        from google.cloud.firestore_v1 import types
+
+        transport = mock.Mock(_stubs={}, spec=["_stubs", "grpc_channel"])
+        stub = self._call_fut(transport, "listen")
+
+        self.assertIs(stub, transport.grpc_channel.stream_stream.return_value)
+        _, kwargs = transport.grpc_channel.stream_stream.call_args
+        self.assertEqual(
+            kwargs["response_deserializer"], types.ListenResponse.pb().FromString
+        )
+
+
 class Test__get_doc_mask(unittest.TestCase):
     @staticmethod
     def _call_fut(field_paths):
@@ -339,6 +339,54 @@ class Test__auto_id(unittest.TestCase):
         self.assertEqual(mock_rand_choice.mock_calls, mock_calls)
 
 
+class Test__page_document_ids(unittest.TestCase):
+    @staticmethod
+    def _call_fut(page):
+        from google.cloud.firestore_v1.base_collection import _page_document_ids
+
+        return _page_document_ids(page)
+
+    def test_it(self):
+        from google.cloud.firestore_v1.types.document import Document
+        from google.cloud.firestore_v1.types.firestore import ListDocumentsResponse
+
+        prefix = "projects/p/databases/d/documents/c/"
+        page = ListDocumentsResponse(
+            documents=[Document(name=prefix + "a"), Document(name=prefix + "b")]
+        )
+        self.assertEqual(self._call_fut(page), ["a", "b"])
+
+
+class Test__scan_document_id(unittest.TestCase):
+    @staticmethod
+    def _call_fut(response_pb, expected_prefix):
+        from google.cloud.firestore_v1.base_collection import _scan_document_id
+
+        return _scan_document_id(response_pb, expected_prefix)
+
+    def test_wo_document(self):
+        from google.cloud.firestore_v1.types.firestore import RunQueryResponse
+
+        self.assertIsNone(self._call_fut(RunQueryResponse(), "a/b"))
+
+    def test_w_document(self):
+        from google.cloud.firestore_v1.types.document import Document
+        from google.cloud.firestore_v1.types.firestore import RunQueryResponse
+
+        prefix = "projects/p/databases/d/documents/c"
+        response_pb = RunQueryResponse(document=Document(name=prefix + "/a"))
+        self.assertEqual(self._call_fut(response_pb, prefix), "a")
+
+    def test_w_document_in_other_collection(self):
+        from google.cloud.firestore_v1.types.document import Document
+        from google.cloud.firestore_v1.types.firestore import RunQueryResponse
+
+        prefix = "projects/p/databases/d/documents/c"
+        name = "projects/p/databases/d/documents/x/y/c/a"
+        response_pb = RunQueryResponse(document=Document(name=name))
+        self.assertIsNone(self._call_fut(response_pb, prefix))
+
+
 def _make_credentials():
     import google.auth.credentials
 
@@ -85,12 +85,16 @@ class TestBaseDocumentReference(unittest.TestCase):
     def test___deepcopy__calls_copy(self):
         client = mock.sentinel.client
         document = self._make_one("a", "b", client=client)
-        document.__copy__ = mock.Mock(return_value=mock.sentinel.new_doc, spec=[])
+        klass = self._get_target_class()
 
         unused_memo = {}
-        new_document = document.__deepcopy__(unused_memo)
+        with mock.patch.object(
+            klass, "__copy__", return_value=mock.sentinel.new_doc
+        ) as copy:
+            new_document = document.__deepcopy__(unused_memo)
+
         self.assertIs(new_document, mock.sentinel.new_doc)
-        document.__copy__.assert_called_once_with()
+        copy.assert_called_once_with()
 
     def test__eq__same_type(self):
         document1 = self._make_one("X", "YY", client=mock.sentinel.client)
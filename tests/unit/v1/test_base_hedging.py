@@ -0,0 +1,233 @@
+# Copyright 2020 Google LLC All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+import mock
+
+
+class TestHedgingStats(unittest.TestCase):
+    @staticmethod
+    def _get_target_class():
+        from google.cloud.firestore_v1.base_hedging import HedgingStats
+
+        return HedgingStats
+
+    def _make_one(self, *args, **kwargs):
+        klass = self._get_target_class()
+        return klass(*args, **kwargs)
+
+    def test_rates_empty(self):
+        stats = self._make_one()
+        self.assertEqual(stats.hedge_rate, 0.0)
+        self.assertEqual(stats.win_rate, 0.0)
+
+    def test_rates(self):
+        stats = self._make_one(calls=10, hedged=4, hedges=5, won=1)
+        self.assertEqual(stats.hedge_rate, 0.4)
+        self.assertEqual(stats.win_rate, 0.25)
+
+    def test___repr__(self):
+        stats = self._make_one(calls=10, hedged=4, hedges=5, won=1)
+        self.assertEqual(repr(stats), "<HedgingStats calls=10 hedged=4 hedges=5 won=1>")
+
+
+class TestBaseHedgingPolicy(unittest.TestCase):
+    @staticmethod
+    def _get_target_class():
+        from google.cloud.firestore_v1.base_hedging import BaseHedgingPolicy
+
+        return BaseHedgingPolicy
+
+    def _make_one(self, *args, **kwargs):
+        klass = self._get_target_class()
+        return klass(*args, **kwargs)
+
+    def test_constructor_defaults(self):
+        from google.cloud.firestore_v1.base_hedging import DEFAULT_HISTORY
+        from google.cloud.firestore_v1.base_hedging import DEFAULT_MAX_DELAY
+        from google.cloud.firestore_v1.base_hedging import DEFAULT_MIN_DELAY
+        from google.cloud.firestore_v1.base_hedging import DEFAULT_PERCENTILE
+
+        client = mock.sentinel.client
+        policy = self._make_one(client)
+        self.assertIs(policy._client, client)
+        self.assertIsNone(policy._delay)
+        self.assertEqual(policy._percentile, DEFAULT_PERCENTILE)
+        self.assertEqual(policy._min_delay, DEFAULT_MIN_DELAY)
+        self.assertEqual(policy._max_delay, DEFAULT_MAX_DELAY)
+        self.assertEqual(policy._max_hedges, 1)
+        self.assertIsNone(policy._deadline)
+        self.assertEqual(policy._latencies.maxlen, DEFAULT_HISTORY)
+        self.assertEqual(policy.stats.calls, 0)
+
+    def test_constructor_bad_percentile(self):
+        with self.assertRaises(ValueError):
+            self._make_one(None, percentile=0)
+        with self.assertRaises(ValueError):
+            self._make_one(None, percentile=101)
+
+    def test_constructor_bad_max_hedges(self):
+        with self.assertRaises(ValueError):
+            self._make_one(None, max_hedges=0)
+
+    def test_constructor_bad_delays(self):
+        with self.assertRaises(ValueError):
+            self._make_one(None, min_delay=-1.0)
+        with self.assertRaises(ValueError):
+            self._make_one(None, min_delay=2.0, max_delay=1.0)
+
+    def test_hedge_delay_fixed(self):
+        policy = self._make_one(None, delay=0.25)
+        policy._record(0, 0, 5.0)
+        self.assertEqual(policy.hedge_delay(), 0.25)
+
+    def test_hedge_delay_too_few_samples(self):
+        policy = self._make_one(None, max_delay=0.5)
+        for _ in range(10):
+            policy._record(0, 0, 0.02)
+        self.assertEqual(policy.hedge_delay(), 0.5)
+
+    def test_hedge_delay_learned(self):
+        policy = self._make_one(None, percentile=90.0)
+        # Latencies of 0.01 to 0.1 seconds, ten times each.
+        for index in range(100):
+            policy._record(0, 0, (index % 10 + 1) / 100.0)
+        self.assertEqual(policy.hedge_delay(), 0.09)
+
+        policy._percentile = 50.0
+        self.assertAlmostEqual(policy.hedge_delay(), 0.06)
+
+    def test_hedge_delay_clamped(self):
+        policy = self._make_one(None, min_delay=0.05, max_delay=0.2)
+        for _ in range(50):
+            policy._record(0, 0, 0.001)
+        self.assertEqual(policy.hedge_delay(), 0.05)
+
+        for _ in range(200):
+            policy._record(0, 0, 3.0)
+        self.assertEqual(policy.hedge_delay(), 0.2)
+
+    def test__record(self):
+        policy = self._make_one(None)
+        policy._record(0, 0, 0.1)
+        policy._record(1, 0, 0.2)
+        policy._record(2, 2, 0.3)
+        policy._record(1, None, 0.0)
+
+        stats = policy.stats
+        self.assertEqual(stats.calls, 4)
+        self.assertEqual(stats.hedged, 3)
+        self.assertEqual(stats.hedges, 4)
+        self.assertEqual(stats.won, 1)
+        # Failed reads do not teach anything about latencies.
+        self.assertEqual(list(policy._latencies), [0.1, 0.2, 0.3])
+
+    def test_stats_is_a_copy(self):
+        policy = self._make_one(None)
+        stats = policy.stats
+        policy._record(0, 0, 0.1)
+        self.assertEqual(stats.calls, 0)
+        self.assertEqual(policy.stats.calls, 1)
+
+    def test__attempt_kwargs_wo_deadline(self):
+        policy = self._make_one(None)
+        kwargs = {"request": mock.sentinel.request}
+        self.assertIs(policy._attempt_kwargs(kwargs, None), kwargs)
+
+    @mock.patch("time.monotonic", return_value=100.0)
+    def test__attempt_kwargs_w_deadline(self, _):
+        policy = self._make_one(None)
+
+        kwargs = policy._attempt_kwargs({"request": mock.sentinel.request}, 102.5)
+        self.assertEqual(kwargs, {"request": mock.sentinel.request, "timeout": 2.5})
+
+        kwargs = policy._attempt_kwargs({"timeout": 1.0}, 102.5)
+        self.assertEqual(kwargs, {"timeout": 1.0})
+
+        kwargs = policy._attempt_kwargs({"timeout": 5.0}, 99.0)
+        self.assertEqual(kwargs, {"timeout": 0.0})
+
+    def test__attempt_kwargs_w_deadline_timeout(self):
+        from google.cloud.firestore_v1.deadline import Deadline
+
+        policy = self._make_one(None)
+        with mock.patch("time.monotonic", return_value=100.0):
+            deadline = Deadline(1.0)
+
+            kwargs = policy._attempt_kwargs({"timeout": deadline}, 102.5)
+            self.assertEqual(kwargs, {"timeout": deadline})
+
+            kwargs = policy._attempt_kwargs({"timeout": deadline}, 100.5)
+            self.assertEqual(kwargs, {"timeout": 0.5})
+
+    @mock.patch("time.monotonic", return_value=100.0)
+    def test__wait_timeout(self, _):
+        policy = self._make_one(None, max_hedges=1)
+        self.assertEqual(policy._wait_timeout(0, 100.5, None), 0.5)
+        self.assertEqual(policy._wait_timeout(0, 100.5, 100.25), 0.25)
+        self.assertEqual(policy._wait_timeout(0, 99.0, None), 0.0)
+        # No more hedges to send.
+        self.assertIsNone(policy._wait_timeout(1, 100.5, None))
+        self.assertEqual(policy._wait_timeout(1, 100.5, 103.0), 3.0)
+
+    def test__is_answer(self):
+        from google.api_core import exceptions
+
+        klass = self._get_target_class()
+        self.assertTrue(klass._is_answer(exceptions.NotFound("missing")))
+        self.assertTrue(klass._is_answer(exceptions.InvalidArgument("bad")))
+        self.assertFalse(klass._is_answer(exceptions.ServiceUnavailable("down")))
+        self.assertFalse(klass._is_answer(ValueError()))
+
+    def test__cancel_stream(self):
+        klass = self._get_target_class()
+        stream = mock.Mock(spec=["cancel"])
+        klass._cancel_stream(stream)
+        stream.cancel.assert_called_once_with()
+
+        # Streams without ``cancel()`` are left alone.
+        klass._cancel_stream(iter([]))
+
+    def test__deadline_exceeded(self):
+        from google.api_core import exceptions
+
+        policy = self._make_one(None, deadline=1.5)
+        error = policy._deadline_exceeded()
+        self.assertIsInstance(error, exceptions.DeadlineExceeded)
+        self.assertIn("1.5 seconds", error.message)
+
+    def test__detach(self):
+        client = mock.Mock(spec=["_hedging_policy"])
+        policy = self._make_one(client)
+        client._hedging_policy = policy
+        policy._detach()
+        self.assertIsNone(client._hedging_policy)
+
+    def test__detach_replaced(self):
+        client = mock.Mock(spec=["_hedging_policy"])
+        policy = self._make_one(client)
+        client._hedging_policy = mock.sentinel.other
+        policy._detach()
+        self.assertIs(client._hedging_policy, mock.sentinel.other)
+
+    def test_call_virtual(self):
+        policy = self._make_one(None)
+        with self.assertRaises(NotImplementedError):
+            policy.call(mock.Mock())
+
+    def test_stream_virtual(self):
+        policy = self._make_one(None)
+        with self.assertRaises(NotImplementedError):
+            policy.stream(mock.Mock())
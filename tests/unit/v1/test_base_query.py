@@ -1138,6 +1138,185 @@ class TestBaseQuery(unittest.TestCase):
         with self.assertRaisesRegex(ValueError, "Can only compare fields "):
             query._comparator(doc1, doc2)
 
+    def test_comparator_ordering_by_name(self):
+        query = self._make_one(mock.sentinel.parent).order_by(
+            "__name__", direction="DESCENDING"
+        )
+        doc1 = mock.Mock(_data={})
+        doc1.reference._path = ("col", "adocument1")
+        doc2 = mock.Mock(_data={})
+        doc2.reference._path = ("col", "adocument2")
+
+        self.assertEqual(query._comparator(doc1, doc2), 1)
+
+    def test__split_disjunctions_wo_large_filter(self):
+        from google.cloud.firestore_v1.base_query import MAX_DISJUNCTION_SIZE
+
+        values = list(range(MAX_DISJUNCTION_SIZE))
+        query = self._make_one(mock.sentinel.parent).where("a", "in", values)
+        self.assertIsNone(query._split_disjunctions())
+
+    def test__split_disjunctions(self):
+        from google.cloud.firestore_v1 import _helpers
+        from google.cloud.firestore_v1.base_query import MAX_DISJUNCTION_SIZE
+
+        values = list(range(MAX_DISJUNCTION_SIZE * 2 + 1))
+        query = (
+            self._make_one(mock.sentinel.parent)
+            .where("a", "in", values)
+            .where("b", "==", 1)
+            .order_by("c")
+            .limit(5)
+            .offset(3)
+        )
+
+        split_queries = query._split_disjunctions()
+
+        self.assertEqual(len(split_queries), 3)
+        chunks = []
+        for split_query in split_queries:
+            in_filter, eq_filter = split_query._field_filters
+            self.assertEqual(in_filter.op, query._field_filters[0].op)
+            self.assertEqual(eq_filter, query._field_filters[1])
+            chunks.append(
+                [
+                    _helpers.decode_value(value, None)
+                    for value in in_filter.value.array_value.values
+                ]
+            )
+            self.assertEqual(split_query._orders, query._orders)
+            self.assertEqual(split_query._limit, 8)
+            self.assertIsNone(split_query._offset)
+        self.assertEqual(chunks, [values[:10], values[10:20], values[20:]])
+
+    def test__split_disjunctions_w_two_large_filters(self):
+        from google.cloud.firestore_v1.base_query import MAX_DISJUNCTION_SIZE
+
+        values = list(range(MAX_DISJUNCTION_SIZE + 1))
+        query = (
+            self._make_one(mock.sentinel.parent)
+            .where("a", "in", values)
+            .where("b", "array_contains_any", values)
+        )
+
+        self.assertEqual(len(query._split_disjunctions()), 4)
+
+    def test__merge_split_results(self):
+        query = self._make_one(mock.sentinel.parent).order_by("n").offset(1).limit(3)
+
+        results = [
+            [_split_snapshot("a", n=1), _split_snapshot("c", n=3)],
+            [_split_snapshot("b", n=2), _split_snapshot("c", n=3)],
+            [_split_snapshot("d", n=4), _split_snapshot("e", n=5)],
+        ]
+
+        merged = list(query._merge_split_results(results))
+
+        self.assertEqual(
+            [snapshot.reference._path[-1] for snapshot in merged], ["b", "c", "d"]
+        )
+
+    def test__merge_split_results_w_inequality(self):
+        from google.cloud.firestore_v1.base_query import MAX_DISJUNCTION_SIZE
+
+        # The backend orders by the inequality field first, not by name.
+        query = (
+            self._make_one(mock.sentinel.parent)
+            .where("x", ">", 0)
+            .where("y", "in", list(range(MAX_DISJUNCTION_SIZE + 1)))
+            .limit(2)
+        )
+        results = [
+            [_split_snapshot("z", x=1), _split_snapshot("zz", x=2)],
+            [_split_snapshot("a", x=5), _split_snapshot("b", x=6)],
+        ]
+
+        merged = list(query._merge_split_results(results))
+
+        self.assertEqual(
+            [snapshot.reference._path[-1] for snapshot in merged], ["z", "zz"]
+        )
+
+    def test__merge_split_results_w_nested_and_missing_fields(self):
+        query = self._make_one(mock.sentinel.parent).order_by("a.b")
+        results = [
+            [_split_snapshot("b", a={"b": 1}), _split_snapshot("d", a={"b": 3})],
+            [_split_snapshot("a"), _split_snapshot("c", a={"b": 2})],
+        ]
+
+        merged = list(query._merge_split_results(results))
+
+        # A missing field sorts first instead of raising.
+        self.assertEqual(
+            [snapshot.reference._path[-1] for snapshot in merged], ["a", "b", "c", "d"],
+        )
+
+    def test__merge_split_results_is_lazy(self):
+        query = self._make_one(mock.sentinel.parent).order_by("n").limit(1)
+        consumed = []
+
+        def _results(*document_ids):
+            for index, document_id in enumerate(document_ids):
+                consumed.append(document_id)
+                yield _split_snapshot(document_id, n=index)
+
+        merged = list(
+            query._merge_split_results([_results("a", "b", "c"), _results("d", "e")])
+        )
+
+        self.assertEqual([snapshot.reference._path[-1] for snapshot in merged], ["a"])
+        self.assertEqual(consumed, ["a", "d"])
+
+    def test__split_projection_fields(self):
+        query = self._make_one(mock.sentinel.parent)
+        self.assertEqual(query._split_projection_fields(), [])
+
+        query = query.where("x", ">", 0).select(["a", "x.y"])
+        self.assertEqual(query._split_projection_fields(), ["x"])
+
+        query = query.order_by("x").order_by("a.b").order_by("c")
+        self.assertEqual(query._split_projection_fields(), ["x", "c"])
+
+    def test__split_disjunctions_w_projection(self):
+        from google.cloud.firestore_v1.base_query import MAX_DISJUNCTION_SIZE
+
+        query = (
+            self._make_one(mock.sentinel.parent)
+            .where("a", "in", list(range(MAX_DISJUNCTION_SIZE + 1)))
+            .order_by("n.m")
+            .select(["b"])
+        )
+
+        for split_query in query._split_disjunctions():
+            self.assertEqual(
+                [field.field_path for field in split_query._projection.fields],
+                ["b", "n.m"],
+            )
+
+    def test__merge_split_results_w_projection(self):
+        query = self._make_one(mock.sentinel.parent).order_by("n.m").select(["b"])
+        results = [
+            [_split_snapshot("b", b=1, n={"m": 1}), _split_snapshot("c", n={"m": 2})],
+            [_split_snapshot("a", b=2, n={"m": 0, "k": 1})],
+        ]
+
+        merged = list(query._merge_split_results(results))
+
+        # The fields only selected to merge the results are removed.
+        self.assertEqual(
+            [snapshot._data for snapshot in merged],
+            [{"b": 2, "n": {"k": 1}}, {"b": 1}, {}],
+        )
+
+
+def _split_snapshot(document_id, **data):
+    snapshot = mock.Mock(_data=data, spec=["_data", "reference"])
+    snapshot.reference._path = ("col", document_id)
+    snapshot.reference._document_path = "projects/p/databases/d/documents/col/" + (
+        document_id
+    )
+    return snapshot
+
 
 class Test__enum_from_op_string(unittest.TestCase):
     @staticmethod
@@ -1348,6 +1527,24 @@ class Test__query_response_to_snapshot(unittest.TestCase):
         self.assertEqual(snapshot.create_time, response_pb.document.create_time)
         self.assertEqual(snapshot.update_time, response_pb.document.update_time)
 
+    def test_response_raw(self):
+        from google.cloud.firestore_v1.document import DocumentSnapshot
+
+        client = _make_client()
+        collection = client.collection("a", "b", "c")
+        _, expected_prefix = collection._parent_info()
+        name = "{}/{}".format(expected_prefix, "gigantic")
+        data = {"a": 901, "b": {"c": [u"d"]}}
+        response_pb = _make_query_response(name=name, data=data)
+
+        snapshot = self._call_fut(response_pb._pb, collection, expected_prefix)
+        self.assertIsInstance(snapshot, DocumentSnapshot)
+        self.assertEqual(snapshot.reference._path, collection._path + ("gigantic",))
+        self.assertEqual(snapshot.to_dict(), data)
+        self.assertEqual(snapshot.read_time, response_pb.read_time)
+        self.assertEqual(snapshot.create_time, response_pb.document.create_time)
+        self.assertEqual(snapshot.update_time, response_pb.document.update_time)
+
 
 class Test__collection_group_query_response_to_snapshot(unittest.TestCase):
     @staticmethod
@@ -1384,9 +1581,34 @@ class Test__collection_group_query_response_to_snapshot(unittest.TestCase):
         self.assertEqual(snapshot.reference._document_path, to_match._document_path)
         self.assertEqual(snapshot.to_dict(), data)
         self.assertTrue(snapshot.exists)
-        self.assertEqual(snapshot.read_time, response_pb._pb.read_time)
-        self.assertEqual(snapshot.create_time, response_pb._pb.document.create_time)
-        self.assertEqual(snapshot.update_time, response_pb._pb.document.update_time)
+        self.assertEqual(snapshot.read_time, response_pb.read_time)
+        self.assertEqual(snapshot.create_time, response_pb.document.create_time)
+        self.assertEqual(snapshot.update_time, response_pb.document.update_time)
+
+    def test_response_caches_document_path(self):
+        client = _make_client()
+        collection = client.collection("a", "b", "c")
+        name = client._database_string + "/documents/a/b/d/gigantic"
+        response_pb = _make_query_response(name=name, data={})
+
+        snapshot = self._call_fut(response_pb, collection)
+        self.assertEqual(snapshot.reference._path, ("a", "b", "d", "gigantic"))
+        self.assertEqual(snapshot.reference._document_path_internal, name)
+
+    def test_response_interns_reference_by_name(self):
+        client = _make_client()
+        collection = client.collection("a", "b", "c")
+        name = client._database_string + "/documents/a/b/d/gigantic"
+        response_pb = _make_query_response(name=name, data={})
+
+        snapshot = self._call_fut(response_pb, collection)
+        with mock.patch.object(
+            client, "_document_path_helper", side_effect=AssertionError
+        ):
+            other = self._call_fut(response_pb, collection)
+
+        # The name is not split again while the reference is alive.
+        self.assertIs(other.reference, snapshot.reference)
 
 
 def _make_credentials():
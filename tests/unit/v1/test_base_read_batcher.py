@@ -0,0 +1,138 @@
+# Copyright 2020 Google LLC All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import concurrent.futures
+import unittest
+
+import mock
+
+
+class TestBaseReadBatcher(unittest.TestCase):
+    @staticmethod
+    def _get_target_class():
+        from google.cloud.firestore_v1.base_read_batcher import BaseReadBatcher
+
+        return BaseReadBatcher
+
+    def _make_one(self, *args, **kwargs):
+        klass = self._get_target_class()
+        return klass(*args, **kwargs)
+
+    def setUp(self):
+        self.client = _make_client()
+
+    def test_ctor(self):
+        batcher = self._make_one(self.client)
+
+        self.assertIs(batcher._client, self.client)
+        self.assertEqual(batcher._window, 0.002)
+        self.assertEqual(batcher._max_batch_size, 100)
+        self.assertEqual(len(batcher), 0)
+        with self.assertRaises(ValueError):
+            self._make_one(self.client, max_batch_size=0)
+
+    def test_enqueue(self):
+        batcher = self._make_one(self.client, max_batch_size=2)
+        first = self.client.document("a", "1")
+        second = self.client.document("a", "2")
+
+        future, mask, full = batcher._enqueue(first, None, concurrent.futures.Future)
+        self.assertIsNone(mask)
+        self.assertFalse(full)
+
+        # Identical reads share the future.
+        again, _, full = batcher._enqueue(first, None, concurrent.futures.Future)
+        self.assertIs(again, future)
+        self.assertFalse(full)
+
+        # Reads of other fields are separate.
+        other, mask, full = batcher._enqueue(
+            first, ["b", "a", "b"], concurrent.futures.Future
+        )
+        self.assertIsNot(other, future)
+        self.assertEqual(mask, ("a", "b"))
+        self.assertFalse(full)
+
+        _, _, full = batcher._enqueue(second, None, concurrent.futures.Future)
+        self.assertTrue(full)
+        self.assertEqual(len(batcher), 3)
+
+    def test_take_batches(self):
+        batcher = self._make_one(self.client, max_batch_size=2)
+        references = [self.client.document("a", str(index)) for index in range(3)]
+        for reference in references:
+            batcher._enqueue(reference, None, concurrent.futures.Future)
+        batcher._enqueue(references[0], ["x"], concurrent.futures.Future)
+
+        self.assertEqual(batcher._take_batches([("x",)]), [(("x",), [references[0]])])
+        self.assertEqual(
+            batcher._take_batches(), [(None, references[:2]), (None, references[2:])],
+        )
+        self.assertEqual(batcher._take_batches(), [])
+        # Taken reads stay in flight until resolved.
+        self.assertEqual(len(batcher), 4)
+
+    def test_resolve_and_fail(self):
+        from google.cloud.firestore_v1.base_document import DocumentSnapshot
+
+        batcher = self._make_one(self.client)
+        references = [self.client.document("a", str(index)) for index in range(3)]
+        futures = [
+            batcher._enqueue(reference, None, concurrent.futures.Future)[0]
+            for reference in references
+        ]
+        snapshot = DocumentSnapshot(references[0], None, False, None, None, None)
+
+        batcher._resolve(None, references[:2], [snapshot])
+        batcher._fail(None, references[2:], RuntimeError("boom"))
+
+        self.assertIs(futures[0].result(), snapshot)
+        with self.assertRaises(ValueError):
+            futures[1].result()
+        with self.assertRaises(RuntimeError):
+            futures[2].result()
+        self.assertEqual(len(batcher), 0)
+
+    def test_detach(self):
+        batcher = self._make_one(self.client)
+        other = self._make_one(self.client)
+        self.client._read_batcher = batcher
+
+        other._detach()
+        self.assertIs(self.client._read_batcher, batcher)
+        batcher._detach()
+        self.assertIsNone(self.client._read_batcher)
+        with self.assertRaises(ValueError):
+            batcher._enqueue(
+                self.client.document("a", "b"), None, concurrent.futures.Future
+            )
+
+    def test_get_virtual(self):
+        batcher = self._make_one(self.client)
+
+        with self.assertRaises(NotImplementedError):
+            batcher.get(self.client.document("a", "b"))
+
+
+def _make_credentials():
+    import google.auth.credentials
+
+    return mock.Mock(spec=google.auth.credentials.Credentials)
+
+
+def _make_client(project="seventy-nine"):
+    from google.cloud.firestore_v1.client import Client
+
+    credentials = _make_credentials()
+    return Client(project=project, credentials=credentials)
@@ -0,0 +1,127 @@
+# Copyright 2020 Google LLC All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+import mock
+
+
+class TestBaseShardedCounter(unittest.TestCase):
+    @staticmethod
+    def _get_target_class():
+        from google.cloud.firestore_v1.base_sharded_counter import BaseShardedCounter
+
+        return BaseShardedCounter
+
+    def _make_one(self, *args, **kwargs):
+        klass = self._get_target_class()
+        return klass(*args, **kwargs)
+
+    def setUp(self):
+        self.reference = _make_client().document("counters", "visits")
+
+    def test_ctor_defaults(self):
+        counter = self._make_one(self.reference)
+
+        self.assertIs(counter.reference, self.reference)
+        self.assertEqual(counter.num_shards, 4)
+        self.assertEqual(counter._max_shards, 32)
+        self.assertEqual(counter._field, "count")
+        self.assertEqual(self._make_one(self.reference, 50)._max_shards, 50)
+
+    def test_ctor_invalid(self):
+        with self.assertRaises(ValueError):
+            self._make_one(self.reference, num_shards=0)
+        with self.assertRaises(ValueError):
+            self._make_one(self.reference, num_shards=4, max_shards=2)
+
+    def test_shards(self):
+        counter = self._make_one(self.reference, num_shards=2, max_shards=3)
+
+        self.assertEqual(
+            [shard.path for shard in counter._all_shards()],
+            [
+                "counters/visits/shards/0",
+                "counters/visits/shards/1",
+                "counters/visits/shards/2",
+            ],
+        )
+
+    def test_choose_shard(self):
+        counter = self._make_one(self.reference, num_shards=8)
+
+        self.assertEqual(
+            counter._choose_shard("user-1"), counter._choose_shard(b"user-1")
+        )
+        with mock.patch("random.randrange", return_value=5) as randrange:
+            self.assertEqual(counter._choose_shard(), 5)
+        randrange.assert_called_once_with(8)
+
+    def test_resize(self):
+        from google.cloud.firestore_v1 import base_sharded_counter
+
+        counter = self._make_one(self.reference, num_shards=2, max_shards=6)
+
+        counter._record_contention()
+        self.assertEqual(counter.num_shards, 4)
+        counter._record_contention()
+        self.assertEqual(counter.num_shards, 6)
+
+        with mock.patch.object(base_sharded_counter, "_SHRINK_AFTER", 2):
+            for _ in range(10):
+                counter._record_success()
+                if counter.num_shards == 5:
+                    counter._record_contention()
+        self.assertEqual(counter.num_shards, 6)
+
+        with mock.patch.object(base_sharded_counter, "_SHRINK_AFTER", 2):
+            for _ in range(20):
+                counter._record_success()
+        self.assertEqual(counter.num_shards, 2)
+
+    def test_total(self):
+        from google.cloud.firestore_v1.base_document import DocumentSnapshot
+
+        counter = self._make_one(self.reference)
+        snapshots = [
+            DocumentSnapshot(shard, data, exists, None, None, None)
+            for shard, data, exists in zip(
+                counter._all_shards(),
+                [{"count": 3}, {"count": 1.5}, None, {"count": True}, {}],
+                [True, True, False, True, True],
+            )
+        ]
+
+        self.assertEqual(counter._total(snapshots), 4.5)
+
+    def test_abstract(self):
+        counter = self._make_one(self.reference)
+
+        with self.assertRaises(NotImplementedError):
+            counter.increment()
+        with self.assertRaises(NotImplementedError):
+            counter.get()
+
+
+def _make_credentials():
+    import google.auth.credentials
+
+    return mock.Mock(spec=google.auth.credentials.Credentials)
+
+
+def _make_client(project="seventy-nine"):
+    from google.cloud.firestore_v1.client import Client
+
+    credentials = _make_credentials()
+    return Client(project=project, credentials=credentials)
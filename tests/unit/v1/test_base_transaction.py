@@ -89,6 +89,52 @@ class TestBaseTransaction(unittest.TestCase):
         transaction._id = mock.sentinel.eye_dee
         self.assertIs(transaction.id, mock.sentinel.eye_dee)
 
+    def test_constructor_w_cache_reads(self):
+        transaction = self._make_one(cache_reads=True)
+        self.assertTrue(transaction._cache_reads)
+        self.assertEqual(transaction._read_cache, {})
+        self.assertEqual(transaction.read_set, ())
+
+    def test__uncached_references(self):
+        transaction = self._make_one(cache_reads=True)
+        ref1 = _make_reference("abc/def")
+        ref2 = _make_reference("abc/ghi")
+        ref3 = _make_reference("abc/jkl")
+        transaction._cache_snapshots([_make_snapshot(ref2)])
+
+        paths, missing = transaction._uncached_references([ref1, ref2, ref1, ref3])
+
+        self.assertEqual(paths, [ref._document_path for ref in (ref1, ref2, ref3)])
+        self.assertEqual(missing, [ref1, ref3])
+        self.assertEqual(transaction.read_set, ("abc/def", "abc/ghi", "abc/jkl"))
+
+    def test__cached_snapshots(self):
+        transaction = self._make_one(cache_reads=True)
+        ref1 = _make_reference("abc/def")
+        ref2 = _make_reference("abc/ghi")
+        ref3 = _make_reference("abc/jkl")
+        snapshot1 = _make_snapshot(ref1)
+        snapshot2 = _make_snapshot(ref2)
+        transaction._cache_snapshots([snapshot1, snapshot2])
+
+        snapshots = transaction._cached_snapshots(
+            [ref2._document_path, ref3._document_path, ref1._document_path]
+        )
+
+        self.assertEqual(snapshots, [snapshot2, snapshot1])
+
+    def test__clean_up_clears_read_cache(self):
+        transaction = self._make_one(cache_reads=True)
+        reference = _make_reference("abc/def")
+        transaction._uncached_references([reference])
+        transaction._cache_snapshots([_make_snapshot(reference)])
+
+        transaction._clean_up()
+
+        self.assertEqual(transaction._read_cache, {})
+        # The read set survives, so that a retry can prefetch it.
+        self.assertEqual(transaction.read_set, ("abc/def",))
+
 
 class Test_Transactional(unittest.TestCase):
     @staticmethod
@@ -117,3 +163,26 @@ class Test_Transactional(unittest.TestCase):
 
         self.assertIsNone(wrapped.current_id)
         self.assertIsNone(wrapped.retry_id)
+
+    def test__reset_w_transaction(self):
+        from google.cloud.firestore_v1.base_transaction import BaseTransaction
+
+        wrapped = self._make_one(mock.sentinel.callable_)
+        transaction = BaseTransaction(cache_reads=True)
+        transaction._uncached_references([_make_reference("abc/def")])
+
+        wrapped._reset(transaction)
+
+        self.assertEqual(transaction.read_set, ())
+
+
+def _make_reference(path):
+    return mock.Mock(
+        _document_path="projects/p/databases/d/documents/" + path,
+        path=path,
+        spec=["_document_path", "path"],
+    )
+
+
+def _make_snapshot(reference):
+    return mock.Mock(reference=reference, spec=["reference"])
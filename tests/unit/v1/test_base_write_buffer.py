@@ -0,0 +1,254 @@
+# Copyright 2020 Google LLC All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+import mock
+
+
+class TestBaseWriteBuffer(unittest.TestCase):
+    @staticmethod
+    def _get_target_class():
+        from google.cloud.firestore_v1.base_write_buffer import BaseWriteBuffer
+
+        class DerivedWriteBuffer(BaseWriteBuffer):
+            def _add(self, entry):
+                return self._add_entry(entry)
+
+        return DerivedWriteBuffer
+
+    def _make_one(self, *args, **kwargs):
+        klass = self._get_target_class()
+        return klass(*args, **kwargs)
+
+    def test_constructor(self):
+        from google.cloud.firestore_v1.base_write_buffer import (
+            DEFAULT_FLUSH_INTERVAL,
+            MAX_BATCH_SIZE,
+        )
+
+        buffer = self._make_one(mock.sentinel.client)
+        self.assertIs(buffer._client, mock.sentinel.client)
+        self.assertEqual(buffer._flush_interval, DEFAULT_FLUSH_INTERVAL)
+        self.assertEqual(buffer._max_batch_size, MAX_BATCH_SIZE)
+        self.assertEqual(len(buffer), 0)
+
+    def test_constructor_w_bad_batch_size(self):
+        with self.assertRaises(ValueError):
+            self._make_one(mock.sentinel.client, max_batch_size=0)
+
+        with self.assertRaises(ValueError):
+            self._make_one(mock.sentinel.client, max_batch_size=501)
+
+    def test_update_folds_fields(self):
+        from google.cloud.firestore_v1 import _helpers
+
+        client = _make_client()
+        buffer = self._make_one(client)
+        reference = client.document("counters", "page")
+
+        first = buffer.update(reference, {"a": 1, "b.c": 2})
+        second = buffer.update(reference, {"a": 3, "d": 4})
+
+        self.assertIs(first, second)
+        self.assertEqual(len(buffer), 1)
+        expected = _helpers.pbs_for_update(
+            reference._document_path, {"a": 3, "b.c": 2, "d": 4}, None
+        )[0]
+        self.assertEqual(first.write_pb, expected)
+
+    def test_update_sums_increments(self):
+        from google.cloud.firestore_v1 import _helpers
+        from google.cloud.firestore_v1.transforms import Increment
+
+        client = _make_client()
+        buffer = self._make_one(client)
+        reference = client.document("counters", "page")
+
+        for _ in range(3):
+            entry = buffer.update(reference, {"views": Increment(2)})
+        buffer.update(reference, {"hits": 7})
+        buffer.update(reference, {"hits": Increment(1)})
+
+        self.assertEqual(len(buffer), 1)
+        expected = _helpers.pbs_for_update(
+            reference._document_path, {"views": Increment(6), "hits": 8}, None
+        )[0]
+        self.assertEqual(entry.write_pb, expected)
+
+    def test_set_merge_then_update(self):
+        from google.cloud.firestore_v1.types import common
+
+        client = _make_client()
+        buffer = self._make_one(client)
+        reference = client.document("counters", "page")
+
+        entry = buffer.set(reference, {"a": {"b": 1}}, merge=True)
+        buffer.update(reference, {"c": 2})
+
+        self.assertEqual(len(buffer), 1)
+        write_pb = entry.write_pb
+        self.assertEqual(
+            write_pb.update_mask, common.DocumentMask(field_paths=["a.b", "c"])
+        )
+        # The merged write keeps the (absent) precondition of ``set()``.
+        self.assertFalse(write_pb._pb.HasField("current_document"))
+
+    def test_parent_child_conflict_not_folded(self):
+        client = _make_client()
+        buffer = self._make_one(client)
+        reference = client.document("counters", "page")
+
+        first = buffer.update(reference, {"a": {"b": 1}})
+        second = buffer.update(reference, {"a.b": 2})
+
+        self.assertIsNot(first, second)
+        self.assertEqual(len(buffer), 2)
+
+    def test_stacked_transforms_not_folded(self):
+        from google.cloud.firestore_v1.transforms import ArrayUnion
+
+        client = _make_client()
+        buffer = self._make_one(client)
+        reference = client.document("tags", "page")
+
+        buffer.update(reference, {"tags": ArrayUnion(["x"])})
+        buffer.update(reference, {"tags": ArrayUnion(["y"])})
+
+        self.assertEqual(len(buffer), 2)
+
+    def test_nested_increments_not_folded(self):
+        from google.cloud.firestore_v1.transforms import Increment
+
+        client = _make_client()
+        buffer = self._make_one(client)
+        reference = client.document("counters", "page")
+
+        first = buffer.update(reference, {"a": {"b": Increment(1)}})
+        second = buffer.update(reference, {"a": {"b": Increment(1)}})
+
+        self.assertIsNot(first, second)
+        self.assertEqual(len(buffer), 2)
+        for entry in (first, second):
+            (transform_pb,) = entry.write_pb.update_transforms
+            self.assertEqual(transform_pb.field_path, "a.b")
+            self.assertEqual(transform_pb.increment.integer_value, 1)
+
+    def test_delete_is_a_barrier(self):
+        client = _make_client()
+        buffer = self._make_one(client)
+        reference = client.document("counters", "page")
+
+        buffer.update(reference, {"a": 1})
+        buffer.delete(reference)
+        buffer.set(reference, {"a": 2}, merge=True)
+        buffer.update(reference, {"b": 3})
+
+        self.assertEqual(len(buffer), 3)
+
+    def test_update_w_option_not_folded(self):
+        from google.cloud.firestore_v1._helpers import LastUpdateOption
+        from google.protobuf import timestamp_pb2
+
+        client = _make_client()
+        buffer = self._make_one(client)
+        reference = client.document("counters", "page")
+        option = LastUpdateOption(timestamp_pb2.Timestamp(seconds=1))
+
+        buffer.update(reference, {"a": 1}, option=option)
+        buffer.update(reference, {"b": 2})
+
+        self.assertEqual(len(buffer), 2)
+
+    def test_update_w_exists_option(self):
+        from google.cloud.firestore_v1._helpers import ExistsOption
+
+        client = _make_client()
+        buffer = self._make_one(client)
+        reference = client.document("counters", "page")
+
+        with self.assertRaises(ValueError):
+            buffer.update(reference, {"a": 1}, option=ExistsOption(True))
+
+    def test_add_after_close(self):
+        client = _make_client()
+        buffer = self._make_one(client)
+        buffer._closed = True
+
+        with self.assertRaises(ValueError):
+            buffer.create(client.document("a", "b"), {"a": 1})
+
+    def test__resolve_and__fail(self):
+        from google.cloud.firestore_v1.base_write_buffer import _PendingWrite
+
+        entry1 = _PendingWrite("a/b", mock.sentinel.write_pb)
+        entry2 = _PendingWrite("c/d", mock.sentinel.write_pb)
+        future1, future2 = mock.Mock(), mock.Mock()
+        future1.done.return_value = future2.done.return_value = False
+        entry1.futures.append(future1)
+        entry2.futures.append(future2)
+        klass = self._get_target_class()
+
+        klass._resolve([entry1, entry2], [mock.sentinel.r1, mock.sentinel.r2])
+        future1.set_result.assert_called_once_with(mock.sentinel.r1)
+        future2.set_result.assert_called_once_with(mock.sentinel.r2)
+
+        exc = RuntimeError("nope")
+        klass._fail([entry1], exc)
+        future1.set_exception.assert_called_once_with(exc)
+
+
+class Test__fold_values(unittest.TestCase):
+    @staticmethod
+    def _call_fut(old, new):
+        from google.cloud.firestore_v1.base_write_buffer import _fold_values
+
+        return _fold_values(old, new)
+
+    def test_plain_values(self):
+        self.assertEqual(self._call_fut(1, "two"), "two")
+
+    def test_increments(self):
+        from google.cloud.firestore_v1.transforms import Increment
+
+        self.assertEqual(self._call_fut(Increment(1), Increment(2.5)), Increment(3.5))
+        self.assertEqual(self._call_fut(10, Increment(-1)), 9)
+
+    def test_conflicts(self):
+        from google.cloud.firestore_v1.base_write_buffer import _CONFLICT
+        from google.cloud.firestore_v1.transforms import Increment
+        from google.cloud.firestore_v1.transforms import Maximum
+        from google.cloud.firestore_v1.transforms import SERVER_TIMESTAMP
+
+        self.assertIs(self._call_fut(True, Increment(1)), _CONFLICT)
+        self.assertIs(self._call_fut(SERVER_TIMESTAMP, Increment(1)), _CONFLICT)
+        self.assertIs(self._call_fut(Increment(1), Maximum(3)), _CONFLICT)
+        self.assertIs(self._call_fut({"a": 1}, {"a": Increment(1)}), _CONFLICT)
+        self.assertIs(self._call_fut({"a": SERVER_TIMESTAMP}, {"a": 1}), _CONFLICT)
+
+    def test_nested_plain_values(self):
+        self.assertEqual(self._call_fut({"a": 1}, {"b": 2}), {"b": 2})
+
+
+def _make_credentials():
+    import google.auth.credentials
+
+    return mock.Mock(spec=google.auth.credentials.Credentials)
+
+
+def _make_client(project="seventy-nine"):
+    from google.cloud.firestore_v1.client import Client
+
+    credentials = _make_credentials()
+    return Client(project=project, credentials=credentials)
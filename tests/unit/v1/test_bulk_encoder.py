@@ -0,0 +1,214 @@
+# Copyright 2020 Google LLC All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import datetime
+import unittest
+
+import mock
+
+
+class _Array(object):
+    """Stand-in for a NumPy array: ``tolist()`` returns native values."""
+
+    def __init__(self, values):
+        self._values = values
+
+    def tolist(self):
+        return list(self._values)
+
+
+class _DatetimeArray(_Array):
+    """Stand-in for a NumPy ``datetime64[ns]`` array of nanosecond counts."""
+
+    dtype = mock.Mock(kind="M", spec=["kind"])
+
+    def astype(self, dtype):
+        if dtype == "int64":
+            return _Array(self._values)
+        return self
+
+
+class TestBulkEncoder(unittest.TestCase):
+    @staticmethod
+    def _get_target_class():
+        from google.cloud.firestore_v1.bulk_encoder import BulkEncoder
+
+        return BulkEncoder
+
+    def _make_one(self, *args, **kwargs):
+        klass = self._get_target_class()
+        return klass(*args, **kwargs)
+
+    def setUp(self):
+        client = _make_client()
+        self.references = [client.document("users", str(index)) for index in range(3)]
+
+    def _expected(self, helper, documents, *args):
+        write_pbs = []
+        for reference, document_data in zip(self.references, documents):
+            write_pbs.extend(helper(reference._document_path, document_data, *args))
+        return write_pbs
+
+    def test_ctor_invalid(self):
+        from google.cloud.firestore_v1.transforms import DELETE_FIELD
+        from google.cloud.firestore_v1.transforms import SERVER_TIMESTAMP
+
+        with self.assertRaises(ValueError):
+            self._make_one([])
+        with self.assertRaises(ValueError):
+            self._make_one(["a"], merge=True, create=True)
+        with self.assertRaises(ValueError):
+            self._make_one(["a", "a.b"])
+        with self.assertRaises(ValueError):
+            self._make_one(["a"], transforms={"a": DELETE_FIELD})
+        with self.assertRaises(ValueError):
+            self._make_one(["a"], transforms={"b": 1})
+        with self.assertRaises(ValueError):
+            self._make_one(["a.b"], transforms={"a": SERVER_TIMESTAMP})
+
+    def test_field_paths(self):
+        from google.cloud.firestore_v1.field_path import FieldPath
+
+        encoder = self._make_one(["a.b", FieldPath("c.d"), "`e.f`"])
+
+        self.assertEqual(
+            encoder.field_paths,
+            [FieldPath("a", "b"), FieldPath("c.d"), FieldPath("e.f")],
+        )
+
+    def test_encode_matches_set(self):
+        from google.cloud.firestore_v1 import _helpers
+        from google.cloud.firestore_v1._helpers import GeoPoint
+        from google.cloud.firestore_v1.transforms import Increment
+        from google.cloud.firestore_v1.transforms import SERVER_TIMESTAMP
+
+        when = datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc)
+        columns = {
+            "name": [u"ada", u"bob", u"cy"],
+            "address.city": [u"x", None, u"z"],
+            "address.zip": _Array([1, 2, 3]),
+            "score": [1.5, True, b"\x00"],
+            "extra": [[1, 2], {"k": when}, GeoPoint(1.0, 2.0)],
+        }
+        encoder = self._make_one(
+            list(columns),
+            transforms={"updated": SERVER_TIMESTAMP, "stats.visits": Increment(1)},
+        )
+
+        write_pbs = encoder.encode(self.references, columns)
+
+        documents = [
+            {
+                "name": columns["name"][index],
+                "address": {"city": columns["address.city"][index], "zip": index + 1},
+                "score": columns["score"][index],
+                "extra": columns["extra"][index],
+                "updated": SERVER_TIMESTAMP,
+                "stats": {"visits": Increment(1)},
+            }
+            for index in range(3)
+        ]
+        self.assertEqual(
+            write_pbs, self._expected(_helpers.pbs_for_set_no_merge, documents)
+        )
+
+    def test_encode_merge_and_create(self):
+        from google.cloud.firestore_v1 import _helpers
+
+        columns = {"b": [1, 2, 3], "a.c": [u"x", u"y", u"z"]}
+        documents = [
+            {"a": {"c": c}, "b": b} for b, c in zip(columns["b"], columns["a.c"])
+        ]
+
+        merged = self._make_one(list(columns), merge=True).encode(
+            self.references, columns
+        )
+        created = self._make_one(list(columns), create=True).encode(
+            self.references, columns
+        )
+
+        self.assertEqual(
+            merged,
+            self._expected(_helpers.pbs_for_set_with_merge, documents, list(columns)),
+        )
+        self.assertEqual(created, self._expected(_helpers.pbs_for_create, documents))
+
+    def test_encode_invalid(self):
+        from google.cloud.firestore_v1.transforms import SERVER_TIMESTAMP
+
+        encoder = self._make_one(["a", "b"])
+
+        with self.assertRaises(ValueError):
+            encoder.encode(self.references, {"a": [1, 2, 3]})
+        with self.assertRaises(ValueError):
+            encoder.encode(self.references, {"a": [1, 2, 3], "b": [1, 2]})
+        with self.assertRaises(ValueError):
+            encoder.encode(
+                self.references, {"a": [1, 2, 3], "b": [1, SERVER_TIMESTAMP, 3]}
+            )
+        with self.assertRaises(TypeError):
+            encoder.encode(self.references, {"a": [1, 2, 3], "b": [1, object(), 3]})
+
+    def test_encode_datetime64_column(self):
+        from google.api_core.datetime_helpers import DatetimeWithNanoseconds
+
+        encoder = self._make_one(["when"])
+        nanos = 1600000000 * 10 ** 9 + 123456789
+        columns = {"when": _DatetimeArray([nanos, -(2 ** 63), -(10 ** 9)])}
+
+        write_pbs = encoder.encode(self.references, columns)
+
+        values = [write_pb._pb.update.fields["when"] for write_pb in write_pbs]
+        self.assertEqual(values[0].timestamp_value.seconds, 1600000000)
+        self.assertEqual(values[0].timestamp_value.nanos, 123456789)
+        # NaT is written as null, and times before the epoch are supported.
+        self.assertEqual(values[1].WhichOneof("value_type"), "null_value")
+        self.assertEqual(values[2].timestamp_value.seconds, -1)
+        self.assertEqual(values[2].timestamp_value.nanos, 0)
+
+        series = mock.Mock(spec=["dtype", "to_numpy"], dtype=_DatetimeArray.dtype)
+        series.to_numpy.return_value = _DatetimeArray([nanos])
+        (write_pb,) = encoder.encode(self.references[:1], {"when": series})
+        self.assertEqual(
+            DatetimeWithNanoseconds.from_timestamp_pb(
+                write_pb._pb.update.fields["when"].timestamp_value
+            ).nanosecond,
+            123456789,
+        )
+
+    def test_encode_columns(self):
+        from google.cloud.firestore_v1.bulk_encoder import encode_columns
+        from google.cloud.firestore_v1.bulk_encoder import BulkEncoder
+
+        columns = {"a": [1, 2, 3]}
+
+        write_pbs = encode_columns(self.references, columns, merge=True)
+
+        self.assertEqual(
+            write_pbs, BulkEncoder(["a"], merge=True).encode(self.references, columns)
+        )
+        self.assertEqual(list(write_pbs[0].update_mask.field_paths), ["a"])
+
+
+def _make_credentials():
+    import google.auth.credentials
+
+    return mock.Mock(spec=google.auth.credentials.Credentials)
+
+
+def _make_client(project="seventy-nine"):
+    from google.cloud.firestore_v1.client import Client
+
+    credentials = _make_credentials()
+    return Client(project=project, credentials=credentials)
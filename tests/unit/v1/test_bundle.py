@@ -0,0 +1,323 @@
+# Copyright 2020 Google LLC All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import datetime
+import io
+import os
+import shutil
+import tempfile
+import unittest
+
+import mock
+
+
+class _BundleTestCase(unittest.TestCase):
+    def setUp(self):
+        self.client = _make_client()
+        self.collection = self.client.collection("cities")
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.path = os.path.join(directory, "cities.bundle")
+
+    def _snapshot(self, document_id, data, exists=True, seconds=10):
+        from google.cloud.firestore_v1.base_document import DocumentSnapshot
+
+        read_time = datetime.datetime.fromtimestamp(seconds, datetime.timezone.utc)
+        update_time = read_time if exists else None
+        return DocumentSnapshot(
+            self.collection.document(document_id),
+            data,
+            exists=exists,
+            read_time=read_time,
+            create_time=update_time,
+            update_time=update_time,
+        )
+
+    def _read_elements(self, data):
+        from google.cloud.firestore_v1.bundle import BundleElement
+        from google.cloud.firestore_v1.bundle import _ELEMENT_LENGTH
+
+        elements = []
+        offset = 0
+        while offset < len(data):
+            (length,) = _ELEMENT_LENGTH.unpack_from(data, offset)
+            offset += _ELEMENT_LENGTH.size
+            elements.append(BundleElement.deserialize(data[offset : offset + length]))
+            offset += length
+        return elements
+
+
+class TestBundleWriter(_BundleTestCase):
+    @staticmethod
+    def _get_target_class():
+        from google.cloud.firestore_v1.bundle import BundleWriter
+
+        return BundleWriter
+
+    def _make_one(self, *args, **kwargs):
+        klass = self._get_target_class()
+        return klass(*args, **kwargs)
+
+    def test_layout(self):
+        buffer = io.BytesIO()
+        snapshot = self._snapshot("sf", {"name": "San Francisco"}, seconds=20)
+        missing = self._snapshot("xx", None, exists=False, seconds=5)
+
+        writer = self._make_one(buffer, "cities")
+        writer.add_document(snapshot)
+        writer.add_document(missing)
+        writer.add_named_query("all", self.collection._query(), snapshots=[snapshot])
+        writer.close()
+        writer.close()
+
+        elements = self._read_elements(buffer.getvalue())
+        kinds = [element._pb.WhichOneof("element_type") for element in elements]
+        self.assertEqual(
+            kinds,
+            [
+                "metadata",
+                "document_metadata",
+                "document",
+                "document_metadata",
+                "document_metadata",
+                "named_query",
+            ],
+        )
+
+        metadata = elements[0].metadata
+        self.assertEqual(metadata.id, "cities")
+        self.assertEqual(metadata.version, 1)
+        self.assertEqual(metadata.total_documents, 1)
+        self.assertEqual(metadata.create_time, snapshot.read_time)
+        self.assertEqual(
+            metadata.total_bytes,
+            len(buffer.getvalue()) - 4 - len(type(elements[0]).serialize(elements[0])),
+        )
+
+        self.assertEqual(elements[2].document.name, snapshot.reference._document_path)
+        self.assertFalse(elements[3].document_metadata.exists)
+        # The document is only stored once, whichever queries return it.
+        self.assertEqual(list(elements[4].document_metadata.queries), ["all"])
+
+        named_query = elements[5].named_query
+        self.assertEqual(named_query.name, "all")
+        self.assertEqual(named_query.read_time, snapshot.read_time)
+        self.assertEqual(
+            named_query.bundled_query.parent,
+            self.client._database_string + "/documents",
+        )
+
+    def test_add_named_query_runs_query(self):
+        snapshot = self._snapshot("sf", {"name": "San Francisco"})
+        query = self.collection.where("name", "==", "San Francisco")
+        read_time = datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc)
+
+        with mock.patch.object(
+            type(query), "stream", return_value=iter([snapshot])
+        ) as stream:
+            with self._make_one(self.path, "cities") as writer:
+                writer.add_named_query("sf", query, read_time=read_time, timeout=5.0)
+
+        stream.assert_called_once_with(read_time=read_time, timeout=5.0)
+        with open(self.path, "rb") as bundle:
+            elements = self._read_elements(bundle.read())
+        self.assertEqual(len(elements), 4)
+
+    def test_add_named_query_collection_group(self):
+        from google.cloud._helpers import _datetime_to_pb_timestamp
+        from google.cloud.firestore_v1.base_query import (
+            _collection_group_query_response_to_snapshot,
+        )
+        from google.cloud.firestore_v1.types import document
+        from google.cloud.firestore_v1.types import firestore
+
+        query = self.client.collection_group("landmarks")
+        snapshots = []
+        for seconds, path in (
+            (20, "cities/sf/landmarks/bridge"),
+            (30, "parks/gg/landmarks/lake"),
+        ):
+            timestamp = _datetime_to_pb_timestamp(
+                datetime.datetime.fromtimestamp(seconds, datetime.timezone.utc)
+            )
+            response_pb = firestore.RunQueryResponse(
+                document=document.Document(
+                    name=self.client.document(path)._document_path,
+                    create_time=timestamp,
+                    update_time=timestamp,
+                ),
+                read_time=timestamp,
+            )
+            snapshots.append(
+                _collection_group_query_response_to_snapshot(response_pb, query._parent)
+            )
+        buffer = io.BytesIO()
+
+        with self._make_one(buffer, "landmarks") as writer:
+            writer.add_named_query("all", query, snapshots=snapshots)
+
+        elements = self._read_elements(buffer.getvalue())
+        self.assertEqual(elements[0].metadata.create_time, snapshots[1].read_time)
+        self.assertEqual(elements[-1].named_query.read_time, snapshots[1].read_time)
+
+    def test_add_named_query_limit_to_last(self):
+        from google.cloud.firestore_v1.bundle import BundledQuery
+
+        query = self.collection.order_by("name").limit_to_last(1)
+        buffer = io.BytesIO()
+
+        with mock.patch.object(type(query), "get", return_value=[]) as get:
+            with self._make_one(buffer, "cities") as writer:
+                writer.add_named_query("last", query)
+
+        get.assert_called_once_with()
+        named_query = self._read_elements(buffer.getvalue())[1].named_query
+        self.assertEqual(
+            named_query.bundled_query.limit_type, BundledQuery.LimitType.LAST
+        )
+
+    def test_add_named_query_duplicate(self):
+        writer = self._make_one(io.BytesIO(), "cities")
+        writer.add_named_query("all", self.collection._query(), snapshots=[])
+
+        with self.assertRaises(ValueError):
+            writer.add_named_query("all", self.collection._query(), snapshots=[])
+
+    def test_closed(self):
+        writer = self._make_one(io.BytesIO(), "cities")
+        writer.close()
+
+        with self.assertRaises(ValueError):
+            writer.add_document(self._snapshot("sf", {}))
+
+    def test_context_manager_error(self):
+        with self.assertRaises(RuntimeError):
+            with self._make_one(self.path, "cities"):
+                raise RuntimeError()
+
+        self.assertFalse(os.path.exists(self.path))
+
+
+class TestBundleReader(_BundleTestCase):
+    @staticmethod
+    def _get_target_class():
+        from google.cloud.firestore_v1.bundle import BundleReader
+
+        return BundleReader
+
+    def _make_one(self, *args, **kwargs):
+        klass = self._get_target_class()
+        return klass(*args, **kwargs)
+
+    def _write_bundle(self):
+        from google.cloud.firestore_v1.bundle import BundleWriter
+
+        snapshots = [
+            self._snapshot("sf", {"name": "San Francisco", "population": 0.9}),
+            self._snapshot("la", {"name": "Los Angeles", "population": 3.9}),
+        ]
+        with BundleWriter(self.path, "cities") as writer:
+            writer.add_named_query("big", self.collection._query(), snapshots[::-1])
+            writer.add_document(snapshots[0])
+            writer.add_document(self._snapshot("xx", None, exists=False))
+        return snapshots
+
+    def test_read(self):
+        snapshots = self._write_bundle()
+
+        with self._make_one(self.client, self.path) as reader:
+            self.assertEqual(reader.metadata.id, "cities")
+            self.assertEqual(len(reader), 3)
+            self.assertEqual(list(reader.named_queries), ["big"])
+
+            self.assertEqual(list(reader.query("big")), snapshots[::-1])
+            self.assertEqual(list(reader.documents())[:2], snapshots[::-1])
+
+            snapshot = reader.get(self.collection.document("sf"))
+            self.assertEqual(snapshot, snapshots[0])
+            self.assertEqual(snapshot.read_time, snapshots[0].read_time)
+            self.assertEqual(snapshot.to_dict(), snapshots[0].to_dict())
+
+            missing = reader.get(self.collection.document("xx"))
+            self.assertFalse(missing.exists)
+            self.assertIsNone(reader.get(self.collection.document("ny")))
+
+            with self.assertRaises(KeyError):
+                list(reader.query("small"))
+
+    def test_read_missing_then_existing(self):
+        from google.cloud.firestore_v1.bundle import BundleWriter
+
+        missing = self._snapshot("sf", None, exists=False, seconds=5)
+        snapshot = self._snapshot("sf", {"name": "San Francisco"}, seconds=20)
+        with BundleWriter(self.path, "cities") as writer:
+            writer.add_document(missing)
+            writer.add_document(snapshot)
+            writer.add_document(missing)
+
+        with self._make_one(self.client, self.path) as reader:
+            self.assertEqual(len(reader), 1)
+            found = reader.get(self.collection.document("sf"))
+            self.assertTrue(found.exists)
+            self.assertEqual(found.to_dict(), snapshot.to_dict())
+            self.assertEqual(found.read_time, snapshot.read_time)
+
+    def test_documents_decoded_lazily(self):
+        from google.cloud.firestore_v1 import _helpers
+
+        self._write_bundle()
+
+        with mock.patch.object(
+            _helpers, "decode_dict", wraps=_helpers.decode_dict
+        ) as decode:
+            with self._make_one(self.client, self.path) as reader:
+                self.assertEqual(decode.call_count, 0)
+                reader.get(self.collection.document("la"))
+
+        self.assertEqual(decode.call_count, 1)
+
+    def test_invalid(self):
+        from google.cloud.firestore_v1.bundle import _ELEMENT_LENGTH
+
+        self._write_bundle()
+        with open(self.path, "rb") as bundle:
+            data = bundle.read()
+
+        document_element = _ELEMENT_LENGTH.pack(2) + b"\x22\x00"
+        for invalid in (
+            b"",
+            data[:-1],
+            data[:3],
+            _ELEMENT_LENGTH.pack(0),
+            document_element,
+            data + document_element,
+            data + _ELEMENT_LENGTH.pack(2) + b"\x2a\x00",
+        ):
+            with open(self.path, "wb") as bundle:
+                bundle.write(invalid)
+            with self.assertRaises(ValueError):
+                self._make_one(self.client, self.path)
+
+
+def _make_credentials():
+    import google.auth.credentials
+
+    return mock.Mock(spec=google.auth.credentials.Credentials)
+
+
+def _make_client(project="seventy-nine"):
+    from google.cloud.firestore_v1.client import Client
+
+    credentials = _make_credentials()
+    return Client(project=project, credentials=credentials)
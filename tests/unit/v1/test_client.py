@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import concurrent.futures
 import datetime
 import types
 import unittest
@@ -48,6 +49,38 @@ class TestClient(unittest.TestCase):
         self.assertEqual(client._database, DEFAULT_DATABASE)
         self.assertIs(client._client_info, _CLIENT_INFO)
         self.assertIsNone(client._emulator_host)
+        self.assertFalse(client._raw_protobuf)
+        self.assertIsNone(client._max_get_documents)
+
+    def test_constructor_max_get_documents(self):
+        credentials = _make_credentials()
+        client = self._make_one(
+            project=self.PROJECT, credentials=credentials, max_get_documents=1000
+        )
+        self.assertEqual(client._max_get_documents, 1000)
+
+    def test_constructor_raw_protobuf(self):
+        credentials = _make_credentials()
+        client = self._make_one(
+            project=self.PROJECT, credentials=credentials, raw_protobuf=True
+        )
+        self.assertTrue(client._raw_protobuf)
+
+    def test_raw_transport(self):
+        from google.cloud.firestore_v1 import types
+        from google.cloud.firestore_v1.client import _RawFirestoreGrpcTransport
+
+        channel = mock.Mock(spec=["unary_unary", "unary_stream", "stream_stream"])
+        transport = _RawFirestoreGrpcTransport(channel=channel)
+
+        for name in ("batch_get_documents", "run_query", "listen"):
+            self.assertIs(getattr(transport, name), transport._stubs[name])
+            self.assertIn(getattr(transport, name), transport._wrapped_methods)
+        channel.unary_stream.assert_any_call(
+            "/google.firestore.v1.Firestore/RunQuery",
+            request_serializer=types.RunQueryRequest.serialize,
+            response_deserializer=types.RunQueryResponse.pb().FromString,
+        )
 
     def test_constructor_with_emulator_host(self):
         from google.cloud.firestore_v1.base_client import _FIRESTORE_EMULATOR_HOST
@@ -193,6 +226,53 @@ class TestClient(unittest.TestCase):
         self.assertIs(document2._client, client)
         self.assertIsInstance(document2, DocumentReference)
 
+    def test_document_factory_interns_references(self):
+        import gc
+
+        client = self._make_default_one()
+        document1 = client.document("rooms/roomA")
+        document_path = document1._document_path
+
+        self.assertIs(client.document("rooms", "roomA"), document1)
+        self.assertIs(client.collection("rooms").document("roomA"), document1)
+        self.assertIs(client.document(document_path), document1)
+        self.assertIsNot(client.document("rooms", "roomB"), document1)
+
+        del document1
+        gc.collect()
+        self.assertNotIn(("rooms", "roomA"), client._document_refs)
+
+    def test__document_from_name(self):
+        import gc
+
+        client = self._make_default_one()
+        name = client._database_string + "/documents/rooms/roomA"
+        document1 = client._document_from_name(name)
+
+        self.assertEqual(document1._path, ("rooms", "roomA"))
+        self.assertIs(client.document("rooms", "roomA"), document1)
+        with mock.patch.object(
+            client, "_document_path_helper", side_effect=AssertionError
+        ):
+            self.assertIs(client._document_from_name(name), document1)
+
+        del document1
+        gc.collect()
+        self.assertNotIn(name, client._document_refs_by_name)
+
+    def test_document_factory_w_slash_in_segment(self):
+        client = self._make_default_one()
+        document = client.document("rooms", "roomA/shoes", "dressy")
+
+        self.assertEqual(document._path, ("rooms", "roomA", "shoes", "dressy"))
+
+    def test_document_reference_has_no_dict(self):
+        client = self._make_default_one()
+        document = client.document("rooms", "roomA")
+
+        self.assertFalse(hasattr(document, "__dict__"))
+        self.assertFalse(hasattr(document.parent, "__dict__"))
+
     def _collections_helper(self, retry=None, timeout=None):
         from google.cloud.firestore_v1 import _helpers
         from google.cloud.firestore_v1.collection import CollectionReference
@@ -233,6 +313,124 @@ class TestClient(unittest.TestCase):
         timeout = 123.0
         self._collections_helper(retry=retry, timeout=timeout)
 
+    def _walk_helper(self, tree, root=(), **kwargs):
+        client = self._make_default_one()
+        if len(root) % 2:
+            kwargs["root"] = client.collection(*root)
+        elif root:
+            kwargs["root"] = client.document(*root)
+        list_collection_ids, list_documents = _tree_listers(client, tree)
+        firestore_api = mock.Mock(spec=["list_collection_ids", "list_documents"])
+        firestore_api.list_collection_ids.side_effect = list_collection_ids
+        firestore_api.list_documents.side_effect = list_documents
+        client._firestore_api_internal = firestore_api
+
+        entries = client.walk(**kwargs)
+        self.assertIsInstance(entries, types.GeneratorType)
+        return client, list(entries)
+
+    def test_walk(self):
+        client, entries = self._walk_helper(_TREE)
+
+        self.assertEqual(
+            entries,
+            [
+                ("logs", "collection"),
+                ("users", "collection"),
+                ("users/alice", "document"),
+                ("users/bob", "document"),
+                ("users/alice/posts", "collection"),
+                ("users/bob/posts", "collection"),
+                ("users/alice/posts/p1", "document"),
+                ("users/alice/posts/p2", "document"),
+            ],
+        )
+        # Leaf documents are expanded once, and nodes never re-expanded.
+        firestore_api = client._firestore_api
+        self.assertEqual(firestore_api.list_collection_ids.call_count, 5)
+        self.assertEqual(firestore_api.list_documents.call_count, 4)
+
+    def test_walk_w_root_and_max_depth(self):
+        _, entries = self._walk_helper(_TREE, root=("users",), max_depth=2)
+
+        self.assertEqual(
+            entries,
+            [
+                ("users/alice", "document"),
+                ("users/bob", "document"),
+                ("users/alice/posts", "collection"),
+                ("users/bob/posts", "collection"),
+            ],
+        )
+
+    def test_walk_w_document_root(self):
+        _, entries = self._walk_helper(_TREE, root=("users", "bob"))
+
+        self.assertEqual(entries, [("users/bob/posts", "collection")])
+
+    def test_walk_skips_visited(self):
+        tree = {"": ["c"], "c": ["d", "d"]}
+        _, entries = self._walk_helper(tree)
+
+        self.assertEqual(entries, [("c", "collection"), ("c/d", "document")])
+
+    def test_walk_close_early(self):
+        documents = ["d1", "d2", "d3", "d4", "d5"]
+        tree = {"": ["c"], "c": documents}
+        tree.update({"c/" + document_id: ["s"] for document_id in documents})
+        client = self._make_default_one()
+        list_collection_ids, list_documents = _tree_listers(client, tree)
+        firestore_api = mock.Mock(spec=["list_collection_ids", "list_documents"])
+        firestore_api.list_collection_ids.side_effect = list_collection_ids
+        firestore_api.list_documents.side_effect = list_documents
+        client._firestore_api_internal = firestore_api
+
+        submit = concurrent.futures.ThreadPoolExecutor.submit
+        with mock.patch.object(
+            concurrent.futures.ThreadPoolExecutor,
+            "submit",
+            autospec=True,
+            side_effect=submit,
+        ) as submit_mock:
+            entries = client.walk(concurrency=2)
+            for path, _ in entries:
+                if path == "c/d1/s":
+                    break
+            entries.close()
+
+        # Only a window of the level's documents was submitted: the first
+        # two, then one more when the first listing was consumed.
+        nodes = [call[0][2] for call in submit_mock.call_args_list]
+        self.assertEqual(
+            [node._path for node in nodes[2:]], [("c", "d1"), ("c", "d2"), ("c", "d3")],
+        )
+
+    def test_walk_w_retry_timeout(self):
+        from google.api_core.retry import Retry
+
+        retry = Retry(predicate=object())
+        client, _ = self._walk_helper(
+            _TREE, max_depth=2, concurrency=1, retry=retry, timeout=123.0
+        )
+
+        for method in (
+            client._firestore_api.list_collection_ids,
+            client._firestore_api.list_documents,
+        ):
+            for _, kwargs in method.call_args_list:
+                self.assertIs(kwargs["retry"], retry)
+                self.assertEqual(kwargs["timeout"], 123.0)
+
+    def test_walk_bad_arguments(self):
+        client = self._make_default_one()
+
+        with self.assertRaises(TypeError):
+            next(client.walk("users"))
+        with self.assertRaises(ValueError):
+            next(client.walk(max_depth=0))
+        with self.assertRaises(ValueError):
+            next(client.walk(concurrency=0))
+
     def _invoke_get_all(self, client, references, document_pbs, **kwargs):
         # Create a minimal fake GAPIC with a dummy response.
         firestore_api = mock.Mock(spec=["batch_get_documents"])
@@ -381,6 +579,37 @@ class TestClient(unittest.TestCase):
         self.assertIsNone(transaction._id)
 
 
+# The IDs of the collections below the root and documents, and of the
+# documents of collections, by path.
+_TREE = {
+    "": ["users", "logs"],
+    "users": ["bob", "alice"],
+    "users/alice": ["posts"],
+    "users/bob": ["posts"],
+    "users/alice/posts": ["p2", "p1"],
+}
+
+
+def _tree_listers(client, tree):
+    from google.cloud.firestore_v1.types.document import Document
+
+    prefix = client._database_string + "/documents"
+
+    def list_collection_ids(request, metadata, **kwargs):
+        path = request["parent"][len(prefix) + 1 :]
+        return list(tree.get(path, []))
+
+    def list_documents(request, metadata, **kwargs):
+        parent = request["parent"] + "/" + request["collection_id"]
+        path = parent[len(prefix) + 1 :]
+        return [
+            Document(name="{}/{}".format(parent, document_id))
+            for document_id in tree.get(path, [])
+        ]
+
+    return list_collection_ids, list_documents
+
+
 def _make_credentials():
     import google.auth.credentials
 
@@ -264,6 +264,236 @@ class TestCollectionReference(unittest.TestCase):
     def test_list_documents_w_page_size(self):
         self._list_documents_helper(page_size=25)
 
+    def test_list_documents_w_deadline_next_pages(self):
+        from google.cloud.firestore_v1.deadline import Deadline
+        from google.cloud.firestore_v1.services.firestore.client import FirestoreClient
+        from google.cloud.firestore_v1.services.firestore.pagers import (
+            ListDocumentsPager,
+        )
+        from google.cloud.firestore_v1.types.document import Document
+        from google.cloud.firestore_v1.types.firestore import ListDocumentsRequest
+        from google.cloud.firestore_v1.types.firestore import ListDocumentsResponse
+
+        client = _make_client()
+        template = client._database_string + "/documents/collection/{}"
+        method = mock.Mock(
+            spec=[],
+            return_value=ListDocumentsResponse(
+                documents=[Document(name=template.format("doc-2"))]
+            ),
+        )
+        first_page = ListDocumentsResponse(
+            documents=[Document(name=template.format("doc-1"))],
+            next_page_token="token",
+        )
+        api_client = mock.create_autospec(FirestoreClient)
+        api_client.list_documents.return_value = ListDocumentsPager(
+            method, ListDocumentsRequest(), first_page
+        )
+        client._firestore_api_internal = api_client
+        collection = self._make_one("collection", client=client)
+        deadline = Deadline(5.0)
+
+        documents = list(collection.list_documents(retry=None, timeout=deadline))
+
+        self.assertEqual([document.id for document in documents], ["doc-1", "doc-2"])
+        # The next page is read within the same deadline.
+        _, kwargs = method.call_args
+        self.assertIsNone(kwargs["retry"])
+        self.assertIs(kwargs["timeout"], deadline)
+
+    def _list_document_ids_helper(self, page_size=None, retry=None, timeout=None):
+        from google.cloud.firestore_v1 import _helpers
+        from google.cloud.firestore_v1.services.firestore.client import FirestoreClient
+        from google.cloud.firestore_v1.types.document import Document
+        from google.cloud.firestore_v1.types.firestore import ListDocumentsResponse
+
+        client = _make_client()
+        template = client._database_string + "/documents/collection/{}"
+        pages = [
+            ListDocumentsResponse(
+                documents=[
+                    Document(name=template.format("doc-1")),
+                    Document(name=template.format("doc-2")),
+                ],
+                next_page_token="token",
+            ),
+            ListDocumentsResponse(documents=[Document(name=template.format("doc-3"))]),
+        ]
+        api_client = mock.create_autospec(FirestoreClient)
+        api_client.list_documents.return_value = mock.Mock(pages=iter(pages))
+        client._firestore_api_internal = api_client
+        collection = self._make_one("collection", client=client)
+        kwargs = _helpers.make_retry_timeout_kwargs(retry, timeout)
+
+        document_ids = collection.list_document_ids(page_size=page_size, **kwargs)
+
+        self.assertIsInstance(document_ids, types.GeneratorType)
+        self.assertEqual(list(document_ids), ["doc-1", "doc-2", "doc-3"])
+        parent, _ = collection._parent_info()
+        api_client.list_documents.assert_called_once_with(
+            request={
+                "parent": parent,
+                "collection_id": collection.id,
+                "page_size": page_size,
+                "show_missing": True,
+                "mask": {"field_paths": None},
+            },
+            metadata=client._rpc_metadata,
+            **kwargs,
+        )
+
+    def test_list_document_ids(self):
+        self._list_document_ids_helper()
+
+    def test_list_document_ids_w_page_size_retry_timeout(self):
+        from google.api_core.retry import Retry
+
+        retry = Retry(predicate=object())
+        self._list_document_ids_helper(page_size=25, retry=retry, timeout=123.0)
+
+    def test_list_document_ids_w_bad_partition_count(self):
+        collection = self._make_one("collection", client=_make_client())
+
+        with self.assertRaises(ValueError):
+            collection.list_document_ids(partition_count=0)
+
+    def test_list_document_ids_w_partition_count(self):
+        from google.cloud.firestore_v1.types import document
+        from google.cloud.firestore_v1.types import firestore
+        from google.cloud.firestore_v1.types import query
+
+        client = _make_client()
+        api_client = mock.Mock(spec=["partition_query", "run_query"])
+        client._firestore_api_internal = api_client
+        collection = self._make_one("collection", client=client)
+        template = client._database_string + "/documents/{}"
+        split = template.format("collection/doc-2")
+        api_client.partition_query.return_value = iter(
+            [query.Cursor(values=[document.Value(reference_value=split)])]
+        )
+
+        def _response(path=None):
+            if path is None:
+                return firestore.RunQueryResponse()
+            name = template.format(path)
+            return firestore.RunQueryResponse(document=document.Document(name=name))
+
+        def run_query(request, metadata):
+            if request["structured_query"]._pb.HasField("start_at"):
+                paths = ["collection/doc-2", "collection/doc-3", None]
+            else:
+                paths = ["collection/doc-1", "other/doc/collection/doc-9"]
+            return iter([_response(path) for path in paths])
+
+        api_client.run_query.side_effect = run_query
+
+        document_ids = collection.list_document_ids(partition_count=2)
+
+        self.assertEqual(list(document_ids), ["doc-1", "doc-2", "doc-3"])
+        request = api_client.partition_query.call_args[1]["request"]
+        self.assertEqual(request["partition_count"], 2)
+        self.assertEqual(api_client.run_query.call_count, 2)
+        for call in api_client.run_query.call_args_list:
+            request = call[1]["request"]
+            structured_query = request["structured_query"]
+            self.assertEqual(request["parent"], template.format("")[:-1])
+            self.assertFalse(structured_query.from_[0].all_descendants)
+            self.assertEqual(
+                [field.field_path for field in structured_query.select.fields],
+                ["__name__"],
+            )
+
+    def test_list_document_ids_w_partition_count_subcollection(self):
+        from google.cloud.firestore_v1.types import document
+        from google.cloud.firestore_v1.types import query
+
+        client = _make_client()
+        api_client = mock.Mock(spec=["partition_query", "run_query"])
+        client._firestore_api_internal = api_client
+        collection = self._make_one("users", "u1", "orders", client=client)
+        template = client._database_string + "/documents/{}"
+        splits = ["users/u0/orders/x", "users/u1/orders/b", "users/u2/orders/y"]
+        api_client.partition_query.return_value = iter(
+            [
+                query.Cursor(
+                    values=[document.Value(reference_value=template.format(split))]
+                )
+                for split in splits
+            ]
+        )
+        api_client.run_query.return_value = iter([])
+
+        self.assertEqual(list(collection.list_document_ids(partition_count=4)), [])
+
+        # Only the two partitions overlapping the collection are read, and
+        # only within the collection.
+        self.assertEqual(api_client.run_query.call_count, 2)
+        bounds = []
+        for call in api_client.run_query.call_args_list:
+            request = call[1]["request"]
+            structured_query = request["structured_query"]
+            self.assertEqual(request["parent"], template.format("users/u1"))
+            self.assertEqual(structured_query.from_[0].collection_id, "orders")
+            self.assertFalse(structured_query.from_[0].all_descendants)
+            bounds.append(
+                tuple(
+                    [value.reference_value for value in cursor.values]
+                    for cursor in (structured_query.start_at, structured_query.end_at)
+                )
+            )
+        split = template.format("users/u1/orders/b")
+        self.assertEqual(sorted(bounds), [([], [split]), ([split], [])])
+
+    @mock.patch("google.cloud.firestore_v1.collection._SCAN_BUFFER_SIZE", new=1)
+    @mock.patch("google.cloud.firestore_v1.collection._MAX_SCAN_WORKERS", new=1)
+    def test_list_document_ids_w_partition_count_closed_early(self):
+        import itertools
+        from google.cloud.firestore_v1.types import document
+        from google.cloud.firestore_v1.types import firestore
+        from google.cloud.firestore_v1.types import query
+
+        client = _make_client()
+        api_client = mock.Mock(spec=["partition_query", "run_query"])
+        client._firestore_api_internal = api_client
+        collection = self._make_one("collection", client=client)
+        template = client._database_string + "/documents/collection/{}"
+        api_client.partition_query.return_value = iter(
+            [
+                query.Cursor(
+                    values=[document.Value(reference_value=template.format("m"))]
+                )
+            ]
+        )
+
+        def run_query(request, metadata):
+            for index in itertools.count():
+                name = template.format("doc-{}".format(index))
+                yield firestore.RunQueryResponse(document=document.Document(name=name))
+
+        api_client.run_query.side_effect = run_query
+
+        document_ids = collection.list_document_ids(partition_count=2)
+        self.assertEqual(next(document_ids), "doc-0")
+        self.assertEqual(next(document_ids), "doc-1")
+        document_ids.close()
+
+        # The second partition waits for a worker, and is never read.
+        self.assertEqual(api_client.run_query.call_count, 1)
+
+    def test_list_document_ids_w_partition_count_error(self):
+        from google.api_core import exceptions
+
+        client = _make_client()
+        api_client = mock.Mock(spec=["partition_query", "run_query"])
+        client._firestore_api_internal = api_client
+        collection = self._make_one("collection", client=client)
+        api_client.partition_query.return_value = iter([])
+        api_client.run_query.side_effect = exceptions.InternalServerError("testing")
+
+        with self.assertRaises(exceptions.InternalServerError):
+            list(collection.list_document_ids(partition_count=2))
+
     @mock.patch("google.cloud.firestore_v1.query.Query", autospec=True)
     def test_get(self, query_class):
         collection = self._make_one("collection")
@@ -273,7 +503,9 @@ class TestCollectionReference(unittest.TestCase):
         query_instance = query_class.return_value
 
         self.assertIs(get_response, query_instance.get.return_value)
-        query_instance.get.assert_called_once_with(transaction=None)
+        query_instance.get.assert_called_once_with(
+            transaction=None, max_documents=None, compact=False
+        )
 
     @mock.patch("google.cloud.firestore_v1.query.Query", autospec=True)
     def test_get_w_retry_timeout(self, query_class):
@@ -289,7 +521,11 @@ class TestCollectionReference(unittest.TestCase):
 
         self.assertIs(get_response, query_instance.get.return_value)
         query_instance.get.assert_called_once_with(
-            transaction=None, retry=retry, timeout=timeout,
+            transaction=None,
+            max_documents=None,
+            compact=False,
+            retry=retry,
+            timeout=timeout,
         )
 
     @mock.patch("google.cloud.firestore_v1.query.Query", autospec=True)
@@ -303,7 +539,20 @@ class TestCollectionReference(unittest.TestCase):
         query_instance = query_class.return_value
 
         self.assertIs(get_response, query_instance.get.return_value)
-        query_instance.get.assert_called_once_with(transaction=transaction)
+        query_instance.get.assert_called_once_with(
+            transaction=transaction, max_documents=None, compact=False
+        )
+
+    @mock.patch("google.cloud.firestore_v1.query.Query", autospec=True)
+    def test_get_w_max_documents_compact(self, query_class):
+        collection = self._make_one("collection")
+        get_response = collection.get(max_documents=10, compact=True)
+
+        query_instance = query_class.return_value
+        self.assertIs(get_response, query_instance.get.return_value)
+        query_instance.get.assert_called_once_with(
+            transaction=None, max_documents=10, compact=True
+        )
 
     @mock.patch("google.cloud.firestore_v1.query.Query", autospec=True)
     def test_stream(self, query_class):
@@ -342,7 +591,7 @@ class TestCollectionReference(unittest.TestCase):
         self.assertIs(stream_response, query_instance.stream.return_value)
         query_instance.stream.assert_called_once_with(transaction=transaction)
 
-    @mock.patch("google.cloud.firestore_v1.collection.Watch", autospec=True)
+    @mock.patch("google.cloud.firestore_v1.watch.Watch", autospec=True)
     def test_on_snapshot(self, watch):
         collection = self._make_one("collection")
         collection.on_snapshot(None)
@@ -0,0 +1,355 @@
+# Copyright 2020 Google LLC All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+import mock
+
+try:
+    import fastavro
+except ImportError:  # pragma: NO COVER
+    fastavro = None
+
+
+class _TransferTestCase(unittest.TestCase):
+    def setUp(self):
+        self.client = _make_client()
+        self.api_client = mock.Mock(spec=["partition_query", "run_query", "commit"])
+        self.client._firestore_api_internal = self.api_client
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.template = self.client._database_string + "/documents/{}"
+
+    def _setup_export(self, fail_after=None):
+        """Partition ``cities`` at ``sf``; record the documents read."""
+        from google.cloud.firestore_v1 import _helpers
+        from google.cloud.firestore_v1.types import document
+        from google.cloud.firestore_v1.types import firestore
+        from google.cloud.firestore_v1.types import query
+
+        split = self.template.format("cities/sf")
+        self.api_client.partition_query.return_value = iter(
+            [query.Cursor(values=[document.Value(reference_value=split)])]
+        )
+        paths = {
+            True: ["cities/la", "cities/ny", "countries/us/cities/nyc"],
+            False: ["cities/sf", "cities/tokyo"],
+        }
+
+        def _response(path):
+            return firestore.RunQueryResponse(
+                document=document.Document(
+                    name=self.template.format(path),
+                    fields=_helpers.encode_dict({"name": path}),
+                )
+            )
+
+        def run_query(request, metadata):
+            structured_query = request["structured_query"]._pb
+            # Only the first partition has an end cursor.
+            selected = paths[structured_query.HasField("end_at")]
+            if structured_query.HasField("start_at"):
+                start = structured_query.start_at.values[0].reference_value
+                selected = [
+                    path
+                    for path in selected
+                    if self.template.format(path) > start
+                    or (structured_query.start_at.before and path == "cities/sf")
+                ]
+            for count, path in enumerate(selected):
+                if count == fail_after:
+                    raise RuntimeError("interrupted")
+                yield firestore.RunQueryResponse()
+                yield _response(path)
+
+        self.api_client.run_query.side_effect = run_query
+
+    def _read_lines(self, filename):
+        with open(os.path.join(self.directory, filename)) as exported:
+            return [
+                json.loads(line)["name"].split("/documents/")[1] for line in exported
+            ]
+
+
+class Test_export_documents(_TransferTestCase):
+    @staticmethod
+    def _call_fut(*args, **kwargs):
+        from google.cloud.firestore_v1.data_transfer import export_documents
+
+        return export_documents(*args, **kwargs)
+
+    def _checkpoint(self):
+        with open(os.path.join(self.directory, "checkpoint.json")) as checkpoint:
+            return json.load(checkpoint)
+
+    def test_ndjson(self):
+        self._setup_export()
+
+        stats = self._call_fut(
+            self.client,
+            "cities",
+            self.directory,
+            partition_count=2,
+            documents_per_file=2,
+        )
+
+        self.assertEqual(
+            [stat.name for stat in stats], ["cities-00000", "cities-00001"]
+        )
+        self.assertEqual([stat.documents for stat in stats], [3, 2])
+        self.assertTrue(all(stat.bytes > 0 for stat in stats))
+        self.assertEqual(
+            sorted(os.listdir(self.directory)),
+            [
+                "checkpoint.json",
+                "cities-00000-00000.ndjson",
+                "cities-00000-00001.ndjson",
+                "cities-00001-00000.ndjson",
+            ],
+        )
+        self.assertEqual(
+            self._read_lines("cities-00000-00000.ndjson"), ["cities/la", "cities/ny"]
+        )
+        self.assertEqual(
+            self._read_lines("cities-00000-00001.ndjson"), ["countries/us/cities/nyc"]
+        )
+        self.assertEqual(
+            self._read_lines("cities-00001-00000.ndjson"), ["cities/sf", "cities/tokyo"]
+        )
+
+        partitions = self._checkpoint()["partitions"]
+        self.assertEqual(
+            [(state["start_at"], state["end_at"]) for state in partitions],
+            [(None, "cities/sf"), ("cities/sf", None)],
+        )
+        self.assertTrue(all(state["done"] for state in partitions))
+        self.assertEqual([state["files"] for state in partitions], [2, 1])
+
+        # Finished exports are not read again.
+        stats = self._call_fut(self.client, "cities", self.directory)
+        self.assertEqual([stat.documents for stat in stats], [0, 0])
+        self.assertEqual(self.api_client.run_query.call_count, 2)
+
+    def test_resume(self):
+        self._setup_export(fail_after=2)
+
+        with self.assertRaises(RuntimeError):
+            self._call_fut(
+                self.client,
+                "cities",
+                self.directory,
+                partition_count=2,
+                documents_per_file=1,
+                max_workers=1,
+            )
+
+        partitions = self._checkpoint()["partitions"]
+        self.assertEqual(partitions[0]["last"], "cities/ny")
+        self.assertEqual(partitions[0]["files"], 2)
+        self.assertFalse(partitions[0]["done"])
+
+        self._setup_export()
+        stats = self._call_fut(
+            self.client, "cities", self.directory, documents_per_file=1
+        )
+
+        # The second partition was completed before the failure surfaced.
+        self.assertEqual([stat.documents for stat in stats], [1, 0])
+        self.assertEqual(
+            self._read_lines("cities-00000-00002.ndjson"), ["countries/us/cities/nyc"]
+        )
+        # The partitions of the interrupted export are kept.
+        self.assertEqual(self.api_client.partition_query.call_count, 1)
+
+    def test_other_export(self):
+        self._setup_export()
+        self._call_fut(self.client, "cities", self.directory)
+
+        with self.assertRaises(ValueError):
+            self._call_fut(self.client, "towns", self.directory)
+
+    def test_bad_format(self):
+        with self.assertRaises(ValueError):
+            self._call_fut(self.client, "cities", self.directory, file_format="csv")
+
+    def test_avro_missing_fastavro(self):
+        with mock.patch.dict(sys.modules, {"fastavro": None}):
+            with self.assertRaises(ImportError):
+                self._call_fut(
+                    self.client, "cities", self.directory, file_format="avro"
+                )
+
+
+class Test_import_documents(_TransferTestCase):
+    @staticmethod
+    def _call_fut(*args, **kwargs):
+        from google.cloud.firestore_v1.data_transfer import import_documents
+
+        return import_documents(*args, **kwargs)
+
+    def _committed(self):
+        return sorted(
+            (write_pb.update.name, write_pb.update._pb.HasField("update_time"))
+            for call in self.api_client.commit.call_args_list
+            for write_pb in call[1]["request"]["writes"]
+        )
+
+    def _export(self, **kwargs):
+        from google.cloud.firestore_v1.data_transfer import export_documents
+
+        self._setup_export()
+        export_documents(
+            self.client, "cities", self.directory, documents_per_file=2, **kwargs
+        )
+
+    def test_import(self):
+        from google.cloud.firestore_v1.types import firestore
+
+        self._export()
+        source = _make_client(project="other")
+        self.client = source
+        self.client._firestore_api_internal = self.api_client
+        self.api_client.commit.return_value = firestore.CommitResponse()
+
+        stats = self._call_fut(source, self.directory, batch_size=2)
+
+        self.assertEqual(
+            [stat.name for stat in stats],
+            [
+                "cities-00000-00000.ndjson",
+                "cities-00000-00001.ndjson",
+                "cities-00001-00000.ndjson",
+            ],
+        )
+        self.assertEqual(sum(stat.documents for stat in stats), 5)
+        self.assertEqual(self.api_client.commit.call_count, 3)
+        prefix = source._database_string + "/documents/"
+        self.assertEqual(
+            self._committed(),
+            [
+                (prefix + "cities/la", False),
+                (prefix + "cities/ny", False),
+                (prefix + "cities/sf", False),
+                (prefix + "cities/tokyo", False),
+                (prefix + "countries/us/cities/nyc", False),
+            ],
+        )
+
+    def test_throttled(self):
+        from google.cloud.firestore_v1.types import firestore
+
+        self._export()
+        self.api_client.commit.return_value = firestore.CommitResponse()
+
+        with mock.patch(
+            "google.cloud.firestore_v1.data_transfer._RateLimiter", autospec=True
+        ) as limiter_class:
+            self._call_fut(
+                self.client, self.directory, max_workers=1, writes_per_second=10
+            )
+
+        limiter_class.assert_called_once_with(10, None)
+        acquire = limiter_class.return_value.acquire
+        self.assertEqual([call[0][0] for call in acquire.call_args_list], [2, 1, 2])
+
+    def test_empty_directory(self):
+        self.assertEqual(self._call_fut(self.client, self.directory), [])
+
+    @unittest.skipIf(fastavro is None, "fastavro is not installed")
+    def test_avro_roundtrip(self):  # pragma: NO COVER
+        from google.cloud.firestore_v1.types import firestore
+
+        self._export(file_format="avro")
+        self.api_client.commit.return_value = firestore.CommitResponse()
+
+        stats = self._call_fut(self.client, self.directory)
+
+        self.assertEqual(sum(stat.documents for stat in stats), 5)
+        self.assertEqual(len(self._committed()), 5)
+
+
+class Test_RateLimiter(unittest.TestCase):
+    @staticmethod
+    def _get_target_class():
+        from google.cloud.firestore_v1.data_transfer import _RateLimiter
+
+        return _RateLimiter
+
+    def _make_one(self, *args, **kwargs):
+        klass = self._get_target_class()
+        return klass(*args, **kwargs)
+
+    @mock.patch("time.sleep")
+    @mock.patch("time.monotonic")
+    def test_acquire(self, monotonic, sleep):
+        limiter = self._make_one(10)
+
+        monotonic.return_value = 100.0
+        limiter.acquire(10)
+        sleep.assert_not_called()
+
+        limiter.acquire(5)
+        sleep.assert_called_once_with(1.0)
+
+        # After 5 minutes, the rate is raised by 50%.
+        monotonic.return_value = 400.0
+        limiter.acquire(15)
+        limiter.acquire(1)
+        sleep.assert_called_with(1.0)
+
+    @mock.patch("time.sleep")
+    @mock.patch("time.monotonic")
+    def test_acquire_w_maximum_rate(self, monotonic, sleep):
+        limiter = self._make_one(10, maximum_rate=12)
+
+        monotonic.return_value = 100.0
+        limiter.acquire(1)
+        monotonic.return_value = 1000.0
+        limiter.acquire(12)
+        limiter.acquire(1)
+
+        sleep.assert_called_once_with(1.0)
+
+
+class TestTransferStats(unittest.TestCase):
+    def test_documents_per_second(self):
+        from google.cloud.firestore_v1.data_transfer import TransferStats
+
+        stats = TransferStats("cities-00000")
+        self.assertEqual(stats.documents_per_second, 0.0)
+
+        stats.documents, stats.bytes, stats.seconds = 10, 100, 2.0
+        self.assertEqual(stats.documents_per_second, 5.0)
+        self.assertEqual(
+            repr(stats),
+            "<TransferStats cities-00000: 10 documents, 100 bytes in 2.000s>",
+        )
+
+
+def _make_credentials():
+    import google.auth.credentials
+
+    return mock.Mock(spec=google.auth.credentials.Credentials)
+
+
+def _make_client(project="seventy-nine"):
+    from google.cloud.firestore_v1.client import Client
+
+    credentials = _make_credentials()
+    return Client(project=project, credentials=credentials)
@@ -0,0 +1,237 @@
+# Copyright 2020 Google LLC All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import unittest
+
+import aiounittest
+import mock
+import pytest
+
+
+class TestDeadline(aiounittest.AsyncTestCase):
+    @staticmethod
+    def _get_target_class():
+        from google.cloud.firestore_v1.deadline import Deadline
+
+        return Deadline
+
+    def _make_one(self, *args, **kwargs):
+        klass = self._get_target_class()
+        return klass(*args, **kwargs)
+
+    @mock.patch("time.monotonic", return_value=100.0)
+    def test_constructor(self, _):
+        deadline = self._make_one(2.5)
+        self.assertEqual(deadline.timeout, 2.5)
+        self.assertEqual(deadline._expiry, 102.5)
+
+    def test_constructor_negative(self):
+        with self.assertRaises(ValueError):
+            self._make_one(-1.0)
+
+    def test_remaining_and_expired(self):
+        with mock.patch("time.monotonic", return_value=100.0):
+            deadline = self._make_one(2.5)
+
+        with mock.patch("time.monotonic", return_value=101.0):
+            self.assertEqual(deadline.remaining(), 1.5)
+            self.assertFalse(deadline.expired)
+
+        with mock.patch("time.monotonic", return_value=103.0):
+            self.assertEqual(deadline.remaining(), 0.0)
+            self.assertTrue(deadline.expired)
+
+    def test_check(self):
+        from google.api_core import exceptions
+
+        with mock.patch("time.monotonic", return_value=100.0):
+            deadline = self._make_one(2.5)
+
+        with mock.patch("time.monotonic", return_value=101.0):
+            deadline.check()
+            deadline.check(1.0)
+            with self.assertRaises(exceptions.DeadlineExceeded) as exc_info:
+                deadline.check(2.0)
+
+        self.assertEqual(
+            exc_info.exception.message, "Deadline of 2.5 seconds exceeded."
+        )
+
+        with mock.patch("time.monotonic", return_value=102.5):
+            with self.assertRaises(exceptions.DeadlineExceeded):
+                deadline.check()
+
+    def test_retry_none(self):
+        deadline = self._make_one(2.5)
+        self.assertIsNone(deadline.retry(None))
+
+    def test_retry_default(self):
+        from google.cloud.firestore_v1.deadline import _BoundedRetry
+        from google.cloud.firestore_v1.deadline import DEFAULT_RETRY
+
+        deadline = self._make_one(2.5)
+        retry = deadline.retry()
+        self.assertIsInstance(retry, _BoundedRetry)
+        self.assertIs(retry._retry, DEFAULT_RETRY)
+        self.assertIs(retry._deadline, deadline)
+
+        # Bounding again is a no-op.
+        self.assertIs(deadline.retry(retry), retry)
+
+    def test_retry_bounded(self):
+        from google.api_core import retry as retries
+
+        with mock.patch("time.monotonic", return_value=100.0):
+            deadline = self._make_one(2.5)
+        policy = mock.Mock(spec=retries.Retry)
+        func = mock.Mock(spec=[])
+
+        wrapped = deadline.retry(policy)(func)
+        with mock.patch("time.monotonic", return_value=101.0):
+            result = wrapped(1, b=2)
+
+        # The retry deadline is the time left when the request is sent.
+        policy.with_deadline.assert_called_once_with(1.5)
+        bounded = policy.with_deadline.return_value
+        bounded.assert_called_once_with(func)
+        bounded.return_value.assert_called_once_with(1, b=2)
+        self.assertIs(result, bounded.return_value.return_value)
+
+    def test_retry_stops_at_deadline(self):
+        from google.api_core import exceptions
+
+        deadline = self._make_one(0.0)
+        func = mock.Mock(side_effect=exceptions.ServiceUnavailable("Try again."))
+
+        with self.assertRaises(exceptions.RetryError):
+            deadline.retry()(func)()
+
+        func.assert_called_once_with()
+
+    def test_async_retry_none(self):
+        deadline = self._make_one(2.5)
+        self.assertIsNone(deadline.async_retry(None))
+
+    def test_async_retry_default(self):
+        from google.cloud.firestore_v1.deadline import _BoundedRetry
+        from google.cloud.firestore_v1.deadline import DEFAULT_ASYNC_RETRY
+
+        deadline = self._make_one(2.5)
+        retry = deadline.async_retry()
+        self.assertIsInstance(retry, _BoundedRetry)
+        self.assertIs(retry._retry, DEFAULT_ASYNC_RETRY)
+        self.assertIs(retry._deadline, deadline)
+
+        # Bounding again is a no-op.
+        self.assertIs(deadline.async_retry(retry), retry)
+
+    @pytest.mark.asyncio
+    async def test_async_retry_retries(self):
+        from google.api_core import exceptions
+
+        calls = []
+
+        async def func(value):
+            calls.append(value)
+            if len(calls) == 1:
+                raise exceptions.ServiceUnavailable("Try again.")
+            return value
+
+        async def sleep(delay):
+            pass
+
+        deadline = self._make_one(60.0)
+        wrapped = deadline.async_retry()(func)
+        with mock.patch("google.api_core.retry_async.asyncio.sleep", sleep):
+            result = await wrapped(42)
+
+        self.assertEqual(result, 42)
+        self.assertEqual(calls, [42, 42])
+
+    def test___call__(self):
+        with mock.patch("time.monotonic", return_value=100.0):
+            deadline = self._make_one(2.5)
+        func = mock.Mock(spec=[])
+
+        wrapped = deadline(func)
+        with mock.patch("time.monotonic", return_value=102.0):
+            result = wrapped(1, timeout=60.0)
+
+        self.assertIs(result, func.return_value)
+        func.assert_called_once_with(1, timeout=0.5)
+
+    def test___call___expired(self):
+        from google.api_core import exceptions
+
+        deadline = self._make_one(0.0)
+        func = mock.Mock(spec=[])
+
+        with self.assertRaises(exceptions.DeadlineExceeded):
+            deadline(func)()
+
+        func.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_wait(self):
+        deadline = self._make_one(5.0)
+
+        async def coro():
+            return mock.sentinel.result
+
+        self.assertIs(await deadline.wait(coro()), mock.sentinel.result)
+
+    @pytest.mark.asyncio
+    async def test_wait_expired(self):
+        from google.api_core import exceptions
+
+        deadline = self._make_one(0.01)
+        cancelled = []
+
+        async def coro():
+            try:
+                await asyncio.sleep(10.0)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+
+        with self.assertRaises(exceptions.DeadlineExceeded):
+            await deadline.wait(coro())
+
+        self.assertEqual(cancelled, [True])
+
+    @mock.patch("time.monotonic", return_value=100.0)
+    def test___repr__(self, _):
+        deadline = self._make_one(2.5)
+        self.assertEqual(repr(deadline), "Deadline(timeout=2.5, remaining=2.500)")
+
+
+class Test_remaining_timeout(unittest.TestCase):
+    @staticmethod
+    def _call_fut(timeout):
+        from google.cloud.firestore_v1.deadline import remaining_timeout
+
+        return remaining_timeout(timeout)
+
+    def test_float_or_none(self):
+        self.assertEqual(self._call_fut(2.5), 2.5)
+        self.assertIsNone(self._call_fut(None))
+
+    def test_deadline(self):
+        from google.cloud.firestore_v1.deadline import Deadline
+
+        with mock.patch("time.monotonic", return_value=100.0):
+            deadline = Deadline(2.5)
+        with mock.patch("time.monotonic", return_value=101.0):
+            self.assertEqual(self._call_fut(deadline), 1.5)
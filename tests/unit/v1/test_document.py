@@ -368,6 +368,7 @@ class TestDocumentReference(unittest.TestCase):
         not_found=False,
         retry=None,
         timeout=None,
+        read_time=None,
     ):
         from google.api_core.exceptions import NotFound
         from google.cloud.firestore_v1 import _helpers
@@ -403,7 +404,10 @@ class TestDocumentReference(unittest.TestCase):
         kwargs = _helpers.make_retry_timeout_kwargs(retry, timeout)
 
         snapshot = document.get(
-            field_paths=field_paths, transaction=transaction, **kwargs
+            field_paths=field_paths,
+            transaction=transaction,
+            read_time=read_time,
+            **kwargs,
         )
 
         self.assertIs(snapshot.reference, document)
@@ -416,7 +420,7 @@ class TestDocumentReference(unittest.TestCase):
         else:
             self.assertEqual(snapshot.to_dict(), {})
             self.assertTrue(snapshot.exists)
-            self.assertIsNone(snapshot.read_time)
+            self.assertIs(snapshot.read_time, read_time)
             self.assertIs(snapshot.create_time, create_time)
             self.assertIs(snapshot.update_time, update_time)
 
@@ -431,12 +435,15 @@ class TestDocumentReference(unittest.TestCase):
         else:
             expected_transaction_id = None
 
+        if read_time is not None:
+            expected_consistency = {"read_time": read_time}
+        else:
+            expected_consistency = {"transaction": expected_transaction_id}
+
         firestore_api.get_document.assert_called_once_with(
-            request={
-                "name": document._document_path,
-                "mask": mask,
-                "transaction": expected_transaction_id,
-            },
+            request=dict(
+                name=document._document_path, mask=mask, **expected_consistency
+            ),
             metadata=client._rpc_metadata,
             **kwargs,
         )
@@ -467,6 +474,19 @@ class TestDocumentReference(unittest.TestCase):
     def test_get_with_transaction(self):
         self._get_helper(use_transaction=True)
 
+    def test_get_with_read_time(self):
+        import datetime
+
+        read_time = datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc)
+        self._get_helper(read_time=read_time)
+
+    def test_get_with_read_time_and_transaction(self):
+        import datetime
+
+        read_time = datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc)
+        with self.assertRaises(ValueError):
+            self._get_helper(use_transaction=True, read_time=read_time)
+
     def _collections_helper(self, page_size=None, retry=None, timeout=None):
         from google.cloud.firestore_v1.collection import CollectionReference
         from google.cloud.firestore_v1 import _helpers
@@ -518,7 +538,7 @@ class TestDocumentReference(unittest.TestCase):
         timeout = 123.0
         self._collections_helper(retry=retry, timeout=timeout)
 
-    @mock.patch("google.cloud.firestore_v1.document.Watch", autospec=True)
+    @mock.patch("google.cloud.firestore_v1.watch.Watch", autospec=True)
     def test_on_snapshot(self, watch):
         client = mock.Mock(_database_string="sprinklez", spec=["_database_string"])
         document = self._make_one("yellow", "mellow", client=client)
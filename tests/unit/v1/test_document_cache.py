@@ -0,0 +1,246 @@
+# Copyright 2020 Google LLC All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import mock
+
+
+class TestDocumentCache(unittest.TestCase):
+    @staticmethod
+    def _get_target_class():
+        from google.cloud.firestore_v1.document_cache import DocumentCache
+
+        return DocumentCache
+
+    def _make_one(self, *args, **kwargs):
+        klass = self._get_target_class()
+        return klass(*args, **kwargs)
+
+    def setUp(self):
+        self.client = _make_client()
+        self.collection = self.client.collection("countries")
+
+    def _document(self, document_id, data, seconds=1, collection=None):
+        from google.cloud.firestore_v1 import _helpers
+        from google.cloud.firestore_v1.types import document
+        from google.protobuf import timestamp_pb2
+
+        collection = collection or self.collection
+        return document.Document(
+            name=collection.document(document_id)._document_path,
+            fields=_helpers.encode_dict(data),
+            create_time=timestamp_pb2.Timestamp(seconds=1),
+            update_time=timestamp_pb2.Timestamp(seconds=seconds),
+        )
+
+    def test_client_factory(self):
+        cache = self.client.document_cache(":memory:", mmap_size=0)
+        self.assertIsInstance(cache, self._get_target_class())
+        self.assertIs(cache._client, self.client)
+
+    def test_put_get_delete(self):
+        cache = self._make_one(self.client, ":memory:")
+        reference = self.collection.document("fr")
+
+        self.assertIsNone(cache.get(reference))
+        cache.put(self._document("fr", {"name": "France"}))
+
+        snapshot = cache.get(reference)
+        self.assertEqual(snapshot.reference, reference)
+        self.assertEqual(snapshot.to_dict(), {"name": "France"})
+        self.assertEqual(snapshot.update_time.timestamp_pb().seconds, 1)
+        self.assertEqual(len(cache), 1)
+
+        cache.delete(reference)
+        self.assertIsNone(cache.get(reference))
+
+    def test_put_keeps_newer_version(self):
+        cache = self._make_one(self.client, ":memory:")
+        reference = self.collection.document("fr")
+
+        cache.put(self._document("fr", {"v": 2}, seconds=2))
+        cache.put(self._document("fr", {"v": 1}, seconds=1))
+        self.assertEqual(cache.get(reference).get("v"), 2)
+
+        cache.put(self._document("fr", {"v": 3}, seconds=3))
+        self.assertEqual(cache.get(reference).get("v"), 3)
+
+    def test_put_snapshots(self):
+        from google.cloud.firestore_v1.base_document import DocumentSnapshot
+
+        cache = self._make_one(self.client, ":memory:")
+        document = self._document("fr", {"name": "France"})
+        snapshot = cache._to_snapshot(document)
+        missing = DocumentSnapshot(
+            self.collection.document("xx"), None, False, None, None, None
+        )
+
+        cache.put_all([snapshot, missing])
+
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(cache.get(snapshot.reference), snapshot)
+
+    def test_query(self):
+        cache = self._make_one(self.client, ":memory:")
+        nested = self.client.collection("continents", "eu", "countries")
+        cache.put_all(
+            [
+                self._document("fr", {"population": 67}),
+                self._document("de", {"population": 83}),
+                self._document("lu", {"population": 1}),
+                self._document("it", {"population": 60}, collection=nested),
+            ]
+        )
+
+        query = self.collection.where("population", ">", 10).order_by("population")
+        self.assertEqual([snapshot.id for snapshot in cache.query(query)], ["fr", "de"])
+
+        group = self.client.collection_group("countries").order_by("population")
+        self.assertEqual(
+            [snapshot.id for snapshot in cache.query(group)], ["lu", "it", "fr", "de"]
+        )
+
+    def test_persistence(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, "cache.db")
+
+        with self._make_one(self.client, path) as cache:
+            cache.put(self._document("fr", {"name": "France"}))
+            cache._save_resume_token("target", b"token")
+
+        with self._make_one(self.client, path) as cache:
+            snapshot = cache.get(self.collection.document("fr"))
+            self.assertEqual(snapshot.get("name"), "France")
+            (token,) = cache._connection.execute(
+                "SELECT resume_token FROM targets"
+            ).fetchone()
+            self.assertEqual(token, b"token")
+
+            cache.clear()
+            self.assertEqual(len(cache), 0)
+
+    def test_stream_writes_through(self):
+        cache = self._make_one(self.client, ":memory:")
+        snapshot = cache._to_snapshot(self._document("fr", {"name": "France"}))
+        query = mock.Mock(spec=["stream"])
+        query.stream.return_value = iter([snapshot])
+
+        self.assertEqual(list(cache.stream(query, timeout=5.0)), [snapshot])
+
+        query.stream.assert_called_once_with(timeout=5.0)
+        self.assertEqual(cache.get(snapshot.reference), snapshot)
+
+    def test_stream_offline(self):
+        from google.api_core import exceptions
+
+        cache = self._make_one(self.client, ":memory:")
+        cache.put(self._document("fr", {"name": "France"}))
+        query = self.collection.where("name", "==", "France")
+
+        with mock.patch.object(
+            type(query), "stream", side_effect=exceptions.ServiceUnavailable("down")
+        ):
+            returned = list(cache.stream(query))
+
+        self.assertEqual([snapshot.id for snapshot in returned], ["fr"])
+
+    def test_stream_fails_mid_stream(self):
+        from google.api_core import exceptions
+
+        cache = self._make_one(self.client, ":memory:")
+        snapshot = cache._to_snapshot(self._document("fr", {"name": "France"}))
+
+        def _stream():
+            yield snapshot
+            raise exceptions.ServiceUnavailable("down")
+
+        query = mock.Mock(spec=["stream"])
+        query.stream.return_value = _stream()
+
+        iterator = cache.stream(query)
+        self.assertIs(next(iterator), snapshot)
+        with self.assertRaises(exceptions.ServiceUnavailable):
+            next(iterator)
+
+    @mock.patch("google.cloud.firestore_v1.watch.Watch", autospec=True)
+    def test_listen_cold(self, watch):
+        cache = self._make_one(self.client, ":memory:")
+        query = self.collection.where("population", ">", 10)
+
+        result = cache.listen(query, mock.sentinel.callback)
+
+        self.assertIs(result, watch.for_query.return_value)
+        self.assertIsNone(watch.for_query.call_args[1]["state"])
+
+    @mock.patch("google.cloud.firestore_v1.watch.Watch", autospec=True)
+    def test_listen_warm(self, watch):
+        from google.cloud.firestore_v1.document_cache import _target_key
+        from google.cloud.firestore_v1.watch import ChangeType
+        from google.cloud.firestore_v1.watch import DocumentChange
+
+        cache = self._make_one(self.client, ":memory:")
+        query = self.collection.where("population", ">", 10)
+        cache.put_all(
+            [
+                self._document("fr", {"population": 67}),
+                self._document("de", {"population": 83}),
+                self._document("lu", {"population": 1}),
+            ]
+        )
+        cache._save_resume_token(_target_key(query), b"old")
+        callback = mock.Mock(spec=[])
+
+        cache.listen(query, callback)
+
+        args, kwargs = watch.for_query.call_args
+        state = kwargs["state"]
+        self.assertEqual(state.resume_token, b"old")
+        self.assertEqual(
+            sorted(document.name.rpartition("/")[2] for document in state.documents),
+            ["de", "fr"],
+        )
+
+        # Deliver a snapshot with one document removed and one added.
+        on_snapshot = args[1]
+        watch.for_query.return_value.resume_token = b"new"
+        added = cache._to_snapshot(self._document("es", {"population": 47}))
+        removed = cache.get(self.collection.document("de"))
+        changes = [
+            DocumentChange(ChangeType.REMOVED, removed, 0, -1),
+            DocumentChange(ChangeType.ADDED, added, -1, 0),
+        ]
+        on_snapshot([added], changes, mock.sentinel.read_time)
+
+        callback.assert_called_once_with([added], changes, mock.sentinel.read_time)
+        self.assertEqual(cache.resume_token(query), b"new")
+        self.assertIsNone(cache.get(removed.reference))
+        self.assertEqual(cache.get(added.reference), added)
+
+
+def _make_credentials():
+    import google.auth.credentials
+
+    return mock.Mock(spec=google.auth.credentials.Credentials)
+
+
+def _make_client(project="seventy-nine"):
+    from google.cloud.firestore_v1.client import Client
+
+    credentials = _make_credentials()
+    return Client(project=project, credentials=credentials)
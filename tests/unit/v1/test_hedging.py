@@ -0,0 +1,302 @@
+# Copyright 2020 Google LLC All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+import unittest
+
+import mock
+
+
+class _Stream(object):
+    def __init__(self, items):
+        self._items = iter(items)
+        self.cancelled = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self._items)
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class TestHedgingPolicy(unittest.TestCase):
+    @staticmethod
+    def _get_target_class():
+        from google.cloud.firestore_v1.hedging import HedgingPolicy
+
+        return HedgingPolicy
+
+    def _make_one(self, *args, **kwargs):
+        klass = self._get_target_class()
+        policy = klass(*args, **kwargs)
+        self.addCleanup(policy.close)
+        return policy
+
+    def setUp(self):
+        self.client = mock.Mock(spec=["_hedging_policy"], _hedging_policy=None)
+        # Released at the end of each test, to unblock stuck requests.
+        self.release = threading.Event()
+        self.addCleanup(self.release.set)
+
+    def _method(self, *behaviours):
+        """An API method whose successive calls behave as given.
+
+        Each behaviour is either a value to return, an exception to raise,
+        or ``None`` to block until the end of the test.
+        """
+        calls = []
+        lock = threading.Lock()
+
+        def method(**kwargs):
+            with lock:
+                index = len(calls)
+                calls.append(kwargs)
+            behaviour = behaviours[index]
+            if behaviour is None:
+                self.release.wait()
+                raise RuntimeError("Released")
+            if isinstance(behaviour, Exception):
+                raise behaviour
+            return behaviour
+
+        return method, calls
+
+    def test_call_fast(self):
+        policy = self._make_one(self.client, delay=5.0)
+        method, calls = self._method(mock.sentinel.response)
+
+        response = policy.call(method, request=mock.sentinel.request)
+
+        self.assertIs(response, mock.sentinel.response)
+        self.assertEqual(calls, [{"request": mock.sentinel.request}])
+        stats = policy.stats
+        self.assertEqual((stats.calls, stats.hedged, stats.won), (1, 0, 0))
+        self.assertEqual(len(policy._latencies), 1)
+
+    def test_call_hedge_wins(self):
+        policy = self._make_one(self.client, delay=0.01)
+        method, calls = self._method(None, mock.sentinel.response)
+
+        response = policy.call(method, request=mock.sentinel.request)
+
+        self.assertIs(response, mock.sentinel.response)
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(calls[1], calls[0])
+        stats = policy.stats
+        self.assertEqual(
+            (stats.calls, stats.hedged, stats.hedges, stats.won), (1, 1, 1, 1)
+        )
+
+    def test_call_max_hedges(self):
+        policy = self._make_one(self.client, delay=0.01, max_hedges=2)
+        method, calls = self._method(None, None, mock.sentinel.response)
+
+        response = policy.call(method)
+
+        self.assertIs(response, mock.sentinel.response)
+        self.assertEqual(len(calls), 3)
+        stats = policy.stats
+        self.assertEqual((stats.hedged, stats.hedges, stats.won), (1, 2, 1))
+
+    def test_call_error_waits_for_hedge(self):
+        from google.api_core import exceptions
+
+        policy = self._make_one(self.client, delay=0.0)
+        gate = threading.Event()
+
+        def method(**kwargs):
+            if not gate.is_set():
+                gate.set()
+                # Fail once the hedge is in flight.
+                self.release.wait(0.05)
+                raise exceptions.ServiceUnavailable("down")
+            return mock.sentinel.response
+
+        self.assertIs(policy.call(method), mock.sentinel.response)
+
+    def test_call_all_fail(self):
+        from google.api_core import exceptions
+
+        policy = self._make_one(self.client, delay=0.0)
+        first = exceptions.ServiceUnavailable("first")
+        method, calls = self._method(first, exceptions.ServiceUnavailable("second"))
+
+        with self.assertRaises(exceptions.ServiceUnavailable) as exc_info:
+            policy.call(method)
+
+        # Not hedged: the first request failed before the hedge delay.
+        self.assertIs(exc_info.exception, first)
+        self.assertEqual(len(calls), 1)
+        stats = policy.stats
+        self.assertEqual(stats.calls, 1)
+        self.assertEqual(len(policy._latencies), 0)
+
+    def test_call_client_error_is_an_answer(self):
+        from google.api_core import exceptions
+
+        policy = self._make_one(self.client, delay=0.01)
+        method, calls = self._method(None, exceptions.NotFound("missing"))
+
+        with self.assertRaises(exceptions.NotFound):
+            policy.call(method)
+
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(policy.stats.won, 1)
+
+    def test_call_deadline(self):
+        from google.api_core import exceptions
+
+        policy = self._make_one(self.client, delay=0.01, deadline=0.05)
+        method, calls = self._method(None, None)
+
+        with self.assertRaises(exceptions.DeadlineExceeded):
+            policy.call(method, timeout=60.0)
+
+        self.assertEqual(len(calls), 2)
+        for kwargs in calls:
+            self.assertLessEqual(kwargs["timeout"], 0.05)
+        stats = policy.stats
+        self.assertEqual((stats.calls, stats.hedged, stats.won), (1, 1, 0))
+
+    def test_stream(self):
+        policy = self._make_one(self.client, delay=5.0)
+        stream = _Stream([1, 2, 3])
+        method, calls = self._method(stream)
+
+        responses = policy.stream(method, request=mock.sentinel.request)
+
+        # Nothing is sent until the responses are iterated.
+        self.assertEqual(calls, [])
+        self.assertEqual(list(responses), [1, 2, 3])
+        self.assertEqual(calls, [{"request": mock.sentinel.request}])
+        self.assertFalse(stream.cancelled)
+
+    def test_stream_empty(self):
+        policy = self._make_one(self.client, delay=5.0)
+        method, _ = self._method(_Stream([]))
+
+        self.assertEqual(list(policy.stream(method)), [])
+
+    def test_stream_hedge_wins_and_loser_cancelled(self):
+        policy = self._make_one(self.client, delay=0.01)
+        fast = _Stream(["fast", "rest"])
+
+        class _SlowStream(_Stream):
+            def __next__(inner):
+                self.release.wait()
+                return "slow"
+
+        slow = _SlowStream([])
+        method, calls = self._method(slow, fast)
+
+        self.assertEqual(list(policy.stream(method)), ["fast", "rest"])
+
+        # Cancelled while still waiting for its first response.
+        self.assertTrue(slow.cancelled)
+        self.assertFalse(fast.cancelled)
+        self.assertEqual(policy.stats.won, 1)
+
+    def test_stream_deadline_cancels_streams(self):
+        from google.api_core import exceptions
+
+        policy = self._make_one(self.client, delay=0.01, deadline=0.05)
+
+        class _SlowStream(_Stream):
+            def __next__(inner):
+                self.release.wait()
+                raise StopIteration
+
+        slow_streams = [_SlowStream([]), _SlowStream([])]
+        method, calls = self._method(*slow_streams)
+
+        with self.assertRaises(exceptions.DeadlineExceeded):
+            list(policy.stream(method))
+
+        self.assertEqual(len(calls), 2)
+        self.assertTrue(all(stream.cancelled for stream in slow_streams))
+
+    def test_client_hedge_reads(self):
+        from google.cloud.firestore_v1 import _helpers
+        from google.cloud.firestore_v1.types import document
+        from google.cloud.firestore_v1.types import firestore
+
+        client = _make_client()
+        api_client = mock.Mock(
+            spec=["batch_get_documents", "get_document", "run_query"]
+        )
+        client._firestore_api_internal = api_client
+        reference = client.document("a", "b")
+        document_pb = document.Document(
+            name=reference._document_path, fields=_helpers.encode_dict({"x": 1})
+        )
+        api_client.get_document.side_effect, _ = self._method(None, document_pb)
+        api_client.batch_get_documents.return_value = iter(
+            [firestore.BatchGetDocumentsResponse(found=document_pb)]
+        )
+        api_client.run_query.return_value = iter(
+            [firestore.RunQueryResponse(document=document_pb)]
+        )
+
+        with client.hedge_reads(delay=0.01) as policy:
+            self.assertIs(client._hedging_policy, policy)
+            snapshot = reference.get()
+            (batch_snapshot,) = client.get_all([reference])
+            (query_snapshot,) = client.collection("a").stream()
+
+        self.assertIsNone(client._hedging_policy)
+        for result in (snapshot, batch_snapshot, query_snapshot):
+            self.assertEqual(result.reference, reference)
+            self.assertEqual(result.to_dict(), {"x": 1})
+        self.assertEqual(api_client.get_document.call_count, 2)
+        stats = policy.stats
+        self.assertEqual((stats.calls, stats.hedged, stats.won), (3, 1, 1))
+
+    def test_client_hedge_reads_replaces(self):
+        client = _make_client()
+        first = client.hedge_reads()
+        second = client.hedge_reads()
+        self.addCleanup(first.close)
+        self.addCleanup(second.close)
+
+        self.assertIs(client._hedging_policy, second)
+        first.close()
+        self.assertIs(client._hedging_policy, second)
+
+    def test_close(self):
+        client = mock.Mock(spec=["_hedging_policy"])
+        policy = self._make_one(client)
+        client._hedging_policy = policy
+
+        with policy:
+            pass
+
+        self.assertIsNone(client._hedging_policy)
+        with self.assertRaises(RuntimeError):
+            policy.call(mock.Mock())
+
+
+def _make_credentials():
+    import google.auth.credentials
+
+    return mock.Mock(spec=google.auth.credentials.Credentials)
+
+
+def _make_client(project="seventy-nine"):
+    from google.cloud.firestore_v1.client import Client
+
+    credentials = _make_credentials()
+    return Client(project=project, credentials=credentials)
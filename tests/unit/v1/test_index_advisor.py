@@ -0,0 +1,284 @@
+# Copyright 2020 Google LLC All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+import mock
+
+
+class Test__query_shape(unittest.TestCase):
+    @staticmethod
+    def _call_fut(query):
+        from google.cloud.firestore_v1.index_advisor import _query_shape
+
+        return _query_shape(query._to_protobuf())
+
+    def setUp(self):
+        self.collection = _make_client().collection("cities")
+
+    def test_single_field_queries(self):
+        collection = self.collection
+
+        for query in (
+            collection._query(),
+            collection.where("a", "==", 1).where("b", "==", 2),
+            collection.where("tags", "array_contains", "x").where("a", "==", 1),
+            collection.where("a", ">", 1),
+            collection.order_by("a", direction="DESCENDING"),
+            collection.where("a", "==", 1).order_by("__name__"),
+            collection.where("a", ">", 1).order_by("a").order_by("__name__"),
+        ):
+            self.assertIsNone(self._call_fut(query), query._to_protobuf())
+
+    def test_composite(self):
+        query = (
+            self.collection.where("state", "==", "CA")
+            .where("country", "in", ["US"])
+            .where("tags", "array_contains", "x")
+            .where("population", ">", 1)
+        )
+
+        self.assertEqual(
+            self._call_fut(query),
+            (
+                "cities",
+                False,
+                (
+                    ("country", "ASCENDING"),
+                    ("state", "ASCENDING"),
+                    ("tags", "CONTAINS"),
+                    ("population", "ASCENDING"),
+                ),
+                2,
+            ),
+        )
+
+    def test_orders(self):
+        client = _make_client()
+        query = (
+            client.collection_group("cities")
+            .where("state", "==", "CA")
+            .order_by("state")
+            .order_by("population", direction="DESCENDING")
+            .order_by("__name__", direction="ASCENDING")
+        )
+
+        self.assertEqual(
+            self._call_fut(query),
+            (
+                "cities",
+                True,
+                (
+                    ("state", "ASCENDING"),
+                    ("population", "DESCENDING"),
+                    ("__name__", "ASCENDING"),
+                ),
+                0,
+            ),
+        )
+
+    def test_unary_filters(self):
+        from google.cloud.firestore_v1.types import StructuredQuery
+
+        query = self.collection.where("a", "==", None)
+        query._field_filters += (
+            StructuredQuery.UnaryFilter(
+                field=StructuredQuery.FieldReference(field_path="b"),
+                op=StructuredQuery.UnaryFilter.Operator.IS_NOT_NULL,
+            ),
+        )
+
+        self.assertEqual(
+            self._call_fut(query),
+            ("cities", False, (("a", "ASCENDING"), ("b", "ASCENDING")), 1),
+        )
+
+
+class TestIndexAdvisor(unittest.TestCase):
+    @staticmethod
+    def _get_target_class():
+        from google.cloud.firestore_v1.index_advisor import IndexAdvisor
+
+        return IndexAdvisor
+
+    def _make_one(self, *args, **kwargs):
+        klass = self._get_target_class()
+        return klass(*args, **kwargs)
+
+    def setUp(self):
+        self.client = _make_client()
+        self.collection = self.client.collection("cities")
+
+    def _admin_client(self, existing=()):
+        from google.cloud.firestore_admin_v1.services.firestore_admin.client import (
+            FirestoreAdminClient,
+        )
+
+        admin_client = mock.Mock(
+            spec=["collection_group_path", "create_index", "list_indexes"]
+        )
+        admin_client.collection_group_path.side_effect = (
+            FirestoreAdminClient.collection_group_path
+        )
+        admin_client.list_indexes.return_value = iter(existing)
+        return admin_client
+
+    @staticmethod
+    def _index(*fields, **kwargs):
+        from google.cloud.firestore_admin_v1.types import Index
+
+        index_fields = []
+        for field_path, mode in fields:
+            if mode == "CONTAINS":
+                index_fields.append(
+                    Index.IndexField(
+                        field_path=field_path,
+                        array_config=Index.IndexField.ArrayConfig.CONTAINS,
+                    )
+                )
+            else:
+                index_fields.append(
+                    Index.IndexField(
+                        field_path=field_path, order=Index.IndexField.Order[mode]
+                    )
+                )
+        kwargs.setdefault("query_scope", Index.QueryScope.COLLECTION)
+        return Index(fields=index_fields, **kwargs)
+
+    def test_required_indexes(self):
+        advisor = self._make_one()
+        by_population = self.collection.where("a", "==", 1).order_by("population")
+
+        advisor.record(self.collection.where("a", ">", 1))
+        advisor.record(self.collection.where("b", "==", 1).where("c", ">", 1))
+        advisor.record(by_population)
+        advisor.record(by_population.where("a", "==", 2)._to_protobuf())
+
+        self.assertEqual(
+            advisor.required_indexes(),
+            [
+                (
+                    "cities",
+                    self._index(("a", "ASCENDING"), ("population", "ASCENDING")),
+                ),
+                ("cities", self._index(("b", "ASCENDING"), ("c", "ASCENDING"))),
+            ],
+        )
+
+    def test_attach(self):
+        from google.cloud.firestore_v1 import base_query
+
+        advisor = self._make_one()
+        query = self.collection.where("a", "==", 1).where("b", "<", 2)
+
+        with advisor:
+            advisor.attach()
+            query._prep_stream()
+            self.assertEqual(base_query._query_observers, [advisor.record])
+        query._prep_stream()
+
+        self.assertEqual(base_query._query_observers, [])
+        self.assertEqual(len(advisor.required_indexes()), 1)
+        advisor.detach()
+
+    def test_missing_indexes(self):
+        from google.cloud.firestore_admin_v1.types import Index
+
+        advisor = self._make_one()
+        advisor.record(
+            self.collection.where("a", "==", 1)
+            .where("b", "==", 1)
+            .order_by("c", direction="DESCENDING")
+        )
+        advisor.record(self.collection.where("a", "==", 1).order_by("d"))
+        advisor.record(self.collection.where("a", "==", 1).order_by("e"))
+        advisor.record(
+            self.client.collection_group("cities").where("a", "==", 1).order_by("d")
+        )
+        admin_client = self._admin_client(
+            [
+                # Equality fields may come in any order / direction.
+                self._index(
+                    ("b", "DESCENDING"),
+                    ("a", "ASCENDING"),
+                    ("c", "DESCENDING"),
+                    ("__name__", "DESCENDING"),
+                ),
+                self._index(("a", "ASCENDING"), ("d", "ASCENDING")),
+                self._index(
+                    ("a", "ASCENDING"),
+                    ("e", "ASCENDING"),
+                    state=Index.State.NEEDS_REPAIR,
+                ),
+            ]
+        )
+
+        missing = advisor.missing_indexes(admin_client, "my-project")
+
+        self.assertEqual(
+            missing,
+            [
+                ("cities", self._index(("a", "ASCENDING"), ("e", "ASCENDING"))),
+                (
+                    "cities",
+                    self._index(
+                        ("a", "ASCENDING"),
+                        ("d", "ASCENDING"),
+                        query_scope=Index.QueryScope.COLLECTION_GROUP,
+                    ),
+                ),
+            ],
+        )
+        admin_client.list_indexes.assert_called_once_with(
+            request={
+                "parent": "projects/my-project/databases/(default)/collectionGroups/cities"
+            }
+        )
+
+    def test_create_missing_indexes(self):
+        advisor = self._make_one()
+        advisor.record(self.collection.where("a", "==", 1).order_by("d"))
+        advisor.record(
+            self.collection.where("tags", "array_contains", "x").order_by("d")
+        )
+        admin_client = self._admin_client(
+            [self._index(("tags", "CONTAINS"), ("d", "ASCENDING"))]
+        )
+        operation = admin_client.create_index.return_value
+
+        created = advisor.create_missing_indexes(
+            admin_client, "my-project", database="other", timeout=60.0
+        )
+
+        self.assertEqual(created, [operation.result.return_value])
+        operation.result.assert_called_once_with(timeout=60.0)
+        admin_client.create_index.assert_called_once_with(
+            request={
+                "parent": "projects/my-project/databases/other/collectionGroups/cities",
+                "index": self._index(("a", "ASCENDING"), ("d", "ASCENDING")),
+            }
+        )
+
+
+def _make_credentials():
+    import google.auth.credentials
+
+    return mock.Mock(spec=google.auth.credentials.Credentials)
+
+
+def _make_client(project="seventy-nine"):
+    from google.cloud.firestore_v1.client import Client
+
+    credentials = _make_credentials()
+    return Client(project=project, credentials=credentials)
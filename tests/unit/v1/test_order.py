@@ -194,6 +194,170 @@ class TestOrder(unittest.TestCase):
         target.compare(left, right)
 
 
+class TestEncodeKey(unittest.TestCase):
+    @staticmethod
+    def _call_fut(value):
+        from google.cloud.firestore_v1.order import encode_key
+
+        return encode_key(value)
+
+    @staticmethod
+    def _random_value(rng, depth=0):
+        """Make a random value, biased towards ties and edge cases."""
+        strings = [
+            u"",
+            u"\u0000",
+            u"a",
+            u"a\u0000",
+            u"ab",
+            u"\u00e9",
+            u"\uffff",
+            u"\U0001d11e",
+        ]
+        choices = [
+            lambda: nullValue(),
+            lambda: _boolean_value(rng.random() < 0.5),
+            lambda: _int_value(
+                rng.choice([0, 1, -1, 2 ** 53, 2 ** 53 + 1, 2 ** 63 - 1, -(2 ** 63)])
+            ),
+            lambda: _int_value(
+                rng.randint(-3, 3) + rng.choice([0, 2 ** 54, -(2 ** 60)])
+            ),
+            lambda: _double_value(
+                rng.choice(
+                    [
+                        0.0,
+                        -0.0,
+                        1.0,
+                        -1.5,
+                        2.0 ** 53,
+                        2.0 ** 63,
+                        float("inf"),
+                        float("-inf"),
+                        float("nan"),
+                    ]
+                )
+            ),
+            lambda: _double_value(rng.uniform(-3, 3)),
+            lambda: _timestamp_value(rng.randint(-2, 2), rng.choice([0, 1, 999999999])),
+            lambda: _string_value(
+                u"".join(rng.choice(strings) for _ in range(rng.randint(0, 2)))
+            ),
+            lambda: _blob_value(
+                bytes(rng.choice([0, 1, 255]) for _ in range(rng.randint(0, 2)))
+            ),
+            lambda: _reference_value(
+                "/".join(
+                    rng.choice([u"c", u"c1", u"c-", u"\u00e9"])
+                    for _ in range(rng.randint(1, 3))
+                )
+            ),
+            lambda: _geoPoint_value(
+                rng.choice([-90, 0, 0.5, 90]), rng.choice([-180, -0.0, 180])
+            ),
+        ]
+        if depth < 2:
+            choices.append(
+                lambda: document.Value(
+                    array_value=document.ArrayValue(
+                        values=[
+                            TestEncodeKey._random_value(rng, depth + 1)
+                            for _ in range(rng.randint(0, 2))
+                        ]
+                    )
+                )
+            )
+            choices.append(
+                lambda: document.Value(
+                    map_value=document.MapValue(
+                        fields={
+                            rng.choice(strings): TestEncodeKey._random_value(
+                                rng, depth + 1
+                            )
+                            for _ in range(rng.randint(0, 2))
+                        }
+                    )
+                )
+            )
+        return rng.choice(choices)()
+
+    def test_matches_order_compare(self):
+        import random
+
+        rng = random.Random(1234)
+        values = [self._random_value(rng) for _ in range(200)]
+        keys = [self._call_fut(value) for value in values]
+
+        for left, left_key in zip(values, keys):
+            for right, right_key in zip(values, keys):
+                self.assertEqual(
+                    Order._compare_to(left_key, right_key),
+                    Order.compare(left, right),
+                    "comparing {} to {}".format(left, right),
+                )
+
+    def test_equal_values_have_equal_keys(self):
+        self.assertEqual(
+            self._call_fut(_int_value(1)), self._call_fut(_double_value(1.0))
+        )
+        self.assertEqual(
+            self._call_fut(_int_value(0)), self._call_fut(_double_value(-0.0))
+        )
+        self.assertEqual(
+            self._call_fut(_double_value(float("nan"))),
+            self._call_fut(_double_value(float("nan"))),
+        )
+        self.assertEqual(
+            self._call_fut(_object_value({"b": 1, "a": 2})),
+            self._call_fut(_object_value({"a": 2.0, "b": 1.0})),
+        )
+
+    def test_large_integers(self):
+        # 2 ** 53 + 1 is not a double: it rounds to 2 ** 53.
+        values = [
+            _double_value(2.0 ** 53),
+            _int_value(2 ** 53 + 1),
+            _double_value(2.0 ** 53 + 2),
+            _int_value(2 ** 63 - 1),
+            _double_value(2.0 ** 63),
+        ]
+        keys = [self._call_fut(value) for value in values]
+
+        self.assertEqual(keys, sorted(keys))
+        self.assertEqual(len(set(keys)), len(keys))
+
+    def test_raw_protobuf(self):
+        value = _array_value([u"a", 1])
+
+        self.assertEqual(self._call_fut(value._pb), self._call_fut(value))
+
+    def test_failure_to_find_type(self):
+        with self.assertRaisesRegex(ValueError, "Could not detect value type"):
+            self._call_fut(document.Value())
+
+    def test_encode_keys(self):
+        from google.cloud.firestore_v1.order import encode_keys
+
+        cursors = [
+            (_string_value(u"a"), _int_value(2)),
+            (_string_value(u"a"), _int_value(1)),
+            (_string_value(u"a\u0000"), _int_value(3)),
+            (_string_value(u"b"), _array_value([1, 2])),
+            (_string_value(u"b"), _array_value([1])),
+        ]
+
+        keys = [encode_keys(cursor, descending=[False, True]) for cursor in cursors]
+
+        self.assertEqual(keys, sorted(keys))
+        self.assertEqual(
+            encode_keys(cursors[0]),
+            self._call_fut(cursors[0][0]) + self._call_fut(cursors[0][1]),
+        )
+        self.assertEqual(
+            encode_keys(cursors[0], descending=[False]), encode_keys(cursors[0])
+        )
+
+
 def _boolean_value(b):
     return encode_value(b)
 
@@ -101,6 +101,132 @@ class TestQuery(unittest.TestCase):
         timeout = 123.0
         self._get_helper(retry=retry, timeout=timeout)
 
+    def _get_max_documents_helper(self, count, max_get_documents=None, **kwargs):
+        firestore_api = mock.Mock(spec=["run_query"])
+        client = _make_client()
+        client._max_get_documents = max_get_documents
+        client._firestore_api_internal = firestore_api
+        parent = client.collection("dee")
+        _, expected_prefix = parent._parent_info()
+        firestore_api.run_query.return_value = iter(
+            [
+                _make_query_response(
+                    name="{}/doc{}".format(expected_prefix, index),
+                    data={"index": index},
+                )
+                for index in range(count)
+            ]
+            + [_make_query_response()]
+        )
+
+        query = self._make_one(parent)
+        return query, query.get(**kwargs)
+
+    def test_get_w_max_documents(self):
+        query, returned = self._get_max_documents_helper(2, max_documents=2)
+
+        self.assertEqual([snapshot.id for snapshot in returned], ["doc0", "doc1"])
+        # No more documents are read than needed to exceed the limit.
+        _, kwargs = query._client._firestore_api.run_query.call_args
+        self.assertEqual(kwargs["request"]["structured_query"].limit, 3)
+
+    def test_get_w_max_documents_exceeded(self):
+        from google.cloud.firestore_v1.query_results import MaterializationLimitExceeded
+
+        with self.assertRaises(MaterializationLimitExceeded) as exc_info:
+            self._get_max_documents_helper(3, max_documents=2)
+
+        self.assertEqual(exc_info.exception.limit, 2)
+
+    def test_get_w_client_max_get_documents(self):
+        from google.cloud.firestore_v1.query_results import MaterializationLimitExceeded
+
+        # The client's limit applies unless ``get`` passes its own.
+        with self.assertRaises(MaterializationLimitExceeded):
+            self._get_max_documents_helper(2, max_get_documents=1)
+        _, returned = self._get_max_documents_helper(
+            2, max_get_documents=1, max_documents=5
+        )
+
+        self.assertEqual(len(returned), 2)
+
+    def test_get_w_max_documents_negative(self):
+        client = _make_client()
+        query = self._make_one(client.collection("dee"))
+
+        with self.assertRaises(ValueError):
+            query.get(max_documents=-1)
+
+    def test_get_compact(self):
+        from google.cloud.firestore_v1.query_results import QueryResults
+
+        _, returned = self._get_max_documents_helper(2, compact=True)
+
+        self.assertIsInstance(returned, QueryResults)
+        self.assertEqual(len(returned), 2)
+        stats = returned.stats
+        self.assertEqual(stats.documents, 2)
+        self.assertGreater(stats.encoded_bytes, 0)
+        self.assertEqual(stats.decoded_documents, 0)
+
+        snapshots = list(returned)
+        self.assertEqual([snapshot.id for snapshot in snapshots], ["doc0", "doc1"])
+        self.assertEqual(snapshots[1].to_dict(), {"index": 1})
+        self.assertEqual(returned.stats.decoded_documents, 2)
+        self.assertEqual(returned.stats.decoded_bytes, stats.encoded_bytes)
+
+    def test_get_compact_limit_to_last(self):
+        client = _make_client()
+        firestore_api = mock.Mock(spec=["run_query"])
+        client._firestore_api_internal = firestore_api
+        parent = client.collection("dee")
+        _, expected_prefix = parent._parent_info()
+        firestore_api.run_query.return_value = iter(
+            [
+                _make_query_response(
+                    name="{}/doc{}".format(expected_prefix, index), data={"n": index}
+                )
+                for index in (2, 1)
+            ]
+        )
+        query = self._make_one(parent).order_by("n").limit_to_last(2)
+
+        returned = query.get(compact=True, max_documents=2)
+
+        self.assertEqual([snapshot.id for snapshot in returned], ["doc1", "doc2"])
+
+    def test_get_compact_w_split_disjunction(self):
+        from google.cloud.firestore_v1.base_query import MAX_DISJUNCTION_SIZE
+
+        client = _make_client()
+        parent = client.collection("dee")
+        _, expected_prefix = parent._parent_info()
+
+        def run_query(request, metadata, **kwargs):
+            query_pb = request["structured_query"]
+            values = query_pb.where.field_filter.value.array_value.values
+            return iter(
+                [
+                    _make_query_response(
+                        name="{}/doc{}".format(expected_prefix, value.integer_value),
+                        data={"n": value.integer_value},
+                    )
+                    for value in values
+                ]
+            )
+
+        firestore_api = mock.Mock(spec=["run_query"])
+        firestore_api.run_query.side_effect = run_query
+        client._firestore_api_internal = firestore_api
+        count = MAX_DISJUNCTION_SIZE + 1
+        query = self._make_one(parent).where("n", "in", list(range(count)))
+
+        returned = query.get(compact=True)
+
+        self.assertEqual(len(returned), count)
+        values = sorted(snapshot.get("n") for snapshot in returned)
+        self.assertEqual(values, list(range(count)))
+
     def test_get_limit_to_last(self):
         from google.cloud import firestore
         from google.cloud.firestore_v1.base_query import _enum_from_direction
@@ -227,6 +353,42 @@ class TestQuery(unittest.TestCase):
         with self.assertRaises(ValueError):
             list(stream_response)
 
+    def test_stream_with_read_time(self):
+        import datetime
+
+        # Create a minimal fake GAPIC.
+        firestore_api = mock.Mock(spec=["run_query"])
+
+        # Attach the fake GAPIC to a real client.
+        client = _make_client()
+        client._firestore_api_internal = firestore_api
+
+        # Make a **real** collection reference as parent.
+        parent = client.collection("snapshot")
+
+        # Add a dummy response to the minimal fake GAPIC.
+        parent_path, expected_prefix = parent._parent_info()
+        name = "{}/pinned".format(expected_prefix)
+        response_pb = _make_query_response(name=name, data={"a": 1})
+        firestore_api.run_query.return_value = iter([response_pb])
+
+        # Execute the query and check the response.
+        read_time = datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc)
+        query = self._make_one(parent)
+        returned = list(query.stream(read_time=read_time))
+        self.assertEqual(len(returned), 1)
+        self.assertEqual(returned[0].reference._path, ("snapshot", "pinned"))
+
+        # Verify the mock call.
+        firestore_api.run_query.assert_called_once_with(
+            request={
+                "parent": parent_path,
+                "structured_query": query._to_protobuf(),
+                "read_time": read_time,
+            },
+            metadata=client._rpc_metadata,
+        )
+
     def test_stream_with_transaction(self):
         # Create a minimal fake GAPIC.
         firestore_api = mock.Mock(spec=["run_query"])
@@ -454,7 +616,97 @@ class TestQuery(unittest.TestCase):
             metadata=client._rpc_metadata,
         )
 
-    @mock.patch("google.cloud.firestore_v1.query.Watch", autospec=True)
+    def test_stream_w_split_disjunction(self):
+        from google.cloud.firestore_v1 import _helpers
+
+        # Create a minimal fake GAPIC.
+        firestore_api = mock.Mock(spec=["run_query"])
+
+        # Attach the fake GAPIC to a real client.
+        client = _make_client()
+        client._firestore_api_internal = firestore_api
+
+        # Make a **real** collection reference as parent.
+        parent = client.collection("dee")
+        _, expected_prefix = parent._parent_info()
+
+        def _run_query(request, metadata):
+            # Answer each split query with one document per value in its filter.
+            structured_query = request["structured_query"]
+            filter_pb = structured_query.where.field_filter
+            values = [
+                _helpers.decode_value(value, client)
+                for value in filter_pb.value.array_value.values
+            ]
+            return iter(
+                [
+                    _make_query_response(
+                        name="{}/doc{:02d}".format(expected_prefix, value),
+                        data={"a": value},
+                    )
+                    for value in sorted(values, reverse=True)
+                ]
+            )
+
+        firestore_api.run_query.side_effect = _run_query
+
+        values = list(range(25))
+        query = (
+            self._make_one(parent)
+            .where("a", "in", values)
+            .order_by("a", direction="DESCENDING")
+            .offset(2)
+            .limit(15)
+        )
+        returned = list(query.stream())
+
+        self.assertEqual(firestore_api.run_query.call_count, 3)
+        self.assertEqual(
+            [snapshot.get("a") for snapshot in returned], list(range(22, 7, -1))
+        )
+
+    def test_stream_w_split_disjunction_inequality_and_limit(self):
+        # Create a minimal fake GAPIC.
+        firestore_api = mock.Mock(spec=["run_query"])
+
+        # Attach the fake GAPIC to a real client.
+        client = _make_client()
+        client._firestore_api_internal = firestore_api
+
+        # Make a **real** collection reference as parent.
+        parent = client.collection("dee")
+        _, expected_prefix = parent._parent_info()
+        consumed = []
+
+        def _run_query(request, metadata):
+            # The backend orders each split query by the inequality field.
+            composite_filter = request["structured_query"].where.composite_filter
+            in_filter = composite_filter.filters[1].field_filter
+            if len(in_filter.value.array_value.values) > 1:
+                documents = [("z", 1), ("zz", 2), ("zzz", 3)]
+            else:
+                documents = [("a", 5), ("b", 6)]
+            for document_id, x in documents:
+                consumed.append(document_id)
+                yield _make_query_response(
+                    name="{}/{}".format(expected_prefix, document_id), data={"x": x}
+                )
+
+        firestore_api.run_query.side_effect = _run_query
+
+        query = (
+            self._make_one(parent)
+            .where("x", ">", 0)
+            .where("y", "in", list(range(11)))
+            .limit(2)
+        )
+        returned = list(query.stream())
+
+        self.assertEqual([snapshot.id for snapshot in returned], ["z", "zz"])
+        # The results of the split queries are merged lazily.
+        self.assertNotIn("zzz", consumed)
+
+    @mock.patch("google.cloud.firestore_v1.watch.Watch", autospec=True)
     def test_on_snapshot(self, watch):
         query = self._make_one(mock.sentinel.parent)
         query.on_snapshot(None)
@@ -585,6 +837,54 @@ class TestCollectionGroup(unittest.TestCase):
         with pytest.raises(ValueError):
             list(query.get_partitions(2))
 
+    @mock.patch("google.cloud.firestore_v1._multiprocess.scan")
+    def test_stream_multiprocess(self, scan):
+        from google.cloud.firestore_v1._multiprocess import DEFAULT_SCAN_BATCH_SIZE
+
+        client = _make_client()
+        query = self._make_one(client.collection("asteroid"))
+
+        result = query.stream_multiprocess(
+            mock.sentinel.partitions, processes=4, timeout=12.5
+        )
+
+        self.assertIs(result, scan.return_value)
+        scan.assert_called_once_with(
+            client,
+            mock.sentinel.partitions,
+            4,
+            None,
+            DEFAULT_SCAN_BATCH_SIZE,
+            None,
+            {"timeout": 12.5},
+        )
+
+    @mock.patch("google.cloud.firestore_v1._multiprocess.scan")
+    def test_stream_multiprocess_w_columns(self, scan):
+        from google.api_core.retry import Retry
+
+        client = _make_client()
+        query = self._make_one(client.collection("asteroid"))
+        retry = Retry(predicate=object())
+
+        query.stream_multiprocess(
+            mock.sentinel.partitions,
+            columns=["a", "b.c"],
+            batch_size=10,
+            retry=retry,
+            read_time=mock.sentinel.read_time,
+        )
+
+        scan.assert_called_once_with(
+            client,
+            mock.sentinel.partitions,
+            None,
+            ["a", "b.c"],
+            10,
+            mock.sentinel.read_time,
+            {"retry": retry},
+        )
+
 
 def _make_client(project="project-project"):
     from google.cloud.firestore_v1.client import Client
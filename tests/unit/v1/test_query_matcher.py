@@ -0,0 +1,241 @@
+# Copyright 2020 Google LLC All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+import mock
+
+
+class TestQueryMatcher(unittest.TestCase):
+    @staticmethod
+    def _get_target_class():
+        from google.cloud.firestore_v1.query_matcher import QueryMatcher
+
+        return QueryMatcher
+
+    def _make_one(self, *args, **kwargs):
+        klass = self._get_target_class()
+        return klass(*args, **kwargs)
+
+    def setUp(self):
+        self.client = _make_client()
+        self.collection = self.client.collection("cities")
+
+    def _document(self, document_id, data, collection=None):
+        from google.cloud.firestore_v1 import _helpers
+        from google.cloud.firestore_v1.types import document
+
+        collection = collection or self.collection
+        return document.Document(
+            name=collection.document(document_id)._document_path,
+            fields=_helpers.encode_dict(data),
+        )
+
+    def _ids(self, documents):
+        return [document.name.rpartition("/")[2] for document in documents]
+
+    def _check_filter(self, field_path, op_string, value, documents, expected):
+        query = self.collection.where(field_path, op_string, value)
+        matcher = self._make_one(query)
+        matched = [
+            document_id
+            for document_id, data in documents
+            if matcher.matches(self._document(document_id, data))
+        ]
+        self.assertEqual(matched, expected, (field_path, op_string, value))
+
+    def test_comparison_filters(self):
+        documents = [
+            ("int", {"a": 1}),
+            ("double", {"a": 2.5}),
+            ("string", {"a": "x"}),
+            ("null", {"a": None}),
+            ("missing", {"b": 1}),
+        ]
+
+        self._check_filter("a", "==", 1.0, documents, ["int"])
+        self._check_filter("a", "<", 2.5, documents, ["int"])
+        self._check_filter("a", "<=", 2.5, documents, ["int", "double"])
+        self._check_filter("a", ">", 1, documents, ["double"])
+        self._check_filter("a", ">=", 1, documents, ["int", "double"])
+        self._check_filter("a", ">", "a", documents, ["string"])
+        self._check_filter("a", "!=", 1, documents, ["double", "string"])
+        self._check_filter("a", "==", None, documents, ["null"])
+
+    def test_array_filters(self):
+        documents = [
+            ("in", {"a": 1, "tags": ["x", "y"]}),
+            ("out", {"a": 3, "tags": ["z"]}),
+            ("scalar", {"a": None, "tags": "x"}),
+        ]
+
+        self._check_filter("a", "in", [1, 2], documents, ["in"])
+        self._check_filter("a", "not-in", [1, 2], documents, ["out"])
+        self._check_filter("tags", "array_contains", "x", documents, ["in"])
+        self._check_filter(
+            "tags", "array_contains_any", ["y", "z"], documents, ["in", "out"]
+        )
+
+    def test_nan_and_nested_fields(self):
+        documents = [
+            ("nan", {"m": {"v": float("nan")}}),
+            ("one", {"m": {"v": 1}}),
+            ("flat", {"m": 1}),
+        ]
+
+        self._check_filter("m.v", "==", float("nan"), documents, ["nan"])
+        self._check_filter("m.v", "<", 2, documents, ["nan", "one"])
+
+    def test_name_filter(self):
+        reference = self.collection.document("b")
+        documents = [("a", {}), ("b", {})]
+
+        self._check_filter("__name__", "==", reference, documents, ["b"])
+        self._check_filter("__name__", ">", reference, [("c", {})] + documents, ["c"])
+
+    def test_scope(self):
+        other = self.client.collection("towns")
+        nested = self.client.collection("countries", "fr", "cities")
+        matcher = self._make_one(self.collection._query())
+
+        self.assertTrue(matcher.matches(self._document("a", {})))
+        self.assertFalse(matcher.matches(self._document("a", {}, other)))
+        self.assertFalse(matcher.matches(self._document("a", {}, nested)))
+
+        group = self.client.collection_group("cities")
+        matcher = self._make_one(group)
+        self.assertTrue(matcher.matches(self._document("a", {})))
+        self.assertTrue(matcher.matches(self._document("a", {}, nested)))
+        self.assertFalse(matcher.matches(self._document("a", {}, other)))
+
+    def test_snapshots(self):
+        from google.cloud.firestore_v1.base_document import DocumentSnapshot
+
+        def _snapshot(document_id, data, exists=True):
+            return DocumentSnapshot(
+                self.collection.document(document_id), data, exists, None, None, None,
+            )
+
+        matcher = self._make_one(self.collection.where("a", ">", 1))
+        self.assertTrue(matcher.matches(_snapshot("x", {"a": 2})))
+        self.assertFalse(matcher.matches(_snapshot("y", {"a": 1})))
+        self.assertFalse(matcher.matches(_snapshot("z", None, exists=False)))
+
+    def test_orders_require_fields(self):
+        matcher = self._make_one(self.collection.order_by("a"))
+
+        self.assertTrue(matcher.matches(self._document("x", {"a": None})))
+        self.assertFalse(matcher.matches(self._document("y", {"b": 1})))
+
+        with self.assertRaises(ValueError):
+            matcher.compare(self._document("x", {"a": 1}), self._document("y", {}))
+
+    def test_sort_mixed_directions(self):
+        query = self.collection.order_by("a").order_by("b", direction="DESCENDING")
+        matcher = self._make_one(query)
+        documents = [
+            self._document("1", {"a": 2, "b": 1}),
+            self._document("2", {"a": 1, "b": 1}),
+            self._document("3", {"a": 1, "b": 2}),
+            self._document("4", {"a": 2, "b": 1}),
+        ]
+
+        # Ties are broken by name, in the direction of the last order.
+        self.assertEqual(self._ids(matcher.sort(documents)), ["3", "2", "4", "1"])
+        self.assertEqual(matcher.compare(documents[2], documents[1]), -1)
+        self.assertEqual(matcher.compare(documents[0], documents[0]), 0)
+
+    def test_sort_mixed_types(self):
+        from google.cloud.firestore_v1 import _helpers
+        from google.cloud.firestore_v1.order import encode_key
+        from google.cloud.firestore_v1.query_matcher import _raw_document
+
+        matcher = self._make_one(self.collection.order_by("a"))
+        values = [{"k": 1}, [1], "a", 1.5, 1, float("nan"), True, None]
+        documents = [
+            self._document(str(index), {"a": value})
+            for index, value in enumerate(values)
+        ]
+
+        # Values sort in the backend's type order, as their order keys do.
+        self.assertEqual(
+            self._ids(matcher.sort(documents)), ["7", "6", "5", "4", "3", "2", "1", "0"]
+        )
+        self.assertEqual(
+            matcher._position(_raw_document(documents[0]))[0],
+            encode_key(_helpers.encode_value({"k": 1})),
+        )
+
+    def test_sort_implicit_inequality_order(self):
+        matcher = self._make_one(self.collection.where("a", ">", 0))
+        documents = [
+            self._document("b", {"a": 2}),
+            self._document("a", {"a": 2}),
+            self._document("c", {"a": 1}),
+        ]
+
+        self.assertEqual(self._ids(matcher.sort(documents)), ["c", "a", "b"])
+
+    def test_cursors(self):
+        documents = [self._document(str(index), {"a": index}) for index in range(6)]
+        query = self.collection.order_by("a")
+
+        matcher = self._make_one(query.start_at({"a": 1}).end_before({"a": 4}))
+        self.assertEqual(self._ids(matcher.apply(documents)), ["1", "2", "3"])
+
+        matcher = self._make_one(query.start_after({"a": 1}).end_at({"a": 4}))
+        self.assertEqual(self._ids(matcher.apply(documents)), ["2", "3", "4"])
+
+        descending = self.collection.order_by("a", direction="DESCENDING")
+        matcher = self._make_one(descending.start_after({"a": 4}))
+        self.assertEqual(self._ids(matcher.apply(documents)), ["3", "2", "1", "0"])
+
+    def test_apply_limit_and_offset(self):
+        documents = [self._document(str(index), {"a": index}) for index in range(6)]
+        query = self.collection.order_by("a")
+
+        matcher = self._make_one(query.offset(1).limit(2))
+        self.assertEqual(self._ids(matcher.apply(documents)), ["1", "2"])
+
+        matcher = self._make_one(query.offset(4))
+        self.assertEqual(self._ids(matcher.apply(documents)), ["4", "5"])
+
+        matcher = self._make_one(query.limit_to_last(2))
+        self.assertEqual(self._ids(matcher.apply(documents)), ["4", "5"])
+
+    def test_unsupported_operator(self):
+        from google.cloud.firestore_v1.types import StructuredQuery
+
+        filter_pb = StructuredQuery.UnaryFilter(
+            field=StructuredQuery.FieldReference(field_path="a"),
+            op=StructuredQuery.UnaryFilter.Operator.OPERATOR_UNSPECIFIED,
+        )
+        query = self.collection.where("a", "==", 1)
+        query._field_filters = (filter_pb,)
+
+        with self.assertRaises(ValueError):
+            self._make_one(query)
+
+
+def _make_credentials():
+    import google.auth.credentials
+
+    return mock.Mock(spec=google.auth.credentials.Credentials)
+
+
+def _make_client(project="seventy-nine"):
+    from google.cloud.firestore_v1.client import Client
+
+    credentials = _make_credentials()
+    return Client(project=project, credentials=credentials)
@@ -0,0 +1,165 @@
+# Copyright 2020 Google LLC All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+import mock
+
+
+class TestMaterializationLimitExceeded(unittest.TestCase):
+    def test_it(self):
+        from google.cloud.firestore_v1.query_results import MaterializationLimitExceeded
+
+        error = MaterializationLimitExceeded(100)
+
+        self.assertIsInstance(error, ValueError)
+        self.assertEqual(error.limit, 100)
+        self.assertIn("more than 100 documents", str(error))
+
+
+class TestQueryResultsStats(unittest.TestCase):
+    def test___repr__(self):
+        from google.cloud.firestore_v1.query_results import QueryResultsStats
+
+        stats = QueryResultsStats(2, 300, 1, 150)
+        self.assertEqual(
+            repr(stats),
+            "<QueryResultsStats documents=2 encoded_bytes=300 "
+            "decoded_documents=1 decoded_bytes=150>",
+        )
+
+
+class TestQueryResults(unittest.TestCase):
+    @staticmethod
+    def _get_target_class():
+        from google.cloud.firestore_v1.query_results import QueryResults
+
+        return QueryResults
+
+    def _make_one(self, *args, **kwargs):
+        klass = self._get_target_class()
+        return klass(*args, **kwargs)
+
+    def _make_results(self, count, **kwargs):
+        from tests.unit.v1.test_base_query import _make_query_response
+
+        client = _make_client()
+        parent = client.collection("dee")
+        query = client.collection("dee")._query()
+        _, expected_prefix = parent._parent_info()
+        results = query._query_results(**kwargs)
+        for index in range(count):
+            results._append(
+                _make_query_response(
+                    name="{}/doc{}".format(expected_prefix, index),
+                    data={"index": index},
+                )
+            )
+        return results
+
+    def test_constructor(self):
+        results = self._make_one(mock.sentinel.to_snapshot)
+
+        self.assertEqual(len(results), 0)
+        self.assertEqual(results.size, 0)
+        self.assertTrue(results.empty)
+        self.assertEqual(results.docs, [])
+        self.assertEqual(results.stats.encoded_bytes, 0)
+
+    def test__append_and_decode(self):
+        results = self._make_results(3, max_documents=None)
+
+        self.assertEqual(results.size, 3)
+        self.assertFalse(results.empty)
+        encoded_bytes = results.stats.encoded_bytes
+        self.assertGreater(encoded_bytes, 0)
+
+        snapshot = results[1]
+        self.assertEqual(snapshot.id, "doc1")
+        self.assertEqual(snapshot.to_dict(), {"index": 1})
+        self.assertEqual(
+            [snapshot.id for snapshot in results[1:]], ["doc1", "doc2"],
+        )
+        self.assertEqual(
+            [snapshot.get("index") for snapshot in results], [0, 1, 2],
+        )
+
+        # Each read decodes again, none is kept.
+        stats = results.stats
+        self.assertEqual(stats.documents, 3)
+        self.assertEqual(stats.encoded_bytes, encoded_bytes)
+        self.assertEqual(stats.decoded_documents, 6)
+
+    def test__append_w_max_documents(self):
+        from google.cloud.firestore_v1.query_results import MaterializationLimitExceeded
+
+        self._make_results(2, max_documents=2)
+        with self.assertRaises(MaterializationLimitExceeded):
+            self._make_results(3, max_documents=2)
+
+    def test__append_snapshot(self):
+        results = self._make_results(1, max_documents=None)
+        snapshot = results[0]
+        other = self._make_results(0, max_documents=None)
+
+        other._append_snapshot(snapshot)
+
+        copy = other[0]
+        self.assertEqual(copy.reference._path, snapshot.reference._path)
+        self.assertEqual(copy.to_dict(), {"index": 0})
+        self.assertEqual(copy.update_time, snapshot.update_time)
+        self.assertEqual(copy.read_time, snapshot.read_time)
+
+    def test__reverse(self):
+        results = self._make_results(2, max_documents=None)
+
+        results._reverse()
+
+        self.assertEqual([snapshot.id for snapshot in results], ["doc1", "doc0"])
+
+
+class Test__max_documents(unittest.TestCase):
+    @staticmethod
+    def _call_fut(client, max_documents):
+        from google.cloud.firestore_v1.query_results import _max_documents
+
+        return _max_documents(client, max_documents)
+
+    def test_it(self):
+        client = mock.Mock(_max_get_documents=None, spec=["_max_get_documents"])
+        self.assertIsNone(self._call_fut(client, None))
+        self.assertEqual(self._call_fut(client, 5), 5)
+
+        client._max_get_documents = 10
+        self.assertEqual(self._call_fut(client, None), 10)
+        self.assertEqual(self._call_fut(client, 5), 5)
+        self.assertEqual(self._call_fut(client, 0), 0)
+
+    def test_negative(self):
+        client = mock.Mock(_max_get_documents=-1, spec=["_max_get_documents"])
+        with self.assertRaises(ValueError):
+            self._call_fut(client, None)
+
+
+def _make_credentials():
+    import google.auth.credentials
+
+    return mock.Mock(spec=google.auth.credentials.Credentials)
+
+
+def _make_client(project="project-project"):
+    from google.cloud.firestore_v1.client import Client
+
+    credentials = _make_credentials()
+    return Client(project=project, credentials=credentials)
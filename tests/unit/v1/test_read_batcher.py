@@ -0,0 +1,163 @@
+# Copyright 2020 Google LLC All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+import unittest
+
+import mock
+
+
+def _batch_get_response(document_path, data=None):
+    from google.cloud.firestore_v1 import _helpers
+    from google.cloud.firestore_v1.types import document
+    from google.cloud.firestore_v1.types import firestore
+
+    if data is None:
+        return firestore.BatchGetDocumentsResponse(missing=document_path)
+    return firestore.BatchGetDocumentsResponse(
+        found=document.Document(name=document_path, fields=_helpers.encode_dict(data))
+    )
+
+
+class TestReadBatcher(unittest.TestCase):
+    @staticmethod
+    def _get_target_class():
+        from google.cloud.firestore_v1.read_batcher import ReadBatcher
+
+        return ReadBatcher
+
+    def _make_one(self, *args, **kwargs):
+        klass = self._get_target_class()
+        return klass(*args, **kwargs)
+
+    def setUp(self):
+        self.client = _make_client()
+        self.api_client = mock.Mock(spec=["batch_get_documents", "get_document"])
+        self.client._firestore_api_internal = self.api_client
+
+        def batch_get_documents(request, **kwargs):
+            return iter(
+                [
+                    _batch_get_response(path, {"path": path})
+                    for path in request["documents"]
+                ]
+            )
+
+        self.api_client.batch_get_documents.side_effect = batch_get_documents
+
+    @staticmethod
+    def _get_concurrently(get, references, field_paths=None):
+        results = [None] * len(references)
+        barrier = threading.Barrier(len(references))
+
+        def read(index):
+            barrier.wait()
+            results[index] = get(references[index], field_paths)
+
+        threads = [
+            threading.Thread(target=read, args=(index,))
+            for index in range(len(references))
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_get_batches_concurrent_reads(self):
+        batcher = self._make_one(self.client, window=0.5)
+        references = [self.client.document("a", str(index)) for index in range(5)]
+
+        snapshots = self._get_concurrently(batcher.get, references + references[:2])
+
+        self.api_client.batch_get_documents.assert_called_once()
+        request = self.api_client.batch_get_documents.call_args[1]["request"]
+        self.assertEqual(
+            sorted(request["documents"]),
+            sorted(reference._document_path for reference in references),
+        )
+        self.assertEqual(
+            [snapshot.get("path") for snapshot in snapshots],
+            [reference._document_path for reference in references + references[:2]],
+        )
+        self.assertEqual(len(batcher), 0)
+
+    def test_get_full_batch(self):
+        batcher = self._make_one(self.client, window=60.0, max_batch_size=2)
+        references = [self.client.document("a", str(index)) for index in range(2)]
+
+        self._get_concurrently(batcher.get, references, field_paths=["path"])
+
+        self.api_client.batch_get_documents.assert_called_once()
+        request = self.api_client.batch_get_documents.call_args[1]["request"]
+        self.assertEqual(request["mask"].field_paths, ["path"])
+        batcher.close()
+
+    def test_get_failure(self):
+        from google.api_core import exceptions
+
+        batcher = self._make_one(self.client, window=0.0)
+        self.api_client.batch_get_documents.side_effect = exceptions.ServiceUnavailable(
+            "x"
+        )
+
+        with self.assertRaises(exceptions.ServiceUnavailable):
+            batcher.get(self.client.document("a", "b"))
+        self.assertEqual(len(batcher), 0)
+
+    def test_client_batch_reads(self):
+        references = [self.client.document("a", str(index)) for index in range(3)]
+
+        with self.client.batch_reads(window=0.5) as batcher:
+            self.assertIsInstance(batcher, self._get_target_class())
+            self.assertIs(self.client._read_batcher, batcher)
+            snapshots = self._get_concurrently(
+                lambda reference, field_paths: reference.get(field_paths),
+                references,
+                field_paths=["path"],
+            )
+            # Reads with their own options are not batched.
+            self.api_client.get_document.return_value = _batch_get_response(
+                references[0]._document_path, {}
+            ).found
+            references[0].get(timeout=1.0)
+
+        self.assertIsNone(self.client._read_batcher)
+        self.assertEqual(len(snapshots), 3)
+        self.api_client.batch_get_documents.assert_called_once()
+        self.api_client.get_document.assert_called_once()
+        with self.assertRaises(ValueError):
+            batcher.get(references[0])
+
+    def test_client_batch_reads_replaces(self):
+        first = self.client.batch_reads()
+        second = self.client.batch_reads()
+
+        self.assertIs(self.client._read_batcher, second)
+        with self.assertRaises(ValueError):
+            first.get(self.client.document("a", "b"))
+        second.close()
+
+
+def _make_credentials():
+    import google.auth.credentials
+
+    return mock.Mock(spec=google.auth.credentials.Credentials)
+
+
+def _make_client(project="seventy-nine"):
+    from google.cloud.firestore_v1.client import Client
+
+    credentials = _make_credentials()
+    return Client(project=project, credentials=credentials)
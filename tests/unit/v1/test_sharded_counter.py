@@ -0,0 +1,182 @@
+# Copyright 2020 Google LLC All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+import mock
+
+
+class TestShardedCounter(unittest.TestCase):
+    @staticmethod
+    def _get_target_class():
+        from google.cloud.firestore_v1.sharded_counter import ShardedCounter
+
+        return ShardedCounter
+
+    def _make_one(self, *args, **kwargs):
+        klass = self._get_target_class()
+        return klass(*args, **kwargs)
+
+    def setUp(self):
+        self.client = _make_client()
+        self.api_client = mock.Mock(spec=["commit", "batch_get_documents"])
+        self.client._firestore_api_internal = self.api_client
+        self.reference = self.client.document("counters", "visits")
+
+    def _commit_response(self):
+        from google.cloud.firestore_v1.types import firestore
+        from google.cloud.firestore_v1.types import write
+
+        return firestore.CommitResponse(write_results=[write.WriteResult()])
+
+    def _written_shard(self, call):
+        write_pb = call[1]["request"]["writes"][0]
+        return write_pb.update.name.rpartition("/")[2]
+
+    def test_increment(self):
+        counter = self._make_one(self.reference, num_shards=4)
+        response = self._commit_response()
+        self.api_client.commit.return_value = response
+
+        result = counter.increment(5, key="user-1")
+
+        self.assertEqual(result, response.write_results[0])
+        write_pb = self.api_client.commit.call_args[1]["request"]["writes"][0]
+        self.assertEqual(
+            write_pb.update.name,
+            counter._shard(counter._choose_shard("user-1"))._document_path,
+        )
+        transform = write_pb.update_transforms[0]
+        self.assertEqual(transform.field_path, "count")
+        self.assertEqual(transform.increment.integer_value, 5)
+
+    def test_increment_w_contention(self):
+        from google.api_core import exceptions
+
+        counter = self._make_one(self.reference, num_shards=1, max_shards=8)
+        self.api_client.commit.side_effect = [
+            exceptions.Aborted("contention"),
+            exceptions.ResourceExhausted("contention"),
+            self._commit_response(),
+        ]
+
+        with mock.patch("random.randrange", side_effect=[0, 1, 3]):
+            counter.increment()
+
+        self.assertEqual(counter.num_shards, 4)
+        self.assertEqual(
+            [
+                self._written_shard(call)
+                for call in self.api_client.commit.call_args_list
+            ],
+            ["0", "1", "3"],
+        )
+
+    def test_increment_gives_up(self):
+        from google.api_core import exceptions
+
+        counter = self._make_one(self.reference, num_shards=1, max_shards=2)
+        self.api_client.commit.side_effect = exceptions.Aborted("contention")
+
+        with self.assertRaises(exceptions.Aborted):
+            counter.increment()
+
+        self.assertEqual(self.api_client.commit.call_count, 3)
+        self.assertEqual(counter.num_shards, 2)
+
+    def test_increment_not_retried_on_deadline(self):
+        from google.api_core import exceptions
+
+        counter = self._make_one(self.reference, num_shards=1)
+        self.api_client.commit.side_effect = exceptions.DeadlineExceeded("slow")
+
+        with self.assertRaises(exceptions.DeadlineExceeded):
+            counter.increment()
+
+        # The write may have been applied: retrying could count it twice.
+        self.assertEqual(self.api_client.commit.call_count, 1)
+        self.assertEqual(counter.num_shards, 2)
+
+    def test_get(self):
+        from google.cloud.firestore_v1 import _helpers
+        from google.cloud.firestore_v1.types import document
+        from google.cloud.firestore_v1.types import firestore
+
+        counter = self._make_one(self.reference, num_shards=2, max_shards=3)
+        shards = counter._all_shards()
+        self.api_client.batch_get_documents.return_value = iter(
+            [
+                firestore.BatchGetDocumentsResponse(
+                    found=document.Document(
+                        name=shards[0]._document_path,
+                        fields=_helpers.encode_dict({"count": 4}),
+                    )
+                ),
+                firestore.BatchGetDocumentsResponse(missing=shards[1]._document_path),
+                firestore.BatchGetDocumentsResponse(
+                    found=document.Document(
+                        name=shards[2]._document_path,
+                        fields=_helpers.encode_dict({"count": -1}),
+                    )
+                ),
+            ]
+        )
+
+        self.assertEqual(counter.get(), 3)
+
+        request = self.api_client.batch_get_documents.call_args[1]["request"]
+        self.assertEqual(
+            request["documents"], [shard._document_path for shard in shards]
+        )
+        self.assertEqual(request["mask"].field_paths, ["count"])
+
+    def test_listen(self):
+        from google.cloud.firestore_v1.base_document import DocumentSnapshot
+
+        counter = self._make_one(self.reference)
+        collection_class = type(self.reference.collection("shards"))
+
+        with mock.patch.object(collection_class, "on_snapshot") as on_snapshot:
+            watch = counter.listen()
+            self.assertIs(counter.listen(), watch)
+
+        self.assertIs(watch, on_snapshot.return_value)
+        self.assertIsNone(counter.cached_total)
+        callback = on_snapshot.call_args[0][0]
+        shard = counter._shard(0)
+        callback(
+            [DocumentSnapshot(shard, {"count": 7}, True, None, None, None)], [], None
+        )
+
+        self.assertEqual(counter.cached_total, 7)
+        self.assertEqual(counter.get(), 7)
+        self.api_client.batch_get_documents.assert_not_called()
+
+        counter.close()
+        watch.unsubscribe.assert_called_once_with()
+        self.assertIsNone(counter.cached_total)
+        counter.close()
+
+
+def _make_credentials():
+    import google.auth.credentials
+
+    return mock.Mock(spec=google.auth.credentials.Credentials)
+
+
+def _make_client(project="seventy-nine"):
+    from google.cloud.firestore_v1.client import Client
+
+    credentials = _make_credentials()
+    return Client(project=project, credentials=credentials)
@@ -47,6 +47,28 @@ class TestTransaction(unittest.TestCase):
         self.assertTrue(transaction._read_only)
         self.assertIsNone(transaction._id)
 
+    def test_constructor_w_deadline(self):
+        from google.cloud.firestore_v1.deadline import Deadline
+
+        deadline = Deadline(5.0)
+        transaction = self._make_one(mock.sentinel.client, deadline=deadline)
+        self.assertIs(transaction._deadline, deadline)
+
+    def test_constructor_w_read_time(self):
+        transaction = self._make_one(
+            mock.sentinel.client, read_only=True, read_time=mock.sentinel.read_time
+        )
+        self.assertTrue(transaction._read_only)
+        self.assertIs(transaction.read_time, mock.sentinel.read_time)
+
+    def test_constructor_w_read_time_read_write(self):
+        from google.cloud.firestore_v1.base_transaction import _READ_TIME_READ_WRITE
+
+        with self.assertRaises(ValueError) as exc_info:
+            self._make_one(mock.sentinel.client, read_time=mock.sentinel.read_time)
+
+        self.assertEqual(exc_info.exception.args, (_READ_TIME_READ_WRITE,))
+
     def test__add_write_pbs_failure(self):
         from google.cloud.firestore_v1.base_transaction import _WRITE_READ_ONLY
 
@@ -107,6 +129,40 @@ class TestTransaction(unittest.TestCase):
             metadata=client._rpc_metadata,
         )
 
+    def test__begin_w_deadline(self):
+        from google.cloud.firestore_v1.deadline import _BoundedRetry
+        from google.cloud.firestore_v1.deadline import Deadline
+        from google.cloud.firestore_v1.types import firestore
+
+        firestore_api = mock.Mock(spec=["begin_transaction"])
+        firestore_api.begin_transaction.return_value = firestore.BeginTransactionResponse(
+            transaction=b"to-begin"
+        )
+        client = _make_client()
+        client._firestore_api_internal = firestore_api
+        deadline = Deadline(5.0)
+        transaction = self._make_one(client, deadline=deadline)
+
+        transaction._begin()
+
+        _, kwargs = firestore_api.begin_transaction.call_args
+        self.assertIs(kwargs["timeout"], deadline)
+        self.assertIsInstance(kwargs["retry"], _BoundedRetry)
+
+    def test__begin_w_read_time(self):
+        firestore_api = mock.Mock(spec=["begin_transaction"])
+        client = _make_client()
+        client._firestore_api_internal = firestore_api
+        transaction = self._make_one(
+            client, read_only=True, read_time=mock.sentinel.read_time
+        )
+
+        ret_val = transaction._begin()
+        self.assertIsNone(ret_val)
+        self.assertIsNone(transaction.id)
+
+        firestore_api.begin_transaction.assert_not_called()
+
     def test__begin_failure(self):
         from google.cloud.firestore_v1.base_transaction import _CANT_BEGIN
 
@@ -150,6 +206,21 @@ class TestTransaction(unittest.TestCase):
             metadata=client._rpc_metadata,
         )
 
+    def test__rollback_w_deadline_expired(self):
+        from google.cloud.firestore_v1.deadline import Deadline
+
+        firestore_api = mock.Mock(spec=["rollback"])
+        client = _make_client()
+        client._firestore_api_internal = firestore_api
+        transaction = self._make_one(client, deadline=Deadline(0.0))
+        transaction._id = b"to-be-r\x00lled"
+
+        transaction._rollback()
+
+        # The transaction is left to expire on the server.
+        firestore_api.rollback.assert_not_called()
+        self.assertIsNone(transaction._id)
+
     def test__rollback_not_allowed(self):
         from google.cloud.firestore_v1.base_transaction import _CANT_ROLLBACK
 
@@ -239,6 +310,21 @@ class TestTransaction(unittest.TestCase):
             metadata=client._rpc_metadata,
         )
 
+    def test__commit_w_read_time(self):
+        firestore_api = mock.Mock(spec=["commit", "rollback"])
+        client = _make_client()
+        client._firestore_api_internal = firestore_api
+        transaction = self._make_one(
+            client, read_only=True, read_time=mock.sentinel.read_time
+        )
+        transaction._begin()
+
+        self.assertEqual(transaction._commit(), [])
+        self.assertIsNone(transaction._rollback())
+
+        firestore_api.commit.assert_not_called()
+        firestore_api.rollback.assert_not_called()
+
     def test__commit_not_allowed(self):
         from google.cloud.firestore_v1.base_transaction import _CANT_COMMIT
 
@@ -316,6 +402,34 @@ class TestTransaction(unittest.TestCase):
         timeout = 123.0
         self._get_all_helper(retry=retry, timeout=timeout)
 
+    def test_get_all_w_deadline(self):
+        from google.cloud.firestore_v1.deadline import Deadline
+
+        client = mock.Mock(spec=["get_all"])
+        deadline = Deadline(5.0)
+        transaction = self._make_one(client, deadline=deadline)
+        ref1 = mock.Mock()
+
+        transaction.get_all([ref1])
+
+        _, kwargs = client.get_all.call_args
+        self.assertIs(kwargs["timeout"], deadline)
+        self.assertIs(kwargs["transaction"], transaction)
+
+    def test_get_all_w_read_time(self):
+        client = mock.Mock(spec=["get_all"])
+        transaction = self._make_one(
+            client, read_only=True, read_time=mock.sentinel.read_time
+        )
+        ref1, ref2 = mock.Mock(), mock.Mock()
+
+        result = transaction.get_all([ref1, ref2])
+
+        client.get_all.assert_called_once_with(
+            [ref1, ref2], read_time=mock.sentinel.read_time
+        )
+        self.assertIs(result, client.get_all.return_value)
+
     def _get_w_document_ref_helper(self, retry=None, timeout=None):
         from google.cloud.firestore_v1.document import DocumentReference
         from google.cloud.firestore_v1 import _helpers
@@ -365,6 +479,21 @@ class TestTransaction(unittest.TestCase):
         timeout = 123.0
         self._get_w_query_helper(retry=retry, timeout=timeout)
 
+    def test_get_w_query_w_read_time(self):
+        from google.cloud.firestore_v1.query import Query
+
+        client = mock.Mock(spec=[])
+        transaction = self._make_one(
+            client, read_only=True, read_time=mock.sentinel.read_time
+        )
+        query = Query(parent=mock.Mock(spec=[]))
+        query.stream = mock.MagicMock()
+
+        result = transaction.get(query)
+
+        self.assertIs(result, query.stream.return_value)
+        query.stream.assert_called_once_with(read_time=mock.sentinel.read_time)
+
     def test_get_failure(self):
         client = _make_client()
         transaction = self._make_one(client)
@@ -372,6 +501,42 @@ class TestTransaction(unittest.TestCase):
         with self.assertRaises(ValueError):
             transaction.get(ref_or_query)
 
+    def test_constructor_w_cache_reads(self):
+        transaction = self._make_one(mock.sentinel.client, cache_reads=True)
+        self.assertTrue(transaction._cache_reads)
+        self.assertEqual(transaction.read_set, ())
+
+    def test_get_all_w_cache_reads(self):
+        client = _make_client()
+        client.get_all = mock.Mock(side_effect=_get_all_snapshots, spec=[])
+        transaction = self._make_one(client, cache_reads=True)
+        ref1 = client.document("abc", "def")
+        ref2 = client.document("abc", "ghi")
+
+        snapshots = list(transaction.get_all([ref1, ref2, ref1]))
+        self.assertEqual([snapshot.reference for snapshot in snapshots], [ref1, ref2])
+        client.get_all.assert_called_once_with([ref1, ref2], transaction=transaction)
+
+        # Documents already read are served from the cache.
+        ref3 = client.document("abc", "jkl")
+        again = list(transaction.get_all([ref2, ref3]))
+        self.assertEqual(again, [snapshots[1], mock.ANY])
+        client.get_all.assert_called_with([ref3], transaction=transaction)
+        self.assertEqual(client.get_all.call_count, 2)
+        self.assertEqual(transaction.read_set, ("abc/def", "abc/ghi", "abc/jkl"))
+
+    def test_get_w_document_ref_w_cache_reads(self):
+        client = _make_client()
+        client.get_all = mock.Mock(side_effect=_get_all_snapshots, spec=[])
+        transaction = self._make_one(client, cache_reads=True)
+        ref = client.document("abc", "def")
+
+        (snapshot,) = transaction.get(ref)
+        (again,) = transaction.get(ref)
+
+        self.assertIs(again, snapshot)
+        client.get_all.assert_called_once_with([ref], transaction=transaction)
+
 
 class Test_Transactional(unittest.TestCase):
     @staticmethod
@@ -743,6 +908,36 @@ class Test_Transactional(unittest.TestCase):
         )
         self.assertEqual(firestore_api.commit.mock_calls, [commit_call, commit_call])
 
+    def test___call__second_attempt_prefetches_reads(self):
+        from google.api_core import exceptions
+        from google.cloud.firestore_v1.types import firestore
+        from google.cloud.firestore_v1.types import write
+
+        transaction = _make_transaction(b"prefetch", cache_reads=True)
+        client = transaction._client
+        ref1 = client.document("abc", "def")
+        ref2 = client.document("abc", "ghi")
+        client.get_all = mock.Mock(side_effect=_get_all_snapshots, spec=[])
+
+        def to_wrap(txn):
+            return [snapshot.reference for snapshot in txn.get_all([ref1, ref2])]
+
+        wrapped = self._make_one(to_wrap)
+        firestore_api = client._firestore_api
+        firestore_api.commit.side_effect = [
+            exceptions.Aborted("Contention junction."),
+            firestore.CommitResponse(write_results=[write.WriteResult()]),
+        ]
+
+        result = wrapped(transaction)
+
+        self.assertEqual(result, [ref1, ref2])
+        # One read per attempt: the second attempt reads its documents
+        # before calling ``to_wrap``, which is then served from the cache.
+        read_call = mock.call([ref1, ref2], transaction=transaction)
+        self.assertEqual(client.get_all.mock_calls, [read_call, read_call])
+        self.assertEqual(transaction.read_set, ("abc/def", "abc/ghi"))
+
     def test___call__failure(self):
         from google.api_core import exceptions
         from google.cloud.firestore_v1.base_transaction import _EXCEED_ATTEMPTS_TEMPLATE
@@ -794,6 +989,23 @@ class Test_Transactional(unittest.TestCase):
             metadata=transaction._client._rpc_metadata,
         )
 
+    def test___call__deadline_expired(self):
+        from google.api_core import exceptions
+        from google.cloud.firestore_v1.deadline import Deadline
+
+        to_wrap = mock.Mock(spec=[])
+        wrapped = self._make_one(to_wrap)
+        firestore_api = mock.Mock(spec=["begin_transaction"])
+        client = _make_client()
+        client._firestore_api_internal = firestore_api
+        transaction = client.transaction(deadline=Deadline(0.0))
+
+        with self.assertRaises(exceptions.DeadlineExceeded):
+            wrapped(transaction)
+
+        to_wrap.assert_not_called()
+        firestore_api.begin_transaction.assert_not_called()
+
 
 class Test_transactional(unittest.TestCase):
     @staticmethod
@@ -971,6 +1183,27 @@ class Test__commit_with_retry(unittest.TestCase):
         )
         self.assertEqual(firestore_api.commit.mock_calls, [commit_call, commit_call])
 
+    @mock.patch("google.cloud.firestore_v1.transaction._sleep")
+    def test_w_deadline(self, _sleep):
+        from google.api_core import exceptions
+        from google.cloud.firestore_v1.deadline import Deadline
+        from google.cloud.firestore_v1.transaction import _commit_with_retry
+
+        firestore_api = mock.Mock(spec=["commit"])
+        firestore_api.commit.side_effect = exceptions.ServiceUnavailable("Later.")
+        client = _make_client()
+        client._firestore_api_internal = firestore_api
+        # Less than the first backoff is left.
+        deadline = Deadline(0.5)
+
+        with self.assertRaises(exceptions.DeadlineExceeded):
+            _commit_with_retry(client, mock.sentinel.write_pbs, b"txn", deadline)
+
+        _sleep.assert_not_called()
+        _, kwargs = firestore_api.commit.call_args
+        self.assertIs(kwargs["timeout"], deadline)
+        self.assertIsNone(kwargs["retry"])
+
 
 class Test__sleep(unittest.TestCase):
     @staticmethod
@@ -1031,6 +1264,13 @@ def _make_client(project="feral-tom-cat"):
     return Client(project=project, credentials=credentials)
 
 
+def _get_all_snapshots(references, **kwargs):
+    from google.cloud.firestore_v1.base_document import DocumentSnapshot
+
+    for reference in references:
+        yield DocumentSnapshot(reference, {}, True, None, None, None)
+
+
 def _make_transaction(txn_id, **txn_kwargs):
     from google.protobuf import empty_pb2
     from google.cloud.firestore_v1.services.firestore import client as firestore_client
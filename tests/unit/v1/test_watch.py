@@ -15,7 +15,10 @@
 import datetime
 import unittest
 import mock
+from google.cloud.firestore_v1 import _helpers
+from google.cloud.firestore_v1.types import document
 from google.cloud.firestore_v1.types import firestore
+from google.cloud.firestore_v1.types import write
 
 
 class TestWatchDocTree(unittest.TestCase):
@@ -172,6 +175,7 @@ class TestWatch(unittest.TestCase):
         snapshot_callback=None,
         snapshot_class=None,
         reference_class=None,
+        **kwargs
     ):  # pragma: NO COVER
         from google.cloud.firestore_v1.watch import Watch
 
@@ -200,6 +204,7 @@ class TestWatch(unittest.TestCase):
             reference_class,
             BackgroundConsumer=DummyBackgroundConsumer,
             ResumableBidiRpc=DummyRpc,
+            **kwargs
         )
         return inst
 
@@ -345,13 +350,20 @@ class TestWatch(unittest.TestCase):
 
     def test_on_snapshot_target_no_change_no_target_ids_not_current(self):
         inst = self._makeOne()
-        proto = DummyProto()
-        inst.on_snapshot(proto)  # nothing to assert, no mutations, no rtnval
+        proto = _listen_response(target_change=_target_change())
+        inst.push = mock.Mock(spec=[])
+        inst.on_snapshot(proto)
+        inst.push.assert_not_called()
 
     def test_on_snapshot_target_no_change_no_target_ids_current(self):
+        from google.protobuf import timestamp_pb2
+
         inst = self._makeOne()
-        proto = DummyProto()
-        proto.target_change.read_time = 1
+        proto = _listen_response(
+            target_change=_target_change(
+                read_time=timestamp_pb2.Timestamp(seconds=1), resume_token=b"token"
+            )
+        )
         inst.current = True
 
         def push(read_time, next_resume_token):
@@ -360,26 +372,47 @@ class TestWatch(unittest.TestCase):
 
         inst.push = push
         inst.on_snapshot(proto)
-        self.assertEqual(inst._read_time, 1)
-        self.assertEqual(inst._next_resume_token, None)
+        self.assertEqual(inst._read_time.timestamp(), 1)
+        self.assertEqual(inst._next_resume_token, b"token")
+
+    def test_on_snapshot_target_no_change_raw(self):
+        from google.protobuf import timestamp_pb2
+
+        inst = self._makeOne()
+        proto = _listen_response(
+            target_change=_target_change(
+                read_time=timestamp_pb2.Timestamp(seconds=1), resume_token=b"token"
+            )
+        )
+        inst.current = True
+        inst.push = mock.Mock(spec=[])
+        inst.on_snapshot(proto._pb)
+
+        read_time, resume_token = inst.push.call_args[0]
+        self.assertEqual(read_time.timestamp(), 1)
+        self.assertEqual(resume_token, b"token")
 
     def test_on_snapshot_target_add(self):
         inst = self._makeOne()
-        proto = DummyProto()
-        proto.target_change.target_change_type = (
-            firestore.TargetChange.TargetChangeType.ADD
+        proto = _listen_response(
+            target_change=_target_change(
+                target_change_type=firestore.TargetChange.TargetChangeType.ADD,
+                target_ids=[1],  # not "Py"
+            )
         )
-        proto.target_change.target_ids = [1]  # not "Py"
         with self.assertRaises(Exception) as exc:
             inst.on_snapshot(proto)
         self.assertEqual(str(exc.exception), "Unexpected target ID 1 sent by server")
 
     def test_on_snapshot_target_remove(self):
+        from google.rpc import status_pb2
+
         inst = self._makeOne()
-        proto = DummyProto()
-        target_change = proto.target_change
-        target_change.target_change_type = (
-            firestore.TargetChange.TargetChangeType.REMOVE
+        proto = _listen_response(
+            target_change=_target_change(
+                target_change_type=firestore.TargetChange.TargetChangeType.REMOVE,
+                cause=status_pb2.Status(code=1, message="hi"),
+            )
         )
         with self.assertRaises(Exception) as exc:
             inst.on_snapshot(proto)
@@ -387,11 +420,10 @@ class TestWatch(unittest.TestCase):
 
     def test_on_snapshot_target_remove_nocause(self):
         inst = self._makeOne()
-        proto = DummyProto()
-        target_change = proto.target_change
-        target_change.cause = None
-        target_change.target_change_type = (
-            firestore.TargetChange.TargetChangeType.REMOVE
+        proto = _listen_response(
+            target_change=_target_change(
+                target_change_type=firestore.TargetChange.TargetChangeType.REMOVE
+            )
         )
         with self.assertRaises(Exception) as exc:
             inst.on_snapshot(proto)
@@ -404,45 +436,45 @@ class TestWatch(unittest.TestCase):
             inst._docs_reset = True
 
         inst._reset_docs = reset
-        proto = DummyProto()
-        target_change = proto.target_change
-        target_change.target_change_type = firestore.TargetChange.TargetChangeType.RESET
+        proto = _listen_response(
+            target_change=_target_change(
+                target_change_type=firestore.TargetChange.TargetChangeType.RESET
+            )
+        )
         inst.on_snapshot(proto)
         self.assertTrue(inst._docs_reset)
 
     def test_on_snapshot_target_current(self):
         inst = self._makeOne()
         inst.current = False
-        proto = DummyProto()
-        target_change = proto.target_change
-        target_change.target_change_type = (
-            firestore.TargetChange.TargetChangeType.CURRENT
+        proto = _listen_response(
+            target_change=_target_change(
+                target_change_type=firestore.TargetChange.TargetChangeType.CURRENT
+            )
         )
         inst.on_snapshot(proto)
         self.assertTrue(inst.current)
 
     def test_on_snapshot_target_unknown(self):
         inst = self._makeOne()
-        proto = DummyProto()
-        proto.target_change.target_change_type = "unknown"
+        proto = _listen_response(target_change=_target_change())
+        proto._pb.target_change.target_change_type = 99
         with self.assertRaises(Exception) as exc:
             inst.on_snapshot(proto)
         self.assertTrue(inst._consumer is None)
         self.assertTrue(inst._rpc is None)
-        self.assertEqual(str(exc.exception), "Unknown target change type: unknown ")
+        self.assertEqual(str(exc.exception), "Unknown target change type: 99 ")
 
     def test_on_snapshot_document_change_removed(self):
         from google.cloud.firestore_v1.watch import WATCH_TARGET_ID, ChangeType
 
         inst = self._makeOne()
-        proto = DummyProto()
-        proto.target_change = ""
-        proto.document_change.removed_target_ids = [WATCH_TARGET_ID]
-
-        class DummyDocument:
-            name = "fred"
-
-        proto.document_change.document = DummyDocument()
+        proto = _listen_response(
+            document_change=write.DocumentChange(
+                document=document.Document(name="fred"),
+                removed_target_ids=[WATCH_TARGET_ID],
+            )
+        )
         inst.on_snapshot(proto)
         self.assertTrue(inst.change_map["fred"] is ChangeType.REMOVED)
 
@@ -450,20 +482,40 @@ class TestWatch(unittest.TestCase):
         from google.cloud.firestore_v1.watch import WATCH_TARGET_ID
 
         inst = self._makeOne()
+        document_pb = document.Document(
+            name="fred", fields=_helpers.encode_dict({"a": 1})
+        )
+        proto = _listen_response(
+            document_change=write.DocumentChange(
+                document=document_pb, target_ids=[WATCH_TARGET_ID]
+            )
+        )
+        with mock.patch(
+            "google.cloud.firestore_v1._helpers.decode_dict"
+        ) as decode_dict:
+            inst.on_snapshot(proto)
 
-        proto = DummyProto()
-        proto.target_change = ""
-        proto.document_change.target_ids = [WATCH_TARGET_ID]
+        # Decoding is deferred until the document is pushed.
+        decode_dict.assert_not_called()
+        self.assertIsInstance(inst.change_map["fred"], document.Document)
+        self.assertEqual(inst.change_map["fred"], document_pb)
 
-        class DummyDocument:
-            name = "fred"
-            fields = {}
-            create_time = None
-            update_time = None
+    def test_on_snapshot_document_change_changed_raw(self):
+        from google.cloud.firestore_v1.watch import WATCH_TARGET_ID
 
-        proto.document_change.document = DummyDocument()
-        inst.on_snapshot(proto)
-        self.assertEqual(inst.change_map["fred"].data, {})
+        inst = self._makeOne()
+        document_pb = document.Document(
+            name="fred", fields=_helpers.encode_dict({"a": 1})
+        )
+        proto = _listen_response(
+            document_change=write.DocumentChange(
+                document=document_pb, target_ids=[WATCH_TARGET_ID]
+            )
+        )
+        inst.on_snapshot(proto._pb)
+
+        self.assertIsInstance(inst.change_map["fred"], document.Document)
+        self.assertEqual(inst.change_map["fred"], document_pb)
 
     def test_on_snapshot_document_change_changed_docname_db_prefix(self):
         # TODO: Verify the current behavior. The change map currently contains
@@ -471,27 +523,30 @@ class TestWatch(unittest.TestCase):
         from google.cloud.firestore_v1.watch import WATCH_TARGET_ID
 
         inst = self._makeOne()
-
-        proto = DummyProto()
-        proto.target_change = ""
-        proto.document_change.target_ids = [WATCH_TARGET_ID]
-
-        class DummyDocument:
-            name = "abc://foo/documents/fred"
-            fields = {}
-            create_time = None
-            update_time = None
-
-        proto.document_change.document = DummyDocument()
+        proto = _listen_response(
+            document_change=write.DocumentChange(
+                document=document.Document(name="abc://foo/documents/fred"),
+                target_ids=[WATCH_TARGET_ID],
+            )
+        )
         inst._firestore._database_string = "abc://foo"
         inst.on_snapshot(proto)
-        self.assertEqual(inst.change_map["abc://foo/documents/fred"].data, {})
+        self.assertEqual(
+            inst.change_map["abc://foo/documents/fred"].name, "abc://foo/documents/fred"
+        )
+
+        inst.push(None, None)
+        (snapshot,) = self.snapshotted[0]
+        self.assertEqual(snapshot.reference._document_path, "/fred")
+        self.assertEqual(snapshot.data, {})
 
     def test_on_snapshot_document_change_neither_changed_nor_removed(self):
         inst = self._makeOne()
-        proto = DummyProto()
-        proto.target_change = ""
-        proto.document_change.target_ids = []
+        proto = _listen_response(
+            document_change=write.DocumentChange(
+                document=document.Document(name="fred"), target_ids=[]
+            )
+        )
 
         inst.on_snapshot(proto)
         self.assertTrue(not inst.change_map)
@@ -500,31 +555,21 @@ class TestWatch(unittest.TestCase):
         from google.cloud.firestore_v1.watch import ChangeType
 
         inst = self._makeOne()
-        proto = DummyProto()
-        proto.target_change = ""
-        proto.document_change = ""
+        proto = _listen_response(document_remove=write.DocumentRemove(document="fred"))
+        inst.on_snapshot(proto)
+        self.assertTrue(inst.change_map["fred"] is ChangeType.REMOVED)
 
-        class DummyRemove(object):
-            document = "fred"
+    def test_on_snapshot_document_deleted(self):
+        from google.cloud.firestore_v1.watch import ChangeType
 
-        remove = DummyRemove()
-        proto.document_remove = remove
-        proto.document_delete = ""
+        inst = self._makeOne()
+        proto = _listen_response(document_delete=write.DocumentDelete(document="fred"))
         inst.on_snapshot(proto)
         self.assertTrue(inst.change_map["fred"] is ChangeType.REMOVED)
 
     def test_on_snapshot_filter_update(self):
         inst = self._makeOne()
-        proto = DummyProto()
-        proto.target_change = ""
-        proto.document_change = ""
-        proto.document_remove = ""
-        proto.document_delete = ""
-
-        class DummyFilter(object):
-            count = 999
-
-        proto.filter = DummyFilter()
+        proto = _listen_response(filter=write.ExistenceFilter(count=999))
 
         def reset():
             inst._docs_reset = True
@@ -535,16 +580,7 @@ class TestWatch(unittest.TestCase):
 
     def test_on_snapshot_filter_update_no_size_change(self):
         inst = self._makeOne()
-        proto = DummyProto()
-        proto.target_change = ""
-        proto.document_change = ""
-        proto.document_remove = ""
-        proto.document_delete = ""
-
-        class DummyFilter(object):
-            count = 0
-
-        proto.filter = DummyFilter()
+        proto = _listen_response(filter=write.ExistenceFilter(count=0))
         inst._docs_reset = False
 
         inst.on_snapshot(proto)
@@ -552,12 +588,7 @@ class TestWatch(unittest.TestCase):
 
     def test_on_snapshot_unknown_listen_type(self):
         inst = self._makeOne()
-        proto = DummyProto()
-        proto.target_change = ""
-        proto.document_change = ""
-        proto.document_remove = ""
-        proto.document_delete = ""
-        proto.filter = ""
+        proto = _listen_response()
         with self.assertRaises(Exception) as exc:
             inst.on_snapshot(proto)
         self.assertTrue(
@@ -565,6 +596,70 @@ class TestWatch(unittest.TestCase):
             str(exc.exception),
         )
 
+    def test_on_snapshot_does_not_render_protos(self):
+        from google.cloud.firestore_v1.watch import WATCH_TARGET_ID
+
+        inst = self._makeOne()
+        proto = _listen_response(
+            document_change=write.DocumentChange(
+                document=document.Document(name="fred"), target_ids=[WATCH_TARGET_ID],
+            )
+        )
+        with mock.patch.object(
+            type(proto), "__str__", side_effect=AssertionError("rendered")
+        ):
+            inst.on_snapshot(proto)
+        self.assertIn("fred", inst.change_map)
+
+    def test_push_decodes_changed_documents(self):
+        from google.protobuf import timestamp_pb2
+
+        inst = self._makeOne()
+        for index in range(2):
+            inst.change_map[
+                "abc://bar//documents/col/doc{}".format(index)
+            ] = document.Document(
+                name="abc://bar//documents/col/doc{}".format(index),
+                fields=_helpers.encode_dict({"n": index}),
+                update_time=timestamp_pb2.Timestamp(seconds=1),
+            )
+        inst.push(mock.sentinel.read_time, b"token")
+
+        docs, changes, read_time = self.snapshotted
+        self.assertEqual(read_time, mock.sentinel.read_time)
+        self.assertEqual(sorted(doc.data["n"] for doc in docs), [0, 1])
+        self.assertTrue(all(doc.read_time is mock.sentinel.read_time for doc in docs))
+        self.assertEqual(len(changes), 2)
+
+    def test_push_skips_unchanged_updates(self):
+        from google.protobuf import timestamp_pb2
+
+        inst = self._makeOne(state=self._make_state())
+        old_snapshot = inst.doc_map["/col/doc1"]
+        inst.has_pushed = True
+
+        # Same version as the one held: not decoded, not a change.
+        inst.change_map["/col/doc1"] = document.Document(
+            name="/col/doc1", update_time=timestamp_pb2.Timestamp(seconds=1)
+        )
+        # A new version: decoded, reusing the known reference.
+        inst.change_map["/col/doc2"] = document.Document(
+            name="/col/doc2",
+            fields=_helpers.encode_dict({"n": 20}),
+            update_time=timestamp_pb2.Timestamp(seconds=20),
+        )
+        with mock.patch.object(
+            inst, "_document_to_snapshot", wraps=inst._document_to_snapshot
+        ) as to_snapshot:
+            inst.push(None, b"token")
+
+        to_snapshot.assert_called_once()
+        self.assertIs(inst.doc_map["/col/doc1"], old_snapshot)
+        docs, changes, _ = self.snapshotted
+        self.assertEqual(len(changes), 1)
+        self.assertEqual(changes[0].document.data, {"n": 20})
+        self.assertIs(changes[0].document.reference, to_snapshot.call_args[0][2])
+
     def test_push_callback_called_no_changes(self):
         import pytz
 
@@ -632,59 +727,17 @@ class TestWatch(unittest.TestCase):
 
     def test__extract_changes_doc_updated(self):
         inst = self._makeOne()
-
-        class Dummy(object):
-            pass
-
-        doc = Dummy()
-        snapshot = Dummy()
-        changes = {"name": snapshot}
-        doc_map = {"name": doc}
+        changes = {"name": mock.sentinel.document}
+        doc_map = {"name": mock.sentinel.snapshot}
         results = inst._extract_changes(doc_map, changes, 1)
-        self.assertEqual(results, ([], [], [snapshot]))
-        self.assertEqual(snapshot.read_time, 1)
-
-    def test__extract_changes_doc_updated_read_time_is_None(self):
-        inst = self._makeOne()
-
-        class Dummy(object):
-            pass
-
-        doc = Dummy()
-        snapshot = Dummy()
-        snapshot.read_time = None
-        changes = {"name": snapshot}
-        doc_map = {"name": doc}
-        results = inst._extract_changes(doc_map, changes, None)
-        self.assertEqual(results, ([], [], [snapshot]))
-        self.assertEqual(snapshot.read_time, None)
+        self.assertEqual(results, ([], [], [mock.sentinel.document]))
 
     def test__extract_changes_doc_added(self):
         inst = self._makeOne()
-
-        class Dummy(object):
-            pass
-
-        snapshot = Dummy()
-        changes = {"name": snapshot}
+        changes = {"name": mock.sentinel.document}
         doc_map = {}
         results = inst._extract_changes(doc_map, changes, 1)
-        self.assertEqual(results, ([], [snapshot], []))
-        self.assertEqual(snapshot.read_time, 1)
-
-    def test__extract_changes_doc_added_read_time_is_None(self):
-        inst = self._makeOne()
-
-        class Dummy(object):
-            pass
-
-        snapshot = Dummy()
-        snapshot.read_time = None
-        changes = {"name": snapshot}
-        doc_map = {}
-        results = inst._extract_changes(doc_map, changes, None)
-        self.assertEqual(results, ([], [snapshot], []))
-        self.assertEqual(snapshot.read_time, None)
+        self.assertEqual(results, ([], [mock.sentinel.document], []))
 
     def test__compute_snapshot_doctree_and_docmap_disagree_about_length(self):
         inst = self._makeOne()
@@ -802,6 +855,89 @@ class TestWatch(unittest.TestCase):
         request = inst._get_rpc_request()
         self.assertEqual(request.add_target.resume_token, b"ABCD0123")
 
+    def _make_state(self, resume_token=b"ABCD0123", **kwargs):
+        from google.cloud.firestore_v1 import _helpers
+        from google.cloud.firestore_v1.types import document
+        from google.cloud.firestore_v1.watch import ListenerState
+        from google.protobuf import timestamp_pb2
+
+        documents = [
+            document.Document(
+                name="abc://bar//documents/col/doc{}".format(index),
+                fields=_helpers.encode_dict({"n": index}),
+                update_time=timestamp_pb2.Timestamp(seconds=index),
+            )
+            for index in (1, 2)
+        ]
+        return ListenerState(resume_token, documents, **kwargs)
+
+    def test_ctor_w_state(self):
+        inst = self._makeOne(state=self._make_state(current=True))
+
+        self.assertEqual(inst.resume_token, b"ABCD0123")
+        self.assertTrue(inst.current)
+        self.assertEqual(inst._current_size(), 2)
+        self.assertEqual(sorted(inst.doc_map), ["/col/doc1", "/col/doc2"])
+        doc2 = inst.doc_map["/col/doc2"]
+        self.assertEqual(doc2.data, {"n": 2})
+        self.assertEqual(inst.doc_tree.find(doc2).index, 1)
+        request = inst._get_rpc_request()
+        self.assertEqual(request.add_target.resume_token, b"ABCD0123")
+
+        # The first snapshot includes the restored documents.
+        inst.push(None, b"EFGH4567")
+        docs, changes, _ = self.snapshotted
+        self.assertEqual(docs, [inst.doc_map["/col/doc1"], doc2])
+        self.assertEqual(changes, [])
+
+    def test_ctor_w_state_then_reset(self):
+        from google.cloud.firestore_v1.watch import ChangeType
+
+        inst = self._makeOne(state=self._make_state())
+        inst._get_rpc_request()
+
+        inst._on_snapshot_target_change_reset(None)
+
+        self.assertIsNone(inst.resume_token)
+        self.assertEqual(
+            inst.change_map,
+            {"/col/doc1": ChangeType.REMOVED, "/col/doc2": ChangeType.REMOVED},
+        )
+        # Reconnecting does not resume from the stale token.
+        request = inst._get_rpc_request()
+        self.assertEqual(request.add_target.resume_token, b"")
+
+    def test_export_state(self):
+        import datetime
+        from google.cloud.firestore_v1.base_document import DocumentSnapshot
+
+        state = self._make_state(current=True)
+        inst = self._makeOne(snapshot_class=DocumentSnapshot, state=state)
+        read_time = datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc)
+        inst.push(read_time, b"EFGH4567")
+
+        exported = inst.export_state()
+
+        self.assertEqual(exported.resume_token, b"EFGH4567")
+        self.assertTrue(exported.current)
+        self.assertEqual(exported.read_time, read_time)
+        self.assertEqual(
+            [document.name for document in exported.documents],
+            ["/col/doc1", "/col/doc2"],
+        )
+        self.assertEqual(
+            [document.fields for document in exported.documents],
+            [document.fields for document in state.documents],
+        )
+
+    def test_push_updates_resume_token_before_callback(self):
+        tokens = []
+        inst = self._makeOne(
+            snapshot_callback=lambda *args: tokens.append(inst.resume_token)
+        )
+        inst.push(None, b"token")
+        self.assertEqual(tokens, [b"token"])
+
 
 class DummyFirestoreStub(object):
     def Listen(self):  # pragma: NO COVER
@@ -963,25 +1099,15 @@ class DummyRpc(object):
         self.closed = True
 
 
-class DummyCause(object):
-    code = 1
-    message = "hi"
-
-
-class DummyChange(object):
-    def __init__(self):
-        self.target_ids = []
-        self.removed_target_ids = []
-        self.read_time = 0
-        self.target_change_type = firestore.TargetChange.TargetChangeType.NO_CHANGE
-        self.resume_token = None
-        self.cause = DummyCause()
+def _listen_response(**kwargs):
+    return firestore.ListenResponse(**kwargs)
 
 
-class DummyProto(object):
-    def __init__(self):
-        self.target_change = DummyChange()
-        self.document_change = DummyChange()
+def _target_change(**kwargs):
+    kwargs.setdefault(
+        "target_change_type", firestore.TargetChange.TargetChangeType.NO_CHANGE
+    )
+    return firestore.TargetChange(**kwargs)
 
 
 class DummyTarget(object):
@@ -1002,3 +1128,48 @@ class DummyPb2(object):
 
     def ListenRequest(self, **kw):
         pass
+
+
+class TestListenerState(unittest.TestCase):
+    @staticmethod
+    def _get_target_class():
+        from google.cloud.firestore_v1.watch import ListenerState
+
+        return ListenerState
+
+    def _make_one(self, *args, **kwargs):
+        klass = self._get_target_class()
+        return klass(*args, **kwargs)
+
+    def test_bytes_round_trip(self):
+        import datetime
+        from google.cloud.firestore_v1.types import document
+
+        documents = [
+            document.Document(name="projects/p/databases/d/documents/c/{}".format(i))
+            for i in range(3)
+        ]
+        read_time = datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc)
+        state = self._make_one(b"token", documents, current=True, read_time=read_time)
+
+        restored = self._get_target_class().from_bytes(state.to_bytes())
+
+        self.assertEqual(restored, state)
+        self.assertNotEqual(restored, object())
+
+    def test_bytes_round_trip_empty(self):
+        state = self._make_one(None, [])
+
+        restored = self._get_target_class().from_bytes(state.to_bytes())
+
+        self.assertIsNone(restored.resume_token)
+        self.assertEqual(restored.documents, [])
+        self.assertFalse(restored.current)
+
+    def test_from_bytes_invalid(self):
+        klass = self._get_target_class()
+        serialized = self._make_one(b"token", []).to_bytes()
+
+        for data in (b"", b"\x00", serialized[:-1], serialized + b"\x00\x00\x00\x09"):
+            with self.assertRaises(ValueError):
+                klass.from_bytes(data)
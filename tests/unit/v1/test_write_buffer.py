@@ -0,0 +1,141 @@
+# Copyright 2020 Google LLC All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+import mock
+
+
+class TestWriteBuffer(unittest.TestCase):
+    @staticmethod
+    def _get_target_class():
+        from google.cloud.firestore_v1.write_buffer import WriteBuffer
+
+        return WriteBuffer
+
+    def _make_one(self, *args, **kwargs):
+        klass = self._get_target_class()
+        return klass(*args, **kwargs)
+
+    def test_client_factory(self):
+        client = _make_client()
+        buffer = client.write_buffer(flush_interval=None, max_batch_size=10)
+        self.assertIsInstance(buffer, self._get_target_class())
+        self.assertIs(buffer._client, client)
+        self.assertIsNone(buffer._flush_interval)
+        self.assertEqual(buffer._max_batch_size, 10)
+
+    def test_flush(self):
+        from google.cloud.firestore_v1.transforms import Increment
+
+        firestore_api = _make_firestore_api(2)
+        client = _make_client()
+        client._firestore_api_internal = firestore_api
+        buffer = self._make_one(client, flush_interval=None)
+        counter = client.document("counters", "page")
+        other = client.document("counters", "other")
+
+        futures = [buffer.update(counter, {"n": Increment(1)}) for _ in range(5)]
+        futures.append(buffer.set(other, {"n": 0}))
+        write_pbs = [entry.write_pb for entry in buffer._entries]
+        self.assertFalse(any(future.done() for future in futures))
+
+        buffer.flush()
+
+        self.assertEqual(len(buffer), 0)
+        results = firestore_api.commit.return_value.write_results
+        for future in futures[:5]:
+            self.assertEqual(future.result(), results[0])
+        self.assertEqual(futures[5].result(), results[1])
+        firestore_api.commit.assert_called_once_with(
+            request={
+                "database": client._database_string,
+                "writes": write_pbs,
+                "transaction": None,
+            },
+            metadata=client._rpc_metadata,
+        )
+
+    def test_flush_when_full(self):
+        firestore_api = _make_firestore_api(2)
+        client = _make_client()
+        client._firestore_api_internal = firestore_api
+        buffer = self._make_one(client, flush_interval=None, max_batch_size=2)
+
+        first = buffer.create(client.document("a", "b"), {"a": 1})
+        firestore_api.commit.assert_not_called()
+        second = buffer.create(client.document("a", "c"), {"a": 1})
+
+        firestore_api.commit.assert_called_once()
+        self.assertTrue(first.done())
+        self.assertTrue(second.done())
+
+    def test_flush_failure(self):
+        from google.api_core import exceptions
+
+        firestore_api = mock.Mock(spec=["commit"])
+        exc = exceptions.NotFound("missing")
+        firestore_api.commit.side_effect = exc
+        client = _make_client()
+        client._firestore_api_internal = firestore_api
+        buffer = self._make_one(client, flush_interval=None)
+
+        future = buffer.update(client.document("a", "b"), {"a": 1})
+        buffer.flush()
+
+        self.assertIs(future.exception(), exc)
+
+    def test_background_flush_and_close(self):
+        firestore_api = _make_firestore_api(1)
+        client = _make_client()
+        client._firestore_api_internal = firestore_api
+
+        with self._make_one(client, flush_interval=0.01) as buffer:
+            future = buffer.create(client.document("a", "b"), {"a": 1})
+            self.assertIsNotNone(buffer._flusher)
+            result = future.result(timeout=5)
+
+        self.assertEqual(result, firestore_api.commit.return_value.write_results[0])
+        self.assertIsNone(buffer._flusher)
+        with self.assertRaises(ValueError):
+            buffer.create(client.document("a", "c"), {"a": 1})
+
+
+def _make_firestore_api(num_results):
+    from google.cloud.firestore_v1.types import firestore
+    from google.cloud.firestore_v1.types import write
+    from google.protobuf import timestamp_pb2
+
+    firestore_api = mock.Mock(spec=["commit"])
+    firestore_api.commit.return_value = firestore.CommitResponse(
+        write_results=[
+            write.WriteResult(update_time=timestamp_pb2.Timestamp(seconds=index))
+            for index in range(1, num_results + 1)
+        ],
+        commit_time=timestamp_pb2.Timestamp(seconds=1234567),
+    )
+    return firestore_api
+
+
+def _make_credentials():
+    import google.auth.credentials
+
+    return mock.Mock(spec=google.auth.credentials.Credentials)
+
+
+def _make_client(project="seventy-nine"):
+    from google.cloud.firestore_v1.client import Client
+
+    credentials = _make_credentials()
+    return Client(project=project, credentials=credentials)